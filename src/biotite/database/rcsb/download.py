@@ -7,6 +7,9 @@ __author__ = "Patrick Kunzmann"
 __all__ = ["fetch"]
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from os.path import isdir, isfile, join, getsize
 import os
 import glob
@@ -20,8 +23,16 @@ _fasta_url = "https://www.rcsb.org/fasta/entry/"
 
 _binary_formats = ["mmtf"]
 
+# Server responses that indicate a temporary problem,
+# so the request is retried
+_retry_status_codes = [429, 500, 502, 503, 504]
+# The waiting time before the n-th retry is
+# '_backoff_factor * 2**(n-1)' seconds
+_backoff_factor = 0.5
 
-def fetch(pdb_ids, format, target_path=None, overwrite=False, verbose=False):
+
+def fetch(pdb_ids, format, target_path=None, overwrite=False, verbose=False,
+          n_threads=1, retries=0):
     """
     Download structure files (or sequence files) from the RCSB PDB in
     various formats.
@@ -48,6 +59,12 @@ def fetch(pdb_ids, format, target_path=None, overwrite=False, verbose=False):
         the file is empty.
     verbose: bool, optional
         If set to true, the function will output the download progress.
+    n_threads : int, optional
+        The number of files that are downloaded concurrently.
+    retries : int, optional
+        The number of times a download is retried, if the connection
+        fails or the server reports a temporary problem.
+        The waiting time between retries increases exponentially.
     
     Returns
     -------
@@ -59,6 +76,19 @@ def fetch(pdb_ids, format, target_path=None, overwrite=False, verbose=False):
         If no `target_path` was given, the file contents are stored in
         either :class:`StringIO` or :class:`BytesIO` objects.
     
+    Notes
+    -----
+    All downloads share the same connection pool, so that consecutive
+    requests to the same server reuse the connection.
+
+    Each file is written to the `target_path` as soon as its download
+    has finished.
+    A file is only visible under its final name after it has been
+    written completely.
+    Hence, if a bulk download is interrupted, calling this function
+    again with the same parameters (and ``overwrite=False``) downloads
+    only the missing files.
+
     Warnings
     --------
     Even if you give valid input to this function, in rare cases the
@@ -90,53 +120,47 @@ def fetch(pdb_ids, format, target_path=None, overwrite=False, verbose=False):
         os.makedirs(target_path)
     
     files = []
-    for i, id in enumerate(pdb_ids):
-        # Verbose output
-        if verbose:
-            print(f"Fetching file {i+1:d} / {len(pdb_ids):d} ({id})...",
-                  end="\r")
-        
-        # Fetch file from database
-        if target_path is not None:
-            file = join(target_path, id + "." + format)
+    with _create_session(n_threads, retries) as session:
+        if n_threads > 1:
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                # Duplicate IDs would be written into the same file
+                # concurrently -> download each file only once
+                keys = [
+                    id if target_path is not None else i
+                    for i, id in enumerate(pdb_ids)
+                ]
+                futures = {}
+                for key, id in zip(keys, pdb_ids):
+                    if key not in futures:
+                        futures[key] = executor.submit(
+                            _fetch_single_file,
+                            session, id, format, target_path, overwrite
+                        )
+                try:
+                    for i, (id, key) in enumerate(zip(pdb_ids, keys)):
+                        files.append(futures[key].result())
+                        # Verbose output
+                        if verbose:
+                            print(
+                                f"Fetched file {i+1:d} / {len(pdb_ids):d} "
+                                f"({id})...", end="\r"
+                            )
+                except BaseException:
+                    # Do not start any further downloads
+                    for future in futures.values():
+                        future.cancel()
+                    raise
         else:
-            # 'file = None' -> store content in a file-like object
-            file = None
-        
-        if file is None \
-           or not isfile(file) \
-           or getsize(file) == 0 \
-           or overwrite:
-                if format == "pdb":
-                    r = requests.get(_standard_url + id + ".pdb")
-                    content = r.text
-                    _assert_valid_file(content, id)
-                elif format in ["cif", "mmcif", "pdbx"]:
-                    r = requests.get(_standard_url + id + ".cif")
-                    content = r.text
-                    _assert_valid_file(content, id)
-                elif format == "mmtf":
-                    r = requests.get(_mmtf_url + id)
-                    content = r.content
-                    _assert_valid_file(r.text, id)
-                elif format == "fasta":
-                    r = requests.get(_fasta_url + id)
-                    content = r.text
-                    _assert_valid_file(content, id)
-                else:
-                    raise ValueError(f"Format '{format}' is not supported")
-                
-                if file is None:
-                    if format in _binary_formats:
-                        file = io.BytesIO(content)
-                    else:
-                        file = io.StringIO(content)
-                else:
-                    mode = "wb+" if format in _binary_formats else "w+"
-                    with open(file, mode) as f:
-                        f.write(content)
-        
-        files.append(file)
+            for i, id in enumerate(pdb_ids):
+                # Verbose output
+                if verbose:
+                    print(
+                        f"Fetching file {i+1:d} / {len(pdb_ids):d} ({id})...",
+                        end="\r"
+                    )
+                files.append(_fetch_single_file(
+                    session, id, format, target_path, overwrite
+                ))
     if verbose:
         print("\nDone")
     # If input was a single ID, return only a single path
@@ -146,6 +170,84 @@ def fetch(pdb_ids, format, target_path=None, overwrite=False, verbose=False):
         return files
 
 
+def _create_session(n_threads, retries):
+    """
+    Create a session, whose connection pool is large enough for the
+    given number of threads.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_maxsize=max(n_threads, 1),
+        max_retries=Retry(
+            total=retries,
+            backoff_factor=_backoff_factor,
+            status_forcelist=_retry_status_codes,
+            # Return the last response to be able to raise
+            # a 'RequestError' below
+            raise_on_status=False
+        )
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _fetch_single_file(session, id, format, target_path, overwrite):
+    """
+    Download a single file and write it into the `target_path`, if
+    given.
+    """
+    if target_path is not None:
+        file = join(target_path, id + "." + format)
+    else:
+        # 'file = None' -> store content in a file-like object
+        file = None
+    
+    if file is not None \
+       and isfile(file) \
+       and getsize(file) != 0 \
+       and not overwrite:
+            # The file was already downloaded
+            return file
+    
+    if format == "pdb":
+        r = session.get(_standard_url + id + ".pdb")
+    elif format in ["cif", "mmcif", "pdbx"]:
+        r = session.get(_standard_url + id + ".cif")
+    elif format == "mmtf":
+        r = session.get(_mmtf_url + id)
+    elif format == "fasta":
+        r = session.get(_fasta_url + id)
+    else:
+        raise ValueError(f"Format '{format}' is not supported")
+    # Check the status first, as server errors after exhausted retries
+    # also respond with an error page
+    if r.status_code not in (200, 404):
+        raise RequestError(
+            f"Download of PDB ID {id} failed with status code "
+            f"{r.status_code}"
+        )
+    _assert_valid_file(r.text, id)
+    if r.status_code == 404:
+        raise RequestError("PDB ID {:} is invalid".format(id))
+    content = r.content if format in _binary_formats else r.text
+    
+    if file is None:
+        if format in _binary_formats:
+            file = io.BytesIO(content)
+        else:
+            file = io.StringIO(content)
+    else:
+        mode = "wb+" if format in _binary_formats else "w+"
+        # Write into a temporary file first, so that an interrupted
+        # download does not leave an incomplete file behind
+        temp_file = file + ".part"
+        with open(temp_file, mode) as f:
+            f.write(content)
+        os.replace(temp_file, file)
+    return file
+
+
 def _assert_valid_file(response_text, pdb_id):
     """
     Checks whether the response is an actual structure file
@@ -8,6 +8,7 @@ __all__ = ["File", "TextFile", "InvalidFileError"]
 
 import abc
 import io
+import os
 import warnings
 from os import PathLike
 
@@ -90,6 +91,10 @@ class TextFile(File, metaclass=abc.ABCMeta):
     When reading a file, the text content is saved as list of strings,
     one for each line.
     When writing a file, this list is written into the file.
+
+    If a file path is given, *gzip*, *bzip2* and *xz* compressed files
+    are transparently decompressed when reading and compressed when
+    writing (see :func:`open_file()`).
     
     Attributes
     ----------
@@ -106,7 +111,7 @@ class TextFile(File, metaclass=abc.ABCMeta):
     def read(cls, file, *args, **kwargs):
         # File name
         if is_open_compatible(file):
-            with open(file, "r") as f:
+            with open_file(file, "r") as f:
                 lines = f.read().splitlines()
         # File object
         else:
@@ -135,7 +140,7 @@ class TextFile(File, metaclass=abc.ABCMeta):
         """
         # File name
         if is_open_compatible(file):
-            with open(file, "r") as f:
+            with open_file(file, "r") as f:
                 yield from f
         # File object
         else:
@@ -155,7 +160,7 @@ class TextFile(File, metaclass=abc.ABCMeta):
             Alternatively a file path can be supplied.
         """
         if is_open_compatible(file):
-            with open(file, "w") as f:
+            with open_file(file, "w") as f:
                 f.write("\n".join(self.lines) + "\n")
         else:
             if not is_text(file):
@@ -185,7 +190,7 @@ class TextFile(File, metaclass=abc.ABCMeta):
             Must not include line break characters.
         """
         if is_open_compatible(file):
-            with open(file, "w") as f:
+            with open_file(file, "w") as f:
                 for line in lines:
                     f.write(line + "\n")
         else:
@@ -241,3 +246,118 @@ def is_text(file):
 
 def is_open_compatible(file):
     return isinstance(file, (str, bytes, PathLike))
+
+
+# Compression formats with the magic bytes at the start of the file
+# and the typical file extensions
+_COMPRESSION_MAGIC_BYTES = {
+    "gzip": b"\x1f\x8b",
+    "bz2":  b"BZh",
+    "xz":   b"\xfd7zXZ\x00",
+}
+_COMPRESSION_SUFFIXES = {
+    ".gz":  "gzip",
+    ".bz2": "bz2",
+    ".xz":  "xz",
+}
+
+
+def open_file(file_name, mode):
+    """
+    Open a file like :func:`open()`, but transparently decompress
+    *gzip*, *bzip2* and *xz* files when reading and compress them
+    when writing.
+
+    When reading, the compression is detected from the first bytes of
+    the file, when writing, it is detected from the file extension
+    (``.gz``, ``.bz2`` or ``.xz``).
+    The file content is (de)compressed in a streaming manner, i.e. the
+    file is never (de)compressed as a whole.
+
+    Parameters
+    ----------
+    file_name : str or bytes or PathLike
+        The path of the file.
+    mode : str
+        The mode to open the file in, e.g. ``'r'`` or ``'wb'``.
+
+    Returns
+    -------
+    file : file-like object
+        The opened file.
+    """
+    if "r" in mode:
+        compression = _compression_from_magic_bytes(file_name)
+    else:
+        compression = compression_from_suffix(file_name)
+    if compression is None:
+        return open(file_name, mode)
+
+    if "b" not in mode and "t" not in mode:
+        # Compression modules use binary mode by default
+        mode += "t"
+    if compression == "gzip":
+        import gzip
+        return gzip.open(file_name, mode)
+    elif compression == "bz2":
+        import bz2
+        return bz2.open(file_name, mode)
+    else:
+        import lzma
+        return lzma.open(file_name, mode)
+
+
+def compression_from_suffix(file_name):
+    """
+    Get the compression format of a file based on its file extension.
+
+    Parameters
+    ----------
+    file_name : str or bytes or PathLike
+        The path of the file.
+
+    Returns
+    -------
+    compression : {'gzip', 'bz2', 'xz'} or None
+        The compression format, or None if the file extension does not
+        indicate a compressed file.
+    """
+    _, suffix = os.path.splitext(os.fsdecode(file_name))
+    return _COMPRESSION_SUFFIXES.get(suffix.lower())
+
+
+def remove_compression_suffix(file_name):
+    """
+    Remove the file extension of a compression format from a file
+    name, e.g. ``'1l2y.cif.gz'`` becomes ``'1l2y.cif'``.
+
+    Parameters
+    ----------
+    file_name : str or bytes or PathLike
+        The path of the file.
+
+    Returns
+    -------
+    file_name : str
+        The path without the compression extension.
+    """
+    file_name = os.fsdecode(file_name)
+    if compression_from_suffix(file_name) is None:
+        return file_name
+    return os.path.splitext(file_name)[0]
+
+
+def _compression_from_magic_bytes(file_name):
+    with open(file_name, "rb") as file:
+        first_bytes = file.read(
+            max(len(magic) for magic in _COMPRESSION_MAGIC_BYTES.values())
+        )
+    for compression, magic in _COMPRESSION_MAGIC_BYTES.items():
+        if first_bytes.startswith(magic):
+            if compression == "bz2" and not first_bytes[3:4].isdigit():
+                # The magic bytes of bzip2 are printable characters,
+                # so additionally check for the following block size
+                # digit to avoid confusion with text files
+                continue
+            return compression
+    return None
@@ -46,4 +46,5 @@ from .multiple import *
 from .pairwise import *
 from .permutation import *
 from .selector import *
-from .statistics import *
\ No newline at end of file
+from .statistics import *
+from .striped import *
\ No newline at end of file
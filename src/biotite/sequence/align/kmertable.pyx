@@ -15,7 +15,11 @@ from cpython.mem cimport PyMem_Free as free
 from libc.string cimport memcpy
 from libcpp.set cimport set as cpp_set
 
+import os
+import pickle
+import sys
 import numpy as np
+from ...file import InvalidFileError
 from ..alphabet import LetterAlphabet, common_alphabet, AlphabetError
 from .kmeralphabet import KmerAlphabet
 from .buckets import bucket_number
@@ -38,6 +42,12 @@ cdef enum EntrySize:
     BUCKETS = 4
 
 
+# Identifies files written by 'KmerTable.to_file()' and
+# 'BucketKmerTable.to_file()'
+_FILE_MAGIC = b"BTKMERTB"
+_FILE_VERSION = 1
+
+
 cdef class KmerTable:
     """
     This class represents a *k-mer* index table.
@@ -150,7 +160,12 @@ cdef class KmerTable:
     *Storage on hard drive*
 
     The most time efficient way to read/write a :class:`KmerTable` is
-    the *pickle* format.
+    its native file format via :meth:`to_file()` and :meth:`from_file()`:
+    A table read from such file is memory-mapped, i.e. opening the file
+    is nearly instantaneous and the operating system shares the
+    table's memory between all processes that read the same file.
+    A memory-mapped table is also pickled only as reference to its
+    file, so it can be cheaply sent to other processes.
     If a custom format is desired, the user needs to extract the
     reference IDs and position for each *k-mer*.
     To restrict this task to all *k-mer* that have at least one match
@@ -235,6 +250,11 @@ cdef class KmerTable:
     # The array length is based on 32 bit units.
     # If there is no entry for a k-mer, the respective pointer is NULL.
     cdef ptr[:] _ptr_array
+    # If the table is memory-mapped from a file, the pointers point into
+    # the mapped file instead of allocated C-arrays
+    cdef bint _is_mapped
+    cdef object _mapped_file
+    cdef object _file_name
 
 
     def __cinit__(self, kmer_alphabet):
@@ -737,6 +757,60 @@ cdef class KmerTable:
         return table
 
 
+    @staticmethod
+    def from_file(file_name):
+        """
+        from_file(file_name)
+
+        Open a :class:`KmerTable` from a file written by
+        :meth:`to_file()`.
+
+        The file is memory-mapped:
+        Instead of reading the *k-mer* positions into memory, they are
+        loaded lazily by the operating system when they are accessed.
+        Hence, multiple processes that open the same file share the
+        same physical memory.
+        Since the file is only read, it must not be modified as long
+        as the returned table is in use.
+
+        Parameters
+        ----------
+        file_name : str or Path
+            The path of the file.
+
+        Returns
+        -------
+        table : KmerTable
+            The memory-mapped table.
+
+        Notes
+        -----
+        The file contains pickled metadata, so only open files from
+        trusted sources.
+
+        Examples
+        --------
+
+        >>> import os.path
+        >>> file_name = os.path.join(path_to_directory, "table.kmer")
+        >>> table = KmerTable.from_sequences(
+        ...     2, [NucleotideSequence("TTATA"), NucleotideSequence("CTAG")]
+        ... )
+        >>> table.to_file(file_name)
+        >>> mapped_table = KmerTable.from_file(file_name)
+        >>> print(mapped_table)
+        AG: (1, 2)
+        AT: (0, 2)
+        CT: (1, 0)
+        TA: (0, 1), (0, 3), (1, 1)
+        TT: (0, 0)
+        """
+        metadata = _read_file_metadata(file_name, "KmerTable")
+        table = KmerTable(metadata["kmer_alphabet"])
+        table._map(file_name)
+        return table
+
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     def match_table(self, KmerTable table, similarity_rule=None):
@@ -1312,6 +1386,25 @@ cdef class KmerTable:
         return np.asarray(kmers)[:i]
 
 
+    def to_file(self, file_name):
+        """
+        to_file(file_name)
+
+        Write this table into a file that can be memory-mapped via
+        :meth:`from_file()`.
+
+        Parameters
+        ----------
+        file_name : str or Path
+            The path of the file.
+            An existing file is overwritten.
+        """
+        _write_c_arrays(
+            file_name, self._ptr_array, "KmerTable",
+            {"kmer_alphabet": self._kmer_alph}
+        )
+
+
     @cython.cdivision(True)
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -1383,19 +1476,43 @@ cdef class KmerTable:
 
 
     def __getstate__(self):
+        if self._is_mapped:
+            # Only the file name is required to map the file again
+            return self._file_name
         relevant_kmers = self.get_kmers()
         return _pickle_c_arrays(self._ptr_array, relevant_kmers)
 
 
     def __setstate__(self, state):
-        _unpickle_c_arrays(self._ptr_array, state)
+        if isinstance(state, str):
+            self._map(state)
+        else:
+            _unpickle_c_arrays(self._ptr_array, state)
 
 
     def __dealloc__(self):
-        if self._is_initialized():
+        if self._is_initialized() and not self._is_mapped:
             _deallocate_ptrs(self._ptr_array)
 
 
+    def _map(self, file_name):
+        """
+        Point the pointer array into the given memory-mapped
+        table file.
+        """
+        metadata, self._mapped_file, self._ptr_array = _map_c_arrays(
+            file_name, "KmerTable"
+        )
+        if metadata["kmer_alphabet"] != self._kmer_alph:
+            raise InvalidFileError(
+                "The k-mer alphabet in the file does not match the table"
+            )
+        self._is_mapped = True
+        # An absolute path is required to map the file again after
+        # unpickling in another working directory
+        self._file_name = os.path.abspath(file_name)
+
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     def _count_kmers(self, int64[:] kmers):
@@ -1606,7 +1723,10 @@ cdef class BucketKmerTable:
     *Storage on hard drive*
 
     The most time efficient way to read/write a :class:`BucketKmerTable`
-    is the *pickle* format.
+    is its native file format via :meth:`to_file()` and
+    :meth:`from_file()`:
+    A table read from such file is memory-mapped, analogous to
+    :class:`KmerTable`.
 
     *Indexing and iteration*
 
@@ -1687,6 +1807,10 @@ cdef class BucketKmerTable:
     # If there is no entry for a k-mer bucket, the respective pointer is
     # NULL.
     cdef ptr[:] _ptr_array
+    # See KmerTable
+    cdef bint _is_mapped
+    cdef object _mapped_file
+    cdef object _file_name
 
 
     def __cinit__(self, n_buckets, kmer_alphabet):
@@ -2141,6 +2265,45 @@ cdef class BucketKmerTable:
         return merged_table
 
 
+    @staticmethod
+    def from_file(file_name):
+        """
+        from_file(file_name)
+
+        Open a :class:`BucketKmerTable` from a file written by
+        :meth:`to_file()`.
+
+        The file is memory-mapped:
+        Instead of reading the *k-mer* positions into memory, they are
+        loaded lazily by the operating system when they are accessed.
+        Hence, multiple processes that open the same file share the
+        same physical memory.
+        Since the file is only read, it must not be modified as long
+        as the returned table is in use.
+
+        Parameters
+        ----------
+        file_name : str or Path
+            The path of the file.
+
+        Returns
+        -------
+        table : BucketKmerTable
+            The memory-mapped table.
+
+        Notes
+        -----
+        The file contains pickled metadata, so only open files from
+        trusted sources.
+        """
+        metadata = _read_file_metadata(file_name, "BucketKmerTable")
+        table = BucketKmerTable(
+            metadata["n_buckets"], metadata["kmer_alphabet"]
+        )
+        table._map(file_name)
+        return table
+
+
     @cython.cdivision(True)
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -2770,6 +2933,25 @@ cdef class BucketKmerTable:
         return np.sort(np.asarray(kmers))
 
 
+    def to_file(self, file_name):
+        """
+        to_file(file_name)
+
+        Write this table into a file that can be memory-mapped via
+        :meth:`from_file()`.
+
+        Parameters
+        ----------
+        file_name : str or Path
+            The path of the file.
+            An existing file is overwritten.
+        """
+        _write_c_arrays(
+            file_name, self._ptr_array, "BucketKmerTable",
+            {"kmer_alphabet": self._kmer_alph, "n_buckets": self._n_buckets}
+        )
+
+
     @cython.cdivision(True)
     @cython.boundscheck(False)
     @cython.wraparound(False)
@@ -2835,6 +3017,8 @@ cdef class BucketKmerTable:
 
 
     def __getstate__(self):
+        if self._is_mapped:
+            return self._file_name
         cdef int64[:] relevant_buckets = np.where(
             np.asarray(self._ptr_array) != 0
         )[0]
@@ -2843,14 +3027,33 @@ cdef class BucketKmerTable:
 
 
     def __setstate__(self, state):
-        _unpickle_c_arrays(self._ptr_array, state)
+        if isinstance(state, str):
+            self._map(state)
+        else:
+            _unpickle_c_arrays(self._ptr_array, state)
 
 
     def __dealloc__(self):
-        if self._is_initialized():
+        if self._is_initialized() and not self._is_mapped:
             _deallocate_ptrs(self._ptr_array)
 
 
+    def _map(self, file_name):
+        metadata, self._mapped_file, self._ptr_array = _map_c_arrays(
+            file_name, "BucketKmerTable"
+        )
+        if metadata["kmer_alphabet"] != self._kmer_alph \
+           or metadata["n_buckets"] != self._n_buckets:
+            raise InvalidFileError(
+                "The k-mer alphabet or number of buckets in the file "
+                "does not match the table"
+            )
+        self._is_mapped = True
+        # An absolute path is required to map the file again after
+        # unpickling in another working directory
+        self._file_name = os.path.abspath(file_name)
+
+
     ## These private methods work analogous to KmerTable
 
     @cython.cdivision(True)
@@ -3149,6 +3352,130 @@ def _unpickle_c_arrays(ptr[:] ptr_array, state):
             ptr_array[bucket] = <ptr>bucket_ptr
 
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _write_c_arrays(file_name, ptr[:] ptr_array, table_type, dict metadata):
+    """
+    Write the C-arrays of the `ptr_array` into a file, that can be
+    memory-mapped via :func:`_map_c_arrays()`.
+
+    The file consists of
+
+        - the magic number,
+        - the length of the pickled metadata (uint64),
+        - the pickled metadata,
+        - an offset array (int64) with the position of each C-array in
+          the file (or 0 if the pointer is NULL) and
+        - the C-arrays in their memory layout.
+    
+    The offset array and each C-array start at a multiple of 8 bytes to
+    retain the alignment of their *int64* values.
+    """
+    cdef int64 bucket
+    cdef int64 offset
+    cdef int64 byte_length
+    cdef uint32* bucket_ptr
+
+    metadata = dict(
+        metadata,
+        version=_FILE_VERSION,
+        table_type=table_type,
+        byteorder=sys.byteorder,
+        length=ptr_array.shape[0]
+    )
+    pickled_metadata = pickle.dumps(metadata)
+    header_size = _aligned(len(_FILE_MAGIC) + 8 + len(pickled_metadata))
+
+    offsets = np.zeros(ptr_array.shape[0], dtype=np.int64)
+    cdef int64[:] offsets_v = offsets
+    offset = header_size + offsets.nbytes
+    for bucket in range(ptr_array.shape[0]):
+        bucket_ptr = <uint32*>ptr_array[bucket]
+        if bucket_ptr != NULL:
+            offsets_v[bucket] = offset
+            byte_length = (<int64*>bucket_ptr)[0] * sizeof(uint32)
+            offset += _aligned(byte_length)
+
+    with open(file_name, "wb") as file:
+        file.write(_FILE_MAGIC)
+        file.write(np.uint64(len(pickled_metadata)).tobytes())
+        file.write(pickled_metadata)
+        file.write(b"\0" * (header_size - file.tell()))
+        file.write(offsets.tobytes())
+        for bucket in range(ptr_array.shape[0]):
+            bucket_ptr = <uint32*>ptr_array[bucket]
+            if bucket_ptr != NULL:
+                byte_length = (<int64*>bucket_ptr)[0] * sizeof(uint32)
+                file.write(<bytes>(<char*>bucket_ptr)[:byte_length])
+                file.write(b"\0" * (_aligned(byte_length) - byte_length))
+
+
+def _read_file_metadata(file_name, table_type):
+    """
+    Read the metadata of a file written by :func:`_write_c_arrays()`.
+    """
+    with open(file_name, "rb") as file:
+        if file.read(len(_FILE_MAGIC)) != _FILE_MAGIC:
+            raise InvalidFileError("The file is not a k-mer table file")
+        metadata_length = int(np.frombuffer(file.read(8), dtype=np.uint64)[0])
+        metadata = pickle.loads(file.read(metadata_length))
+    if metadata["version"] != _FILE_VERSION:
+        raise InvalidFileError(
+            f"Unsupported k-mer table file version {metadata['version']}"
+        )
+    if metadata["table_type"] != table_type:
+        raise InvalidFileError(
+            f"The file contains a {metadata['table_type']}, "
+            f"not a {table_type}"
+        )
+    if metadata["byteorder"] != sys.byteorder:
+        raise InvalidFileError(
+            "The file was written on a machine with different byte order"
+        )
+    metadata["header_size"] = _aligned(
+        len(_FILE_MAGIC) + 8 + metadata_length
+    )
+    return metadata
+
+
+def _map_c_arrays(file_name, table_type):
+    """
+    Memory-map a file written by :func:`_write_c_arrays()` and create
+    a pointer array pointing to the C-arrays in the mapped file.
+
+    Returns
+    -------
+    metadata : dict
+        The metadata of the file.
+    mapped_file : memmap
+        The mapped file.
+        The pointers are only valid as long as this object exists.
+    ptr_array : ndarray, dtype=uint64
+        The pointer array.
+    """
+    metadata = _read_file_metadata(file_name, table_type)
+    mapped_file = np.memmap(file_name, dtype=np.uint8, mode="r")
+    offsets = np.frombuffer(
+        mapped_file, dtype=np.int64,
+        count=metadata["length"], offset=metadata["header_size"]
+    )
+    if np.any(offsets < 0) or np.any(offsets >= len(mapped_file)):
+        raise InvalidFileError("The file contains invalid offsets")
+    ptr_array = np.where(
+        offsets != 0,
+        offsets.astype(np.uint64) + np.uint64(mapped_file.ctypes.data),
+        0
+    ).astype(np.uint64)
+    return metadata, mapped_file, ptr_array
+
+
+cdef inline int64 _aligned(int64 byte_length):
+    """
+    Round the given number of bytes up to a multiple of 8.
+    """
+    return (byte_length + 7) // 8 * 8
+
+
 cdef inline void _deallocate_ptrs(ptr[:] ptrs):
     cdef int64 kmer
     for kmer in range(ptrs.shape[0]):
@@ -4,13 +4,16 @@
 
 __name__ = "biotite.sequence.align"
 __author__ = "Patrick Kunzmann"
-__all__ = ["align_local_ungapped"]
+__all__ = ["align_local_ungapped", "align_local_ungapped_batch"]
 
 cimport cython
 cimport numpy as np
 
+import os
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from .alignment import Alignment
+from .util import concatenate_targets
 
 
 ctypedef np.int32_t int32
@@ -211,6 +214,285 @@ def align_local_ungapped(seq1, seq2, matrix, seed, int32 threshold,
     return Alignment([seq1, seq2], trace, total_score)
 
 
+def align_local_ungapped_batch(query, targets, matrix, seeds,
+                               int32 threshold, str direction="both",
+                               bint traceback=False, n_threads=None):
+    """
+    align_local_ungapped_batch(query, targets, matrix, seeds, threshold,
+                               direction="both", traceback=False,
+                               n_threads=None)
+
+    Perform local alignments of a query with multiple target sequences
+    extending from the given `seeds` without inserting gaps.
+
+    The alignments are performed in the same way as in
+    :func:`align_local_ungapped()`, but the alphabets and the
+    substitution matrix are checked and prepared only once for all
+    seeds.
+    The seeds are processed in compiled code without holding the
+    *global interpreter lock*, which allows distributing them to
+    multiple threads.
+    This makes the function suitable for the large number of seeds
+    obtained from :meth:`KmerTable.match()`.
+
+    Parameters
+    ----------
+    query : Sequence
+        The query sequence, i.e. the first sequence in each alignment.
+    targets : list of Sequence
+        The target sequences.
+    matrix : SubstitutionMatrix
+        The substitution matrix used for scoring.
+        The first alphabet of the matrix must extend the alphabet of
+        the query, the second alphabet must extend the alphabets of the
+        targets.
+    seeds : ndarray, shape=(n,3), dtype=int
+        The seeds, where the alignments start.
+        Each row contains the index in the `query`, the index of the
+        target in `targets` and the index in this target.
+        This is the format of the matches returned by
+        :meth:`KmerTable.match()`, if the table was created from the
+        `targets` with their list indices as reference IDs.
+    threshold : int
+        If the current score falls this value below the maximum score
+        found, the alignment terminates.
+    direction : {'both', 'upstream', 'downstream'}, optional
+        Controls in which direction the alignments extend starting
+        from the seed, as described in :func:`align_local_ungapped()`.
+    traceback : bool, optional
+        If set to true, :class:`Alignment` objects are returned instead
+        of the score and position arrays.
+    n_threads : int, optional
+        The number of threads the seeds are distributed to.
+        By default, the number of CPUs is used.
+
+    Returns
+    -------
+    scores : ndarray, shape=(n,), dtype=np.int32
+        The alignment similarity score for each seed.
+        Only returned, if `traceback` is false.
+    starts, ends : ndarray, shape=(n,2), dtype=np.int64
+        The index of the first and last aligned symbol in the query and
+        the target, respectively, for each seed.
+        Only returned, if `traceback` is false.
+    alignments : list of Alignment
+        The resulting ungapped alignment for each seed.
+        Only returned, if `traceback` is true.
+
+    See also
+    --------
+    align_local_ungapped
+        For a single alignment.
+
+    Examples
+    --------
+
+    >>> query = ProteinSequence("BIQTITE")
+    >>> targets = [
+    ...     ProteinSequence("PYRRHQTITE"),
+    ...     ProteinSequence("TITANITE"),
+    ... ]
+    >>> matrix = SubstitutionMatrix.std_protein_matrix()
+    >>> table = KmerTable.from_sequences(3, targets)
+    >>> seeds = table.match(query)
+    >>> print(seeds)
+    [[2 0 5]
+     [3 0 6]
+     [3 1 0]
+     [4 0 7]
+     [4 1 5]]
+    >>> scores, starts, ends = align_local_ungapped_batch(
+    ...     query, targets, matrix, seeds, threshold=10
+    ... )
+    >>> print(scores)
+    [24 24 14 24 14]
+    >>> print(starts)
+    [[2 5]
+     [2 5]
+     [3 0]
+     [2 5]
+     [3 4]]
+    >>> print(ends)
+    [[6 9]
+     [6 9]
+     [5 2]
+     [6 9]
+     [6 7]]
+    >>> alignments = align_local_ungapped_batch(
+    ...     query, targets, matrix, seeds, threshold=10, traceback=True
+    ... )
+    >>> print(alignments[4])
+    TITE
+    NITE
+    """
+    if n_threads is None:
+        n_threads = os.cpu_count()
+    if n_threads < 1:
+        raise ValueError("At least one thread is required")
+
+    if not matrix.get_alphabet1().extends(query.get_alphabet()):
+        raise ValueError("The query's alphabet does not fit the matrix")
+    # The codes of all targets are concatenated into a single array
+    target_codes, lengths, offsets = concatenate_targets(
+        targets, matrix.get_alphabet2()
+    )
+    score_matrix = matrix.score_matrix()
+
+    cdef bint upstream
+    cdef bint downstream
+    if direction == "both":
+        upstream = True
+        downstream = True
+    elif direction == "upstream":
+        upstream = True
+        downstream = False
+    elif direction == "downstream":
+        upstream = False
+        downstream = True
+    else:
+        raise ValueError(f"Direction '{direction}' is invalid")
+
+    if threshold < 0:
+        raise ValueError("The threshold value must be a non-negative integer")
+
+    seeds = np.asarray(seeds, dtype=np.int64)
+    if seeds.ndim != 2 or seeds.shape[1] != 3:
+        raise IndexError(
+            f"Expected seeds with shape (n,3), got {seeds.shape}"
+        )
+    query_pos = np.ascontiguousarray(seeds[:, 0])
+    target_indices = np.ascontiguousarray(seeds[:, 1])
+    target_pos = np.ascontiguousarray(seeds[:, 2])
+    if (seeds < 0).any():
+        raise IndexError("Seeds must contain positive indices")
+    if (query_pos >= len(query)).any():
+        raise IndexError("Seed is out of range of the query")
+    if (target_indices >= len(targets)).any():
+        raise IndexError("Seed refers to a non-existing target")
+    if (target_pos >= lengths[target_indices]).any():
+        raise IndexError("Seed is out of range of the target")
+
+    scores = np.zeros(len(seeds), dtype=np.int32)
+    starts = np.zeros((len(seeds), 2), dtype=np.int64)
+    ends = np.zeros((len(seeds), 2), dtype=np.int64)
+    params = (
+        query.code, target_codes, offsets, score_matrix,
+        query_pos, target_indices, target_pos, threshold,
+        upstream, downstream, scores, starts, ends
+    )
+    # The seeds are distributed to the threads in contiguous ranges
+    bounds = np.linspace(
+        0, len(seeds), min(n_threads, max(len(seeds), 1)) + 1
+    ).astype(np.int64)
+    if len(bounds) <= 2:
+        _extend_seeds(*params, 0, len(seeds))
+    else:
+        with ThreadPoolExecutor(max_workers=len(bounds) - 1) as executor:
+            futures = [
+                executor.submit(_extend_seeds, *params, start, stop)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            for future in futures:
+                # Raise potential exceptions
+                future.result()
+
+    if not traceback:
+        return scores, starts, ends
+    return [
+        Alignment(
+            [query, targets[target_i]],
+            np.stack([
+                np.arange(start[0], end[0] + 1),
+                np.arange(start[1], end[1] + 1)
+            ], axis=-1),
+            int(score)
+        )
+        for target_i, score, start, end
+        in zip(target_indices, scores, starts, ends)
+    ]
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _extend_seeds(const CodeType1[:] code1 not None,
+                  const CodeType2[:] codes2 not None,
+                  const int64[:] offsets not None,
+                  const int32[:,:] matrix not None,
+                  const int64[:] seed_pos1 not None,
+                  const int64[:] seed_indices2 not None,
+                  const int64[:] seed_pos2 not None,
+                  int32 threshold, bint upstream, bint downstream,
+                  int32[:] scores not None,
+                  int64[:,:] starts not None,
+                  int64[:,:] ends not None,
+                  int64 start, int64 stop):
+    """
+    Perform the ungapped seed extension for the seeds in the range from
+    `start` to `stop`.
+    The second sequences are given by their concatenated `codes2` and
+    the `offsets` of each sequence in `codes2`.
+    """
+    cdef int64 n, i
+    cdef int64 pos1, pos2, offset2, length1, length2
+    cdef int64 max_length
+    cdef int32 total_score, max_score, seed_score
+    cdef int64 i_max_score, start_offset, stop_offset
+
+    length1 = code1.shape[0]
+    with nogil:
+        for n in range(start, stop):
+            pos1 = seed_pos1[n]
+            pos2 = seed_pos2[n]
+            offset2 = offsets[seed_indices2[n]]
+            length2 = offsets[seed_indices2[n] + 1] - offset2
+            seed_score = matrix[code1[pos1], codes2[offset2 + pos2]]
+            start_offset = 0
+            stop_offset = 0
+
+            if upstream:
+                total_score = 0
+                max_score = 0
+                i_max_score = 0
+                max_length = pos1 if pos1 < pos2 else pos2
+                for i in range(1, max_length + 1):
+                    total_score += matrix[
+                        code1[pos1 - i], codes2[offset2 + pos2 - i]
+                    ]
+                    if total_score >= max_score:
+                        max_score = total_score
+                        i_max_score = i
+                    elif max_score - total_score > threshold:
+                        # Score drops too low -> terminate alignment
+                        break
+                seed_score += max_score
+                start_offset = i_max_score
+
+            if downstream:
+                total_score = 0
+                max_score = 0
+                i_max_score = 0
+                max_length = length1 - pos1 - 1
+                if length2 - pos2 - 1 < max_length:
+                    max_length = length2 - pos2 - 1
+                for i in range(1, max_length + 1):
+                    total_score += matrix[
+                        code1[pos1 + i], codes2[offset2 + pos2 + i]
+                    ]
+                    if total_score >= max_score:
+                        max_score = total_score
+                        i_max_score = i
+                    elif max_score - total_score > threshold:
+                        break
+                seed_score += max_score
+                stop_offset = i_max_score
+
+            scores[n] = seed_score
+            starts[n, 0] = pos1 - start_offset
+            starts[n, 1] = pos2 - start_offset
+            ends[n, 0] = pos1 + stop_offset
+            ends[n, 1] = pos2 + stop_offset
+
+
 @cython.boundscheck(False)
 @cython.wraparound(False)
 def _seed_extend_generic(CodeType1[:] code1 not None,
@@ -10,10 +10,13 @@ cimport cython
 cimport numpy as np
 from libc.math cimport log
 
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from .matrix import SubstitutionMatrix
 from .alignment import Alignment
 from .pairwise import align_optimal
+from .banded import align_banded
+from .kmeralphabet import KmerAlphabet
 from ..sequence import Sequence
 from ..alphabet import Alphabet
 from ..phylo.upgma import upgma
@@ -64,11 +67,13 @@ class GapSymbol:
 
 
 def align_multiple(sequences, matrix, gap_penalty=-10, terminal_penalty=True,
-                   distances=None, guide_tree=None):
+                   distances=None, guide_tree=None, kmer_size=None,
+                   band_width=None, n_processes=1):
     r"""
     align_multiple(sequences, matrix, gap_penalty=-10,
                    terminal_penalty=True, distances=None,
-                   guide_tree=None)
+                   guide_tree=None, kmer_size=None, band_width=None,
+                   n_processes=1)
     
     Perform a multiple sequence alignment using a progressive
     alignment algorithm. :footcite:`Feng1987`
@@ -109,6 +114,30 @@ def align_multiple(sequences, matrix, gap_penalty=-10, terminal_penalty=True,
         The guide tree to be used for the progressive alignment.
         By default the guide tree is constructed from `distances`
         via the UPGMA clustering method.
+    kmer_size : int, optional
+        If set, the pairwise distances are estimated from the *k-mers*
+        of this size shared between two sequences, instead of
+        pairwise alignments.
+        This is much faster, but less accurate.
+        Only has an effect, if `distances` is not given.
+    band_width : int, optional
+        If set, the pairwise alignments for the distance calculation
+        are computed by :func:`align_banded()` instead of
+        :func:`align_optimal()`.
+        The band spans the diagonals from the start to the end of both
+        sequences and is widened by `band_width` on both sides.
+        This is suitable for closely related sequences.
+        The banded alignments are semi-global, i.e. terminal gaps are
+        not penalized, regardless of `terminal_penalty`.
+        If the banded alignment of two sequences does not give a
+        proper distance, the optimal semi-global alignment is used for
+        this pair, so that all distances are based on the same scoring
+        scheme.
+        Only has an effect, if `distances` is not given.
+    n_processes : int, optional
+        If greater than 1, the pairwise alignments for the distance
+        calculation are distributed to the given number of processes.
+        Only has an effect, if `distances` is not given.
 
     Returns
     -------
@@ -167,6 +196,19 @@ def align_multiple(sequences, matrix, gap_penalty=-10, terminal_penalty=True,
     In this case the logaritmus cannot be calculated and a
     :class:`ValueError` is raised.
 
+    If `kmer_size` is set, the distance is calculated from the
+    fraction of shared *k-mers* :footcite:`Edgar2004`
+
+    .. math:: D_{a,b} = 1 - \frac
+                 { \sum_{\tau} \min \left( N_a(\tau), N_b(\tau) \right) }
+                 { \min(L_a, L_b) - k + 1 },
+
+    where :math:`N_a(\tau)` is the number of occurences of the *k-mer*
+    :math:`\tau` in sequence *a* and :math:`L_a` is the length of
+    sequence *a*.
+    Terminal gaps are not penalized in the banded alignments, as
+    :func:`align_banded()` performs a semi-global alignment.
+
     References
     ----------
     
@@ -222,9 +264,15 @@ def align_multiple(sequences, matrix, gap_penalty=-10, terminal_penalty=True,
     # Template parameter workaround
     _T = sequences[0].code
     if distances is None:
-        distances = _get_distance_matrix(
-            _T, sequences, matrix, gap_penalty, terminal_penalty
-        )
+        if kmer_size is not None:
+            distances = _get_kmer_distance_matrix(
+                sequences, alphabet, kmer_size
+            )
+        else:
+            distances = _get_distance_matrix(
+                _T, sequences, matrix, gap_penalty, terminal_penalty,
+                band_width, n_processes
+            )
     else:
         distances = distances.astype(np.float32, copy=True)
     if guide_tree is None:
@@ -285,7 +333,8 @@ def align_multiple(sequences, matrix, gap_penalty=-10, terminal_penalty=True,
 
 
 def _get_distance_matrix(CodeType[:] _T, sequences, matrix,
-                         gap_penalty, terminal_penalty):
+                         gap_penalty, terminal_penalty, band_width,
+                         int n_processes):
     """
     Create all pairwise alignments for the given sequences and use the
     method proposed by Feng & Doolittle to calculate the pairwise
@@ -306,32 +355,61 @@ def _get_distance_matrix(CodeType[:] _T, sequences, matrix,
     terminal_penalty : bool
         Whether to or not count terminal gap penalties for the
         alignments.
+    band_width : int or None
+        If not None, banded alignments with the given additional width
+        are used instead of optimal alignments.
+    n_processes : int
+        The number of processes the alignments are distributed to.
     
     Returns
     -------
     distances : ndarray, shape=(n,n), dtype=float32
         The pairwise distance matrix.
     """
-    cdef int i, j
+    cdef int i, j, k
 
+    # Each pair is aligned only once, including the pair of a sequence
+    # with itself
+    pair_i, pair_j = np.tril_indices(len(sequences))
+    align_params = (
+        sequences, matrix, gap_penalty, terminal_penalty, band_width
+    )
+    if n_processes > 1:
+        # Distribute chunks of pairs to the processes
+        # The sequences are transferred only once to each process
+        n_chunks = min(n_processes * 4, len(pair_i))
+        with ProcessPoolExecutor(
+            max_workers=n_processes,
+            initializer=_init_align_process,
+            initargs=align_params
+        ) as executor:
+            results = list(executor.map(
+                _align_pairs_in_process,
+                np.array_split(pair_i, n_chunks),
+                np.array_split(pair_j, n_chunks)
+            ))
+        pair_results = [
+            np.concatenate([result[k] for result in results])
+            for k in range(4)
+        ]
+    else:
+        pair_results = _align_pairs(*align_params, pair_i, pair_j)
     cdef np.ndarray scores = np.zeros(
         (len(sequences), len(sequences)), dtype=np.int32
     )
-    cdef np.ndarray alignments = np.full(
-        (len(sequences), len(sequences)), None, dtype=object
+    cdef np.ndarray lengths = np.zeros(
+        (len(sequences), len(sequences)), dtype=np.int64
     )
-    for i in range(len(sequences)):
-        # Inclusive range
-        for j in range(i+1):
-            # For this method we only consider one alignment:
-            # Score is equal for all alignments
-            # Alignment length is equal for most alignments
-            alignment = align_optimal(
-                sequences[i], sequences[j], matrix,
-                gap_penalty, terminal_penalty, max_number=1
-            )[0]
-            scores[i,j] = alignment.score
-            alignments[i,j] = alignment
+    cdef np.ndarray gap_open_counts = np.zeros(
+        (len(sequences), len(sequences)), dtype=np.int64
+    )
+    cdef np.ndarray gap_ext_counts = np.zeros(
+        (len(sequences), len(sequences)), dtype=np.int64
+    )
+    for array, values in zip(
+        (scores, lengths, gap_open_counts, gap_ext_counts), pair_results
+    ):
+        array[pair_i, pair_j] = values
     
     ### Distance calculation from similarity scores ###
     # Calculate the occurences of each symbol code in each sequence
@@ -345,15 +423,8 @@ def _get_distance_matrix(CodeType[:] _T, sequences, matrix,
     for i in range(len(sequences)):
         code_count[i] = np.bincount(sequences[i].code, minlength=alphabet_size)
 
-    cdef int gap_open=0, gap_ext=0
-    if type(gap_penalty) == int:
-        gap_open = gap_penalty
-        gap_ext = gap_penalty
-    elif type(gap_penalty) == tuple:
-        gap_open = gap_penalty[0]
-        gap_ext = gap_penalty[1]
-    else:
-        raise TypeError("Gap penalty must be either integer or tuple")
+    cdef int gap_open, gap_ext
+    gap_open, gap_ext = _split_gap_penalty(gap_penalty)
 
     cdef const int32[:,:] score_matrix = matrix.score_matrix()
     cdef int32[:,:] scores_v = scores
@@ -370,19 +441,11 @@ def _get_distance_matrix(CodeType[:] _T, sequences, matrix,
     for i in range(scores_v.shape[0]):
         for j in range(i):
             score_max =  (scores_v[i,i] + scores_v[j,j]) / 2.0
-            score_rand = 0
-            for code1 in range(alphabet_size):
-                for code2 in range(alphabet_size):
-                    score_rand += score_matrix[code1,code2] \
-                                  * code_count[i,code1] \
-                                  * code_count[j,code2]
-            score_rand /= alignments[i,j].trace.shape[0]
-            gap_open_count, gap_ext_count = _count_gaps(
-                alignments[i,j].trace.astype(np.int64, copy=False),
-                terminal_penalty
+            score_rand = _random_score(
+                score_matrix, code_count_v, i, j, alphabet_size,
+                lengths[i,j], gap_open_counts[i,j], gap_ext_counts[i,j],
+                gap_open, gap_ext
             )
-            score_rand += gap_open_count * gap_open
-            score_rand += gap_ext_count * gap_ext
             if scores_v[i,j] < score_rand:
                 # Randomized alignment is better than actual alignment
                 # -> the logaritmus argument would become negative
@@ -401,6 +464,211 @@ def _get_distance_matrix(CodeType[:] _T, sequences, matrix,
     return distances
 
 
+cdef float32 _random_score(const int32[:,:] score_matrix,
+                           int32[:,:] code_count, int i, int j,
+                           int alphabet_size, int64 length,
+                           int64 gap_open_count, int64 gap_ext_count,
+                           int gap_open, int gap_ext):
+    """
+    Calculate the expected score of a randomized alignment of the
+    sequences *i* and *j*.
+    """
+    cdef int code1, code2
+    cdef float32 score_rand = 0
+    for code1 in range(alphabet_size):
+        for code2 in range(alphabet_size):
+            score_rand += score_matrix[code1,code2] \
+                          * code_count[i,code1] \
+                          * code_count[j,code2]
+    score_rand /= length
+    score_rand += gap_open_count * gap_open
+    score_rand += gap_ext_count * gap_ext
+    return score_rand
+
+
+def _split_gap_penalty(gap_penalty):
+    """
+    Get the gap opening and extension penalty from a linear or affine
+    gap penalty.
+    """
+    if type(gap_penalty) == int:
+        return gap_penalty, gap_penalty
+    elif type(gap_penalty) == tuple:
+        return gap_penalty[0], gap_penalty[1]
+    else:
+        raise TypeError("Gap penalty must be either integer or tuple")
+
+
+# Parameters for '_align_pairs()' in a process of the process pool
+_process_align_params = None
+
+def _init_align_process(*align_params):
+    global _process_align_params
+    _process_align_params = align_params
+
+
+def _align_pairs_in_process(pair_i, pair_j):
+    return _align_pairs(*_process_align_params, pair_i, pair_j)
+
+
+def _align_pairs(sequences, matrix, gap_penalty, terminal_penalty,
+                 band_width, pair_i, pair_j):
+    """
+    Align the sequence pairs given by the indices `pair_i` and `pair_j`
+    and return the score, the alignment length and the number of gap
+    openings and extensions for each pair.
+    """
+    scores = np.zeros(len(pair_i), dtype=np.int32)
+    lengths = np.zeros(len(pair_i), dtype=np.int64)
+    gap_open_counts = np.zeros(len(pair_i), dtype=np.int64)
+    gap_ext_counts = np.zeros(len(pair_i), dtype=np.int64)
+    for k, (i, j) in enumerate(zip(pair_i, pair_j)):
+        scores[k], lengths[k], gap_open_counts[k], gap_ext_counts[k] \
+            = _align_pair(
+                sequences[i], sequences[j], matrix,
+                gap_penalty, terminal_penalty, band_width
+            )
+    return scores, lengths, gap_open_counts, gap_ext_counts
+
+
+def _align_pair(seq1, seq2, matrix, gap_penalty, terminal_penalty,
+                band_width):
+    """
+    Align two sequences and return the score, the alignment length and
+    the number of gap openings and extensions.
+    """
+    # For this method we only consider one alignment:
+    # Score is equal for all alignments
+    # Alignment length is equal for most alignments
+    if band_width is None:
+        alignment = align_optimal(
+            seq1, seq2, matrix,
+            gap_penalty, terminal_penalty, max_number=1
+        )[0]
+    else:
+        # The band must contain the diagonals of the start
+        # and the end of both sequences
+        end_diagonal = len(seq2) - len(seq1)
+        band = (
+            min(0, end_diagonal) - band_width,
+            max(0, end_diagonal) + band_width
+        )
+        alignment = align_banded(
+            seq1, seq2, matrix, band, gap_penalty, max_number=1
+        )[0]
+        # Terminal gaps are not penalized in the semi-global alignment
+        terminal_penalty = False
+    gap_open_count, gap_ext_count = _count_gaps(
+        alignment.trace.astype(np.int64, copy=False), terminal_penalty
+    )
+    if band_width is not None and alignment.score < _pair_random_score(
+        seq1, seq2, matrix, gap_penalty, alignment.trace.shape[0],
+        gap_open_count, gap_ext_count
+    ):
+        # The band may have been too narrow for this pair
+        # -> Fall back to the optimal alignment,
+        # which is also semi-global for consistent distances
+        alignment = align_optimal(
+            seq1, seq2, matrix,
+            gap_penalty, terminal_penalty=False, max_number=1
+        )[0]
+        gap_open_count, gap_ext_count = _count_gaps(
+            alignment.trace.astype(np.int64, copy=False), False
+        )
+    return (
+        alignment.score, alignment.trace.shape[0],
+        gap_open_count, gap_ext_count
+    )
+
+
+def _pair_random_score(seq1, seq2, matrix, gap_penalty, length,
+                       gap_open_count, gap_ext_count):
+    """
+    Calculate the expected score of a randomized alignment of two
+    sequences, equivalent to the random score in
+    :func:`_get_distance_matrix()`.
+    """
+    alphabet_size = len(matrix.get_alphabet1())
+    code_count = np.stack([
+        np.bincount(seq1.code, minlength=alphabet_size),
+        np.bincount(seq2.code, minlength=alphabet_size)
+    ]).astype(np.int32)
+    gap_open, gap_ext = _split_gap_penalty(gap_penalty)
+    return _random_score(
+        matrix.score_matrix(), code_count, 0, 1, alphabet_size,
+        length, gap_open_count, gap_ext_count, gap_open, gap_ext
+    )
+
+
+def _get_kmer_distance_matrix(sequences, alphabet, int kmer_size):
+    """
+    Calculate the pairwise distance matrix from the fraction of shared
+    *k-mers* between two sequences.
+    
+    Parameters
+    ----------
+    sequences : list of Sequence, length=n
+        The sequences to get the distance matrix for.
+    alphabet : Alphabet
+        The common alphabet of the sequences.
+    kmer_size : int
+        The *k-mer* length.
+    
+    Returns
+    -------
+    distances : ndarray, shape=(n,n), dtype=float32
+        The pairwise distance matrix.
+    """
+    cdef int i, j, k
+    cdef int64 group_start, group_stop
+
+    kmer_alph = KmerAlphabet(alphabet, kmer_size)
+    kmers = [kmer_alph.create_kmers(seq.code) for seq in sequences]
+    seq_ids = np.concatenate([
+        np.full(len(seq_kmers), i, dtype=np.int32)
+        for i, seq_kmers in enumerate(kmers)
+    ])
+    kmers = np.concatenate(kmers)
+    # Count each k-mer in each sequence:
+    # Sort by k-mer and sequence and count the equal consecutive rows
+    order = np.lexsort((seq_ids, kmers))
+    kmers = kmers[order]
+    seq_ids = seq_ids[order]
+    is_new_row = np.ones(len(kmers), dtype=bool)
+    is_new_row[1:] = (kmers[1:] != kmers[:-1]) | (seq_ids[1:] != seq_ids[:-1])
+    row_starts = np.append(np.where(is_new_row)[0], len(kmers))
+    cdef int32[:] counts_v = np.diff(row_starts).astype(np.int32)
+    kmers = kmers[row_starts[:-1]]
+    cdef int32[:] seq_ids_v = seq_ids[row_starts[:-1]]
+    # Rows with the same k-mer form a group
+    is_new_group = np.ones(len(kmers), dtype=bool)
+    is_new_group[1:] = kmers[1:] != kmers[:-1]
+    cdef int64[:] group_starts_v = np.append(
+        np.where(is_new_group)[0], len(kmers)
+    ).astype(np.int64)
+
+    # Sum the number of shared k-mers for each pair of sequences
+    cdef np.ndarray shared = np.zeros(
+        (len(sequences), len(sequences)), dtype=np.float32
+    )
+    cdef float32[:,:] shared_v = shared
+    for k in range(group_starts_v.shape[0] - 1):
+        group_start = group_starts_v[k]
+        group_stop = group_starts_v[k+1]
+        for i in range(group_start, group_stop):
+            for j in range(group_start, i):
+                shared_v[seq_ids_v[i], seq_ids_v[j]] \
+                    += min(counts_v[i], counts_v[j])
+    shared = shared + shared.T
+
+    lengths = np.array([len(seq) for seq in sequences])
+    n_kmers = np.minimum(lengths[:, np.newaxis], lengths[np.newaxis, :]) \
+              - kmer_size + 1
+    distances = 1 - shared / np.maximum(n_kmers, 1)
+    np.fill_diagonal(distances, 0)
+    return distances.astype(np.float32)
+
+
 def _count_gaps(int64[:,:] trace_v, bint terminal_penalty):
     """
     Count the number of gap openings and gap extensions in an alignment
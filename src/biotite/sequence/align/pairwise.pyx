@@ -98,10 +98,11 @@ def _add_scores(CodeType1[:] code1 not None,
 
 def align_optimal(seq1, seq2, matrix, gap_penalty=-10,
                   terminal_penalty=True, local=False,
-                  max_number=1000):
+                  max_number=1000, score_only=False, linear_memory=False):
     """
     align_optimal(seq1, seq2, matrix, gap_penalty=-10,
-                  terminal_penalty=True, local=False, max_number=1000)
+                  terminal_penalty=True, local=False, max_number=1000,
+                  score_only=False, linear_memory=False)
 
     Perform an optimal alignment of two sequences based on a
     dynamic programming algorithm.
@@ -151,6 +152,22 @@ def align_optimal(seq1, seq2, matrix, gap_penalty=-10,
         When the number of branches exceeds this value in the traceback
         step, no further branches are created.
         (Default: 1000)
+    score_only : bool, optional
+        If set to ``True``, only the similarity score is returned
+        instead of the alignments.
+        In this case only two rows of the alignment table are kept in
+        memory at the same time.
+        For computing the scores of one sequence with many other
+        sequences, :class:`QueryProfile` is considerably faster.
+        (Default: False)
+    linear_memory : bool, optional
+        If set to ``True``, the memory requirement scales only linearly
+        with the length of `seq2`, instead of the product of both
+        sequence lengths, at the cost of approximately doubling the
+        execution time.
+        In this case only a single optimal alignment is returned and
+        `max_number` has no effect.
+        (Default: False)
     
     Returns
     -------
@@ -158,10 +175,29 @@ def align_optimal(seq1, seq2, matrix, gap_penalty=-10,
         A list of alignments.
         Each alignment in the list has the same maximum similarity
         score.
+        Only returned, if `score_only` is ``False``.
+    score : int
+        The alignment similarity score.
+        Only returned, if `score_only` is ``True``.
     
     See also
     --------
     align_banded
+
+    Notes
+    -----
+    With `linear_memory` set to ``True``, the alignment is found via
+    a divide-and-conquer approach :footcite:`Hirschberg1975`, that is
+    adapted to affine gap penalties :footcite:`Myers1988`:
+    The middle row of the alignment table is computed both from the
+    start and from the end of the table.
+    The cell of the middle row, where the optimal alignment passes
+    through, is the one with the highest sum of both scores.
+    Then the upper-left and the lower-right part of the table are
+    aligned recursively.
+    This makes the alignment of long sequences, e.g. whole bacterial
+    genomes, feasible, where the complete table would not fit into
+    memory.
     
     References
     ----------
@@ -183,6 +219,12 @@ def align_optimal(seq1, seq2, matrix, gap_penalty=-10,
     ATACGCTTGCT
     AGGCGC-AGCT 
     <BLANKLINE>
+    >>> ali = align_optimal(seq1, seq2, matrix, gap_penalty=-6, linear_memory=True)
+    >>> print(ali[0])
+    ATACGCTTGCT
+    AGGCGC-AGCT
+    >>> print(align_optimal(seq1, seq2, matrix, gap_penalty=-6, score_only=True))
+    17
     """
     # Check matrix alphabets
     if     not matrix.get_alphabet1().extends(seq1.get_alphabet()) \
@@ -205,6 +247,13 @@ def align_optimal(seq1, seq2, matrix, gap_penalty=-10,
             "Maximum number of returned alignments must be at least 1"
         )
     
+    if score_only or linear_memory:
+        result = _align_optimal_linear_memory(
+            seq1, seq2, matrix, gap_penalty, terminal_penalty, local,
+            score_only
+        )
+        return result if score_only else [result]
+
 
     # This implementation uses transposed tables in comparison
     # to the common visualization
@@ -584,4 +633,478 @@ def _fill_align_table_affine(CodeType1[:] code1 not None,
                 m_table[i,j] = m_score
                 g1_table[i,j] = g1_score
                 g2_table[i,j] = g2_score
-            trace_table[i,j] = trace
\ No newline at end of file
+            trace_table[i,j] = trace
+
+# The states in the linear memory variant of 'align_optimal()',
+# i.e. the kind of the edge in the alignment table leading into a cell
+cdef int _MATCH = 0
+# Horizontal edge -> gap in the first sequence
+cdef int _GAP_LEFT = 1
+# Vertical edge -> gap in the second sequence
+cdef int _GAP_TOP = 2
+
+# Value for negative infinity in the linear memory variant
+# Scores below this value are clamped to prevent integer overflow
+cdef int32 _NEG_INF = np.iinfo(np.int32).min // 2
+# Regions of the alignment table with at most this number of cells
+# are aligned via a complete table in the linear memory variant
+_LINEAR_MEMORY_BASE_SIZE = 2**16
+
+
+def _align_optimal_linear_memory(seq1, seq2, matrix, gap_penalty,
+                                 bint terminal_penalty, bint local,
+                                 bint score_only):
+    """
+    Perform an optimal alignment or compute only its score, keeping
+    only a number of rows of the alignment table in memory, that is
+    proportional to the length of `seq2`.
+
+    The alignment is obtained via divide-and-conquer in the manner of
+    Hirschberg and Myers-Miller: The optimal path through the table is
+    split at the middle row, which is determined from the scores of the
+    forward pass in the upper half and the backward pass in the lower
+    half.
+    Both halves are aligned recursively.
+    Each cell of the table has three states, like in the Gotoh
+    algorithm.
+    Linear gap penalties are handled by allowing transitions between the
+    two gap states.
+    """
+    if type(gap_penalty) == int:
+        gap_open = gap_penalty
+        gap_ext = gap_penalty
+        allow_switch = True
+    else:
+        gap_open, gap_ext = gap_penalty
+        allow_switch = False
+    # For local alignments terminal gaps are irrelevant,
+    # as the alignment would stop before
+    if local:
+        terminal_penalty = True
+    gap_params = (gap_open, gap_ext, allow_switch, terminal_penalty)
+    code1 = seq1.code
+    code2 = seq2.code
+    score_matrix = matrix.score_matrix()
+    rows = np.empty((2, 3, len(seq2) + 1), dtype=np.int32)
+
+    if local:
+        max_score, i_end, j_end = _fill_rows(
+            code1, code2, score_matrix, 0, len(seq1), 0, len(seq2),
+            _state_init(_MATCH), rows, *gap_params, True
+        )
+        if score_only:
+            return max_score
+        if max_score == 0:
+            # No pair of symbols has a positive score
+            return Alignment(
+                [seq1, seq2], np.zeros((0, 2), dtype=np.int64), 0
+            )
+        # The alignment starts with a match in the cell following the
+        # origin found by a backward pass from the end of the alignment
+        _, i_origin, j_origin = _fill_rows_backward(
+            code1, code2, score_matrix, 0, i_end, 0, j_end, 1 << _MATCH,
+            rows[:, :, :j_end+1], *gap_params, True, max_score
+        )
+        edges = [np.array([_MATCH], dtype=np.uint8)]
+        _align_region(
+            code1, code2, score_matrix, i_origin+1, i_end, j_origin+1, j_end,
+            _MATCH, 1 << _MATCH, gap_params, edges
+        )
+        score = max_score
+
+    else:
+        _fill_rows(
+            code1, code2, score_matrix, 0, len(seq1), 0, len(seq2),
+            _state_init(_MATCH), rows, *gap_params, False
+        )
+        score = int(np.max(rows[len(seq1) % 2, :, len(seq2)]))
+        if score_only:
+            return score
+        i_origin, j_origin = 0, 0
+        edges = []
+        _align_region(
+            code1, code2, score_matrix, 0, len(seq1), 0, len(seq2),
+            _MATCH, (1 << _MATCH) | (1 << _GAP_LEFT) | (1 << _GAP_TOP),
+            gap_params, edges
+        )
+
+    edges = np.concatenate(edges)
+    # Matches and gaps in the second sequence consume a symbol of the
+    # first sequence and vice versa
+    consumes1 = edges != _GAP_LEFT
+    consumes2 = edges != _GAP_TOP
+    trace = np.stack([
+        np.where(consumes1, i_origin + np.cumsum(consumes1) - 1, -1),
+        np.where(consumes2, j_origin + np.cumsum(consumes2) - 1, -1),
+    ], axis=-1).astype(np.int64)
+    return Alignment([seq1, seq2], trace, score)
+
+
+def _align_region(code1, code2, score_matrix, int i0, int i1, int j0, int j1,
+                  int start_state, int end_states, gap_params, list edges):
+    """
+    Find an optimal path through the region of the alignment table
+    from cell ``(i0, j0)`` in `start_state` to cell ``(i1, j1)`` in one
+    of the `end_states` (bit mask) and append the states of the edges
+    along this path to `edges`.
+    """
+    cdef int i_mid, j_mid, mid_state
+    cdef int width = j1 - j0 + 1
+
+    if i1 - i0 <= 1 or (i1 - i0 + 1) * width <= _LINEAR_MEMORY_BASE_SIZE:
+        # The region is small enough for a complete table
+        table = np.empty((i1 - i0 + 1, 3, width), dtype=np.int32)
+        _fill_rows(
+            code1, code2, score_matrix, i0, i1, j0, j1,
+            _state_init(start_state), table, *gap_params, False
+        )
+        end_scores = np.where(
+            (end_states >> np.arange(3)) & 1 == 1, table[-1, :, -1], _NEG_INF
+        )
+        edges.append(_traceback(
+            code1, code2, score_matrix, i0, i1, j0, j1,
+            np.argmax(end_scores), table, *gap_params
+        ))
+        return
+
+    i_mid = (i0 + i1) // 2
+    forward_rows = np.empty((2, 3, width), dtype=np.int32)
+    backward_rows = np.empty((2, 3, width), dtype=np.int32)
+    _fill_rows(
+        code1, code2, score_matrix, i0, i_mid, j0, j1,
+        _state_init(start_state), forward_rows, *gap_params, False
+    )
+    _fill_rows_backward(
+        code1, code2, score_matrix, i_mid, i1, j0, j1,
+        end_states, backward_rows, *gap_params, False, 0
+    )
+    # The score of the best path through each cell of the middle row
+    # in each state
+    total_scores = (
+        forward_rows[(i_mid - i0) % 2].astype(np.int64)
+        + backward_rows[(i1 - i_mid) % 2]
+    )
+    j_mid, mid_state = np.unravel_index(
+        np.argmax(total_scores.T), (width, 3)
+    )
+    j_mid += j0
+    _align_region(
+        code1, code2, score_matrix, i0, i_mid, j0, j_mid,
+        start_state, 1 << mid_state, gap_params, edges
+    )
+    _align_region(
+        code1, code2, score_matrix, i_mid, i1, j_mid, j1,
+        mid_state, end_states, gap_params, edges
+    )
+
+
+def _state_init(int state):
+    """
+    Get the scores of the first cell of a region, where the alignment
+    path must start in the given state.
+    """
+    init = np.full(3, _NEG_INF, dtype=np.int32)
+    init[state] = 0
+    return init
+
+
+cdef inline int32 _clamp(int32 score):
+    return _NEG_INF if score < _NEG_INF else score
+
+
+cdef inline bint _is_terminal(int pos, int length, bint term_penalty):
+    """
+    Check whether gaps in the given row/column of the alignment table
+    are terminal gaps, that are not penalized.
+    """
+    return not term_penalty and (pos == 0 or pos == length)
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _fill_rows(CodeType1[:] code1 not None,
+               CodeType2[:] code2 not None,
+               const int32[:,:] matrix not None,
+               int i0, int i1, int j0, int j1,
+               const int32[:] init not None,
+               int32[:,:,:] rows not None,
+               int32 gap_open, int32 gap_ext, bint allow_switch,
+               bint term_penalty, bint local):
+    """
+    Compute the scores of the three states for each cell in the region
+    of the alignment table from row `i0` to `i1` and column `j0` to
+    `j1`, starting with the scores `init` in cell ``(i0, j0)``.
+
+    The scores of row *i* are written into
+    ``rows[(i - i0) % len(rows)]``, so that two rows suffice to obtain
+    the scores of the last row.
+
+    For local alignments, the region must start at the origin of the
+    table and the maximum score and its cell is returned.
+    """
+    cdef int n1 = code1.shape[0]
+    cdef int n2 = code2.shape[0]
+    cdef int n_rows = rows.shape[0]
+    cdef int width = j1 - j0
+    cdef int i, j
+    cdef int32[:,:] curr, prev
+    cdef int32 h_open, h_ext, v_open, v_ext
+    cdef int32 m_score, g1_score, g2_score
+    cdef int32 max_score = 0
+    cdef int max_i = i0, max_j = j0
+
+    # The first row contains only horizontal edges
+    curr = rows[0]
+    if _is_terminal(i0, n1, term_penalty):
+        h_open, h_ext = 0, 0
+    else:
+        h_open, h_ext = gap_open, gap_ext
+    for j in range(width + 1):
+        if local:
+            curr[_MATCH, j] = 0
+            curr[_GAP_LEFT, j] = _NEG_INF
+            curr[_GAP_TOP, j] = _NEG_INF
+        elif j == 0:
+            curr[_MATCH, j] = init[_MATCH]
+            curr[_GAP_LEFT, j] = init[_GAP_LEFT]
+            curr[_GAP_TOP, j] = init[_GAP_TOP]
+        else:
+            g1_score = max(
+                curr[_MATCH, j-1] + h_open, curr[_GAP_LEFT, j-1] + h_ext
+            )
+            if allow_switch:
+                g1_score = max(g1_score, curr[_GAP_TOP, j-1] + h_open)
+            curr[_MATCH, j] = _NEG_INF
+            curr[_GAP_LEFT, j] = _clamp(g1_score)
+            curr[_GAP_TOP, j] = _NEG_INF
+
+    for i in range(i0 + 1, i1 + 1):
+        prev = curr
+        curr = rows[(i - i0) % n_rows]
+        if _is_terminal(i, n1, term_penalty):
+            h_open, h_ext = 0, 0
+        else:
+            h_open, h_ext = gap_open, gap_ext
+        for j in range(width + 1):
+            if _is_terminal(j0 + j, n2, term_penalty):
+                v_open, v_ext = 0, 0
+            else:
+                v_open, v_ext = gap_open, gap_ext
+            if j == 0:
+                # The first column contains only vertical edges
+                if local:
+                    curr[_MATCH, j] = 0
+                    curr[_GAP_LEFT, j] = _NEG_INF
+                    curr[_GAP_TOP, j] = _NEG_INF
+                    continue
+                m_score = _NEG_INF
+                g1_score = _NEG_INF
+            else:
+                m_score = max(
+                    prev[_MATCH, j-1],
+                    prev[_GAP_LEFT, j-1],
+                    prev[_GAP_TOP, j-1]
+                ) + matrix[code1[i-1], code2[j0+j-1]]
+                g1_score = max(
+                    curr[_MATCH, j-1] + h_open, curr[_GAP_LEFT, j-1] + h_ext
+                )
+                if allow_switch:
+                    g1_score = max(g1_score, curr[_GAP_TOP, j-1] + h_open)
+            g2_score = max(
+                prev[_MATCH, j] + v_open, prev[_GAP_TOP, j] + v_ext
+            )
+            if allow_switch:
+                g2_score = max(g2_score, prev[_GAP_LEFT, j] + v_open)
+
+            if local:
+                # The score of a local alignment never drops below 0,
+                # instead a new alignment starts
+                if m_score <= 0:
+                    m_score = 0
+                elif m_score > max_score:
+                    max_score = m_score
+                    max_i = i
+                    max_j = j0 + j
+                if g1_score <= 0:
+                    g1_score = _NEG_INF
+                if g2_score <= 0:
+                    g2_score = _NEG_INF
+            curr[_MATCH, j] = _clamp(m_score)
+            curr[_GAP_LEFT, j] = _clamp(g1_score)
+            curr[_GAP_TOP, j] = _clamp(g2_score)
+
+    return max_score, max_i, max_j
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _fill_rows_backward(CodeType1[:] code1 not None,
+                        CodeType2[:] code2 not None,
+                        const int32[:,:] matrix not None,
+                        int i0, int i1, int j0, int j1,
+                        int end_states,
+                        int32[:,:,:] rows not None,
+                        int32 gap_open, int32 gap_ext, bint allow_switch,
+                        bint term_penalty,
+                        bint find_start, int32 target_score):
+    """
+    Compute for each cell in the region of the alignment table from
+    row `i0` to `i1` and column `j0` to `j1` and each state of this
+    cell the score of the best path to cell ``(i1, j1)``, ending in one
+    of the `end_states` (bit mask).
+
+    The scores of row *i* are written into
+    ``rows[(i1 - i) % len(rows)]``.
+
+    If `find_start` is true, the cell is searched, from which a path
+    starting with a match reaches the `target_score`.
+    This cell and the score are returned.
+    """
+    cdef int n1 = code1.shape[0]
+    cdef int n2 = code2.shape[0]
+    cdef int n_rows = rows.shape[0]
+    cdef int width = j1 - j0
+    cdef int i, j, state
+    cdef int32[:,:] curr, succ
+    cdef int32 h_open, h_ext, v_open, v_ext
+    cdef int32 diag_score, g1_score, g2_score
+    cdef int32 best_score = _NEG_INF
+    cdef int best_i = i1, best_j = j1
+
+    # The last row contains only horizontal edges
+    curr = rows[0]
+    if _is_terminal(i1, n1, term_penalty):
+        h_open, h_ext = 0, 0
+    else:
+        h_open, h_ext = gap_open, gap_ext
+    for state in range(3):
+        curr[state, width] = 0 if (end_states >> state) & 1 else _NEG_INF
+    for j in range(width - 1, -1, -1):
+        g1_score = curr[_GAP_LEFT, j+1]
+        curr[_MATCH, j] = _clamp(g1_score + h_open)
+        curr[_GAP_LEFT, j] = _clamp(g1_score + h_ext)
+        curr[_GAP_TOP, j] = _clamp(g1_score + h_open) if allow_switch \
+                            else _NEG_INF
+
+    for i in range(i1 - 1, i0 - 1, -1):
+        succ = curr
+        curr = rows[(i1 - i) % n_rows]
+        if _is_terminal(i, n1, term_penalty):
+            h_open, h_ext = 0, 0
+        else:
+            h_open, h_ext = gap_open, gap_ext
+        for j in range(width, -1, -1):
+            if _is_terminal(j0 + j, n2, term_penalty):
+                v_open, v_ext = 0, 0
+            else:
+                v_open, v_ext = gap_open, gap_ext
+            # The scores of the paths continuing with a gap
+            # in the second sequence, i.e. a vertical edge
+            g2_score = succ[_GAP_TOP, j]
+            if j == width:
+                # The last column contains only vertical edges
+                curr[_MATCH, j] = _clamp(g2_score + v_open)
+                curr[_GAP_LEFT, j] = _clamp(g2_score + v_open) \
+                                     if allow_switch else _NEG_INF
+                curr[_GAP_TOP, j] = _clamp(g2_score + v_ext)
+                continue
+            # The scores of the paths continuing with a match
+            # or a gap in the first sequence, i.e. a horizontal edge
+            diag_score = succ[_MATCH, j+1] + matrix[code1[i], code2[j0+j]]
+            g1_score = curr[_GAP_LEFT, j+1]
+            curr[_MATCH, j] = _clamp(max(
+                diag_score, g1_score + h_open, g2_score + v_open
+            ))
+            if allow_switch:
+                curr[_GAP_LEFT, j] = _clamp(max(
+                    diag_score, g1_score + h_ext, g2_score + v_open
+                ))
+                curr[_GAP_TOP, j] = _clamp(max(
+                    diag_score, g1_score + h_open, g2_score + v_ext
+                ))
+            else:
+                curr[_GAP_LEFT, j] = _clamp(max(
+                    diag_score, g1_score + h_ext
+                ))
+                curr[_GAP_TOP, j] = _clamp(max(
+                    diag_score, g2_score + v_ext
+                ))
+
+            if find_start and diag_score > best_score:
+                best_score = diag_score
+                best_i = i
+                best_j = j0 + j
+                if best_score == target_score:
+                    return best_score, best_i, best_j
+
+    return best_score, best_i, best_j
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _traceback(CodeType1[:] code1 not None,
+               CodeType2[:] code2 not None,
+               const int32[:,:] matrix not None,
+               int i0, int i1, int j0, int j1, int state,
+               const int32[:,:,:] table not None,
+               int32 gap_open, int32 gap_ext, bint allow_switch,
+               bint term_penalty):
+    """
+    Follow the path from cell ``(i1, j1)`` in the given `state` back to
+    cell ``(i0, j0)`` in a complete table filled by :func:`_fill_rows()`
+    and return the states of the edges along the path.
+    """
+    cdef int n1 = code1.shape[0]
+    cdef int n2 = code2.shape[0]
+    cdef int i = i1, j = j1
+    cdef int32 score, similarity
+    cdef int32 open_penalty, ext_penalty
+    cdef int k = 0
+    cdef np.ndarray edges = np.zeros((i1 - i0) + (j1 - j0), dtype=np.uint8)
+    cdef uint8[:] edges_v = edges
+
+    while i != i0 or j != j0:
+        score = table[i - i0, state, j - j0]
+        edges_v[k] = state
+        k += 1
+        if state == _MATCH:
+            similarity = matrix[code1[i-1], code2[j-1]]
+            i -= 1
+            j -= 1
+            if table[i - i0, _MATCH, j - j0] + similarity == score:
+                state = _MATCH
+            elif table[i - i0, _GAP_LEFT, j - j0] + similarity == score:
+                state = _GAP_LEFT
+            else:
+                state = _GAP_TOP
+        elif state == _GAP_LEFT:
+            if _is_terminal(i, n1, term_penalty):
+                open_penalty, ext_penalty = 0, 0
+            else:
+                open_penalty, ext_penalty = gap_open, gap_ext
+            j -= 1
+            if table[i - i0, _MATCH, j - j0] + open_penalty == score:
+                state = _MATCH
+            elif table[i - i0, _GAP_LEFT, j - j0] + ext_penalty == score:
+                state = _GAP_LEFT
+            elif allow_switch:
+                state = _GAP_TOP
+            else:
+                raise ValueError("Invalid trace")
+        else:
+            if _is_terminal(j, n2, term_penalty):
+                open_penalty, ext_penalty = 0, 0
+            else:
+                open_penalty, ext_penalty = gap_open, gap_ext
+            i -= 1
+            if table[i - i0, _MATCH, j - j0] + open_penalty == score:
+                state = _MATCH
+            elif table[i - i0, _GAP_TOP, j - j0] + ext_penalty == score:
+                state = _GAP_TOP
+            elif allow_switch:
+                state = _GAP_LEFT
+            else:
+                raise ValueError("Invalid trace")
+
+    # The edges were collected from the end to the start
+    return edges[:k][::-1]
@@ -0,0 +1,795 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+__name__ = "biotite.sequence.align"
+__author__ = "Patrick Kunzmann"
+__all__ = ["QueryProfile"]
+
+cimport cython
+cimport numpy as np
+from libc.string cimport memcpy
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from .util import concatenate_targets
+
+
+ctypedef np.int8_t int8
+ctypedef np.int16_t int16
+ctypedef np.int32_t int32
+ctypedef np.int64_t int64
+ctypedef np.uint8_t uint8
+ctypedef np.uint16_t uint16
+ctypedef np.uint32_t uint32
+ctypedef np.uint64_t uint64
+
+ctypedef fused CodeType:
+    uint8
+    uint16
+    uint32
+    uint64
+
+ctypedef fused LaneType:
+    int8
+    int16
+    int32
+
+
+# The combined size of the lanes that are processed at once in bytes,
+# corresponding to the size of a 256-bit vector register
+DEF VECTOR_SIZE = 32
+# The number of scratch buffers required by the kernel
+DEF N_BUFFERS = 7
+
+# The integer types of the lanes in the order they are tried
+_LANE_TYPES = (np.int8, np.int16, np.int32)
+
+
+class QueryProfile:
+    """
+    QueryProfile(query, matrix, gap_penalty=-10, terminal_penalty=True,
+                 local=False)
+
+    A query profile allows the fast computation of the optimal
+    alignment score of a query sequence and any number of target
+    sequences, without obtaining the alignment itself.
+
+    The scores are computed via the striped algorithm by Farrar
+    :footcite:`Farrar2007`:
+    The substitution scores of the query for each symbol of the
+    target alphabet are precomputed once in a *striped* layout, so that
+    multiple rows of a column of the alignment table are computed
+    at once in independent lanes of small integers.
+    The scores are computed with 8-bit lanes, if the value range of
+    these lanes is sufficient for the given sequence lengths and
+    scores.
+    If a score would exceed this range, it is recomputed with 16-bit or
+    32-bit lanes, respectively.
+
+    The obtained score is equal to the score of the alignments from
+    :func:`align_optimal()` with the same parameters.
+    Hence, a :class:`QueryProfile` can be used to quickly filter a
+    large number of target sequences, before the alignments are
+    computed for the remaining targets.
+
+    Parameters
+    ----------
+    query : Sequence
+        The query sequence, i.e. the first sequence in the alignment.
+    matrix : SubstitutionMatrix
+        The substitution matrix used for scoring.
+        The first alphabet of the matrix must extend the alphabet of
+        the query, the second alphabet must extend the alphabet of the
+        targets.
+    gap_penalty : int or tuple(int, int), optional
+        If an integer is provided, the value will be interpreted as
+        linear gap penalty.
+        If a tuple is provided, an affine gap penalty is used.
+        The first integer in the tuple is the gap opening penalty,
+        the second integer is the gap extension penalty.
+        The values need to be negative.
+    terminal_penalty : bool, optional
+        If true, gap penalties are applied to terminal gaps.
+        If `local` is true, this parameter has no effect.
+    local : bool, optional
+        If false, a global alignment is performed, otherwise a local
+        alignment is performed.
+
+    Attributes
+    ----------
+    query : Sequence
+        The query sequence.
+    matrix : SubstitutionMatrix
+        The substitution matrix.
+    gap_penalty : int or tuple(int, int)
+        The gap penalty.
+    terminal_penalty : bool
+        Whether terminal gaps are penalized.
+    local : bool
+        Whether local alignment scores are computed.
+
+    Notes
+    -----
+    The lanes are not processed via explicit *SIMD* instructions, but
+    the lane-wise loops are written in a way that allows the compiler
+    to vectorize them for the target architecture.
+
+    A :class:`QueryProfile` reuses its internal buffers for each
+    target.
+    Hence, the same object must not be used in multiple threads at the
+    same time.
+
+    References
+    ----------
+
+    .. footbibliography::
+
+    Examples
+    --------
+
+    >>> query = NucleotideSequence("ATACGCTTGCT")
+    >>> targets = [
+    ...     NucleotideSequence("AGGCGCAGCT"),
+    ...     NucleotideSequence("TTTTTTTTT"),
+    ...     NucleotideSequence("GCTTGC"),
+    ... ]
+    >>> matrix = SubstitutionMatrix.std_nucleotide_matrix()
+    >>> profile = QueryProfile(query, matrix, gap_penalty=-6, local=True)
+    >>> for target in targets:
+    ...     print(profile.score(target))
+    20
+    10
+    30
+    >>> score, (query_end, target_end) = profile.score(
+    ...     targets[2], return_end=True
+    ... )
+    >>> print(query_end, target_end)
+    9 5
+    """
+
+    def __init__(self, query, matrix, gap_penalty=-10,
+                 terminal_penalty=True, local=False):
+        if not matrix.get_alphabet1().extends(query.get_alphabet()):
+            raise ValueError("The query's alphabet does not fit the matrix")
+        if type(gap_penalty) == int:
+            if gap_penalty > 0:
+                raise ValueError("Gap penalty must be negative")
+            self._gap_open = gap_penalty
+            self._gap_ext = gap_penalty
+        elif type(gap_penalty) == tuple:
+            if gap_penalty[0] > 0 or gap_penalty[1] > 0:
+                raise ValueError("Gap penalty must be negative")
+            self._gap_open, self._gap_ext = gap_penalty
+        else:
+            raise TypeError("Gap penalty must be either integer or tuple")
+        self._query = query
+        self._matrix = matrix
+        self._gap_penalty = gap_penalty
+        self._terminal_penalty = terminal_penalty
+        self._local = local
+        # Linear gap penalties are handled as affine gap penalties,
+        # that allow direct transitions between the two gap states
+        self._allow_switch = type(gap_penalty) == int
+
+        score_matrix = matrix.score_matrix()
+        self._max_abs_value = max(
+            int(np.max(np.abs(score_matrix))),
+            abs(self._gap_open), abs(self._gap_ext)
+        )
+        # The query scores for each symbol of the target alphabet
+        query_scores = score_matrix[query.code]
+        # The striped profile and scratch buffer for each lane type
+        # are created lazily
+        self._query_scores = query_scores
+        self._profiles = {}
+        self._buffers = {}
+
+
+    @property
+    def query(self):
+        return self._query
+
+    @property
+    def matrix(self):
+        return self._matrix
+
+    @property
+    def gap_penalty(self):
+        return self._gap_penalty
+
+    @property
+    def terminal_penalty(self):
+        return self._terminal_penalty
+
+    @property
+    def local(self):
+        return self._local
+
+
+    def score(self, target, bint return_end=False):
+        """
+        score(target, return_end=False)
+
+        Compute the optimal alignment score of the query and the
+        given target sequence.
+
+        Parameters
+        ----------
+        target : Sequence
+            The target sequence, i.e. the second sequence in the
+            alignment.
+        return_end : bool, optional
+            If set to true, the end position of the alignment is
+            returned additionally.
+
+        Returns
+        -------
+        score : int
+            The optimal alignment score.
+        end : tuple(int, int)
+            The index of the last symbol in the query and the target,
+            that is part of the aligned region, respectively.
+            For global alignments without terminal penalty, trailing
+            terminal gaps are not part of the aligned region.
+            If no symbol of a sequence is part of the aligned region,
+            e.g. for an empty local alignment, the index is -1.
+            Only returned, if `return_end` is true.
+
+        See also
+        --------
+        score_batch
+            For computing the scores of multiple targets at once.
+        """
+        if return_end:
+            scores, ends = self.score_batch([target], True, n_threads=1)
+            return int(scores[0]), (int(ends[0, 0]), int(ends[0, 1]))
+        else:
+            return int(self.score_batch([target], n_threads=1)[0])
+
+
+    def score_batch(self, targets, bint return_end=False, n_threads=None):
+        """
+        score_batch(targets, return_end=False, n_threads=None)
+
+        Compute the optimal alignment scores of the query and multiple
+        target sequences.
+
+        In contrast to calling :meth:`score()` for each target, the
+        targets are processed in compiled code without holding the
+        *global interpreter lock*.
+        This allows distributing the targets to multiple threads.
+
+        Parameters
+        ----------
+        targets : iterable object of Sequence
+            The target sequences.
+        return_end : bool, optional
+            If set to true, the end positions of the alignments are
+            returned additionally.
+        n_threads : int, optional
+            The number of threads the targets are distributed to.
+            By default, the number of CPUs is used.
+
+        Returns
+        -------
+        scores : ndarray, shape=(n,), dtype=np.int64
+            The optimal alignment score for each target.
+        ends : ndarray, shape=(n,2), dtype=np.int64
+            The end position of the alignment for each target, as
+            described in :meth:`score()`.
+            Only returned, if `return_end` is true.
+
+        Examples
+        --------
+
+        >>> query = NucleotideSequence("ATACGCTTGCT")
+        >>> targets = [
+        ...     NucleotideSequence("AGGCGCAGCT"),
+        ...     NucleotideSequence("TTTTTTTTT"),
+        ...     NucleotideSequence("GCTTGC"),
+        ... ]
+        >>> matrix = SubstitutionMatrix.std_nucleotide_matrix()
+        >>> profile = QueryProfile(query, matrix, gap_penalty=-6, local=True)
+        >>> scores, ends = profile.score_batch(targets, return_end=True)
+        >>> print(scores)
+        [20 10 30]
+        >>> print(ends)
+        [[10  9]
+         [ 7  1]
+         [ 9  5]]
+        """
+        if n_threads is None:
+            n_threads = os.cpu_count()
+        if n_threads < 1:
+            raise ValueError("At least one thread is required")
+
+        targets = list(targets)
+        # The codes of all targets are concatenated into a single array
+        codes, lengths, offsets = concatenate_targets(
+            targets, self._matrix.get_alphabet2()
+        )
+        result = np.zeros((len(targets), 3), dtype=np.int64)
+        overflow = np.zeros(len(targets), dtype=np.uint8)
+
+        # Each target is first aligned with the narrowest lane type,
+        # whose value range may be sufficient;
+        # if the scores exceed the range during the computation,
+        # the target is aligned again with the next wider lane type
+        first_lane_types = self._first_lane_types(lengths)
+        pending = np.arange(len(targets))
+        for i, lane_type in enumerate(_LANE_TYPES):
+            is_current = first_lane_types[pending] <= i
+            indices = pending[is_current]
+            self._score_indices(
+                lane_type, codes, offsets, indices, result, overflow,
+                return_end, n_threads
+            )
+            pending = np.concatenate([
+                pending[~is_current], indices[overflow[indices] != 0]
+            ])
+        if len(pending) > 0:
+            raise OverflowError(
+                "The alignment score exceeds the 32-bit range"
+            )
+
+        scores = result[:, 0]
+        if return_end:
+            return scores, result[:, 1:]
+        else:
+            return scores
+
+
+    def _score_indices(self, lane_type, codes, offsets, indices, result,
+                       overflow, bint find_end, int n_threads):
+        """
+        Compute the scores for the targets at the given indices with
+        the given lane type, distributed to the given number of
+        threads.
+        """
+        profile = self._get_profile(lane_type)
+        params = (
+            len(self._query), self._gap_open, self._gap_ext,
+            self._allow_switch, self._terminal_penalty, self._local,
+            find_end
+        )
+        n_threads = min(n_threads, len(indices))
+        if n_threads <= 1:
+            _score_targets(
+                profile, self._get_buffer(lane_type), codes, offsets,
+                indices, result, overflow, *params
+            )
+            return
+        # Each thread requires its own buffer
+        # The targets are interleaved to balance the target lengths
+        # between the threads
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            futures = [
+                executor.submit(
+                    _score_targets,
+                    profile, self._create_buffer(lane_type), codes, offsets,
+                    indices[i::n_threads], result, overflow, *params
+                )
+                for i in range(n_threads)
+            ]
+            for future in futures:
+                # Raise potential exceptions
+                future.result()
+
+
+    def _first_lane_types(self, target_lengths):
+        """
+        Get the index of the narrowest lane type in `_LANE_TYPES`,
+        whose value range may be sufficient for aligning targets of
+        the given lengths.
+        """
+        target_lengths = np.asarray(target_lengths, dtype=np.int64)
+        query_length = len(self._query)
+        if self._local:
+            # The scores of a local alignment are never negative
+            # -> only the maximum score is limited by the range,
+            # which is checked during the computation
+            bounds = np.full(
+                target_lengths.shape, self._max_abs_value, dtype=np.int64
+            )
+        else:
+            # The lowest possible score of a cell is limited by the
+            # path consisting only of gaps and mismatches
+            # and the highest possible score by the path consisting only
+            # of matches
+            bounds = 2 * self._max_abs_value \
+                + 2 * abs(self._gap_open) \
+                + (query_length + target_lengths) * abs(self._gap_ext) \
+                + np.minimum(query_length, target_lengths) \
+                * self._max_abs_value
+        # Ensure that the lowest possible score is well above the
+        # value used as negative infinity
+        limits = np.array(
+            [np.iinfo(lane_type).max // 4 for lane_type in _LANE_TYPES]
+        )
+        # The widest lane type is always used as last resort
+        return np.minimum(
+            np.searchsorted(limits, bounds), len(_LANE_TYPES) - 1
+        )
+
+
+    def _get_profile(self, lane_type):
+        """
+        Get the striped query profile for the given lane type.
+        """
+        profile = self._profiles.get(lane_type)
+        if profile is None:
+            n_lanes, seg_length = self._striped_shape(lane_type)
+            # Padding positions at the end of the query have a score
+            # of 0 for all symbols, so they never exceed the score of
+            # the preceding query positions
+            scores = np.zeros(
+                (seg_length * n_lanes, self._query_scores.shape[1]),
+                dtype=lane_type
+            )
+            scores[:len(self._query)] = self._query_scores
+            # Query position 'lane * seg_length + segment' is located
+            # at 'profile[symbol, segment, lane]'
+            profile = np.ascontiguousarray(
+                scores.reshape(n_lanes, seg_length, -1).transpose(2, 1, 0)
+            )
+            self._profiles[lane_type] = profile
+        return profile
+
+
+    def _get_buffer(self, lane_type):
+        """
+        Get the scratch buffer for the given lane type, that is reused
+        for each call in the current thread.
+        """
+        buffer = self._buffers.get(lane_type)
+        if buffer is None:
+            buffer = self._create_buffer(lane_type)
+            self._buffers[lane_type] = buffer
+        return buffer
+
+
+    def _create_buffer(self, lane_type):
+        n_lanes, seg_length = self._striped_shape(lane_type)
+        return np.zeros((N_BUFFERS, seg_length, n_lanes), dtype=lane_type)
+
+
+    def _striped_shape(self, lane_type):
+        """
+        Get the number of lanes and the segment length for the given
+        lane type.
+        """
+        n_lanes = VECTOR_SIZE // np.dtype(lane_type).itemsize
+        seg_length = max(-(-len(self._query) // n_lanes), 1)
+        return n_lanes, seg_length
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _score_targets(const LaneType[:,:,:] profile not None,
+                   LaneType[:,:,:] buffer not None,
+                   const CodeType[:] codes not None,
+                   const int64[:] offsets not None,
+                   const int64[:] indices not None,
+                   int64[:,:] result not None,
+                   uint8[:] overflow not None,
+                   int query_length, int32 gap_open, int32 gap_ext,
+                   bint allow_switch, bint term_penalty, bint local,
+                   bint find_end):
+    """
+    Compute the alignment scores of the query represented by the
+    striped `profile` and the targets at the given `indices` using
+    the scratch `buffer`.
+
+    The targets are given by their concatenated `codes` and the
+    `offsets` of each target in `codes`.
+    The score and the end position of each target are written into
+    `result`.
+    If the scores of a target exceed the range of the lane type, this
+    is marked in `overflow`.
+    """
+    cdef int64 n, target_i, start, stop
+    cdef const CodeType* codes_ptr = NULL
+    if codes.shape[0] > 0:
+        codes_ptr = &codes[0]
+
+    with nogil:
+        for n in range(indices.shape[0]):
+            target_i = indices[n]
+            start = offsets[target_i]
+            stop = offsets[target_i + 1]
+            if start == stop:
+                # The kernel requires at least one column
+                _score_empty(
+                    query_length, gap_open, gap_ext, term_penalty, local,
+                    &result[target_i, 0]
+                )
+                overflow[target_i] = False
+                continue
+            overflow[target_i] = _striped_kernel(
+                &profile[0, 0, 0], profile.shape[1], query_length,
+                codes_ptr + start, stop - start, &buffer[0, 0, 0],
+                gap_open, gap_ext, allow_switch, term_penalty, local,
+                find_end, &result[target_i, 0]
+            )
+
+
+cdef void _score_empty(int query_length, int32 gap_open, int32 gap_ext,
+                       bint term_penalty, bint local,
+                       int64* result) noexcept nogil:
+    """
+    Get the alignment score, if the target is empty.
+    """
+    if local or not term_penalty or query_length == 0:
+        result[0] = 0
+    else:
+        result[0] = gap_open + (query_length - 1) * gap_ext
+    result[1] = query_length - 1 if not local and term_penalty else -1
+    result[2] = -1
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cdivision(True)
+cdef bint _striped_kernel(const LaneType* profile, int seg_length,
+                          int query_length,
+                          const CodeType* target, int target_length,
+                          LaneType* buffer,
+                          int32 gap_open, int32 gap_ext, bint allow_switch,
+                          bint term_penalty, bint local, bint find_end,
+                          int64* result) noexcept nogil:
+    """
+    Fill the alignment table column by column, where each column is
+    stored in the striped layout.
+
+    Each cell has three states like in the Gotoh algorithm:
+    The score of the match state *M*, the score of the horizontal gap
+    state *E* and the score of the vertical gap state *F*.
+    *H* is the maximum of these three scores.
+    Gaps are opened from the score *O*, which is *M* for affine gap
+    penalties and *H*, if transitions between the gap states are
+    allowed.
+
+    For global alignments without terminal penalty, the terminal gaps
+    in the last row and column are not penalized in the table, instead
+    the score is the maximum *O* from the last row and column.
+    """
+    cdef int n_lanes = VECTOR_SIZE // sizeof(LaneType)
+    cdef int stride = seg_length * n_lanes
+    # Scores below this value are clamped to prevent integer overflow
+    cdef int neg_inf = -(1 << (8 * sizeof(LaneType) - 2))
+    # Scores of local alignments never drop below 0,
+    # instead a new alignment starts
+    cdef int floor = 0 if local else neg_inf
+    # If the maximum score exceeds this value, the next column might
+    # exceed the range of the lane type
+    cdef int max_value = <int> (
+        (<int64> 1 << (8 * sizeof(LaneType) - 1)) - 1
+        - (<int64> 1 << (8 * sizeof(LaneType) - 3))
+    )
+    # The scores of the previous and current column
+    cdef LaneType* h_prev = buffer
+    cdef LaneType* h_curr = buffer + stride
+    cdef LaneType* o_prev = buffer + 2 * stride
+    cdef LaneType* o_curr = buffer + 3 * stride
+    cdef LaneType* e_col = buffer + 4 * stride
+    cdef LaneType* f_col = buffer + 5 * stride
+    # The H scores of the column containing the maximum score
+    cdef LaneType* h_best = buffer + 6 * stride
+    cdef LaneType* swap
+    cdef const LaneType* scores
+    # The lane-wise registers
+    cdef LaneType v_diag[VECTOR_SIZE]
+    cdef LaneType v_f[VECTOR_SIZE]
+    cdef LaneType v_max[VECTOR_SIZE]
+    cdef LaneType v_score[VECTOR_SIZE]
+    cdef LaneType v_h_prev[VECTOR_SIZE]
+    cdef LaneType v_o_prev[VECTOR_SIZE]
+    cdef LaneType v_h[VECTOR_SIZE]
+    cdef LaneType v_o[VECTOR_SIZE]
+    cdef LaneType v_e[VECTOR_SIZE]
+    cdef LaneType v_f_col[VECTOR_SIZE]
+    cdef size_t lane_bytes = VECTOR_SIZE
+    cdef int offset
+    cdef int m, e, f, h, o
+    cdef int i, j, k, s, idx
+    cdef bint improved
+    cdef int col_max
+    cdef int best_score = 0
+    cdef int best_i = -1, best_j = -1
+    # The position of the last query symbol in the striped layout
+    cdef int last_idx = 0
+    if query_length > 0:
+        last_idx = ((query_length - 1) % seg_length) * n_lanes \
+                 + (query_length - 1) // seg_length
+    cdef int row_score, col_score
+    cdef int row_j, col_i
+
+    # Initialize column 0, containing only vertical gaps
+    for k in range(n_lanes):
+        for s in range(seg_length):
+            i = k * seg_length + s
+            idx = s * n_lanes + k
+            if local or not term_penalty:
+                h = 0
+            else:
+                h = _clamp(gap_open + <int64> i * gap_ext, neg_inf)
+            h_prev[idx] = <LaneType> h
+            if local:
+                o_prev[idx] = 0
+            elif allow_switch:
+                o_prev[idx] = <LaneType> h
+            else:
+                o_prev[idx] = <LaneType> neg_inf
+            e_col[idx] = <LaneType> neg_inf
+    # Without terminal penalty the best score in the last row
+    # and the column it was found in
+    row_score = o_prev[last_idx] if query_length > 0 else 0
+    row_j = -1
+
+    for j in range(target_length):
+        scores = profile + target[j] * stride
+        # The first row contains only horizontal gaps
+        # -> lane 0 is initialized from the first row
+        v_diag[0] = <LaneType> _first_row(j, gap_open, gap_ext, term_penalty,
+                                          local, neg_inf)
+        h = _first_row(j + 1, gap_open, gap_ext, term_penalty, local,
+                       neg_inf)
+        if local or not allow_switch:
+            v_f[0] = <LaneType> neg_inf
+        else:
+            v_f[0] = <LaneType> _clamp(h + gap_open, neg_inf)
+        for k in range(1, n_lanes):
+            v_diag[k] = h_prev[(seg_length - 1) * n_lanes + k - 1]
+            v_f[k] = <LaneType> neg_inf
+        for k in range(n_lanes):
+            v_max[k] = 0
+
+        for s in range(seg_length):
+            offset = s * n_lanes
+            # The computation is performed on local copies of the
+            # segment, so that the compiler can vectorize the loop
+            # without considering aliasing between the buffers
+            memcpy(v_score, scores + offset, lane_bytes)
+            memcpy(v_h_prev, h_prev + offset, lane_bytes)
+            memcpy(v_o_prev, o_prev + offset, lane_bytes)
+            memcpy(v_e, e_col + offset, lane_bytes)
+            for k in range(n_lanes):
+                m = max(v_diag[k] + v_score[k], floor)
+                e = max(v_o_prev[k] + gap_open, v_e[k] + gap_ext)
+                e = e if e > floor else neg_inf
+                f = v_f[k]
+                h = max(max(m, e), f)
+                o = h if allow_switch else m
+                v_diag[k] = v_h_prev[k]
+                v_h[k] = <LaneType> h
+                v_o[k] = <LaneType> o
+                v_e[k] = <LaneType> e
+                v_f_col[k] = <LaneType> f
+                f = max(o + gap_open, f + gap_ext)
+                v_f[k] = <LaneType> (f if f > floor else neg_inf)
+                v_max[k] = <LaneType> max(<int> v_max[k], m)
+            memcpy(h_curr + offset, v_h, lane_bytes)
+            memcpy(o_curr + offset, v_o, lane_bytes)
+            memcpy(e_col + offset, v_e, lane_bytes)
+            memcpy(f_col + offset, v_f_col, lane_bytes)
+
+        # Vertical gaps crossing the segment boundaries are propagated
+        # lazily, as they rarely improve the scores
+        _shift(v_f, n_lanes, neg_inf)
+        s = 0
+        while True:
+            improved = False
+            for k in range(n_lanes):
+                improved |= v_f[k] > f_col[s * n_lanes + k]
+            if not improved:
+                break
+            for k in range(n_lanes):
+                idx = s * n_lanes + k
+                f = max(<int> v_f[k], <int> f_col[idx])
+                h = max(<int> h_curr[idx], f)
+                f_col[idx] = <LaneType> f
+                h_curr[idx] = <LaneType> h
+                if allow_switch:
+                    o_curr[idx] = <LaneType> h
+                f = f + gap_ext
+                v_f[k] = <LaneType> (f if f > floor else neg_inf)
+            s += 1
+            if s == seg_length:
+                s = 0
+                _shift(v_f, n_lanes, neg_inf)
+
+        if local:
+            col_max = 0
+            for k in range(n_lanes):
+                col_max = max(col_max, <int> v_max[k])
+            if col_max > max_value:
+                return True
+            if col_max > best_score:
+                best_score = col_max
+                best_j = j
+                if find_end:
+                    for idx in range(stride):
+                        h_best[idx] = h_curr[idx]
+        elif not term_penalty and query_length > 0:
+            if o_curr[last_idx] > row_score:
+                row_score = o_curr[last_idx]
+                row_j = j
+
+        swap = h_prev
+        h_prev = h_curr
+        h_curr = swap
+        swap = o_prev
+        o_prev = o_curr
+        o_curr = swap
+
+    # From here on, the '_prev' buffers contain the last column
+    if local:
+        result[0] = best_score
+        if find_end and best_score > 0:
+            # Find the first row containing the maximum score
+            for i in range(query_length):
+                idx = (i % seg_length) * n_lanes + i // seg_length
+                if h_best[idx] == best_score:
+                    best_i = i
+                    break
+        else:
+            best_j = -1
+    elif term_penalty or query_length == 0:
+        result[0] = h_prev[last_idx] if query_length > 0 \
+                    else _first_row(target_length, gap_open, gap_ext,
+                                    term_penalty, local, neg_inf)
+        best_i = query_length - 1
+        best_j = target_length - 1
+    else:
+        # Trailing gaps in the last column are free
+        # -> find best score in the last column including the first row
+        col_score = _first_row(target_length, gap_open, gap_ext,
+                               term_penalty, local, neg_inf) \
+                    if allow_switch else neg_inf
+        col_i = -1
+        for i in range(query_length):
+            idx = (i % seg_length) * n_lanes + i // seg_length
+            if o_prev[idx] > col_score:
+                col_score = o_prev[idx]
+                col_i = i
+        if row_score >= col_score:
+            result[0] = row_score
+            best_i = query_length - 1
+            best_j = row_j
+        else:
+            result[0] = col_score
+            best_i = col_i
+            best_j = target_length - 1
+    result[1] = best_i
+    result[2] = best_j
+    return False
+
+
+cdef inline int _clamp(int64 value, int neg_inf) noexcept nogil:
+    return <int> value if value > neg_inf else neg_inf
+
+
+cdef inline int _first_row(int j, int32 gap_open, int32 gap_ext,
+                           bint term_penalty, bint local,
+                           int neg_inf) noexcept nogil:
+    """
+    Get the *H* score of the first row of the alignment table in the
+    given column.
+    """
+    if j == 0 or local or not term_penalty:
+        return 0
+    return _clamp(gap_open + <int64> (j - 1) * gap_ext, neg_inf)
+
+
+cdef inline void _shift(LaneType* lanes, int n_lanes,
+                        int neg_inf) noexcept nogil:
+    """
+    Shift the values of the lanes by one lane, i.e. the value of the
+    last lane is moved to the first row of the next segment.
+    """
+    cdef int k
+    for k in range(n_lanes - 1, 0, -1):
+        lanes[k] = lanes[k-1]
+    lanes[0] = <LaneType> neg_inf
@@ -0,0 +1,62 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+Utility functions for internal use in `biotite.sequence.align` package
+"""
+
+__name__ = "biotite.sequence.align"
+__author__ = "Patrick Kunzmann"
+__all__ = ["concatenate_targets"]
+
+import numpy as np
+
+
+def concatenate_targets(targets, target_alphabet):
+    """
+    Check the alphabets of the given target sequences and concatenate
+    their codes into a single array for batch processing.
+
+    Parameters
+    ----------
+    targets : sequence of Sequence
+        The target sequences.
+    target_alphabet : Alphabet
+        The alphabet of the substitution matrix for the targets.
+        It must extend the alphabet of each target.
+
+    Returns
+    -------
+    codes : ndarray, dtype=uint8 or uint16
+        The concatenated sequence codes of all targets.
+    lengths : ndarray, shape=(n,), dtype=int64
+        The length of each target.
+    offsets : ndarray, shape=(n+1,), dtype=int64
+        The start of each target in `codes` and the total length as
+        last element.
+
+    Raises
+    ------
+    ValueError
+        If the alphabet of a target does not fit `target_alphabet`.
+    """
+    # Usually all targets share the same alphabet object
+    # -> check each distinct alphabet object only once
+    checked_alphabets = []
+    for target in targets:
+        alphabet = target.get_alphabet()
+        if any(alphabet is checked for checked in checked_alphabets):
+            continue
+        if not target_alphabet.extends(alphabet):
+            raise ValueError("The target's alphabet does not fit the matrix")
+        checked_alphabets.append(alphabet)
+
+    lengths = np.array([len(target) for target in targets], dtype=np.int64)
+    offsets = np.zeros(len(targets) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if len(targets) > 0:
+        codes = np.concatenate([target.code for target in targets])
+    else:
+        codes = np.zeros(0, dtype=np.uint8)
+    return codes, lengths, offsets
@@ -9,6 +9,7 @@ __all__ = ["Location", "Feature", "Annotation", "AnnotatedSequence"]
 import numbers
 import copy
 import sys
+from bisect import bisect_left, bisect_right
 from enum import Flag, Enum, auto
 import numpy as np
 from .sequence import Sequence
@@ -284,6 +285,17 @@ class Annotation(Copyable):
     contain a not truncated :class:`Feature` only if its last
     base/residue is smaller than the stop value of the slice.
 
+    The features, whose locations are in range of the slice, are found
+    via an interval index over all feature locations, which is created
+    the first time it is required and updated after the
+    :class:`Annotation` was modified.
+    Hence, slicing the same :class:`Annotation` repeatedly, e.g. with a
+    sliding window, takes only logarithmic time with respect to the
+    number of features plus the time required for creating the
+    subannotation.
+    The same index is used by :meth:`get_overlapping_features()` and
+    :meth:`get_nearest_feature()`.
+
     Integers or other index types are not supported. If you want to
     obtain the :class:`Feature` instances from the :class:`Annotation`
     you need to  iterate over it.
@@ -340,6 +352,17 @@ class Annotation(Copyable):
     test5 40-149 >    Defect.MISS_RIGHT|MISS_LEFT
     test2 40-50 >    Defect.MISS_LEFT
     test3 100-130 >    Defect.NONE
+
+    Querying features without truncation:
+
+    >>> annotation = annotation2 + feature1 + feature2
+    >>> for f in annotation.get_overlapping_features(25, 120):
+    ...     print(f.qual["gene"])
+    test1
+    test2
+    test3
+    >>> print(annotation.get_nearest_feature(70).qual["gene"])
+    test2
     """
 
     def __init__(self, features=None):
@@ -347,13 +370,18 @@ class Annotation(Copyable):
             self._features = set()
         else:
             self._features = set(features)
+        # The interval index is created lazily
+        self._index = None
 
     def __repr__(self):
         """Represent Annotation as a string for debugging."""
         return f'Annotation([{", ".join([feat.__repr__() for feat in self._features])}])'
 
     def __copy_create__(self):
-        return Annotation(self._features)
+        clone = Annotation(self._features)
+        # The index is never modified in place and can be shared
+        clone._index = self._index
+        return clone
 
     def get_features(self):
         """
@@ -381,6 +409,7 @@ class Annotation(Copyable):
                 f"not {type(feature).__name__}"
             )
         self._features.add(feature)
+        self._index = None
 
     def get_location_range(self):
         """
@@ -394,17 +423,88 @@ class Annotation(Copyable):
         int : stop
             Exclusive stop location.
         """
-        first = sys.maxsize
-        last = -sys.maxsize
-        for feature in self._features:
-            for loc in feature.locs:
-                if loc.first < first:
-                    first = loc.first
-                if loc.last > last:
-                    last = loc.last
+        index = self._get_index()
+        if len(index) == 0:
+            first = sys.maxsize
+            last = -sys.maxsize
+        else:
+            first = index.firsts[0]
+            last = index.sorted_lasts[-1]
         # Exclusive stop -> +1
         return first, last+1
 
+    def get_overlapping_features(self, start=None, stop=None):
+        """
+        Get all features that have at least one location overlapping
+        the given range.
+
+        In contrast to slicing the :class:`Annotation`, the features
+        are returned as they are, i.e. they are not truncated to the
+        given range.
+
+        Parameters
+        ----------
+        start, stop : int, optional
+            The range of positions, where `stop` is exclusive.
+            If omitted, the range is unbounded at the respective side.
+
+        Returns
+        -------
+        features : list of Feature
+            The overlapping features, ordered by the first position of
+            their first overlapping location.
+        """
+        first, last = _to_inclusive_range(start, stop)
+        index = self._get_index()
+        return index.get_features(index.query(first, last))
+
+    def get_nearest_feature(self, position):
+        """
+        Get the feature with the location closest to the given position.
+
+        Features with a location containing the given position have a
+        distance of zero.
+        Otherwise, the distance is the number of bases/residues between
+        the position and the nearest first or last position of any
+        location of the feature, respectively.
+
+        Parameters
+        ----------
+        position : int
+            The base/residue position.
+
+        Returns
+        -------
+        feature : Feature or None
+            The nearest feature.
+            If multiple features are equally close, the one located
+            more upstream is returned.
+            ``None``, if the annotation is empty.
+        """
+        index = self._get_index()
+        if len(index) == 0:
+            return None
+
+        loc_indices = index.query(position, position)
+        if len(loc_indices) > 0:
+            return index.get_features(loc_indices[:1])[0]
+
+        # No location contains the position
+        # -> nearest location is either the one with the highest last
+        # position before or the lowest first position after 'position'
+        left_i = bisect_left(index.sorted_lasts, position) - 1
+        right_i = bisect_right(index.firsts, position)
+        if left_i < 0:
+            return index.get_features([right_i])[0]
+        if right_i >= len(index):
+            return index.get_features([index.last_order[left_i]])[0]
+        left_distance = position - index.sorted_lasts[left_i]
+        right_distance = index.firsts[right_i] - position
+        if left_distance <= right_distance:
+            return index.get_features([index.last_order[left_i]])[0]
+        else:
+            return index.get_features([right_i])[0]
+
     def del_feature(self, feature):
         """
         Delete a feature from the annotation.
@@ -420,6 +520,7 @@ class Annotation(Copyable):
             If the feature is not in the annotation
         """
         self._features.remove(feature)
+        self._index = None
 
     def __add__(self, item):
         if isinstance(item, Annotation):
@@ -442,22 +543,19 @@ class Annotation(Copyable):
                 f"Only 'Feature' and 'Annotation' objects are supported, "
                 f"not {type(item).__name__}"
             )
+        self._index = None
         return self
 
     def __getitem__(self, index):
         if isinstance(index, slice):
-            # If no start or stop index is given, include all
-            if index.start is None:
-                i_first = -sys.maxsize
-            else:
-                i_first = index.start
-            if index.stop is None:
-                i_last = sys.maxsize
-            else:
-                i_last = index.stop - 1
+            i_first, i_last = _to_inclusive_range(index.start, index.stop)
             
             sub_annot = Annotation()
-            for feature in self:
+            # Only iterate over features that are at least partly
+            # in the given location range
+            for feature in self.get_overlapping_features(
+                index.start, index.stop
+            ):
                 locs_in_scope = []
                 for loc in feature.locs:
                     # Always true for maxsize values
@@ -514,6 +612,135 @@ class Annotation(Copyable):
     def __len__(self):
         return len(self._features)
 
+    def _get_index(self):
+        if self._index is None:
+            self._index = _LocationIndex(self._features)
+        return self._index
+
+
+def _to_inclusive_range(start, stop):
+    """
+    Convert a range with exclusive stop into inclusive first and last
+    positions.
+    If no start or stop is given, the range is unbounded at this side.
+    """
+    first = -sys.maxsize if start is None else start
+    last = sys.maxsize if stop is None else stop - 1
+    return first, last
+
+
+class _LocationIndex:
+    """
+    An interval index over the locations of a set of features.
+
+    The locations are sorted by their first position and indexed by an
+    implicit augmented interval tree, as used by *cgranges*:
+    The sorted locations form an in-order binary tree, where each node
+    additionally stores the maximum last position within its subtree.
+    This allows finding all *k* locations overlapping a range in
+    *O(log n + k)* time.
+    The locations are additionally sorted by their last position for
+    finding the nearest location upstream of a position.
+
+    The index is not updated, when features are added or removed, but
+    recreated instead.
+    """
+
+    def __init__(self, features):
+        self._features = list(features)
+        firsts = []
+        lasts = []
+        feature_indices = []
+        for i, feature in enumerate(self._features):
+            for loc in feature.locs:
+                firsts.append(loc.first)
+                lasts.append(loc.last)
+                feature_indices.append(i)
+        firsts = np.array(firsts, dtype=np.int64)
+        lasts = np.array(lasts, dtype=np.int64)
+        feature_indices = np.array(feature_indices, dtype=np.int64)
+        order = np.argsort(firsts, kind="stable")
+        firsts = firsts[order]
+        lasts = lasts[order]
+        feature_indices = feature_indices[order]
+        last_order = np.argsort(lasts, kind="stable")
+        n_locs = len(firsts)
+
+        # Pad the locations to a perfect binary tree of size 2^m - 1
+        # The padding locations never overlap any range
+        n_levels = max(n_locs.bit_length(), 1)
+        tree_size = 2**n_levels - 1
+        tree_firsts = np.full(tree_size, np.iinfo(np.int64).max)
+        tree_firsts[:n_locs] = firsts
+        tree_lasts = np.full(tree_size, np.iinfo(np.int64).min)
+        tree_lasts[:n_locs] = lasts
+        max_lasts = tree_lasts.copy()
+        # The leaves (level 0) are the nodes with even index,
+        # the nodes of level k have 'k' trailing one bits
+        for level in range(1, n_levels):
+            nodes = np.arange(2**level - 1, tree_size, 2**(level+1))
+            child_offset = 2**(level-1)
+            max_lasts[nodes] = np.maximum(
+                max_lasts[nodes],
+                np.maximum(
+                    max_lasts[nodes - child_offset],
+                    max_lasts[nodes + child_offset]
+                )
+            )
+
+        # Python lists are faster for accessing single elements
+        self.firsts = firsts.tolist()
+        self.sorted_lasts = lasts[last_order].tolist()
+        self.last_order = last_order.tolist()
+        self._feature_indices = feature_indices.tolist()
+        self._tree_firsts = tree_firsts.tolist()
+        self._tree_lasts = tree_lasts.tolist()
+        self._max_lasts = max_lasts.tolist()
+        self._root_level = n_levels - 1
+
+    def __len__(self):
+        return len(self.firsts)
+
+    def query(self, first, last):
+        """
+        Get the indices of all locations overlapping the given
+        inclusive range, sorted by the first position of the locations.
+        """
+        tree_firsts = self._tree_firsts
+        tree_lasts = self._tree_lasts
+        max_lasts = self._max_lasts
+        hits = []
+        # Stack of (node, level) pairs
+        stack = [(2**self._root_level - 1, self._root_level)]
+        while stack:
+            node, level = stack.pop()
+            if max_lasts[node] < first:
+                # No location in this subtree reaches the range
+                continue
+            if level == 0:
+                if tree_firsts[node] <= last:
+                    hits.append(node)
+                continue
+            child_offset = 1 << (level - 1)
+            stack.append((node - child_offset, level - 1))
+            # All locations in the right subtree start after this node
+            if tree_firsts[node] <= last:
+                if tree_lasts[node] >= first:
+                    hits.append(node)
+                stack.append((node + child_offset, level - 1))
+        hits.sort()
+        return hits
+
+    def get_features(self, loc_indices):
+        """
+        Get the unique features belonging to the given location
+        indices, in the order of the locations.
+        """
+        feature_indices = dict.fromkeys(
+            self._feature_indices[i] for i in loc_indices
+        )
+        return [self._features[i] for i in feature_indices]
+
 
 class AnnotatedSequence(Copyable):
     """
@@ -13,10 +13,15 @@ values.
 
 Furthermore, the package contains convenience functions for
 getting/setting directly :class:`Sequence` objects, rather than strings.
+
+For large files, e.g. reference genomes, the :class:`IndexedFastaFile`
+provides random access to sequence regions based on a
+*samtools*-compatible :class:`FastaIndex`.
 """
 
 __name__ = "biotite.sequence.io.fasta"
 __author__ = "Patrick Kunzmann"
 
 from .file import *
-from .convert import *
\ No newline at end of file
+from .convert import *
+from .index import *
\ No newline at end of file
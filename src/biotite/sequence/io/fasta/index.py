@@ -0,0 +1,420 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+__name__ = "biotite.sequence.io.fasta"
+__author__ = "Patrick Kunzmann"
+__all__ = ["FastaIndex", "IndexedFastaFile"]
+
+import mmap
+import os
+from collections import OrderedDict
+from collections.abc import Mapping
+import numpy as np
+from ....file import InvalidFileError, is_open_compatible
+from .convert import _convert_to_sequence
+
+
+_NEWLINE = ord("\n")
+_CARRIAGE_RETURN = ord("\r")
+
+
+class FastaIndex(Mapping):
+    """
+    An index of a FASTA file, that allows random access to the
+    sequences in the file, compatible to the *samtools* ``.fai``
+    format.
+
+    For each sequence the index stores
+
+        - the sequence length,
+        - the byte offset of the first sequence symbol in the file,
+        - the number of sequence symbols per line and
+        - the number of bytes per line, including the line break.
+
+    This class is used in a dictionary like manner, implementing the
+    :class:`Mapping` interface:
+    The sequence names are the keys and the tuples containing the
+    values listed above are the corresponding values.
+    As in *samtools*, the name of a sequence is the part of its header
+    line up to the first whitespace character.
+
+    An index is either built from a FASTA file via :meth:`build()`
+    or read from an existing ``.fai`` file via :meth:`read()`.
+
+    Examples
+    --------
+
+    >>> import os.path
+    >>> file_name = os.path.join(path_to_directory, "indexed.fasta")
+    >>> FastaFile.write_iter(
+    ...     file_name, [("seq1", "ACGTACGT"), ("seq2 description", "TTTT")],
+    ...     chars_per_line=3
+    ... )
+    >>> index = FastaIndex.build(file_name)
+    >>> for name, (length, offset, line_bases, line_width) in index.items():
+    ...     print(name, length, offset, line_bases, line_width)
+    seq1 8 6 3 4
+    seq2 4 35 3 4
+    >>> index.write(file_name + ".fai")
+    """
+
+    def __init__(self):
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def build(fasta_file):
+        """
+        Build the index of a FASTA file.
+
+        All sequence lines of an entry, except the last one, must have
+        the same length.
+
+        Parameters
+        ----------
+        fasta_file : str or file-like object
+            The FASTA file to be indexed.
+            Alternatively a file path can be supplied.
+            A file object must be opened in *binary* mode.
+            Compressed files are not supported.
+
+        Returns
+        -------
+        index : FastaIndex
+            The index of the FASTA file.
+        """
+        if is_open_compatible(fasta_file):
+            with open(fasta_file, "rb") as f:
+                return FastaIndex._build(f)
+        else:
+            return FastaIndex._build(fasta_file)
+
+    @staticmethod
+    def _build(file):
+        index = FastaIndex()
+        name = None
+        # The current byte position in the file
+        position = 0
+        for line in file:
+            line_width = len(line)
+            line = line.rstrip(b"\r\n")
+            if line.startswith(b">"):
+                if name is not None:
+                    index._add_entry(
+                        name, seq_length, seq_offset,
+                        entry_line_bases, entry_line_width
+                    )
+                header = line[1:].split(maxsplit=1)
+                if len(header) == 0:
+                    raise InvalidFileError(
+                        f"Header line at byte {position} has no name"
+                    )
+                name = header[0].decode("ascii")
+                seq_offset = position + line_width
+                seq_length = 0
+                entry_line_bases = 0
+                entry_line_width = 0
+                # True, if the last sequence line of the entry is
+                # already passed, i.e. a line was shorter than the
+                # preceding ones
+                is_terminated = False
+            else:
+                line_bases = len(line)
+                if name is None:
+                    if line_bases != 0:
+                        raise InvalidFileError(
+                            "File does not start with a header line"
+                        )
+                elif line_bases != 0:
+                    if is_terminated:
+                        raise InvalidFileError(
+                            f"Entry '{name}' has sequence lines of "
+                            f"different length"
+                        )
+                    if entry_line_bases == 0:
+                        entry_line_bases = line_bases
+                        entry_line_width = line_width
+                    elif line_bases < entry_line_bases:
+                        is_terminated = True
+                    elif line_bases > entry_line_bases or (
+                        line_width != entry_line_width
+                        # The final line may have no line break
+                        and line_width != line_bases
+                    ):
+                        raise InvalidFileError(
+                            f"Entry '{name}' has sequence lines of "
+                            f"different length"
+                        )
+                    seq_length += line_bases
+                else:
+                    # An empty line can only occur after the last
+                    # sequence line of an entry
+                    is_terminated = True
+            position += line_width
+        if name is not None:
+            index._add_entry(
+                name, seq_length, seq_offset,
+                entry_line_bases, entry_line_width
+            )
+        return index
+
+    @staticmethod
+    def read(file):
+        """
+        Read a FASTA index (``.fai``) file.
+
+        Parameters
+        ----------
+        file : str or file-like object
+            The index file to be read.
+            Alternatively a file path can be supplied.
+
+        Returns
+        -------
+        index : FastaIndex
+            The parsed index.
+        """
+        if is_open_compatible(file):
+            with open(file, "r") as f:
+                lines = f.read().splitlines()
+        else:
+            lines = file.read().splitlines()
+        index = FastaIndex()
+        for line in lines:
+            if len(line.strip()) == 0:
+                continue
+            columns = line.split("\t")
+            if len(columns) < 5:
+                raise InvalidFileError(
+                    f"Expected at least 5 columns in index line, "
+                    f"but got {len(columns)}"
+                )
+            try:
+                values = [int(val) for val in columns[1:5]]
+            except ValueError:
+                raise InvalidFileError(
+                    f"Index line '{line}' contains non-integer values"
+                )
+            index._add_entry(columns[0], *values)
+        return index
+
+    def write(self, file):
+        """
+        Write the index into a FASTA index (``.fai``) file.
+
+        Parameters
+        ----------
+        file : str or file-like object
+            The index file to be written to.
+            Alternatively a file path can be supplied.
+        """
+        content = "".join([
+            "\t".join([name] + [str(val) for val in entry]) + "\n"
+            for name, entry in self._entries.items()
+        ])
+        if is_open_compatible(file):
+            with open(file, "w") as f:
+                f.write(content)
+        else:
+            file.write(content)
+
+    def _add_entry(self, name, length, offset, line_bases, line_width):
+        if name in self._entries:
+            raise InvalidFileError(f"Duplicate sequence name '{name}'")
+        self._entries[name] = (length, offset, line_bases, line_width)
+
+    def __getitem__(self, name):
+        return self._entries[name]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return self._entries.__iter__()
+
+    def __contains__(self, name):
+        return name in self._entries
+
+
+class IndexedFastaFile(Mapping):
+    """
+    Random access to the sequences of a large FASTA file, based on a
+    :class:`FastaIndex`.
+
+    In contrast to :class:`FastaFile`, the file is not parsed as a
+    whole.
+    Instead the file is memory-mapped and only the bytes of a requested
+    sequence region are read, whose position in the file is computed
+    from the index.
+
+    This class is used in a dictionary like manner, implementing the
+    :class:`Mapping` interface:
+    The sequence names (the header up to the first whitespace character)
+    are the keys and strings containing the complete sequences are the
+    corresponding values.
+    Sections of a sequence are obtained via :meth:`get_region()` and
+    :meth:`get_sequence()`.
+
+    The file is closed via :meth:`close()` or when used as context
+    manager.
+
+    Parameters
+    ----------
+    file_name : str or PathLike
+        The path of the FASTA file.
+        Compressed files are not supported.
+    index : FastaIndex or str or PathLike, optional
+        The index of the FASTA file or the path to an index file.
+        By default, the index is read from the ``.fai`` file next to
+        the FASTA file, if existing, or it is built otherwise.
+
+    Examples
+    --------
+
+    >>> import os.path
+    >>> file_name = os.path.join(path_to_directory, "random_access.fasta")
+    >>> FastaFile.write_iter(
+    ...     file_name, [("seq1", "ACGTACGT"), ("seq2", "TTTT")],
+    ...     chars_per_line=3
+    ... )
+    >>> with IndexedFastaFile(file_name) as file:
+    ...     print(file["seq2"])
+    ...     print(file.get_region("seq1", 2, 7))
+    ...     print(repr(file.get_sequence("seq1", 2, 7)))
+    TTTT
+    GTACG
+    NucleotideSequence("GTACG", ambiguous=False)
+    """
+
+    def __init__(self, file_name, index=None):
+        if index is None:
+            index_file_name = str(file_name) + ".fai"
+            if os.path.isfile(index_file_name):
+                index = FastaIndex.read(index_file_name)
+            else:
+                index = FastaIndex.build(file_name)
+        elif not isinstance(index, FastaIndex):
+            index = FastaIndex.read(index)
+        self._index = index
+        self._file = open(file_name, "rb")
+        if os.fstat(self._file.fileno()).st_size == 0:
+            self._file.close()
+            raise InvalidFileError("File is empty")
+        self._mmap = mmap.mmap(
+            self._file.fileno(), 0, access=mmap.ACCESS_READ
+        )
+
+    @property
+    def index(self):
+        """
+        The index of the FASTA file.
+
+        Returns
+        -------
+        index : FastaIndex
+            The index.
+        """
+        return self._index
+
+    def get_region(self, name, start=None, stop=None):
+        """
+        Get a section of a sequence in the file as string.
+
+        Parameters
+        ----------
+        name : str
+            The name of the sequence.
+        start, stop : int, optional
+            The 0-based sequence positions, where the region starts
+            (inclusive) and stops (exclusive), as in Python slices.
+            Hence, the *samtools* region ``name:101-200`` corresponds
+            to ``start=100`` and ``stop=200``.
+            By default, the region starts at the beginning and stops at
+            the end of the sequence, respectively.
+
+        Returns
+        -------
+        seq_str : str
+            The sequence region.
+        """
+        length, offset, line_bases, line_width = self._index[name]
+        if start is None:
+            start = 0
+        if stop is None:
+            stop = length
+        if start < 0 or stop > length or start > stop:
+            raise IndexError(
+                f"Region {start}-{stop} is invalid for sequence '{name}' "
+                f"of length {length}"
+            )
+        if start == stop:
+            return ""
+        first_byte = offset + _byte_offset(start, line_bases, line_width)
+        stop_byte = offset + _byte_offset(stop-1, line_bases, line_width) + 1
+        region = np.frombuffer(
+            self._mmap, dtype=np.uint8,
+            count=stop_byte - first_byte, offset=first_byte
+        )
+        # Remove line breaks
+        region = region[(region != _NEWLINE) & (region != _CARRIAGE_RETURN)]
+        return region.tobytes().decode("ascii")
+
+    def get_sequence(self, name, start=None, stop=None, seq_type=None):
+        """
+        Get a section of a sequence in the file as :class:`Sequence`.
+
+        Parameters
+        ----------
+        name : str
+            The name of the sequence.
+        start, stop : int, optional
+            The 0-based sequence positions, where the region starts
+            (inclusive) and stops (exclusive), as in Python slices.
+            By default, the region starts at the beginning and stops at
+            the end of the sequence, respectively.
+        seq_type : Class, optional
+            The :class:`Sequence` subclass contained in the file.
+            If not set, biotite will attempt to automatically detect
+            whether a nucleotide or protein sequence is present.
+
+        Returns
+        -------
+        sequence : NucleotideSequence or ProteinSequence
+            The requested sequence region.
+        """
+        return _convert_to_sequence(
+            self.get_region(name, start, stop), seq_type
+        )
+
+    def close(self):
+        """
+        Close the underlying file.
+        """
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getitem__(self, name):
+        return self.get_region(name)
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        return self._index.__iter__()
+
+    def __contains__(self, name):
+        return name in self._index
+
+
+def _byte_offset(position, line_bases, line_width):
+    """
+    Get the byte offset of the given sequence position relative to
+    the start of the sequence.
+    """
+    return (position // line_bases) * line_width + position % line_bases
@@ -10,10 +10,13 @@ from numbers import Integral
 from collections import OrderedDict
 from collections.abc import MutableMapping
 import numpy as np
-from ....file import TextFile, InvalidFileError, wrap_string
+from ....file import (
+    TextFile, InvalidFileError, wrap_string,
+    is_open_compatible, is_binary, open_file
+)
 from ...seqtypes import NucleotideSequence
 
-__all__ = ["FastqFile"]
+__all__ = ["FastqFile", "FastqBatch"]
 
 
 _OFFSETS = {
@@ -437,6 +440,76 @@ class FastqFile(TextFile, MutableMapping):
                 raise InvalidFileError(f"FASTQ file is invalid")
     
 
+    @staticmethod
+    def read_batches(file, offset, chunk_size=2**24):
+        """
+        Create an iterator over batches of entries in the given FASTQ
+        file.
+
+        In contrast to :meth:`read_iter()`, the file is read in large
+        chunks of bytes and the entries in each chunk are parsed at
+        once into a :class:`FastqBatch`, without creating Python
+        objects for the individual sequences and scores.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be read.
+            Alternatively a file path can be supplied.
+            A file object must be opened in *binary* mode.
+        offset : int or {'Sanger', 'Solexa', 'Illumina-1.3', 'Illumina-1.5', 'Illumina-1.8'}
+            This value that is added to the quality score to obtain the
+            ASCII code.
+            Can either be directly the value, or a string that indicates
+            the score format.
+        chunk_size : int, optional
+            The number of bytes that are read from the file for each
+            batch.
+            A batch contains all entries that are completed within the
+            chunk.
+
+        Yields
+        ------
+        batch : FastqBatch
+            The entries in the current chunk.
+
+        Notes
+        -----
+        Only the common FASTQ layout with exactly one line per
+        sequence and score string is supported, i.e. this method
+        cannot read files written with `chars_per_line`.
+
+        Examples
+        --------
+
+        >>> import os.path
+        >>> file_name = os.path.join(path_to_directory, "batches.fastq")
+        >>> FastqFile.write_iter(
+        ...     file_name,
+        ...     [
+        ...         ("seq1", ("ATACT", [0, 3, 10, 7, 12])),
+        ...         ("seq2", ("TTGTAGG", [15, 13, 24, 21, 28, 38, 35])),
+        ...     ],
+        ...     offset="Sanger"
+        ... )
+        >>> for batch in FastqFile.read_batches(file_name, offset="Sanger"):
+        ...     print(batch.identifiers)
+        ...     print(batch.offsets)
+        ...     print(batch.get_sequence_code())
+        ['seq1' 'seq2']
+        [ 0  5 12]
+        [0 3 0 1 3 3 3 2 3 0 2 2]
+        """
+        offset = _convert_offset(offset)
+        if is_open_compatible(file):
+            with open_file(file, "rb") as f:
+                yield from _read_batches(f, offset, chunk_size)
+        else:
+            if not is_binary(file):
+                raise TypeError("A file opened in 'binary' mode is required")
+            yield from _read_batches(file, offset, chunk_size)
+    
+
     @staticmethod
     def write_iter(file, items, offset, chars_per_line=None):
         """
@@ -515,6 +588,186 @@ class FastqFile(TextFile, MutableMapping):
         TextFile.write_iter(file, line_generator())
 
 
+class FastqBatch:
+    """
+    A batch of entries from a FASTQ file.
+
+    The sequences and scores of all entries in the batch are
+    concatenated into a single array, respectively.
+    The sequence and scores of the *i*-th entry are located at
+    ``offsets[i]:offsets[i+1]`` in these arrays.
+
+    Objects of this class are created by
+    :meth:`FastqFile.read_batches()`.
+
+    Parameters
+    ----------
+    identifiers : ndarray, shape=(n,), dtype=str
+        The identifiers of the entries.
+    sequences : ndarray, shape=(k,), dtype=uint8
+        The concatenated sequences as ASCII codes.
+    scores : ndarray, shape=(k,), dtype=int8
+        The concatenated quality scores.
+    offsets : ndarray, shape=(n+1,), dtype=int64
+        The start of each entry in `sequences` and `scores` and the
+        total length as last element.
+
+    Attributes
+    ----------
+    identifiers, sequences, scores, offsets
+        The same as the parameters.
+    """
+
+    def __init__(self, identifiers, sequences, scores, offsets):
+        self.identifiers = identifiers
+        self.sequences = sequences
+        self.scores = scores
+        self.offsets = offsets
+
+    def get_sequence_code(self, alphabet=NucleotideSequence.alphabet_amb):
+        """
+        Get the sequence code of the concatenated sequences.
+
+        The code can be split into the sequences of the individual
+        entries by means of :attr:`offsets`.
+
+        Parameters
+        ----------
+        alphabet : LetterAlphabet, optional
+            The alphabet used for encoding the sequences.
+            By default, the alphabet of ambiguous
+            :class:`NucleotideSequence` objects is used.
+
+        Returns
+        -------
+        code : ndarray, shape=(k,), dtype=uint8
+            The sequence code.
+        """
+        # Sequences may contain lower case letters
+        is_lower = (self.sequences >= ord("a")) & (self.sequences <= ord("z"))
+        upper_sequences = np.where(
+            is_lower, self.sequences - (ord("a") - ord("A")), self.sequences
+        ).astype(np.uint8)
+        return alphabet.encode_multiple(upper_sequences.tobytes())
+
+    def __len__(self):
+        return len(self.identifiers)
+
+    def __getitem__(self, index):
+        """
+        Get the entry with the given index in the same form as
+        :meth:`FastqFile.read_iter()` yields it.
+        """
+        start = self.offsets[index]
+        stop = self.offsets[index+1]
+        return self.identifiers[index], (
+            self.sequences[start:stop].tobytes().decode("ascii"),
+            self.scores[start:stop]
+        )
+
+
+def _read_batches(file, offset, chunk_size):
+    """
+    Read the given binary file chunk-wise and parse the entries in
+    each chunk into a :class:`FastqBatch`.
+    """
+    remainder = b""
+    while True:
+        chunk = file.read(chunk_size)
+        is_last_chunk = len(chunk) == 0
+        buffer = np.frombuffer(remainder + chunk, dtype=np.uint8)
+        if len(buffer) == 0:
+            return
+        batch, n_parsed_bytes = _parse_batch(buffer, offset, is_last_chunk)
+        # Incomplete entries are parsed with the next chunk
+        remainder = buffer[n_parsed_bytes:].tobytes()
+        if len(batch) > 0:
+            yield batch
+        if is_last_chunk:
+            if len(remainder.strip()) != 0:
+                raise InvalidFileError(
+                    "The last entry in the file is incomplete"
+                )
+            return
+
+
+def _parse_batch(buffer, offset, is_last_chunk):
+    """
+    Parse all complete entries in the given buffer.
+
+    Returns
+    -------
+    batch : FastqBatch
+        The parsed entries.
+    n_parsed_bytes : int
+        The number of bytes from the beginning of the buffer that were
+        parsed.
+    """
+    line_ends = np.flatnonzero(buffer == ord("\n"))
+    if is_last_chunk:
+        # The last line may not be terminated with a line break
+        line_ends = np.append(line_ends, len(buffer))
+    line_starts = np.concatenate(([0], line_ends[:-1] + 1))
+    # Remove carriage return of Windows line endings
+    line_stops = line_ends.copy()
+    has_carriage_return = (line_stops > line_starts) & (
+        buffer[np.maximum(line_stops - 1, 0)] == ord("\r")
+    )
+    line_stops[has_carriage_return] -= 1
+    # Ignore empty lines
+    is_non_empty = line_stops > line_starts
+    line_starts = line_starts[is_non_empty]
+    line_stops = line_stops[is_non_empty]
+    line_ends = line_ends[is_non_empty]
+
+    # Each entry consists of four lines
+    n_entries = len(line_starts) // 4
+    n_parsed_bytes = line_ends[4*n_entries - 1] + 1 if n_entries > 0 else 0
+    id_starts,  id_stops  = line_starts[0 : 4*n_entries : 4], \
+                            line_stops [0 : 4*n_entries : 4]
+    seq_starts, seq_stops = line_starts[1 : 4*n_entries : 4], \
+                            line_stops [1 : 4*n_entries : 4]
+    sep_starts            = line_starts[2 : 4*n_entries : 4]
+    scr_starts, scr_stops = line_starts[3 : 4*n_entries : 4], \
+                            line_stops [3 : 4*n_entries : 4]
+    if (buffer[id_starts] != ord("@")).any() \
+       or (buffer[sep_starts] != ord("+")).any():
+            raise InvalidFileError(
+                "FASTQ file is invalid or has multi-line entries"
+            )
+    seq_lengths = seq_stops - seq_starts
+    if (seq_lengths != scr_stops - scr_starts).any():
+        raise InvalidFileError(
+            "The amount of scores is not equal to the sequence length"
+        )
+
+    sequences = _concatenate_ranges(buffer, seq_starts, seq_stops)
+    scores = _concatenate_ranges(buffer, scr_starts, scr_stops) \
+             .astype(np.int8)
+    scores -= offset
+    offsets = np.zeros(n_entries + 1, dtype=np.int64)
+    np.cumsum(seq_lengths, out=offsets[1:])
+    # Join the identifiers (without '@') with line breaks,
+    # to decode them at once
+    id_bytes = _concatenate_ranges(buffer, id_starts + 1, id_stops + 1)
+    id_bytes[np.cumsum(id_stops - id_starts) - 1] = ord("\n")
+    identifiers = np.array(
+        id_bytes.tobytes().decode().split("\n")[:-1], dtype=str
+    )
+    return FastqBatch(identifiers, sequences, scores, offsets), n_parsed_bytes
+
+
+def _concatenate_ranges(buffer, starts, stops):
+    """
+    Concatenate the given non-overlapping ranges of the buffer.
+    """
+    lengths = stops - starts
+    range_offsets = np.cumsum(lengths) - lengths
+    indices = np.arange(np.sum(lengths)) \
+              + np.repeat(starts - range_offsets, lengths)
+    return buffer[indices]
+
+
 def _score_str_to_scores(score_str, offset):
     """
     Convert an ASCII string into actual score values.
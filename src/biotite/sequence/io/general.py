@@ -19,6 +19,7 @@ from collections import OrderedDict
 import numpy as np
 from ..seqtypes import NucleotideSequence, ProteinSequence
 from ..alphabet import Alphabet
+from ...file import remove_compression_suffix
 
 
 def load_sequence(file_path):
@@ -28,6 +29,8 @@ def load_sequence(file_path):
     
     Internally this function uses a :class:`File` object, based on the
     file extension.
+    Files compressed with *gzip*, *bzip2* or *xz*
+    (e.g. ``sequences.fasta.gz``) are decompressed on the fly.
     
     Parameters
     ----------
@@ -39,8 +42,8 @@ def load_sequence(file_path):
     sequence : Sequence
         The first sequence in the file.
     """
-    # We only need the suffix here
-    filename, suffix = os.path.splitext(file_path)
+    # We only need the suffix of the uncompressed file here
+    filename, suffix = os.path.splitext(remove_compression_suffix(file_path))
     if suffix in [".fasta", ".fa", ".mpfa", ".fna", ".fsa"]:
         from .fasta import FastaFile, get_sequence
         file = FastaFile.read(file_path)
@@ -71,6 +74,8 @@ def save_sequence(file_path, sequence):
     
     Internally this function uses a :class:`File` object, based on the
     given file extension.
+    If the file extension is followed by ``.gz``, ``.bz2`` or ``.xz``,
+    the file is compressed accordingly.
     
     Parameters
     ----------
@@ -79,8 +84,8 @@ def save_sequence(file_path, sequence):
     sequence : Sequence
         The sequence to be saved.
     """
-    # We only need the suffix here
-    filename, suffix = os.path.splitext(file_path)
+    # We only need the suffix of the uncompressed file here
+    filename, suffix = os.path.splitext(remove_compression_suffix(file_path))
     if suffix in [".fasta", ".fa", ".mpfa", ".fna", ".fsa"]:
         from .fasta import FastaFile, set_sequence
         file = FastaFile()
@@ -112,6 +117,8 @@ def load_sequences(file_path):
     
     Internally this function uses a :class:`File` object, based on the
     file extension.
+    Files compressed with *gzip*, *bzip2* or *xz*
+    (e.g. ``sequences.fasta.gz``) are decompressed on the fly.
     
     Parameters
     ----------
@@ -125,8 +132,8 @@ def load_sequences(file_path):
         This dictionary maps each header name to
         the respective sequence. 
     """
-    # We only need the suffix here
-    filename, suffix = os.path.splitext(file_path)
+    # We only need the suffix of the uncompressed file here
+    filename, suffix = os.path.splitext(remove_compression_suffix(file_path))
     if suffix in [".fasta", ".fa", ".mpfa", ".fna", ".fsa"]:
         from .fasta import FastaFile, get_sequences
         file = FastaFile.read(file_path)
@@ -157,6 +164,8 @@ def save_sequences(file_path, sequences):
     
     Internally this function uses a :class:`File` object, based on the
     given file extension.
+    If the file extension is followed by ``.gz``, ``.bz2`` or ``.xz``,
+    the file is compressed accordingly.
     
     Parameters
     ----------
@@ -166,8 +175,8 @@ def save_sequences(file_path, sequences):
         The sequences to be saved. The dictionary maps a header name
         to asequence.
     """
-    # We only need the suffix here
-    filename, suffix = os.path.splitext(file_path)
+    # We only need the suffix of the uncompressed file here
+    filename, suffix = os.path.splitext(remove_compression_suffix(file_path))
     if suffix in [".fasta", ".fa", ".mpfa", ".fna", ".fsa"]:
         from .fasta import FastaFile, set_sequences
         file = FastaFile()
@@ -9,6 +9,8 @@ This subpackage is used for reading and writing sequence features in the
 It provides the :class:`GFFFile` class, a low-level line-based
 interface to this format, and high-level functions for extracting
 :class:`Annotation` objects.
+Large files can be read in chunks into column-wise :class:`GFFTable`
+objects via :meth:`GFFFile.read_tables()`.
 
 .. note: This package cannot create hierarchical data structures from
    GFF 3 files. This means, that you cannot directly access the the
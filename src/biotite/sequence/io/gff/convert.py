@@ -25,8 +25,11 @@ def get_annotation(gff_file):
     
     Parameters
     ----------
-    gff_file : GFFFile
+    gff_file : GFFFile or GFFTable
         The file tro extract the :class:`Annotation` object from.
+        Alternatively, a :class:`GFFTable` can be given, e.g. to
+        extract only the entries selected via
+        :meth:`GFFFile.read_tables()`.
     
     Returns
     -------
@@ -4,13 +4,17 @@
 
 __name__ = "biotite.sequence.io.gff"
 __author__ = "Patrick Kunzmann"
-__all__ = ["GFFFile"]
+__all__ = ["GFFFile", "GFFTable"]
 
 import copy
 import string
+from numbers import Integral
 from urllib.parse import quote, unquote
 import warnings
-from ....file import TextFile, InvalidFileError
+import numpy as np
+from ....file import (
+    TextFile, InvalidFileError, is_open_compatible, is_binary, open_file
+)
 from ...annotation import Location
 
 
@@ -153,6 +157,100 @@ class GFFFile(TextFile):
         file._index_entries()
         return file
     
+    @staticmethod
+    def read_tables(file, seqids=None, types=None, chunk_size=2**24):
+        """
+        Create an iterator over column-wise tables of entries in the
+        given GFF3 file.
+
+        In contrast to :meth:`read()`, the file is read in large chunks
+        of bytes and the entries in each chunk are parsed at once into
+        a :class:`GFFTable`, without keeping the lines of the file or
+        creating Python objects for the individual entries.
+        Entries can be filtered by their *seqid* and *type* already
+        during parsing, so that the remaining columns are only parsed
+        for the selected entries.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be read.
+            Alternatively a file path can be supplied.
+            A file object must be opened in *binary* mode.
+        seqids, types : iterable object of str, optional
+            If given, only entries with one of the given *seqid* or
+            *type* values, respectively, are included in the tables.
+        chunk_size : int, optional
+            The number of bytes that are read from the file for each
+            table.
+            A table contains all selected entries whose lines are
+            completed within the chunk.
+
+        Returns
+        -------
+        tables : generator of GFFTable
+            The selected entries in each chunk.
+            The codes of the categorical columns are consistent across
+            all tables from the same file.
+
+        Notes
+        -----
+        Like :meth:`read()`, the content after a ``##FASTA`` directive
+        is ignored.
+
+        Examples
+        --------
+
+        >>> import os.path
+        >>> file_name = os.path.join(path_to_sequences, "sc_chrom1.gff3")
+        >>> tables = GFFFile.read_tables(file_name, types=["gene"])
+        >>> table = GFFTable.concatenate(tables)
+        >>> print(len(table))
+        100
+        >>> print(table.types)
+        ['gene']
+        >>> print(table.starts[:5])
+        [ 1807  2480  7235 11565 12046]
+        >>> print(table.get_attributes(0)["Name"])
+        PAU8
+        """
+        seqids = None if seqids is None else set(seqids)
+        types = None if types is None else set(types)
+        if is_open_compatible(file):
+            # Open the file here, so that errors are raised immediately
+            # instead of on the first iteration
+            return _read_tables(
+                open_file(file, "rb"), seqids, types, chunk_size,
+                close_file=True
+            )
+        else:
+            if not is_binary(file):
+                raise TypeError("A file opened in 'binary' mode is required")
+            return _read_tables(file, seqids, types, chunk_size)
+
+    @staticmethod
+    def write_tables(file, tables):
+        """
+        Write the entries of the given tables into a GFF3 file.
+
+        In contrast to :meth:`write()`, the entries are written
+        directly to the file without storing the lines in an
+        intermediate :class:`GFFFile`.
+
+        Parameters
+        ----------
+        file : file-like object or str
+            The file to be written to.
+            Alternatively a file path can be supplied.
+        tables : iterable object of GFFTable
+            The tables whose entries are written.
+        """
+        def line_generator():
+            yield "##gff-version 3"
+            for table in tables:
+                yield from table._create_lines()
+        TextFile.write_iter(file, line_generator())
+
     def insert(self, index, seqid, source, type, start, end,
                score, strand, phase, attributes=None):
         """
@@ -431,4 +529,524 @@ class GFFFile(TextFile):
                 )
             key, val = compounds
             attrib_dict[unquote(key)] = unquote(val)
-        return attrib_dict
\ No newline at end of file
+        return attrib_dict
+
+
+class GFFTable:
+    """
+    A column-wise table of entries from a GFF3 file.
+
+    The *seqid*, *source* and *type* columns are categorical:
+    Each of these columns is represented by the array of distinct
+    values and an array of codes, that point to the value of each
+    entry.
+    The *attributes* of all entries are stored as concatenated raw
+    bytes, that are only parsed, when requested via
+    :meth:`get_attributes()`.
+    The raw attributes of the *i*-th entry are located at
+    ``attribute_offsets[i]:attribute_offsets[i+1]``.
+
+    Objects of this class are usually created by
+    :meth:`GFFFile.read_tables()`.
+    Indexing a table with an integer gives the entry in the same form
+    as indexing a :class:`GFFFile`.
+    Hence, a table can be given to :func:`get_annotation()` to convert
+    only its entries into an :class:`Annotation`.
+    Indexing with a slice, a boolean mask or an index array gives a
+    new table with the selected entries.
+
+    Parameters
+    ----------
+    seqids, sources, types : ndarray, dtype=str
+        The distinct values of the *seqid*, *source* and *type*
+        columns.
+    seqid_codes, source_codes, type_codes : ndarray, shape=(n,), dtype=int32
+        The index of the value of each entry in `seqids`, `sources`
+        and `types`, respectively.
+    starts, ends : ndarray, shape=(n,), dtype=int64
+        The start and end coordinates of each entry.
+    scores : ndarray, shape=(n,), dtype=float64
+        The score of each entry, *NaN* if the entry has no score.
+    strands : ndarray, shape=(n,), dtype=int8
+        The strand of each entry:
+        ``1`` for the forward strand, ``-1`` for the reverse strand and
+        ``0`` for unstranded entries.
+    phases : ndarray, shape=(n,), dtype=int8
+        The phase of each entry, ``-1`` if the entry has no phase.
+    attributes : ndarray, shape=(k,), dtype=uint8
+        The concatenated raw *attributes* column, still containing the
+        percent-encoded characters.
+    attribute_offsets : ndarray, shape=(n+1,), dtype=int64
+        The start of the attributes of each entry in `attributes` and
+        the total length as last element.
+
+    Attributes
+    ----------
+    seqids, seqid_codes, sources, source_codes, types, type_codes, starts, ends, scores, strands, phases, attributes, attribute_offsets
+        The same as the parameters.
+    """
+
+    def __init__(self, seqids, seqid_codes, sources, source_codes,
+                 types, type_codes, starts, ends, scores, strands, phases,
+                 attributes, attribute_offsets):
+        self.seqids = seqids
+        self.seqid_codes = seqid_codes
+        self.sources = sources
+        self.source_codes = source_codes
+        self.types = types
+        self.type_codes = type_codes
+        self.starts = starts
+        self.ends = ends
+        self.scores = scores
+        self.strands = strands
+        self.phases = phases
+        self.attributes = attributes
+        self.attribute_offsets = attribute_offsets
+
+    @staticmethod
+    def concatenate(tables):
+        """
+        Concatenate multiple tables into a single table.
+
+        Parameters
+        ----------
+        tables : iterable object of GFFTable
+            The tables to be concatenated.
+
+        Returns
+        -------
+        table : GFFTable
+            The concatenated table.
+            The categorical columns are merged, so the tables may
+            also originate from different files.
+        """
+        tables = list(tables)
+        categories = {}
+        codes = {}
+        for name in ("seqid", "source", "type"):
+            merged = {}
+            table_codes = []
+            for table in tables:
+                values = getattr(table, name + "s")
+                # Map the codes of this table to the merged categories
+                code_map = np.array(
+                    [merged.setdefault(value, len(merged))
+                     for value in values],
+                    dtype=np.int32
+                )
+                table_codes.append(code_map[getattr(table, name + "_codes")])
+            categories[name] = np.array(list(merged), dtype=str)
+            codes[name] = np.concatenate(
+                table_codes + [np.zeros(0, dtype=np.int32)]
+            )
+
+        attribute_offsets = [np.zeros(1, dtype=np.int64)]
+        offset = 0
+        for table in tables:
+            attribute_offsets.append(table.attribute_offsets[1:] + offset)
+            offset += table.attribute_offsets[-1]
+
+        def concat(attr_name, dtype):
+            return np.concatenate(
+                [getattr(table, attr_name) for table in tables]
+                + [np.zeros(0, dtype=dtype)]
+            )
+
+        return GFFTable(
+            categories["seqid"], codes["seqid"],
+            categories["source"], codes["source"],
+            categories["type"], codes["type"],
+            concat("starts", np.int64), concat("ends", np.int64),
+            concat("scores", np.float64), concat("strands", np.int8),
+            concat("phases", np.int8), concat("attributes", np.uint8),
+            np.concatenate(attribute_offsets)
+        )
+
+    def get_attributes(self, index):
+        """
+        Parse the *attributes* of the entry at the given index.
+
+        Parameters
+        ----------
+        index : int
+            The index of the entry.
+
+        Returns
+        -------
+        attributes : dict
+            The attributes of the entry.
+        """
+        start = self.attribute_offsets[index]
+        stop = self.attribute_offsets[index+1]
+        if start == stop:
+            return {}
+        return GFFFile._parse_attributes(
+            self.attributes[start:stop].tobytes().decode("utf-8")
+        )
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __getitem__(self, index):
+        if isinstance(index, Integral):
+            if index < -len(self) or index >= len(self):
+                raise IndexError(
+                    f"Index {index} is out of range for GFFTable with "
+                    f"{len(self)} entries"
+                )
+            if index < 0:
+                index += len(self)
+            return self._get_entry(index)
+
+        if isinstance(index, slice):
+            index = np.arange(len(self))[index]
+        else:
+            index = np.asarray(index)
+            if index.dtype == bool:
+                index = np.flatnonzero(index)
+        starts = self.attribute_offsets[:-1][index]
+        stops = self.attribute_offsets[1:][index]
+        attribute_offsets = np.zeros(len(index) + 1, dtype=np.int64)
+        np.cumsum(stops - starts, out=attribute_offsets[1:])
+        return GFFTable(
+            self.seqids, self.seqid_codes[index],
+            self.sources, self.source_codes[index],
+            self.types, self.type_codes[index],
+            self.starts[index], self.ends[index], self.scores[index],
+            self.strands[index], self.phases[index],
+            _concatenate_ranges(self.attributes, starts, stops),
+            attribute_offsets
+        )
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._get_entry(i)
+
+    def _get_entry(self, index):
+        score = self.scores[index]
+        strand = self.strands[index]
+        phase = self.phases[index]
+        return (
+            self.seqids[self.seqid_codes[index]],
+            self.sources[self.source_codes[index]],
+            self.types[self.type_codes[index]],
+            int(self.starts[index]),
+            int(self.ends[index]),
+            None if np.isnan(score) else float(score),
+            _STRANDS[strand],
+            None if phase == -1 else int(phase),
+            self.get_attributes(index)
+        )
+
+    def _create_lines(self):
+        """
+        Create the GFF3 lines for the entries in this table.
+        """
+        # The categorical columns only need to be quoted once
+        seqids = [quote(value, safe=_NOT_QUOTED) for value in self.seqids]
+        sources = [quote(value, safe=_NOT_QUOTED) for value in self.sources]
+        types = list(self.types)
+        strand_chars = {1: "+", -1: "-", 0: "."}
+        for i, (seqid_code, source_code, type_code, start, end,
+                score, strand, phase) in enumerate(zip(
+            self.seqid_codes.tolist(), self.source_codes.tolist(),
+            self.type_codes.tolist(), self.starts.tolist(),
+            self.ends.tolist(), self.scores.tolist(),
+            self.strands.tolist(), self.phases.tolist()
+        )):
+            attrib_start = self.attribute_offsets[i]
+            attrib_stop = self.attribute_offsets[i+1]
+            if attrib_start == attrib_stop:
+                attributes = "."
+            else:
+                attributes = self.attributes[attrib_start:attrib_stop] \
+                             .tobytes().decode("utf-8")
+            yield "\t".join([
+                seqids[seqid_code], sources[source_code], types[type_code],
+                str(start), str(end),
+                "." if score != score else str(score),
+                strand_chars[strand],
+                "." if phase == -1 else str(phase),
+                attributes
+            ])
+
+
+# Maps the strand codes in 'GFFTable' to the strand of a 'Location'
+_STRANDS = {
+    1: Location.Strand.FORWARD,
+    -1: Location.Strand.REVERSE,
+    0: None
+}
+
+
+def _read_tables(file, seqids, types, chunk_size, close_file=False):
+    """
+    Read the given binary file chunk-wise and parse the selected entries
+    in each chunk into a :class:`GFFTable`.
+    If `close_file` is true, the file is closed, when the generator is
+    exhausted or closed.
+    """
+    try:
+        yield from _read_tables_from_file(file, seqids, types, chunk_size)
+    finally:
+        if close_file:
+            file.close()
+
+
+def _read_tables_from_file(file, seqids, types, chunk_size):
+    # The distinct values of the categorical columns as
+    # (value -> code) dictionary, shared by all tables of the file
+    categories = {"seqid": {}, "source": {}, "type": {}}
+    remainder = b""
+    while True:
+        chunk = file.read(chunk_size)
+        is_last_chunk = len(chunk) == 0
+        buffer = np.frombuffer(remainder + chunk, dtype=np.uint8)
+        if len(buffer) == 0:
+            return
+        table, n_parsed_bytes, has_fasta = _parse_table(
+            buffer, seqids, types, categories, is_last_chunk
+        )
+        # Incomplete lines are parsed with the next chunk
+        remainder = buffer[n_parsed_bytes:].tobytes()
+        if len(table) > 0:
+            yield table
+        if has_fasta:
+            warnings.warn(
+                "Biotite does not support FASTA data mixed into "
+                "GFF files, the FASTA data will be ignored"
+            )
+            return
+        if is_last_chunk:
+            return
+
+
+def _parse_table(buffer, seqids, types, categories, is_last_chunk):
+    """
+    Parse all complete lines in the given buffer.
+
+    Returns
+    -------
+    table : GFFTable
+        The selected entries.
+    n_parsed_bytes : int
+        The number of bytes from the beginning of the buffer that were
+        parsed.
+    has_fasta : bool
+        True, if a ``##FASTA`` directive was found, which ends the
+        feature entries.
+    """
+    line_ends = np.flatnonzero(buffer == ord("\n"))
+    if is_last_chunk:
+        # The last line may not be terminated with a line break
+        line_ends = np.append(line_ends, len(buffer))
+    n_parsed_bytes = line_ends[-1] + 1 if len(line_ends) > 0 else 0
+    line_starts = np.zeros(len(line_ends), dtype=np.int64)
+    line_starts[1:] = line_ends[:-1] + 1
+    # Remove carriage return of Windows line endings
+    line_stops = line_ends.copy()
+    has_carriage_return = (line_stops > line_starts) & (
+        buffer[np.maximum(line_stops - 1, 0)] == ord("\r")
+    )
+    line_stops[has_carriage_return] -= 1
+
+    # Ignore everything after a '##FASTA' directive
+    has_fasta = False
+    fasta_directive = np.frombuffer(b"##FASTA", dtype=np.uint8)
+    for line_i in np.flatnonzero(
+        (line_stops - line_starts == len(fasta_directive))
+        & (buffer[np.minimum(line_starts, len(buffer) - 1)] == ord("#"))
+    ):
+        if (buffer[line_starts[line_i] : line_stops[line_i]]
+            == fasta_directive).all():
+                has_fasta = True
+                line_starts = line_starts[:line_i]
+                line_stops = line_stops[:line_i]
+                break
+
+    # Like in 'GFFFile', empty lines, lines starting with a space,
+    # comments and directives are ignored
+    first_chars = buffer[np.minimum(line_starts, len(buffer) - 1)]
+    is_entry = (line_stops > line_starts) \
+               & (first_chars != ord(" ")) & (first_chars != ord("#"))
+    entry_lines = np.flatnonzero(is_entry)
+
+    # Split the entry lines into columns
+    tabs = np.flatnonzero(buffer[:n_parsed_bytes] == ord("\t"))
+    tab_lines = np.searchsorted(line_starts, tabs, side="right") - 1
+    is_entry_tab = (tab_lines >= 0) & (tab_lines < len(line_starts))
+    is_entry_tab[is_entry_tab] = is_entry[tab_lines[is_entry_tab]]
+    is_entry_tab[is_entry_tab] &= (
+        tabs[is_entry_tab] < line_stops[tab_lines[is_entry_tab]]
+    )
+    tabs = tabs[is_entry_tab]
+    n_tabs = np.bincount(
+        tab_lines[is_entry_tab], minlength=len(line_starts)
+    )[entry_lines]
+    if (n_tabs != 8).any():
+        raise InvalidFileError(
+            f"Expected 9 columns, but got {n_tabs[n_tabs != 8][0] + 1}"
+        )
+    tabs = tabs.reshape(-1, 8)
+    col_starts = np.concatenate(
+        [line_starts[entry_lines, np.newaxis], tabs + 1], axis=1
+    )
+    col_stops = np.concatenate(
+        [tabs, line_stops[entry_lines, np.newaxis]], axis=1
+    )
+
+    # Filter the entries before parsing the remaining columns
+    seqid_values, seqid_codes = _parse_strings(
+        buffer, col_starts[:, 0], col_stops[:, 0]
+    )
+    type_values, type_codes = _parse_strings(
+        buffer, col_starts[:, 2], col_stops[:, 2]
+    )
+    mask = np.ones(len(entry_lines), dtype=bool)
+    if seqids is not None:
+        mask &= np.array(
+            [value in seqids for value in seqid_values], dtype=bool
+        )[seqid_codes]
+    if types is not None:
+        mask &= np.array(
+            [value in types for value in type_values], dtype=bool
+        )[type_codes]
+    col_starts = col_starts[mask]
+    col_stops = col_stops[mask]
+    seqid_codes = seqid_codes[mask]
+    type_codes = type_codes[mask]
+    source_values, source_codes = _parse_strings(
+        buffer, col_starts[:, 1], col_stops[:, 1]
+    )
+
+    scores = np.full(len(col_starts), np.nan)
+    has_score = ~_is_dot(buffer, col_starts, col_stops, 5)
+    if has_score.any():
+        try:
+            scores[has_score] = np.array(_decode_ranges(
+                buffer, col_starts[has_score, 5], col_stops[has_score, 5]
+            )).astype(np.float64)
+        except ValueError:
+            raise InvalidFileError("The score column is invalid")
+
+    strand_chars = buffer[col_starts[:, 6]]
+    strands = np.zeros(len(col_starts), dtype=np.int8)
+    strands[strand_chars == ord("+")] = 1
+    strands[strand_chars == ord("-")] = -1
+
+    phases = np.full(len(col_starts), -1, dtype=np.int8)
+    has_phase = ~_is_dot(buffer, col_starts, col_stops, 7)
+    phases[has_phase] = _parse_integers(
+        buffer, col_starts[has_phase, 7], col_stops[has_phase, 7]
+    )
+
+    # Entries without attributes get an empty range
+    attrib_stops = col_stops[:, 8].copy()
+    has_no_attributes = _is_dot(buffer, col_starts, col_stops, 8)
+    attrib_stops[has_no_attributes] = col_starts[has_no_attributes, 8]
+    attribute_offsets = np.zeros(len(col_starts) + 1, dtype=np.int64)
+    np.cumsum(attrib_stops - col_starts[:, 8], out=attribute_offsets[1:])
+
+    return GFFTable(
+        *_update_categories(categories["seqid"], seqid_values, seqid_codes),
+        *_update_categories(categories["source"], source_values, source_codes),
+        *_update_categories(categories["type"], type_values, type_codes),
+        _parse_integers(buffer, col_starts[:, 3], col_stops[:, 3]),
+        _parse_integers(buffer, col_starts[:, 4], col_stops[:, 4]),
+        scores, strands, phases,
+        _concatenate_ranges(buffer, col_starts[:, 8], attrib_stops),
+        attribute_offsets
+    ), n_parsed_bytes, has_fasta
+
+
+def _is_dot(buffer, col_starts, col_stops, col):
+    """
+    Get a mask of the entries, whose given column is unspecified
+    (``.``).
+    """
+    return (col_stops[:, col] - col_starts[:, col] == 1) \
+           & (buffer[col_starts[:, col]] == ord("."))
+
+
+def _parse_strings(buffer, starts, stops):
+    """
+    Decode the given ranges of the buffer into categorical values.
+
+    Returns
+    -------
+    values : list of str
+        The distinct unquoted values.
+    codes : ndarray, dtype=int32
+        The index of the value of each range in `values`.
+    """
+    raw_values, codes = np.unique(
+        np.array(_decode_ranges(buffer, starts, stops), dtype=object),
+        return_inverse=True
+    )
+    # The values need to be unquoted only once
+    values = [unquote(value) for value in raw_values]
+    return values, codes.astype(np.int32)
+
+
+def _update_categories(category_dict, values, codes):
+    """
+    Add the given values to the categories of the file and convert the
+    codes into codes pointing to these categories.
+    Only values that are actually used are added.
+    """
+    used = np.zeros(len(values), dtype=bool)
+    used[codes] = True
+    code_map = np.zeros(len(values), dtype=np.int32)
+    for i in np.flatnonzero(used):
+        code_map[i] = category_dict.setdefault(values[i], len(category_dict))
+    return np.array(list(category_dict), dtype=str), code_map[codes]
+
+
+def _decode_ranges(buffer, starts, stops):
+    """
+    Decode the given ranges of the buffer into a list of strings.
+    """
+    if len(starts) == 0:
+        return []
+    # Join the ranges with line breaks, to decode them at once
+    lengths = stops - starts
+    joined = _concatenate_ranges(buffer, starts, stops + 1)
+    joined[np.cumsum(lengths + 1) - 1] = ord("\n")
+    return joined.tobytes().decode("utf-8").split("\n")[:-1]
+
+
+def _parse_integers(buffer, starts, stops):
+    """
+    Parse the given ranges of the buffer into integers.
+    """
+    if len(starts) == 0:
+        return np.zeros(0, dtype=np.int64)
+    is_negative = buffer[starts] == ord("-")
+    starts = starts + is_negative
+    lengths = stops - starts
+    # Limit the number of digits to avoid 64-bit integer overflow
+    if (lengths < 1).any() or (lengths > 18).any():
+        raise InvalidFileError("Expected an integer value")
+    positions = np.arange(np.max(lengths))
+    is_digit = positions < lengths[:, np.newaxis]
+    indices = np.minimum(starts[:, np.newaxis] + positions, len(buffer) - 1)
+    digits = buffer[indices].astype(np.int64) - ord("0")
+    digits[~is_digit] = 0
+    if ((digits < 0) | (digits > 9)).any():
+        raise InvalidFileError("Expected an integer value")
+    # The last digit of each number has the lowest exponent
+    exponents = np.maximum(lengths[:, np.newaxis] - 1 - positions, 0)
+    values = np.sum(digits * 10**exponents, axis=1)
+    values[is_negative] *= -1
+    return values
+
+
+def _concatenate_ranges(buffer, starts, stops):
+    """
+    Concatenate the given non-overlapping ranges of the buffer.
+    """
+    lengths = stops - starts
+    range_offsets = np.cumsum(lengths) - lengths
+    indices = np.arange(np.sum(lengths, dtype=np.int64)) \
+              + np.repeat(starts - range_offsets, lengths)
+    return buffer[indices]
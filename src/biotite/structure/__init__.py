@@ -109,6 +109,7 @@ from .box import *
 from .celllist import *
 from .charges import *
 from .compare import *
+from .contacts import *
 from .density import *
 from .dotbracket import *
 from .error import *
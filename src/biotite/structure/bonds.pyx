@@ -17,6 +17,7 @@ cimport cython
 cimport numpy as np
 from libc.stdlib cimport free, malloc, realloc
 
+import functools
 import itertools
 import numbers
 from enum import IntEnum
@@ -1585,49 +1586,55 @@ def connect_via_residue_names(atoms, atom_mask=None, bint inter_residue=True):
     Although this includes most molecules one encounters, this will fail
     for exotic molecules, e.g. specialized inhibitors.
     """
-    from .info.bonds import bond_dataset
     from .residues import get_residue_starts
 
-    cdef list bonds = []
     cdef int i
     cdef int curr_start_i, next_start_i
-    cdef np.ndarray atom_names = atoms.atom_name
-    cdef np.ndarray atom_names_in_res
+    # Python lists are faster to slice into tuples than NumPy arrays
+    cdef list atom_names = atoms.atom_name.tolist()
     cdef np.ndarray res_names = atoms.res_name
-    cdef str atom_name1, atom_name2
-    cdef np.ndarray atom_indices1, atom_indices2
-    cdef int atom_index1, atom_index2
-    cdef int bond_order
-    # Obtain dictionary containing bonds for all residues in RCSB
-    cdef dict bond_dict = bond_dataset()
-    cdef dict bond_dict_for_res
+    cdef dict template_res_starts = {}
+    cdef list bond_arrays = []
+    cdef list bond_res_starts = []
 
     residue_starts = get_residue_starts(atoms, add_exclusive_stop=True)
+    # Group the residues by their bond template, i.e. their residue name
+    # and the names of their atoms, to handle each group at once
     # Omit exclsive stop in 'residue_starts'
     for i in range(len(residue_starts)-1):
         curr_start_i = residue_starts[i]
         next_start_i = residue_starts[i+1]
+        template_key = (
+            res_names[curr_start_i],
+            tuple(atom_names[curr_start_i : next_start_i])
+        )
+        template_res_starts.setdefault(template_key, []).append(curr_start_i)
 
-        bond_dict_for_res = bond_dict.get(res_names[curr_start_i])
-        if bond_dict_for_res is None:
-            # Residue is not in dataset -> skip this residue
-            continue
-        atom_names_in_res = atom_names[curr_start_i : next_start_i]
-        for (atom_name1, atom_name2), bond_type in bond_dict_for_res.items():
-            atom_indices1 = np.where(atom_names_in_res == atom_name1)[0]
-            atom_indices2 = np.where(atom_names_in_res == atom_name2)[0]
-            if len(atom_indices1) == 0 or len(atom_indices2) == 0:
-                # The pair of atoms in this bond from the dataset is not
-                # in the residue of the atom array
-                # -> skip this bond
+    for (res_name, atom_names_in_res), res_starts \
+        in template_res_starts.items():
+            template = _get_residue_bond_template(res_name, atom_names_in_res)
+            if len(template) == 0:
                 continue
-            bonds.append((
-                curr_start_i + atom_indices1[0],
-                curr_start_i + atom_indices2[0],
-                bond_type
-            ))
-
-    bond_list = BondList(atoms.array_length(), np.array(bonds))
+            res_starts = np.array(res_starts, dtype=np.int64)
+            # Shift the residue-local atom indices of the template
+            # to the position of each residue in the atom array
+            bonds = np.repeat(
+                template[np.newaxis, :, :], len(res_starts), axis=0
+            )
+            bonds[:, :, :2] += res_starts[:, np.newaxis, np.newaxis]
+            bond_arrays.append(bonds.reshape(-1, 3))
+            bond_res_starts.append(np.repeat(res_starts, len(template)))
+
+    if len(bond_arrays) > 0:
+        bonds = np.concatenate(bond_arrays)
+        # Restore the order of residues in the atom array
+        # while maintaining the order of bonds within each residue
+        bonds = bonds[
+            np.argsort(np.concatenate(bond_res_starts), kind="stable")
+        ]
+    else:
+        bonds = np.zeros((0, 3), dtype=np.int64)
+    bond_list = BondList(atoms.array_length(), bonds)
 
     if inter_residue:
         inter_bonds = _connect_inter_residue(atoms, residue_starts)
@@ -1637,6 +1644,52 @@ def connect_via_residue_names(atoms, atom_mask=None, bint inter_residue=True):
 
 
 
+@functools.lru_cache(maxsize=4096)
+def _get_residue_bond_template(res_name, atom_names):
+    """
+    Get the bonds of a residue with the given atom names, as they appear
+    in the RCSB ``components.cif`` dataset.
+
+    The result is cached, as residues of the same type usually reappear
+    many times in a structure.
+
+    Parameters
+    ----------
+    res_name : str
+        The name of the residue.
+    atom_names : tuple of str
+        The names of the atoms in the residue in the order of the
+        atom array.
+
+    Returns
+    -------
+    template : ndarray, shape=(n,3), dtype=int64
+        The bonds of the residue:
+        The residue-local indices of the two bonded atoms and the bond
+        type.
+        If an atom name appears multiple times, the first occurrence is
+        used.
+        The array is read-only.
+    """
+    from .info.bonds import bonds_in_residue
+
+    bond_dict_for_res = bonds_in_residue(res_name)
+    if bond_dict_for_res is None:
+        # Residue is not in dataset
+        bond_dict_for_res = {}
+    atom_indices = {}
+    for i, atom_name in enumerate(atom_names):
+        atom_indices.setdefault(atom_name, i)
+    template = np.array([
+        (atom_indices[atom_name1], atom_indices[atom_name2], bond_type)
+        for (atom_name1, atom_name2), bond_type in bond_dict_for_res.items()
+        # Skip bonds, whose atoms are not in the residue of the atom array
+        if atom_name1 in atom_indices and atom_name2 in atom_indices
+    ], dtype=np.int64).reshape(-1, 3)
+    template.setflags(write=False)
+    return template
+
+
 _PEPTIDE_LINKS = ["PEPTIDE LINKING", "L-PEPTIDE LINKING", "D-PEPTIDE LINKING"]
 _NUCLEIC_LINKS = ["RNA LINKING", "DNA LINKING"]
 
@@ -14,6 +14,7 @@ __all__ = ["CellList"]
 cimport cython
 cimport numpy as np
 from libc.stdlib cimport realloc, malloc, free
+from libc.math cimport sqrt
 
 import numpy as np
 from .atoms import coord as to_coord
@@ -21,6 +22,7 @@ from .atoms import AtomArrayStack
 from .box import repeat_box_coord, move_inside_box
 
 ctypedef np.uint64_t ptr
+ctypedef np.int64_t int64
 ctypedef np.float32_t float32
 ctypedef np.uint8_t uint8
 
@@ -81,6 +83,9 @@ cdef class CellList:
     cdef ptr[:,:,:] _cells
     # The amount elements in each C-array in '_cells'
     cdef int[:,:,:] _cell_length
+    # The cell index (i,j,k) of each atom in '_coord',
+    # -1 for atoms that are not selected
+    cdef int[:,:] _atom_cell
     # The maximum value of '_cell_length' over all cells,
     # required for worst case assumption on size of output arrays
     cdef int _max_cell_length
@@ -106,12 +111,6 @@ cdef class CellList:
     @cython.wraparound(False)
     def __cinit__(self, atom_array not None, float cell_size,
                   bint periodic=False, box=None, np.ndarray selection=None):
-        cdef float32 x, y, z
-        cdef int i, j, k
-        cdef int atom_array_i
-        cdef int* cell_ptr = NULL
-        cdef int length
-
         if isinstance(atom_array, AtomArrayStack):
             raise TypeError("Expected 'AtomArray' but got 'AtomArrayStack'")
         coord = to_coord(atom_array)
@@ -152,14 +151,42 @@ cdef class CellList:
         if cell_size <= 0:
             raise ValueError("Cell size must be greater than 0")
         self._periodic = periodic
-        self._coord = coord.astype(np.float32, copy=False)
         self._cellsize = cell_size
+        
+        # Prepare selection
+        if selection is not None:
+            self._has_selection = True
+            self._selection = np.frombuffer(selection, dtype=np.uint8)
+            if self._selection.shape[0] != self._orig_length:
+                raise IndexError(
+                    f"Atom array has length {self._orig_length}, "
+                    f"but selection has length {self._selection.shape[0]}"
+                )
+        else:
+            self._has_selection = False
+        
+        self._create_cells(coord)
+    
+
+    cdef _create_cells(self, np.ndarray coord):
+        """
+        Create the cells for the given coordinates (including periodic
+        copies) and fill them with the atom indices.
+        """
+        cdef float32 x, y, z
+        cdef int i, j, k
+        cdef int atom_array_i
+        cdef int* cell_ptr = NULL
+        cdef int length
+
+        self._coord = coord.astype(np.float32, copy=False)
         # calculate how many cells are required for each dimension
         min_coord = np.min(coord, axis=0).astype(np.float32)
         max_coord = np.max(coord, axis=0).astype(np.float32)
         self._min_coord = min_coord
         self._max_coord = max_coord
-        cell_count = (((max_coord - min_coord) / cell_size) +1).astype(int)
+        cell_count = (((max_coord - min_coord) / self._cellsize) +1) \
+                     .astype(int)
         if self._periodic:
             self._orig_min_coord = np.min(coord[:self._orig_length], axis=0) \
                                    .astype(np.float32)
@@ -171,18 +198,8 @@ cdef class CellList:
         self._cells = np.zeros(cell_count, dtype=np.uint64)
         # Stores the length of the C-arrays
         self._cell_length = np.zeros(cell_count, dtype=np.int32)
-        
-        # Prepare selection
-        if selection is not None:
-            self._has_selection = True
-            self._selection = np.frombuffer(selection, dtype=np.uint8)
-            if self._selection.shape[0] != self._orig_length:
-                raise IndexError(
-                    f"Atom array has length {self._orig_length}, "
-                    f"but selection has length {self._selection.shape[0]}"
-                )
-        else:
-            self._has_selection = False
+        self._max_cell_length = 0
+        self._atom_cell = np.full((self._coord.shape[0], 3), -1, dtype=np.int32)
         
         # Fill cells
         for atom_array_i in range(self._coord.shape[0]):
@@ -194,22 +211,174 @@ cdef class CellList:
                     z = self._coord[atom_array_i, 2]
                     # Get cell indices for coordinates
                     self._get_cell_index(x, y, z, &i, &j, &k)
-                    # Increment cell length and reallocate
-                    length = self._cell_length[i,j,k] + 1
-                    cell_ptr = <int*>self._cells[i,j,k]
-                    cell_ptr = <int*>realloc(cell_ptr, length * sizeof(int))
-                    if not cell_ptr:
-                        raise MemoryError()
-                    # Potentially increase max cell length
-                    if length > self._max_cell_length:
-                        self._max_cell_length = length
-                    # Store atom array index in respective cell
-                    cell_ptr[length-1] = atom_array_i
-                    # Store new cell pointer and length
-                    self._cell_length[i,j,k] = length
-                    self._cells[i,j,k] = <ptr> cell_ptr
-            
+                    self._add_to_cell(atom_array_i, i, j, k)
+    
+
+    def update(self, atom_array not None, box=None):
+        """
+        update(atom_array, box=None)
+
+        Update the cell list with new coordinates of the same atoms.
+
+        Only atoms that moved into another cell are relocated.
+        Hence, updating is considerably faster than creating a new
+        :class:`CellList`, if the atoms moved only slightly, as it is
+        usually the case for consecutive frames of a trajectory.
+        If an atom moved outside the range of the existing cells or the
+        box changed, the cells are recreated.
+
+        Parameters
+        ----------
+        atom_array : AtomArray or ndarray, dtype=float, shape=(n,3)
+            The :class:`AtomArray` with the new coordinates.
+            Alternatively the atom coordinates are accepted directly.
+            The number of atoms must not change.
+        box : ndarray, dtype=float, shape=(3,3), optional
+            If provided, the periodicity is based on this parameter
+            instead of the :attr:`box` attribute of `atom_array`.
+            If neither is given, the box from the previous coordinates
+            is retained.
+            Only has an effect, if `periodic` is ``True``.
+
+        Examples
+        --------
+
+        >>> cell_list = CellList(atom_array, cell_size=5)
+        >>> moved_array = translate(atom_array, [0.1, 0.0, 0.0])
+        >>> cell_list.update(moved_array)
+        >>> print(cell_list.get_atoms(moved_array.coord[0], radius=2.0))
+        [ 0  1  8  9 10]
+        """
+        if isinstance(atom_array, AtomArrayStack):
+            raise TypeError("Expected 'AtomArray' but got 'AtomArrayStack'")
+        coord = to_coord(atom_array)
+        if coord.ndim != 2 or coord.shape[1] != 3:
+            raise ValueError("Coordinates must have shape (n,3)")
+        if coord.shape[0] != self._orig_length:
+            raise IndexError(
+                f"The cell list contains {self._orig_length} atoms, "
+                f"but {coord.shape[0]} coordinates were given"
+            )
+        if np.isnan(coord).any():
+            raise ValueError("Coordinates contain NaN values")
+        
+        cdef bint box_changed = False
+        if self._periodic:
+            if box is None and not isinstance(atom_array, np.ndarray):
+                box = atom_array.box
+            if box is not None:
+                box = np.asarray(box)
+                if box.shape != (3,3):
+                    raise ValueError("Box has invalid shape")
+                if np.isnan(box).any():
+                    raise ValueError("Box contains NaN values")
+                box_changed = not np.array_equal(box, self._box)
+                self._box = box
+            coord = move_inside_box(coord, self._box)
+            coord, _ = repeat_box_coord(coord, self._box)
+        coord = coord.astype(np.float32, copy=False)
+        
+        if box_changed or not self._update_cells(coord):
+            # Cells do not fit the new coordinates anymore
+            deallocate_ptrs(self._cells)
+            self._create_cells(coord)
     
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef bint _update_cells(self, float32[:,:] coord) except *:
+        """
+        Move the atoms whose cell changed into the new cell.
+        Return false without changing the cells, if any atom is outside
+        the range of the existing cells.
+        """
+        cdef int atom_array_i
+        cdef int i, j, k
+        cdef float32 x, y, z
+        cdef int[:,:] atom_cell = self._atom_cell
+
+        # Bound check for all atoms before any modification
+        for atom_array_i in range(coord.shape[0]):
+            x = coord[atom_array_i, 0]
+            y = coord[atom_array_i, 1]
+            z = coord[atom_array_i, 2]
+            # Lower bound must be checked on the coordinates,
+            # since the index conversion truncates towards zero
+            if x < self._min_coord[0] or y < self._min_coord[1] \
+               or z < self._min_coord[2]:
+                    return False
+            self._get_cell_index(x, y, z, &i, &j, &k)
+            if i >= self._cells.shape[0] or j >= self._cells.shape[1] \
+               or k >= self._cells.shape[2]:
+                    return False
+        
+        for atom_array_i in range(coord.shape[0]):
+            if atom_cell[atom_array_i, 0] == -1:
+                # Atom is not selected
+                continue
+            self._get_cell_index(
+                coord[atom_array_i, 0],
+                coord[atom_array_i, 1],
+                coord[atom_array_i, 2],
+                &i, &j, &k
+            )
+            if i != atom_cell[atom_array_i, 0] \
+               or j != atom_cell[atom_array_i, 1] \
+               or k != atom_cell[atom_array_i, 2]:
+                    self._remove_from_cell(
+                        atom_array_i,
+                        atom_cell[atom_array_i, 0],
+                        atom_cell[atom_array_i, 1],
+                        atom_cell[atom_array_i, 2],
+                    )
+                    self._add_to_cell(atom_array_i, i, j, k)
+        
+        self._coord = coord
+        return True
+
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef int _add_to_cell(self, int atom_array_i, int i, int j, int k) \
+                          except -1:
+        # Increment cell length and reallocate
+        cdef int length = self._cell_length[i,j,k] + 1
+        cdef int* cell_ptr = <int*>self._cells[i,j,k]
+        cell_ptr = <int*>realloc(cell_ptr, length * sizeof(int))
+        if not cell_ptr:
+            raise MemoryError()
+        # Potentially increase max cell length
+        if length > self._max_cell_length:
+            self._max_cell_length = length
+        # Store atom array index in respective cell
+        cell_ptr[length-1] = atom_array_i
+        # Store new cell pointer and length
+        self._cell_length[i,j,k] = length
+        self._cells[i,j,k] = <ptr> cell_ptr
+        self._atom_cell[atom_array_i, 0] = i
+        self._atom_cell[atom_array_i, 1] = j
+        self._atom_cell[atom_array_i, 2] = k
+        return 0
+    
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _remove_from_cell(self, int atom_array_i, int i, int j, int k):
+        cdef int cell_i
+        cdef int length = self._cell_length[i,j,k]
+        cdef int* cell_ptr = <int*>self._cells[i,j,k]
+        for cell_i in range(length):
+            if cell_ptr[cell_i] == atom_array_i:
+                # Replace removed index with the last index in the cell
+                # The memory is kept allocated for subsequent additions
+                cell_ptr[cell_i] = cell_ptr[length-1]
+                self._cell_length[i,j,k] = length - 1
+                return
+            
+
     def __dealloc__(self):
         if self._has_initialized_cells():
             deallocate_ptrs(self._cells)
@@ -218,9 +387,10 @@ cdef class CellList:
     @cython.initializedcheck(False)
     @cython.boundscheck(False)
     @cython.wraparound(False)
-    def create_adjacency_matrix(self, float32 threshold_distance):
+    def create_adjacency_matrix(self, float32 threshold_distance,
+                                bint as_sparse=False):
         """
-        create_adjacency_matrix(threshold_distance)
+        create_adjacency_matrix(threshold_distance, as_sparse=False)
         
         Create an adjacency matrix for the atoms in this cell list.
 
@@ -235,10 +405,15 @@ cdef class CellList:
             The threshold distance. All atom pairs that have a distance
             lower than this value are indicated by ``True`` values in
             the resulting matrix.
+        as_sparse : bool, optional
+            If true, the matrix is returned as
+            :class:`scipy.sparse.csr_matrix`, which requires only memory
+            proportional to the number of adjacent atom pairs.
+            This requires *SciPy* to be installed.
         
         Returns
         -------
-        matrix : ndarray, dtype=bool, shape=(n,n)
+        matrix : ndarray, dtype=bool, shape=(n,n) or scipy.sparse.csr_matrix
             An *n x n* adjacency matrix.
             If a `selection` was given to the constructor of the
             :class:`CellList`, the rows and columns corresponding to
@@ -274,6 +449,10 @@ cdef class CellList:
         # (no periodic copies)
         coord = np.asarray(self._coord[:self._orig_length])
 
+        if as_sparse:
+            return self._create_sparse_adjacency_matrix(
+                coord, threshold_distance
+            )
         if self._has_selection:
             selection = np.asarray(self._selection, dtype=bool)
             # Create matrix with all elements set to False
@@ -471,6 +650,219 @@ cdef class CellList:
         )
     
     
+    def get_atoms_sparse(self, np.ndarray coord, radius,
+                         bint return_distances=False):
+        """
+        get_atoms_sparse(coord, radius, return_distances=False)
+        
+        Find atoms with a maximum distance from given coordinates and
+        return them in a compressed sparse row (CSR) format.
+
+        In contrast to :meth:`get_atoms()`, the indices for all
+        positions are concatenated into a single flat array, instead of
+        padding each row to the maximum number of adjacent atoms.
+        Hence, the memory requirement is proportional to the number of
+        found atoms.
+        
+        Parameters
+        ----------
+        coord : ndarray, dtype=float, shape=(3,) or shape=(m,3)
+            The central coordinates, around which the atoms are
+            searched.
+            A single position is handled as *m = 1*.
+        radius : float or ndarray, shape=(m,), dtype=float, optional
+            The radius around `coord`, in which the atoms are searched.
+            Either a single radius can be given as scalar, or individual
+            radii for each position in `coord` can be provided as
+            :class:`ndarray`.
+        return_distances : bool, optional
+            If true, the distances of the found atoms to the respective
+            position are returned as well.
+        
+        Returns
+        -------
+        indptr : ndarray, dtype=int64, shape=(m+1,)
+            The indices of the atoms adjacent to the position *i* are
+            ``indices[indptr[i] : indptr[i+1]]``.
+        indices : ndarray, dtype=int32, shape=(p,)
+            The indices of the atom array, where the atoms are in the
+            defined `radius` around the positions.
+        distances : ndarray, dtype=float32, shape=(p,)
+            The distance of each atom in `indices` to the respective
+            position.
+            Only returned with `return_distances` set to true.
+
+        See Also
+        --------
+        get_atoms
+
+        Notes
+        -----
+        The return values can be directly used to construct a
+        :class:`scipy.sparse.csr_matrix`.
+
+        In case of a :class:`CellList` with `periodic` set to `True`:
+        If more than one periodic copy of an atom is within the
+        threshold radius, the returned `indices` array contains the
+        corresponding index multiple times.
+
+        Examples
+        --------
+
+        >>> cell_list = CellList(atom_array, 3)
+        >>> pos = np.array([[1.0,2.0,3.0], [2.0,3.0,4.0], [3.0,4.0,5.0]])
+        >>> indptr, indices = cell_list.get_atoms_sparse(pos, radius=3.0)
+        >>> print(indptr)
+        [ 0 13 28 36]
+        >>> print(indices[indptr[2] : indptr[3]])
+        [ 46  55 273 268 269 272 274 275]
+        """
+        cdef np.ndarray indptr, indices, distances
+
+        if len(coord) == 0:
+            indptr = np.zeros(1, dtype=np.int64)
+            indices = np.zeros(0, dtype=np.int32)
+            if return_distances:
+                return indptr, indices, np.zeros(0, dtype=np.float32)
+            else:
+                return indptr, indices
+        
+        # Handle periodicity for the input coordinates
+        if self._periodic:
+            coord = move_inside_box(coord, self._box)
+        # Convert input parameters into a uniform format
+        coord, radius, _, _ = _prepare_vectorization(coord, radius, np.float32)
+        sq_radii = radius * radius
+        cell_radii = np.ceil(radius / self._cellsize).astype(np.int32)
+
+        # First pass: Count the adjacent atoms for each position
+        indptr = np.zeros(len(coord) + 1, dtype=np.int64)
+        indices = np.zeros(0, dtype=np.int32)
+        distances = np.zeros(0, dtype=np.float32)
+        self._find_atoms_sparse(
+            coord, sq_radii, cell_radii, indptr, indices, distances,
+            False, False
+        )
+        np.cumsum(indptr, out=indptr)
+        # Second pass: Fill the indices
+        indices = np.zeros(indptr[-1], dtype=np.int32)
+        if return_distances:
+            distances = np.zeros(indptr[-1], dtype=np.float32)
+        self._find_atoms_sparse(
+            coord, sq_radii, cell_radii, indptr, indices, distances,
+            True, return_distances
+        )
+
+        # Handle periodicity for the output indices
+        if self._periodic:
+            indices %= self._orig_length
+        if return_distances:
+            return indptr, indices, distances
+        else:
+            return indptr, indices
+    
+
+    @cython.initializedcheck(False)
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void _find_atoms_sparse(self,
+                                 float32[:,:] coord,
+                                 float32[:] sq_radii,
+                                 int[:] cell_radii,
+                                 int64[:] indptr,
+                                 int[:] indices,
+                                 float32[:] distances,
+                                 bint fill,
+                                 bint fill_distances):
+        """
+        Find the atoms within the radius of each position.
+
+        If `fill` is false, only the number of atoms for the position
+        *i* is written into ``indptr[i+1]``.
+        Otherwise the atom indices (and distances) are written into
+        `indices` (and `distances`), starting at ``indptr[i]``.
+        """
+        cdef int length
+        cdef int* list_ptr
+        cdef float32 x1, y1, z1, x2, y2, z2
+        cdef float32 sq_dist, sq_radius
+        cdef int i=0, j=0, k=0
+        cdef int adj_i, adj_j, adj_k
+        cdef int pos_i, cell_i, atom_i
+        cdef int cell_r
+        cdef int64 array_i
+        
+        cdef ptr[:,:,:] cells = self._cells
+        cdef int[:,:,:] cell_length = self._cell_length
+
+        for pos_i in range(coord.shape[0]):
+            array_i = indptr[pos_i] if fill else 0
+            cell_r = cell_radii[pos_i]
+            sq_radius = sq_radii[pos_i]
+            x1 = coord[pos_i, 0]
+            y1 = coord[pos_i, 1]
+            z1 = coord[pos_i, 2]
+            self._get_cell_index(x1, y1, z1, &i, &j, &k)
+            # Look into cells of the indices and adjacent cells
+            # in all 3 dimensions
+            for adj_i in range(i-cell_r, i+cell_r+1):
+                if (adj_i >= 0 and adj_i < cells.shape[0]):
+                    for adj_j in range(j-cell_r, j+cell_r+1):
+                        if (adj_j >= 0 and adj_j < cells.shape[1]):
+                            for adj_k in range(k-cell_r, k+cell_r+1):
+                                if (adj_k >= 0 and adj_k < cells.shape[2]):
+                                    list_ptr = <int*>cells[adj_i, adj_j, adj_k]
+                                    length = cell_length[adj_i, adj_j, adj_k]
+                                    for cell_i in range(length):
+                                        atom_i = list_ptr[cell_i]
+                                        x2 = self._coord[atom_i, 0]
+                                        y2 = self._coord[atom_i, 1]
+                                        z2 = self._coord[atom_i, 2]
+                                        sq_dist = squared_distance(
+                                            x1, y1, z1, x2, y2, z2
+                                        )
+                                        if sq_dist > sq_radius:
+                                            continue
+                                        if fill:
+                                            indices[array_i] = atom_i
+                                            if fill_distances:
+                                                distances[array_i] \
+                                                    = sqrt(sq_dist)
+                                        array_i += 1
+            if not fill:
+                indptr[pos_i+1] = array_i
+    
+
+    def _create_sparse_adjacency_matrix(self, np.ndarray coord,
+                                        float32 threshold_distance):
+        """
+        Create the adjacency matrix for :meth:`create_adjacency_matrix()`
+        as :class:`scipy.sparse.csr_matrix`.
+        """
+        import scipy.sparse
+
+        if self._has_selection:
+            selection = np.asarray(self._selection, dtype=bool)
+            sel_indptr, indices = self.get_atoms_sparse(
+                coord[selection], threshold_distance
+            )
+            # Rows of atoms, that are not masked by the selection,
+            # are empty
+            counts = np.zeros(self._orig_length + 1, dtype=np.int64)
+            counts[1:][selection] = np.diff(sel_indptr)
+            indptr = np.cumsum(counts)
+        else:
+            indptr, indices = self.get_atoms_sparse(coord, threshold_distance)
+        matrix = scipy.sparse.csr_matrix(
+            (np.ones(len(indices), dtype=bool), indices, indptr),
+            shape=(self._orig_length, self._orig_length)
+        )
+        # Periodic copies of the same atom may result in duplicate
+        # entries
+        matrix.sum_duplicates()
+        return matrix
+
+
     @cython.boundscheck(False)
     @cython.wraparound(False)
     def get_atoms_in_cells(self, np.ndarray coord,
@@ -17,6 +17,11 @@ from .geometry import index_distance
 from .util import vector_dot
 
 
+# The maximum number of atom pair distances computed at once in
+# 'rmspd()'
+_RMSPD_BLOCK_SIZE = 2**22
+
+
 def rmsd(reference, subject):
     r"""
     Calculate the RMSD between two structures.
@@ -111,6 +116,12 @@ def rmspd(reference, subject, periodic=False, box=None):
         If subject is an :class:`AtomArrayStack` a :class:`ndarray`
         containing the RMSD for each model is returned.
     
+    Notes
+    -----
+    The distances are computed in blocks of atom pairs.
+    Hence, in contrast to the number of computed distances, the memory
+    requirement does not grow quadratically with the number of atoms.
+
     Warnings
     --------
     Internally, this function uses :func:`index_distance()`.
@@ -126,16 +137,47 @@ def rmspd(reference, subject, periodic=False, box=None):
     remove_pbc
     rmsd
     """
-    # Compute index pairs in reference structure -> pair_ij for j < i
-    reflen = reference.array_length()
-    index_i = np.repeat(np.arange(reflen), reflen)
-    index_j = np.tile(np.arange(reflen), reflen)
-    pairs = np.stack([index_i, index_j]).T
-    refdist = index_distance(reference, pairs, periodic=periodic, box=box)
-    subjdist = index_distance(subject, pairs, periodic=periodic, box=box)
+    ref_coord = coord(reference)
+    subj_coord = coord(subject)
+    n_atoms = ref_coord.shape[-2]
+    n_models = 1 if subj_coord.ndim == 2 else subj_coord.shape[0]
+
+    # As the distance matrix is symmetric, only the pairs 'i < j' are
+    # computed
+    # To avoid O(n^2) memory usage, the pairs are processed in blocks of
+    # consecutive rows of the distance matrix
+    row_lengths = np.arange(n_atoms - 1, -1, -1, dtype=np.int64)
+    row_offsets = np.zeros(n_atoms + 1, dtype=np.int64)
+    np.cumsum(row_lengths, out=row_offsets[1:])
+    max_pairs = max(_RMSPD_BLOCK_SIZE // n_models, 1)
+
+    sq_sum = np.zeros(subj_coord.shape[:-2], dtype=np.float64)
+    start = 0
+    while start < n_atoms:
+        # Take as many rows as fit into the block, but at least one
+        stop = np.searchsorted(
+            row_offsets, row_offsets[start] + max_pairs, side="right"
+        ) - 1
+        stop = min(max(stop, start + 1), n_atoms)
+        rows = np.arange(start, stop)
+        lengths = row_lengths[start:stop]
+        index_i = np.repeat(rows, lengths)
+        # For row 'i' the column indices run from 'i+1' to 'n-1'
+        index_j = np.arange(len(index_i)) + np.repeat(
+            rows + 1 - (row_offsets[start:stop] - row_offsets[start]),
+            lengths
+        )
+        pairs = np.stack([index_i, index_j], axis=-1)
+        refdist = index_distance(reference, pairs, periodic=periodic, box=box)
+        subjdist = index_distance(subject, pairs, periodic=periodic, box=box)
+        sq_sum += np.sum(
+            (subjdist - refdist).astype(np.float64)**2, axis=-1
+        )
+        start = stop
 
-    rmspd = np.sqrt(np.sum((subjdist - refdist)**2, axis = -1))/reflen
-    return rmspd
+    # Each pair 'i < j' represents also the pair 'j > i'
+    rmspd = np.sqrt(2 * sq_sum) / n_atoms
+    return rmspd[()] if rmspd.ndim == 0 else rmspd
 
 def rmsf(reference, subject):
     r"""
@@ -0,0 +1,391 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module provides functions for the calculation of sparse atom
+contact maps and quantities derived from them.
+"""
+
+__name__ = "biotite.structure"
+__author__ = "Patrick Kunzmann"
+__all__ = ["contact_map", "contact_map_iter", "contact_frequency",
+           "native_contact_fraction"]
+
+import numpy as np
+from .atoms import AtomArrayStack, coord as to_coord
+from .celllist import CellList
+from .error import BadStructureError
+from .geometry import index_distance
+
+
+def contact_map(atoms, cutoff, periodic=False, box=None):
+    """
+    Find all pairs of atoms within a cutoff distance of each other
+    in a structure.
+
+    In contrast to a dense *n x n* distance matrix, the contacts are
+    returned as sparse list of atom pairs.
+    The contacts are found via a :class:`CellList`, so that the
+    computation time and memory requirement are proportional to the
+    number of atoms and contacts.
+
+    Parameters
+    ----------
+    atoms : AtomArray or ndarray, dtype=float, shape=(n,3)
+        The atoms to find the contacts in.
+        Alternatively, coordinates can be provided directly as
+        :class:`ndarray`.
+    cutoff : float
+        Two atoms are in contact, if their distance is lower than or
+        equal to this value.
+    periodic : bool, optional
+        If set to true, periodic boundary conditions are taken into
+        account (minimum-image convention).
+        The `box` attribute of the `atoms` parameter is used for
+        calculation.
+        An alternative box can be provided via the `box` parameter.
+        By default, periodicity is ignored.
+    box : ndarray, shape=(3,3), optional
+        If this parameter is set, the given box is used instead of the
+        `box` attribute of `atoms`.
+
+    Returns
+    -------
+    pairs : ndarray, dtype=int, shape=(k,2)
+        The indices of the atoms in contact.
+        Each contact is reported once, with the lower index in the
+        first column.
+        The pairs are sorted by the first and then by the second index.
+    distances : ndarray, dtype=float32, shape=(k,)
+        The distance between the atoms of each pair.
+
+    See also
+    --------
+    contact_map_iter
+
+    Examples
+    --------
+
+    >>> ca = atom_array[atom_array.atom_name == "CA"]
+    >>> pairs, distances = contact_map(ca, cutoff=4.0)
+    >>> print(pairs[:5])
+    [[0 1]
+     [1 2]
+     [2 3]
+     [3 4]
+     [4 5]]
+    >>> print(distances[:5])
+    [3.876 3.861 3.871 3.846 3.867]
+    """
+    if isinstance(atoms, AtomArrayStack):
+        raise TypeError("Expected 'AtomArray' but got 'AtomArrayStack'")
+    coord = to_coord(atoms)
+    if periodic and box is None:
+        box = atoms.box
+        if box is None:
+            raise BadStructureError(
+                "The atoms have no associated box, "
+                "but periodic boundary conditions are requested"
+            )
+    if len(coord) == 0:
+        return _contacts_from_keys(*_empty_contacts(), 0)
+    cell_list = CellList(
+        coord, cell_size=cutoff, periodic=periodic,
+        box=box if periodic else None
+    )
+    return _contacts_from_keys(
+        *_find_contacts(cell_list, coord, cutoff, periodic), len(coord)
+    )
+
+
+def contact_map_iter(frames, cutoff, periodic=False):
+    """
+    Find all pairs of atoms within a cutoff distance of each other
+    in a stream of frames.
+
+    The frames are processed one after another, so that the
+    trajectory does not need to be loaded into memory at once.
+    A single :class:`CellList` is updated from frame to frame.
+
+    Parameters
+    ----------
+    frames : iterable object of AtomArray or AtomArrayStack
+        The frames to find the contacts in, for example obtained from
+        :func:`TrajectoryFile.read_iter_structure()`.
+        If an iterated element is an :class:`AtomArrayStack`, each of
+        its models is handled as a separate frame.
+        All frames must contain the same atoms.
+    cutoff : float
+        Two atoms are in contact, if their distance is lower than or
+        equal to this value.
+    periodic : bool, optional
+        If set to true, periodic boundary conditions are taken into
+        account (minimum-image convention).
+        The `box` attribute of each frame is required in this case.
+        By default, periodicity is ignored.
+
+    Yields
+    ------
+    pairs : ndarray, dtype=int, shape=(k,2)
+        The indices of the atoms in contact in the current frame,
+        as described in :func:`contact_map()`.
+    distances : ndarray, dtype=float32, shape=(k,)
+        The distance between the atoms of each pair.
+
+    See also
+    --------
+    contact_map
+    contact_frequency
+
+    Examples
+    --------
+
+    >>> ca = atom_array_stack[:, atom_array_stack.atom_name == "CA"]
+    >>> for pairs, distances in contact_map_iter(ca[:3], cutoff=7.0):
+    ...     print(len(pairs))
+    61
+    59
+    59
+    """
+    for keys, distances, n_atoms in _iter_contact_keys(
+        frames, cutoff, periodic
+    ):
+        yield _contacts_from_keys(keys, distances, n_atoms)
+
+
+def contact_frequency(frames, cutoff, periodic=False):
+    """
+    Get the relative frequency of each contact in a stream of frames.
+
+    The frequency is the number of frames, where the two atoms are in
+    contact, divided by the total number of frames.
+    Only the counts of the contacts found so far are kept in memory,
+    so that the trajectory does not need to be loaded at once.
+
+    Parameters
+    ----------
+    frames : iterable object of AtomArray or AtomArrayStack
+        The frames to find the contacts in.
+        If an iterated element is an :class:`AtomArrayStack`, each of
+        its models is handled as a separate frame.
+        All frames must contain the same atoms.
+    cutoff : float
+        Two atoms are in contact, if their distance is lower than or
+        equal to this value.
+    periodic : bool, optional
+        If set to true, periodic boundary conditions are taken into
+        account (minimum-image convention).
+        The `box` attribute of each frame is required in this case.
+        By default, periodicity is ignored.
+
+    Returns
+    -------
+    pairs : ndarray, dtype=int, shape=(k,2)
+        The indices of the atoms that are in contact in at least one
+        frame, as described in :func:`contact_map()`.
+    frequency : ndarray, dtype=float, shape=(k,)
+        The fraction of frames, in which the respective atoms are in
+        contact.
+
+    See also
+    --------
+    contact_map_iter
+
+    Examples
+    --------
+
+    >>> ca = atom_array_stack[:, atom_array_stack.atom_name == "CA"]
+    >>> pairs, frequency = contact_frequency(ca, cutoff=7.0)
+    >>> print(pairs[frequency < 0.5])
+    [[ 0  4]
+     [ 0 18]
+     [ 0 19]
+     [ 2 19]
+     [ 5  9]
+     [10 17]]
+    """
+    # The sorted keys of the contacts found so far
+    # and the corresponding number of frames with the contact
+    sorted_keys = np.zeros(0, dtype=np.int64)
+    counts = np.zeros(0, dtype=np.int64)
+    n_frames = 0
+    n_atoms = 0
+    for keys, _, n_atoms in _iter_contact_keys(frames, cutoff, periodic):
+        n_frames += 1
+        merged_keys, inverse = np.unique(
+            np.concatenate([sorted_keys, keys]), return_inverse=True
+        )
+        merged_counts = np.zeros(len(merged_keys), dtype=np.int64)
+        merged_counts[inverse[:len(sorted_keys)]] = counts
+        # The keys are unique within a frame
+        merged_counts[inverse[len(sorted_keys):]] += 1
+        sorted_keys = merged_keys
+        counts = merged_counts
+    if n_frames == 0:
+        raise ValueError("At least one frame must be given")
+
+    pairs, _ = _contacts_from_keys(sorted_keys, None, n_atoms)
+    return pairs, counts / n_frames
+
+
+def native_contact_fraction(reference, frames, cutoff, periodic=False):
+    """
+    Compute the fraction of native contacts *Q* for each frame of a
+    trajectory.
+
+    The native contacts are the pairs of atoms within the `cutoff`
+    distance in the `reference` structure.
+    *Q* is the fraction of these pairs, whose distance is also within
+    the `cutoff` in the respective frame.
+    Only the distances of the native contacts are computed for each
+    frame, hence neither the entire distance matrix nor the trajectory
+    is kept in memory.
+
+    Parameters
+    ----------
+    reference : AtomArray
+        The reference (native) structure.
+    frames : iterable object of AtomArray or AtomArrayStack
+        The frames to compute *Q* for.
+        If an iterated element is an :class:`AtomArrayStack`, each of
+        its models is handled as a separate frame.
+        All frames must contain the same atoms as the `reference`.
+    cutoff : float
+        Two atoms are in contact, if their distance is lower than or
+        equal to this value.
+    periodic : bool, optional
+        If set to true, periodic boundary conditions are taken into
+        account (minimum-image convention).
+        The `box` attribute of the reference and each frame is required
+        in this case.
+        By default, periodicity is ignored.
+
+    Returns
+    -------
+    q : ndarray, dtype=float, shape=(m,)
+        The fraction of native contacts for each frame.
+
+    Notes
+    -----
+    Usually, contacts between atoms that are close in sequence are not
+    meaningful, as they are always in contact.
+    Therefore, it is advisable to choose the atoms accordingly, e.g.
+    only heavy atoms or only *CA* atoms.
+
+    Examples
+    --------
+
+    >>> ca = atom_array_stack[:, atom_array_stack.atom_name == "CA"]
+    >>> q = native_contact_fraction(ca[0], ca, cutoff=7.0)
+    >>> print(q[:5])
+    [1.000 0.951 0.934 0.951 0.984]
+    """
+    native_pairs, _ = contact_map(reference, cutoff, periodic)
+    n_atoms = reference.array_length()
+
+    q = []
+    for coord, box in _iter_models(frames, periodic):
+        if coord.shape[0] != n_atoms:
+            raise BadStructureError(
+                f"The frame has {coord.shape[0]} atoms, "
+                f"but the reference has {n_atoms} atoms"
+            )
+        if len(native_pairs) == 0:
+            q.append(np.nan)
+            continue
+        distances = index_distance(
+            coord, native_pairs, periodic=periodic, box=box
+        )
+        q.append(np.count_nonzero(distances <= cutoff) / len(native_pairs))
+    return np.array(q, dtype=float)
+
+
+def _iter_models(frames, periodic):
+    """
+    Iterate over the coordinates and the box of each model in the given
+    frames.
+    """
+    for frame in frames:
+        if isinstance(frame, AtomArrayStack):
+            coord = frame.coord
+            box = frame.box
+        else:
+            coord = frame.coord[np.newaxis, ...]
+            box = frame.box[np.newaxis, ...] if frame.box is not None \
+                  else None
+        if periodic and box is None:
+            raise BadStructureError(
+                "The frame has no associated box, "
+                "but periodic boundary conditions are requested"
+            )
+        for model_i in range(len(coord)):
+            yield coord[model_i], box[model_i] if periodic else None
+
+
+def _iter_contact_keys(frames, cutoff, periodic):
+    """
+    Find the contacts in each model of the given frames and yield them
+    as sorted keys ``i * n + j``, together with the distances and
+    the number of atoms *n*.
+    """
+    n_atoms = None
+    cell_list = None
+    for coord, box in _iter_models(frames, periodic):
+        if n_atoms is None:
+            n_atoms = coord.shape[0]
+        elif coord.shape[0] != n_atoms:
+            raise BadStructureError(
+                f"The frame has {coord.shape[0]} atoms, "
+                f"but the first frame has {n_atoms} atoms"
+            )
+        if n_atoms == 0:
+            yield (*_empty_contacts(), n_atoms)
+            continue
+        if cell_list is None:
+            cell_list = CellList(
+                coord, cell_size=cutoff, periodic=periodic, box=box
+            )
+        else:
+            cell_list.update(coord, box=box)
+        yield (*_find_contacts(cell_list, coord, cutoff, periodic), n_atoms)
+
+
+def _find_contacts(cell_list, coord, cutoff, periodic):
+    """
+    Find the contacts of the given atoms in the given cell list and
+    return them as sorted keys ``i * n + j`` with ``i < j`` and the
+    corresponding distances.
+    """
+    n_atoms = coord.shape[0]
+    indptr, index_j, distances = cell_list.get_atoms_sparse(
+        coord, cutoff, return_distances=True
+    )
+    index_i = np.repeat(np.arange(n_atoms), np.diff(indptr))
+    # Each contact is found from both atoms and each atom is found by
+    # itself -> keep only pairs with 'i < j'
+    mask = index_i < index_j
+    keys = index_i[mask].astype(np.int64) * n_atoms + index_j[mask]
+    distances = distances[mask]
+    if periodic:
+        # Multiple periodic copies of an atom may be within the cutoff
+        # -> only the closest copy is kept
+        order = np.lexsort((distances, keys))
+        keys = keys[order]
+        distances = distances[order]
+        is_first = np.ones(len(keys), dtype=bool)
+        is_first[1:] = keys[1:] != keys[:-1]
+        return keys[is_first], distances[is_first]
+    else:
+        order = np.argsort(keys)
+        return keys[order], distances[order]
+
+
+def _empty_contacts():
+    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+
+def _contacts_from_keys(keys, distances, n_atoms):
+    pairs = np.stack([keys // n_atoms, keys % n_atoms], axis=-1) \
+            if n_atoms > 0 else np.zeros((0, 2), dtype=np.int64)
+    return pairs, distances
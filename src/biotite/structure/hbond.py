@@ -8,13 +8,14 @@ This module provides functions for hydrogen bonding calculation.
 
 __name__ = "biotite.structure"
 __author__ = "Daniel Bauer, Patrick Kunzmann"
-__all__ = ["hbond", "hbond_frequency"]
+__all__ = ["hbond", "hbond_iter", "hbond_frequency"]
 
 import warnings
 from .geometry import distance, angle
 import numpy as np
 from .atoms import AtomArrayStack, stack
 from .celllist import CellList
+from .error import BadStructureError
 
 
 def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
@@ -118,6 +119,7 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
 
     See Also
     --------
+    hbond_iter
     hbond_frequency
 
     References
@@ -228,6 +230,298 @@ def hbond(atoms, selection1=None, selection2=None, selection1_type='both',
         return triplets, mask
 
 
+def hbond_iter(frames, selection1=None, selection2=None,
+               selection1_type='both', cutoff_dist=2.5, cutoff_angle=120,
+               donor_elements=('O', 'N', 'S'),
+               acceptor_elements=('O', 'N', 'S'), periodic=False):
+    r"""
+    Find hydrogen bonds in a stream of frames using the Baker-Hubbard
+    algorithm. :footcite:`Baker1984`
+
+    In contrast to :func:`hbond()`, the frames are processed one after
+    another, so that the trajectory does not need to be loaded into
+    memory at once.
+    A single :class:`CellList` is updated from frame to frame and only
+    the Donor-H..Acceptor candidates within the cutoff distance in
+    each frame are evaluated.
+    The occurrence of each hydrogen bond in each frame is recorded in a
+    bit-packed mask.
+
+    Parameters
+    ----------
+    frames : iterable object of AtomArray or AtomArrayStack
+        The frames to find hydrogen bonds in, for example obtained from
+        :func:`TrajectoryFile.read_iter_structure()`.
+        If an iterated element is an :class:`AtomArrayStack`, each of
+        its models is handled as a separate frame.
+        All frames must contain the same atoms.
+        The atoms annotations and the :class:`BondList` are taken from
+        the first frame.
+    selection1, selection2: ndarray or None
+        Boolean mask for atoms to limit the hydrogen bond search to
+        specific sections of the model. The length must match the
+        number of atoms in each frame. If None is given, all atoms are
+        used instead. (Default: None)
+    selection1_type: {'acceptor', 'donor', 'both'}, optional (default: 'both')
+        Determines the type of `selection1`.
+        The type of `selection2` is chosen accordingly
+        ('both' or the opposite).
+        (Default: 'both')
+    cutoff_dist : float, optional
+        The maximal distance between the hydrogen and acceptor to be
+        considered a hydrogen bond. (Default: 2.5)
+    cutoff_angle : float, optional
+        The angle cutoff in degree between Donor-H..Acceptor to be
+        considered a hydrogen bond (default: 120).
+    donor_elements, acceptor_elements: tuple of str
+        Elements to be considered as possible donors or acceptors
+        (Default: O, N, S).
+    periodic : bool, optional
+        If true, hydrogen bonds can also be detected in periodic
+        boundary conditions.
+        The `box` attribute of each frame is required in this case.
+        (Default: False).
+
+    Returns
+    -------
+    triplets : ndarray, dtype=int, shape=(n,3)
+        *n x 3* matrix containing the indices of every Donor-H..Acceptor
+        interaction that is available in any of the frames.
+        *n* is the number of found interactions.
+        The three matrix columns are *D_index*, *H_index*, *A_index*.
+        The interactions are ordered by their first occurrence.
+    packed_mask : ndarray, dtype=uint8, shape=(m,ceil(n/8))
+        Bit-packed *m x n* matrix that shows if an interaction with
+        index *n* in `triplets` is present in the frame *m*.
+        The boolean matrix is obtained via
+        ``numpy.unpackbits(packed_mask, axis=1, count=n).astype(bool)``.
+        :func:`hbond_frequency()` accepts this mask directly, if the
+        number of interactions is given via its `n_bonds` parameter.
+
+    See Also
+    --------
+    hbond
+    hbond_frequency
+
+    Examples
+    --------
+
+    >>> triplets, packed_mask = hbond_iter(atom_array_stack)
+    >>> mask = np.unpackbits(
+    ...     packed_mask, axis=1, count=len(triplets)
+    ... ).astype(bool)
+    >>> hbonds_per_model = np.count_nonzero(mask, axis=1)
+    >>> print(hbonds_per_model)
+    [14 14 14 12 11 12  9 13  9 14 13 13 14 11 11 12 11 14 14 13 14 13 15 17
+     14 12 15 12 12 13 13 13 12 12 11 14 10 11]
+
+    References
+    ----------
+
+    .. footbibliography::
+    """
+    if selection1_type not in ("both", "donor", "acceptor"):
+        raise ValueError(f"Unkown selection type '{selection1_type}'")
+
+    # The following variables are set up from the first frame
+    n_atoms = None
+    donor_h_i = None
+    acceptor_i = None
+    associated_donor_indices = None
+    is_allowed = None
+
+    # Sorted keys of the triplets found so far and their corresponding
+    # index in 'triplets'
+    # As each donor hydrogen has exactly one associated donor,
+    # the key is built only from the hydrogen and the acceptor index
+    sorted_keys = np.zeros(0, dtype=np.int64)
+    sorted_key_indices = np.zeros(0, dtype=int)
+    triplets = []
+    packed_rows = []
+    cell_list = None
+
+    for frame in frames:
+        if isinstance(frame, AtomArrayStack):
+            coord = frame.coord
+            box = frame.box
+            frame = frame[0]
+        else:
+            coord = frame.coord[np.newaxis, ...]
+            box = frame.box[np.newaxis, ...] if frame.box is not None \
+                  else None
+        if periodic and box is None:
+            raise BadStructureError(
+                "The frame has no associated box, "
+                "but periodic boundary conditions are requested"
+            )
+
+        if n_atoms is None:
+            n_atoms = frame.array_length()
+            (
+                donor_h_i, acceptor_i, associated_donor_indices, is_allowed
+            ) = _setup_hbond_iter(
+                frame, selection1, selection2, selection1_type,
+                donor_elements, acceptor_elements,
+                box[0] if periodic else None
+            )
+        elif frame.array_length() != n_atoms:
+            raise BadStructureError(
+                f"The frame has {frame.array_length()} atoms, "
+                f"but the first frame has {n_atoms} atoms"
+            )
+
+        for model_i in range(len(coord)):
+            model_coord = coord[model_i]
+            model_box = box[model_i] if periodic else None
+            if len(donor_h_i) == 0 or len(acceptor_i) == 0:
+                packed_rows.append(np.zeros(0, dtype=np.uint8))
+                continue
+
+            # Find Donor-H..Acceptor candidates within the cutoff
+            # distance using a cell list, that is updated for each frame
+            if cell_list is None:
+                cell_list = CellList(
+                    model_coord[donor_h_i], cell_size=cutoff_dist,
+                    periodic=periodic, box=model_box
+                )
+            else:
+                cell_list.update(model_coord[donor_h_i], box=model_box)
+            candidates = cell_list.get_atoms(
+                model_coord[acceptor_i], radius=cutoff_dist
+            )
+            acc_pos, col_pos = np.nonzero(candidates != -1)
+            cand_acceptor_i = acceptor_i[acc_pos]
+            cand_donor_h_i = donor_h_i[candidates[acc_pos, col_pos]]
+            cand_donor_i = associated_donor_indices[cand_donor_h_i]
+            # Remove entries where donor and acceptor are the same
+            # and entries not allowed by the selections
+            valid = (
+                (cand_donor_i != cand_acceptor_i)
+                & is_allowed(cand_donor_i, cand_acceptor_i)
+            )
+            keys = (
+                cand_donor_h_i[valid].astype(np.int64) * n_atoms
+                + cand_acceptor_i[valid]
+            )
+            if periodic:
+                # Periodic copies may be reported multiple times
+                keys = np.unique(keys)
+            hbond_h_i = keys // n_atoms
+            hbond_acceptor_i = keys % n_atoms
+            hbond_donor_i = associated_donor_indices[hbond_h_i]
+            is_hbond = _is_hbond(
+                model_coord[hbond_donor_i],
+                model_coord[hbond_h_i],
+                model_coord[hbond_acceptor_i],
+                model_box, cutoff_dist=cutoff_dist, cutoff_angle=cutoff_angle
+            )
+            keys = keys[is_hbond]
+
+            # Map the keys to indices in 'triplets'
+            # and register hydrogen bonds, that are new in this frame
+            pos = np.searchsorted(sorted_keys, keys)
+            is_known = np.zeros(len(keys), dtype=bool)
+            in_range = pos < len(sorted_keys)
+            is_known[in_range] = sorted_keys[pos[in_range]] == keys[in_range]
+            new_keys = keys[~is_known]
+            new_indices = np.arange(
+                len(triplets), len(triplets) + len(new_keys)
+            )
+            new_h_i = new_keys // n_atoms
+            triplets.extend(zip(
+                associated_donor_indices[new_h_i],
+                new_h_i,
+                new_keys % n_atoms
+            ))
+            sorted_keys = np.concatenate([sorted_keys, new_keys])
+            sorted_key_indices = np.concatenate(
+                [sorted_key_indices, new_indices]
+            )
+            order = np.argsort(sorted_keys, kind="stable")
+            sorted_keys = sorted_keys[order]
+            sorted_key_indices = sorted_key_indices[order]
+
+            row = np.zeros(len(triplets), dtype=bool)
+            row[
+                sorted_key_indices[np.searchsorted(sorted_keys, keys)]
+            ] = True
+            packed_rows.append(np.packbits(row))
+
+    if n_atoms is None:
+        raise ValueError("At least one frame must be given")
+
+    triplets = np.array(triplets, dtype=int).reshape(-1, 3)
+    # Rows from earlier frames are shorter, since fewer hydrogen bonds
+    # were known at that time -> pad with unset bits
+    packed_mask = np.zeros(
+        (len(packed_rows), (len(triplets) + 7) // 8), dtype=np.uint8
+    )
+    for i, row in enumerate(packed_rows):
+        packed_mask[i, :len(row)] = row
+    return triplets, packed_mask
+
+
+def _setup_hbond_iter(array, selection1, selection2, selection1_type,
+                      donor_elements, acceptor_elements, box):
+    """
+    Determine the donor hydrogen and acceptor candidates for
+    :func:`hbond_iter()` and a function that checks whether a
+    donor-acceptor pair is allowed by the selections.
+    """
+    if not (array.element == "H").any():
+        warnings.warn(
+            "Input structure does not contain hydrogen atoms, "
+            "hence no hydrogen bonds can be identified"
+        )
+
+    if selection1 is None:
+        selection1 = np.ones(array.array_length(), dtype=bool)
+    if selection2 is None:
+        selection2 = np.ones(array.array_length(), dtype=bool)
+
+    if selection1_type == 'both':
+        donor_selection = selection1 | selection2
+        acceptor_selection = selection1 | selection2
+        def is_allowed(donor_i, acceptor_i):
+            # Equivalent to the selection combinations in 'hbond()'
+            return (
+                (selection1[donor_i] & selection2[acceptor_i])
+                | (selection2[donor_i] & selection1[acceptor_i])
+            )
+    else:
+        if selection1_type == 'donor':
+            donor_selection, acceptor_selection = selection1, selection2
+        else:
+            donor_selection, acceptor_selection = selection2, selection1
+        def is_allowed(donor_i, acceptor_i):
+            # Already ensured by the donor and acceptor candidates
+            return np.ones(len(donor_i), dtype=bool)
+
+    donor_mask = donor_selection & np.isin(array.element, donor_elements)
+    acceptor_mask = acceptor_selection \
+                    & np.isin(array.element, acceptor_elements)
+
+    if array.bonds is not None:
+        donor_h_mask, associated_donor_indices = _get_bonded_h(
+            array, donor_mask, array.bonds
+        )
+    else:
+        warnings.warn(
+            "Input structure has no associated 'BondList', "
+            "Hydrogen atoms bonded to donors are detected by distance"
+        )
+        donor_h_mask, associated_donor_indices = _get_bonded_h_via_distance(
+            array, donor_mask, box
+        )
+
+    return (
+        np.where(donor_h_mask)[0],
+        np.where(acceptor_mask)[0],
+        associated_donor_indices,
+        is_allowed
+    )
+
+
 def _hbond(atoms, donor_mask, acceptor_mask,
            donor_element_mask, acceptor_element_mask,
            cutoff_dist, cutoff_angle, box):
@@ -268,14 +562,18 @@ def _hbond(atoms, donor_mask, acceptor_mask,
         dtype=bool
     )
     periodic = False if box is None else True
+    cell_list = None
     for model_i in range(atoms.stack_depth()):
         donor_h_coord = coord[model_i, donor_h_mask]
         acceptor_coord = coord[model_i, acceptor_mask]
         box_for_model = box[model_i] if box is not None else None
-        cell_list = CellList(
-            donor_h_coord, cell_size=cutoff_dist,
-            periodic=periodic, box=box_for_model
-        )
+        if cell_list is None:
+            cell_list = CellList(
+                donor_h_coord, cell_size=cutoff_dist,
+                periodic=periodic, box=box_for_model
+            )
+        else:
+            cell_list.update(donor_h_coord, box=box_for_model)
         possible_bonds |= cell_list.get_atoms_in_cells(
             acceptor_coord, as_mask=True
         )
@@ -371,7 +669,7 @@ def _is_hbond(donor, donor_h, acceptor, box, cutoff_dist, cutoff_angle):
     return (theta > cutoff_angle_rad) & (dist <= cutoff_dist)
 
 
-def hbond_frequency(mask):
+def hbond_frequency(mask, n_bonds=None):
     """
     Get the relative frequency of each hydrogen bond in a multi-model
     structure.
@@ -381,8 +679,15 @@ def hbond_frequency(mask):
     
     Parameters
     ----------
-    mask: ndarray, dtype=bool, shape=(m,n)
-        Input mask obtained from `hbond` function.
+    mask: ndarray, dtype=bool, shape=(m,n) or dtype=uint8, shape=(m,ceil(n/8))
+        Input mask obtained from `hbond` function or bit-packed mask
+        obtained from `hbond_iter` function.
+        A bit-packed mask is processed in chunks of models, so that it
+        is never unpacked as a whole.
+    n_bonds : int, optional
+        The number of interactions *n* in a bit-packed mask, i.e. the
+        length of the `triplets` obtained from `hbond_iter`.
+        Must be given if and only if `mask` is bit-packed.
     
     Returns
     -------
@@ -394,6 +699,7 @@ def hbond_frequency(mask):
     See Also
     --------
     hbond
+    hbond_iter
 
     Examples
     --------
@@ -406,4 +712,21 @@ def hbond_frequency(mask):
      0.132 0.053 0.026 0.158 0.026 0.868 0.211 0.026 0.921 0.316 0.079 0.237
      0.105 0.421 0.079 0.026 1.000 0.053 0.132 0.026 0.184]
     """
-    return mask.sum(axis=0)/len(mask)
+    if n_bonds is None:
+        return mask.sum(axis=0)/len(mask)
+    
+    if mask.dtype != np.uint8:
+        raise TypeError("A bit-packed mask must have the 'uint8' dtype")
+    if mask.shape[1] != (n_bonds + 7) // 8:
+        raise IndexError(
+            f"A bit-packed mask for {n_bonds} bonds must have "
+            f"{(n_bonds + 7) // 8} columns, but it has {mask.shape[1]}"
+        )
+    CHUNK_SIZE = 1024
+    counts = np.zeros(mask.shape[1] * 8, dtype=int)
+    for start in range(0, len(mask), CHUNK_SIZE):
+        counts += np.unpackbits(
+            mask[start : start+CHUNK_SIZE], axis=1
+        ).sum(axis=0, dtype=int)
+    # Remove the padding bits
+    return counts[:n_bonds]/len(mask)
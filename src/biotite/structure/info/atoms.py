@@ -6,36 +6,10 @@ __name__ = "biotite.structure.info"
 __author__ = "Patrick Kunzmann"
 __all__ = ["residue"]
 
-from os.path import join, dirname, realpath
-import msgpack
 import numpy as np
 from ..atoms import AtomArray
 from ..bonds import BondList
-
-
-_residues = None
-
-
-def _init_dataset():
-    """
-    Load the residue dataset from MessagePack file.
-
-    Since loading the database is computationally expensive,
-    this is only done, when the residue database is actually required.
-    """
-    global _residues
-    if _residues is not None:
-        # Database is already initialized
-        return
-
-    # Residue data is taken from
-    # ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
-    # (2019/01/27)
-    _info_dir = dirname(realpath(__file__))
-    with open(join(_info_dir, "residues.msgpack"), "rb") as file:
-        _residues = msgpack.unpack(
-            file, use_list=False, raw=False
-        )
+from .ccd import get_dataset, find_residue
 
 
 def residue(res_name):
@@ -90,30 +64,36 @@ def residue(res_name):
      ['CB' 'HB3']
      ['OXT' 'HXT']]
     """
-    _init_dataset()
-    array_dict = _residues[res_name]
+    dataset = get_dataset("residues")
+    index = find_residue(dataset, res_name)
+    if index is None:
+        raise KeyError(res_name)
+    atom_offsets = dataset["atom_offset"]
+    atom_slice = slice(atom_offsets[index], atom_offsets[index+1])
+    bond_offsets = dataset["bond_offset"]
+    bond_slice = slice(bond_offsets[index], bond_offsets[index+1])
 
-    array = AtomArray(len(array_dict["res_name"]))
+    array = AtomArray(atom_slice.stop - atom_slice.start)
 
     array.add_annotation("charge", int)
 
-    array.res_name = array_dict["res_name"]
-    array.atom_name = array_dict["atom_name"]
-    array.element = array_dict["element"]
-    array.charge = array_dict["charge"]
-    array.hetero = array_dict["hetero"]
+    # Copy the values into the existing annotation arrays,
+    # as the dataset is read-only
+    array.res_name[:] = res_name
+    array.atom_name[:] = dataset["atom_name"][atom_slice].astype(str)
+    array.element[:] = dataset["element"][atom_slice].astype(str)
+    array.charge[:] = dataset["charge"][atom_slice]
+    array.hetero[:] = dataset["hetero"][atom_slice]
 
-    array.coord[:,0] = array_dict["coord_x"]
-    array.coord[:,1] = array_dict["coord_y"]
-    array.coord[:,2] = array_dict["coord_z"]
+    array.coord[:] = dataset["coord"][atom_slice]
 
     array.bonds = BondList(
         array.array_length(),
         bonds = np.stack([
-            array_dict["bond_i"],
-            array_dict["bond_j"],
-            array_dict["bond_type"]
+            dataset["bond_i"][bond_slice],
+            dataset["bond_j"][bond_slice],
+            dataset["bond_type"][bond_slice]
         ]).T
     )
 
-    return array
\ No newline at end of file
+    return array
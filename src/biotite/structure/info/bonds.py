@@ -8,34 +8,30 @@ __all__ = ["bond_dataset", "bond_order", "bond_type", "bonds_in_residue"]
 
 import warnings
 import copy
-from os.path import join, dirname, realpath
-import msgpack
 from ..bonds import BondType
+from .ccd import get_dataset, find_residue
 
 
-_intra_bonds = None
+# The complete bond dataset as nested dictionary,
+# only created when it is actually required
+_bond_dict = None
 
 
-def _init_dataset():
+def _bonds_in_residue(res_name):
     """
-    Load the bond dataset from MessagePack file.
-
-    Since loading the database is computationally expensive,
-    this is only done, when the bond database is actually required.
+    Get the bonds of the given residue as dictionary from the columnar
+    dataset, or `None` if the residue is unknown.
     """
-    global _intra_bonds
-    if _intra_bonds is not None:
-        # Database is already initialized
-        return
-
-    # Bonds are taken from
-    # ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
-    # (2019/01/27)
-    _info_dir = dirname(realpath(__file__))
-    with open(join(_info_dir, "intra_bonds.msgpack"), "rb") as file:
-        _intra_bonds= msgpack.unpack(
-            file, use_list=False, raw=False, strict_map_key=False
-        )
+    dataset = get_dataset("intra_bonds")
+    index = find_residue(dataset, res_name)
+    if index is None:
+        return None
+    offsets = dataset["bond_offset"]
+    bond_slice = slice(offsets[index], offsets[index+1])
+    atom_names_1 = dataset["atom_name_1"][bond_slice].astype(str).tolist()
+    atom_names_2 = dataset["atom_name_2"][bond_slice].astype(str).tolist()
+    bond_types = dataset["bond_type"][bond_slice].tolist()
+    return dict(zip(zip(atom_names_1, atom_names_2), bond_types))
 
 
 def bond_dataset():
@@ -56,9 +52,23 @@ def bond_dataset():
         Specifically, it uses a set of two atom names, that are bonded,
         as keys and the respective :class:`BondType`
         (represented by an integer) as values.
+
+    Notes
+    -----
+    The first call of this function creates the dictionary for all
+    residues in the dataset, which is computationally expensive.
+    Subsequent calls return a copy of the same dictionary.
+    If only the bonds of certain residues are required,
+    :func:`bonds_in_residue()` is much faster.
     """
-    _init_dataset()
-    return copy.copy(_intra_bonds)
+    global _bond_dict
+    if _bond_dict is None:
+        dataset = get_dataset("intra_bonds")
+        _bond_dict = {
+            res_name: _bonds_in_residue(res_name)
+            for res_name in dataset["res_name"].tolist()
+        }
+    return copy.copy(_bond_dict)
 
 
 def bond_order(res_name, atom_name1, atom_name2):
@@ -86,7 +96,6 @@ def bond_order(res_name, atom_name1, atom_name2):
     """
     warnings.warn("Please use `bond_type()` instead", DeprecationWarning)
 
-    _init_dataset()
     btype = bond_type(res_name, atom_name1, atom_name2)
     if btype is None:
         return None
@@ -132,8 +141,7 @@ def bond_type(res_name, atom_name1, atom_name2):
     >>> print(bond_type("PHE", "FOO", "BAR"))
     None
     """
-    _init_dataset()
-    group_bonds = _intra_bonds.get(res_name.upper())
+    group_bonds = _bonds_in_residue(res_name.upper())
     if group_bonds is None:
         return None
     # Try both atom aroders
@@ -195,5 +203,4 @@ def bonds_in_residue(res_name):
     H2  + N   -> BondType.SINGLE
     HXT + OXT -> BondType.SINGLE
     """
-    _init_dataset()
-    return copy.copy(_intra_bonds.get(res_name.upper()))
\ No newline at end of file
+    return _bonds_in_residue(res_name.upper())
\ No newline at end of file
@@ -0,0 +1,317 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+Access to the datasets extracted from the chemical components
+dictionary in a memory-mappable columnar format, for internal use in
+the `biotite.structure.info` package.
+
+On first access, a *MessagePack* dataset is converted into a set of
+*NumPy* arrays, which are written into the user cache directory
+(``$XDG_CACHE_HOME/biotite`` or the directory given by the
+``BIOTITE_CACHE_DIR`` environment variable).
+Subsequent accesses, also from other processes, memory-map these
+arrays, which is much faster than unpacking the *MessagePack* file and
+allows processes to share the memory.
+"""
+
+__name__ = "biotite.structure.info"
+__author__ = "Patrick Kunzmann"
+__all__ = ["get_dataset", "find_residue", "get_string"]
+
+import os
+import shutil
+import tempfile
+from os.path import join, dirname, realpath, expanduser, isdir
+import msgpack
+import numpy as np
+
+
+# Increment, if the layout of the converted datasets changes
+_FORMAT_VERSION = 1
+
+_info_dir = dirname(realpath(__file__))
+# The loaded datasets
+_datasets = {}
+
+
+def get_dataset(name):
+    """
+    Get the columns of the dataset with the given name.
+
+    Parameters
+    ----------
+    name : str
+        The name of the dataset, i.e. the name of the *MessagePack*
+        file without extension.
+
+    Returns
+    -------
+    dataset : dict (str -> ndarray)
+        The columns of the dataset.
+        The arrays are memory-mapped and read-only, if the cache
+        directory is writable.
+        Atom names and elements are stored as ASCII encoded byte
+        strings.
+        Each dataset contains the column ``'res_name'`` with the sorted
+        residue names.
+    """
+    dataset = _datasets.get(name)
+    if dataset is None:
+        dataset = _load_dataset(name)
+        _datasets[name] = dataset
+    return dataset
+
+
+def find_residue(dataset, res_name):
+    """
+    Find the index of a residue in a dataset.
+
+    Parameters
+    ----------
+    dataset : dict (str -> ndarray)
+        The dataset obtained from :func:`get_dataset()`.
+    res_name : str
+        The name of the residue.
+
+    Returns
+    -------
+    index : int or None
+        The index of the residue in the dataset.
+        `None` if the residue is not in the dataset.
+    """
+    res_names = dataset["res_name"]
+    index = np.searchsorted(res_names, res_name)
+    # Exact comparison, as 'searchsorted()' may truncate the residue
+    # name to the string length of the array
+    if index < len(res_names) and res_names[index] == res_name:
+        return int(index)
+    else:
+        return None
+
+
+def get_string(dataset, column, index):
+    """
+    Get a variable-length string from a dataset.
+
+    Parameters
+    ----------
+    dataset : dict (str -> ndarray)
+        The dataset obtained from :func:`get_dataset()`.
+    column : str
+        The name of the string column.
+    index : int
+        The index of the residue in the dataset.
+
+    Returns
+    -------
+    string : str
+        The string.
+    """
+    offsets = dataset[column + "_offset"]
+    return dataset[column][offsets[index] : offsets[index+1]] \
+        .tobytes().decode("utf-8")
+
+
+def _load_dataset(name):
+    source_path = join(_info_dir, name + ".msgpack")
+    stat = os.stat(source_path)
+    dir_name = (
+        f"{name}-{stat.st_size:x}-{stat.st_mtime_ns:x}-v{_FORMAT_VERSION}"
+    )
+
+    cache_dir = _cache_dir()
+    dataset_dir = join(cache_dir, dir_name)
+    if isdir(dataset_dir):
+        try:
+            return _read_columns(dataset_dir)
+        except (OSError, ValueError):
+            # Cache is broken -> convert the dataset again
+            pass
+
+    with open(source_path, "rb") as file:
+        data = msgpack.unpack(
+            file, use_list=False, raw=False, strict_map_key=False
+        )
+    columns = _CONVERTERS[name](data)
+    del data
+
+    try:
+        _write_columns(columns, cache_dir, dir_name)
+        _remove_stale(cache_dir, name, dir_name)
+        return _read_columns(dataset_dir)
+    except (OSError, ValueError):
+        # The cache directory is not writable
+        # -> keep the dataset in memory
+        return columns
+
+
+def _cache_dir():
+    """
+    Get the directory, where converted datasets are stored.
+    """
+    cache_dir = os.environ.get("BIOTITE_CACHE_DIR")
+    if cache_dir is not None:
+        return cache_dir
+    user_cache_dir = os.environ.get(
+        "XDG_CACHE_HOME", join(expanduser("~"), ".cache")
+    )
+    return join(user_cache_dir, "biotite")
+
+
+def _remove_stale(cache_dir, name, dir_name):
+    """
+    Remove the converted versions of the given dataset, that were
+    created from a different *MessagePack* file or format version.
+    """
+    for other_dir_name in os.listdir(cache_dir):
+        # Directory names have the form
+        # '<name>-<size>-<modification time>-v<version>'
+        if other_dir_name != dir_name \
+           and other_dir_name.rsplit("-", 3)[0] == name:
+                shutil.rmtree(
+                    join(cache_dir, other_dir_name), ignore_errors=True
+                )
+
+
+def _read_columns(dataset_dir):
+    return {
+        file_name[:-len(".npy")]: np.load(
+            join(dataset_dir, file_name), mmap_mode="r"
+        )
+        for file_name in os.listdir(dataset_dir)
+        if file_name.endswith(".npy")
+    }
+
+
+def _write_columns(columns, cache_dir, dir_name):
+    os.makedirs(cache_dir, exist_ok=True)
+    dataset_dir = join(cache_dir, dir_name)
+    # Write into a temporary directory first and rename it afterwards,
+    # so that other processes never see an incomplete dataset
+    temp_dir = tempfile.mkdtemp(prefix=".tmp-", dir=cache_dir)
+    try:
+        for column_name, array in columns.items():
+            np.save(join(temp_dir, column_name + ".npy"), array)
+        # 'mkdtemp()' creates a directory only accessible by the owner
+        os.chmod(temp_dir, 0o755)
+        os.rename(temp_dir, dataset_dir)
+    except OSError:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        if not isdir(dataset_dir):
+            raise
+        # Otherwise another process has written the dataset meanwhile
+
+
+def _offsets(counts):
+    """
+    Convert the number of elements per residue into the offsets of
+    each residue in a column.
+    """
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def _string_column(strings):
+    """
+    Convert strings into a column containing the concatenated
+    UTF-8 encoded strings and the corresponding offsets.
+    """
+    encoded = [string.encode("utf-8") for string in strings]
+    return (
+        np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        _offsets([len(string) for string in encoded])
+    )
+
+
+def _convert_intra_bonds(data):
+    res_names = sorted(data.keys())
+    bond_dicts = [data[res_name] for res_name in res_names]
+    atom_name_pairs = [
+        pair for bond_dict in bond_dicts for pair in bond_dict.keys()
+    ]
+    return {
+        "res_name": np.array(res_names, dtype=str),
+        "bond_offset": _offsets([len(bonds) for bonds in bond_dicts]),
+        "atom_name_1": np.array(
+            [atom_name_1 for atom_name_1, _ in atom_name_pairs], dtype="S"
+        ),
+        "atom_name_2": np.array(
+            [atom_name_2 for _, atom_name_2 in atom_name_pairs], dtype="S"
+        ),
+        "bond_type": np.array(
+            [bond_type for bond_dict in bond_dicts
+             for bond_type in bond_dict.values()],
+            dtype=np.uint8
+        ),
+    }
+
+
+def _convert_residues(data):
+    res_names = sorted(data.keys())
+    residues = [data[res_name] for res_name in res_names]
+
+    def concatenate(key, dtype):
+        return np.array(
+            [value for residue in residues for value in residue[key]],
+            dtype=dtype
+        )
+
+    return {
+        "res_name": np.array(res_names, dtype=str),
+        "atom_offset": _offsets(
+            [len(residue["atom_name"]) for residue in residues]
+        ),
+        "atom_name": concatenate("atom_name", "S"),
+        "element": concatenate("element", "S"),
+        "charge": concatenate("charge", np.int8),
+        "hetero": concatenate("hetero", bool),
+        "coord": np.stack([
+            concatenate("coord_x", np.float32),
+            concatenate("coord_y", np.float32),
+            concatenate("coord_z", np.float32),
+        ], axis=-1),
+        "bond_offset": _offsets(
+            [len(residue["bond_i"]) for residue in residues]
+        ),
+        "bond_i": concatenate("bond_i", np.int32),
+        "bond_j": concatenate("bond_j", np.int32),
+        "bond_type": concatenate("bond_type", np.uint8),
+    }
+
+
+def _convert_residue_names(data):
+    res_names = sorted(data.keys())
+    full_names, full_name_offsets = _string_column(
+        [data[res_name] for res_name in res_names]
+    )
+    return {
+        "res_name": np.array(res_names, dtype=str),
+        "full_name": full_names,
+        "full_name_offset": full_name_offsets,
+    }
+
+
+def _convert_link_types(data):
+    res_names = sorted(data.keys())
+    link_types, link_type_codes = np.unique(
+        [data[res_name] for res_name in res_names], return_inverse=True
+    )
+    return {
+        "res_name": np.array(res_names, dtype=str),
+        "link_type": link_types,
+        "link_type_code": link_type_codes.astype(np.uint8),
+    }
+
+
+# The datasets are taken from
+# ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
+# (2019/01/27)
+_CONVERTERS = {
+    "intra_bonds": _convert_intra_bonds,
+    "residues": _convert_residues,
+    "residue_names": _convert_residue_names,
+    "link_types": _convert_link_types,
+}
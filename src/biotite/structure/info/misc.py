@@ -6,18 +6,7 @@ __name__ = "biotite.structure.info"
 __author__ = "Patrick Kunzmann"
 __all__ = ["all_residues", "full_name", "link_type"]
 
-from os.path import join, dirname, realpath
-import msgpack
-
-
-_info_dir = dirname(realpath(__file__))
-# Data is taken from
-# ftp://ftp.wwpdb.org/pub/pdb/data/monomers/components.cif
-# (2019/01/27)
-with open(join(_info_dir, "residue_names.msgpack"), "rb") as file:
-    _res_names = msgpack.load(file, raw=False)
-with open(join(_info_dir, "link_types.msgpack"), "rb") as file:
-    _link_types = msgpack.load(file, raw=False)
+from .ccd import get_dataset, find_residue, get_string
 
 
 def all_residues():
@@ -36,7 +25,7 @@ def all_residues():
     >>> print(all_residues()[1000 : 1010])
     ['0Y4', '0Y5', '0Y7', '0Y8', '0Y9', '0YA', '0YB', '0YC', '0YD', '0YE']
     """
-    return list(_res_names.keys()) 
+    return get_dataset("residue_names")["res_name"].tolist()
 
 
 def full_name(res_name):
@@ -60,7 +49,11 @@ def full_name(res_name):
     >>> print(full_name("MAN"))
     alpha-D-mannopyranose
     """
-    return _res_names.get(res_name.upper())
+    dataset = get_dataset("residue_names")
+    index = find_residue(dataset, res_name.upper())
+    if index is None:
+        return None
+    return get_string(dataset, "full_name", index)
 
 
 def link_type(res_name):
@@ -88,4 +81,8 @@ def link_type(res_name):
     >>> print(link_type("HOH"))
     NON-POLYMER
     """
-    return _link_types.get(res_name.upper())
\ No newline at end of file
+    dataset = get_dataset("link_types")
+    index = find_residue(dataset, res_name.upper())
+    if index is None:
+        return None
+    return str(dataset["link_type"][dataset["link_type_code"][index]])
\ No newline at end of file
@@ -29,4 +29,5 @@ __author__ = "Patrick Kunzmann"
 
 from .ctab import *
 from .general import *
+from .batch import *
 from .trajfile import *
\ No newline at end of file
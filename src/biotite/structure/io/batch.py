@@ -0,0 +1,174 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+"""
+This module contains a function for loading a large number of structure
+files in parallel.
+"""
+
+# In contrast to other modules, '__name__' is not set to the package
+# name, as the worker functions and classes defined here must be
+# importable from their actual module, when they are pickled
+__author__ = "Patrick Kunzmann"
+__all__ = ["load_structures"]
+
+import io
+import os
+import itertools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from .general import load_structure
+
+
+def load_structures(file_paths, callback=None, n_processes=None,
+                    prefetch=None, template=None, **kwargs):
+    """
+    Load structures from a large number of structure files in parallel.
+
+    The files are parsed via :func:`load_structure()` in a pool of
+    worker processes.
+    The loaded structures are returned as iterator in the order of
+    the input files, so that only a limited number of structures needs
+    to be kept in memory at the same time.
+
+    Optionally, a `callback` function is applied to each structure
+    within the worker processes, e.g. to filter the structure or to
+    compute a property from it.
+    In this case only the return value of the `callback` is transferred
+    to the calling process, which is usually much less data than the
+    entire structure.
+
+    Parameters
+    ----------
+    file_paths : iterable object of str
+        The paths to the structure files.
+    callback : callable, optional
+        If given, this function is called with the loaded
+        :class:`AtomArray` or :class:`AtomArrayStack` as single
+        argument in the worker process.
+        The return value of the function is returned instead of the
+        structure.
+        As the function is transferred to the worker processes, it
+        must be picklable, i.e. it must be defined on the top level of
+        a module.
+    n_processes : int, optional
+        The number of worker processes.
+        By default, the number of CPUs is used.
+        If set to 1, the structures are loaded in the calling process.
+    prefetch : int, optional
+        The maximum number of structures that are loaded in advance,
+        before they are requested from the iterator.
+        By default, two structures per worker process are loaded in
+        advance.
+    template : AtomArray or AtomArrayStack or file-like object or str, optional
+        Only required when reading trajectory files.
+        The template is loaded and transferred to the worker processes
+        only once.
+    kwargs
+        Additional parameters will be passed to
+        :func:`load_structure()`.
+
+    Yields
+    ------
+    result : AtomArray or AtomArrayStack or object
+        The structure loaded from each file or the return value of
+        `callback` for this structure, respectively.
+
+    Notes
+    -----
+    The results are transferred from the worker processes via
+    :mod:`pickle`.
+    As the coordinates and annotation arrays of a structure are pickled
+    as raw memory buffers, this takes only a small fraction of the time
+    required for parsing the file.
+
+    If loading a file or the `callback` raises an exception, this
+    exception is raised when the result for the file would be returned
+    by the iterator.
+
+    Examples
+    --------
+
+    >>> import os.path
+    >>> file_paths = [
+    ...     os.path.join(path_to_structures, pdb_id + ".mmtf")
+    ...     for pdb_id in ("1l2y", "1gya", "1aki")
+    ... ]
+    >>> for atoms in load_structures(file_paths, n_processes=2, model=1):
+    ...     print(atoms.array_length())
+    304
+    1976
+    1079
+    """
+    if n_processes is None:
+        n_processes = os.cpu_count()
+    if n_processes < 1:
+        raise ValueError("At least one process is required")
+    if prefetch is None:
+        prefetch = 2 * n_processes
+    if prefetch < 1:
+        raise ValueError("At least one structure must be prefetched")
+    # Load the template only once instead of for each file
+    if isinstance(template, (io.IOBase, str)):
+        template = load_structure(template)
+
+    if n_processes == 1:
+        return (
+            _load(file_path, callback, template, kwargs)
+            for file_path in file_paths
+        )
+    else:
+        return _load_parallel(
+            iter(file_paths), n_processes, prefetch,
+            callback, template, kwargs
+        )
+
+
+def _load(file_path, callback, template, kwargs):
+    atoms = load_structure(file_path, template, **kwargs)
+    if callback is None:
+        return atoms
+    else:
+        return callback(atoms)
+
+
+def _load_parallel(file_paths, n_processes, prefetch,
+                   callback, template, kwargs):
+    # The callback and the template are transferred only once to each
+    # process
+    executor = ProcessPoolExecutor(
+        max_workers=n_processes,
+        initializer=_init_load_process,
+        initargs=(callback, template, kwargs)
+    )
+    # The futures of the submitted files in the order of the input
+    pending = deque()
+    try:
+        for file_path in itertools.islice(file_paths, prefetch):
+            pending.append(executor.submit(_load_in_process, file_path))
+        while pending:
+            result = pending.popleft().result()
+            # Submit the next file before the result is consumed,
+            # to keep the worker processes busy
+            for file_path in itertools.islice(file_paths, 1):
+                pending.append(executor.submit(_load_in_process, file_path))
+            yield result
+    finally:
+        # If the iterator is not exhausted, skip the remaining files
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+# Parameters for '_load()' in a process of the process pool
+_process_load_params = None
+
+def _init_load_process(callback, template, kwargs):
+    global _process_load_params
+    _process_load_params = (callback, template, kwargs)
+
+
+def _load_in_process(file_path):
+    return _load(file_path, *_process_load_params)
+
@@ -14,6 +14,7 @@ __all__ = ["load_structure", "save_structure"]
 import os.path
 import io
 from ..atoms import AtomArray, AtomArrayStack
+from ...file import remove_compression_suffix, compression_from_suffix
 
 
 def load_structure(file_path, template=None, **kwargs):
@@ -26,6 +27,9 @@ def load_structure(file_path, template=None, **kwargs):
     file extension.
     Trajectory files furthermore require specification of the `template`
     parameter.
+    Files compressed with *gzip*, *bzip2* or *xz*
+    (e.g. ``1l2y.cif.gz``) are decompressed on the fly, except for
+    trajectory files.
     
     Parameters
     ----------
@@ -59,8 +63,9 @@ def load_structure(file_path, template=None, **kwargs):
     if isinstance(template, (io.IOBase, str)):
         template = load_structure(template)
 
-    # We only need the suffix here
-    _, suffix = os.path.splitext(file_path)
+    # We only need the suffix of the uncompressed file here
+    _, suffix = os.path.splitext(remove_compression_suffix(file_path))
+    is_compressed = compression_from_suffix(file_path) is not None
     if suffix == ".pdb":
         from .pdb import PDBFile
         file = PDBFile.read(file_path)
@@ -122,6 +127,8 @@ def load_structure(file_path, template=None, **kwargs):
         # MOL files only contain a single model
         return array
     elif suffix in [".trr", ".xtc", ".tng", ".dcd", ".netcdf"]:
+        if is_compressed:
+            raise ValueError("Compressed trajectory files are not supported")
         if template is None:
             raise TypeError("Template must be specified for trajectory files")
         # filter template for atom ids if it is an unfiltered template
@@ -156,6 +163,8 @@ def save_structure(file_path, array, **kwargs):
     
     Internally this function uses a :class:`File` object, based on the
     file extension.
+    If the file extension is followed by ``.gz``, ``.bz2`` or ``.xz``,
+    the file is compressed accordingly, except for trajectory files.
     
     Parameters
     ----------
@@ -172,8 +181,9 @@ def save_structure(file_path, array, **kwargs):
     ValueError
         If the file format (i.e. the file extension) is unknown.
     """
-    # We only need the suffix here
-    _, suffix = os.path.splitext(file_path)
+    # We only need the suffix of the uncompressed file here
+    _, suffix = os.path.splitext(remove_compression_suffix(file_path))
+    is_compressed = compression_from_suffix(file_path) is not None
     if suffix == ".pdb":
         from .pdb import PDBFile
         file = PDBFile()
@@ -210,6 +220,8 @@ def save_structure(file_path, array, **kwargs):
         file.set_structure(array, **kwargs)
         file.write(file_path)
     elif suffix in [".trr", ".xtc", ".tng", ".dcd", ".netcdf"]:
+        if is_compressed:
+            raise ValueError("Compressed trajectory files are not supported")
         from .trr import TRRFile
         from .xtc import XTCFile
         from .tng import TNGFile
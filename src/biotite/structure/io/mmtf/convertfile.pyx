@@ -116,20 +116,7 @@ def get_structure(file, model=None, altloc="first",
     cdef int32[:] res_type_i = file["groupTypeList"]
     cdef np.ndarray index_list = file["groupIdList"]
     cdef int32[:] res_ids = index_list
-    cdef np.ndarray x_coord = file["xCoordList"]
-    cdef np.ndarray y_coord = file["yCoordList"]
-    cdef np.ndarray z_coord = file["zCoordList"]
-    cdef np.ndarray occupancy = file.get("occupancyList")
-    cdef np.ndarray b_factor
-    if "b_factor" in extra_fields:
-        b_factor = file["bFactorList"]
-    cdef np.ndarray atom_ids
-    if "atom_id" in extra_fields:
-        atom_ids = file["atomIdList"]
-    cdef np.ndarray all_altloc_ids
-    cdef np.ndarray inscode
-    all_altloc_ids = file.get("altLocList")
-    inscode = file.get("insCodeList")
+    cdef np.ndarray inscode = file.get("insCodeList")
 
 
     # Create arrays from 'groupList' list of dictionaries
@@ -167,6 +154,7 @@ def get_structure(file, model=None, altloc="first",
     cdef bint extra_charge
     cdef np.ndarray altloc_ids
     cdef np.ndarray inscode_array
+    cdef np.ndarray occupancy
 
 
     if model == None:
@@ -185,17 +173,21 @@ def get_structure(file, model=None, altloc="first",
 
         array = AtomArrayStack(depth, length)
         array.coord = np.stack(
-            [x_coord,
-             y_coord,
-             z_coord],
+            [file["xCoordList"],
+             file["yCoordList"],
+             file["zCoordList"]],
              axis=1
         ).reshape(depth, length, 3)
 
         # Create altloc array for the final filtering
-        if all_altloc_ids is not None:
-            altloc_ids = all_altloc_ids[:length]
+        if "altLocList" in file:
+            altloc_ids = file.get_array("altLocList", 0, length)
         else:
             altloc_ids = None
+        if "occupancyList" in file:
+            occupancy = file.get_array("occupancyList", 0, length)
+        else:
+            occupancy = None
 
         extra_charge = False
         if "ins_code" in extra_fields:
@@ -205,11 +197,15 @@ def get_structure(file, model=None, altloc="first",
             extra_charge = True
             array.add_annotation("charge", int)
         if "atom_id" in extra_fields:
-            array.set_annotation("atom_id", atom_ids[:length])
+            array.set_annotation(
+                "atom_id", file.get_array("atomIdList", 0, length)
+            )
         if "b_factor" in extra_fields:
-            array.set_annotation("b_factor", b_factor[:length])
+            array.set_annotation(
+                "b_factor", file.get_array("bFactorList", 0, length)
+            )
         if "occupancy" in extra_fields:
-            array.set_annotation("occupancy", occupancy[:length])
+            array.set_annotation("occupancy", occupancy)
 
         _fill_annotations(1, array, extra_charge,
                           chain_names, chains_per_model, res_per_chain,
@@ -243,27 +239,38 @@ def get_structure(file, model=None, altloc="first",
         start_i = np.sum(lengths[:model-1])
         stop_i = start_i + length
 
+        # Only decode the atom-wise arrays for the specified model
         array = AtomArray(length)
-        array.coord[:,0] = x_coord[start_i : stop_i]
-        array.coord[:,1] = y_coord[start_i : stop_i]
-        array.coord[:,2] = z_coord[start_i : stop_i]
+        array.coord[:,0] = file.get_array("xCoordList", start_i, stop_i)
+        array.coord[:,1] = file.get_array("yCoordList", start_i, stop_i)
+        array.coord[:,2] = file.get_array("zCoordList", start_i, stop_i)
 
         # Create altloc array for the final filtering
-        if all_altloc_ids is not None:
-            altloc_ids = np.array(all_altloc_ids[start_i : stop_i], dtype="U1")
+        if "altLocList" in file:
+            altloc_ids = np.array(
+                file.get_array("altLocList", start_i, stop_i), dtype="U1"
+            )
         else:
             altloc_ids = None
+        if "occupancyList" in file:
+            occupancy = file.get_array("occupancyList", start_i, stop_i)
+        else:
+            occupancy = None
 
         extra_charge = False
         if "charge" in extra_fields:
             extra_charge = True
             array.add_annotation("charge", int)
         if "atom_id" in extra_fields:
-            array.set_annotation("atom_id", atom_ids[start_i : stop_i])
+            array.set_annotation(
+                "atom_id", file.get_array("atomIdList", start_i, stop_i)
+            )
         if "b_factor" in extra_fields:
-            array.set_annotation("b_factor", b_factor[start_i : stop_i])
+            array.set_annotation(
+                "b_factor", file.get_array("bFactorList", start_i, stop_i)
+            )
         if "occupancy" in extra_fields:
-            array.set_annotation("occupancy", occupancy[start_i : stop_i])
+            array.set_annotation("occupancy", occupancy)
 
         _fill_annotations(model, array, extra_charge,
                           chain_names, chains_per_model, res_per_chain,
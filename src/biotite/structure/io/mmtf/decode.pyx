@@ -14,112 +14,202 @@ import numpy as np
 ctypedef np.int8_t int8
 ctypedef np.int16_t int16
 ctypedef np.int32_t int32
+ctypedef np.int64_t int64
 ctypedef np.uint8_t uint8
 ctypedef np.uint16_t uint16
 ctypedef np.uint32_t uint32
 ctypedef np.uint64_t uint64
 ctypedef np.float32_t float32
 
+ctypedef fused PackedType:
+    int8
+    int16
 
-def decode_array(int codec, bytes raw_bytes, int param):
-    cdef np.ndarray array
-    # Pass-through: 32-bit floating-point number array
-    if   codec == 1:
-        array = np.frombuffer(raw_bytes, dtype=">f4").astype(np.float32)
-        return array
-    # Pass-through: 8-bit signed integer array
-    elif codec == 2:
-        array = np.frombuffer(raw_bytes, dtype=">i1").astype(np.int8)
-        return array
-    # Pass-through: 16-bit signed integer array
-    elif codec == 3:
-        array = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
-        return array
-    # Pass-through: 32-bit signed integer array
-    elif codec == 4:
-        array = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
+ctypedef fused OutputType:
+    int32
+    float32
+
+
+# Codec -> (big-endian input dtype, output dtype) for pass-through codecs
+_PASS_THROUGH_DTYPES = {
+    1:  (">f4", np.float32),
+    2:  (">i1", np.int8),
+    3:  (">i2", np.int16),
+    4:  (">i4", np.int32),
+}
+# Codecs based on run-length encoding
+_RUN_LENGTH_CODECS = (6, 7, 8, 9)
+# Codecs based on recursive index (packed) encoding
+_PACKED_CODECS = (10, 12, 13, 14, 15)
+
+
+def decode_array(int codec, raw_bytes, int param,
+                 start=None, stop=None):
+    """
+    decode_array(codec, raw_bytes, param, start=None, stop=None)
+
+    Decode an MMTF encoded array.
+
+    If a range is given, only the values in this range are written into
+    the output array.
+    The encoded data after the end of the range is not decoded at all.
+    For codecs, that allow random access (pass-through and integer
+    encoding), the data before the start of the range is skipped
+    as well.
+
+    Parameters
+    ----------
+    codec : int
+        The MMTF codec ID.
+    raw_bytes : bytes-like object
+        The encoded data, without the 12 byte header.
+    param : int
+        The codec parameter.
+    start, stop : int, optional
+        The range of the decoded array to obtain, interpreted like a
+        Python slice.
+        By default the entire array is decoded.
+
+    Returns
+    -------
+    array : ndarray
+        The decoded array (range).
+    """
+    cdef np.ndarray encoded
+    cdef int length
+
+    if codec in _PASS_THROUGH_DTYPES or codec == 11:
+        if codec == 11:
+            in_dtype, out_dtype = ">i2", np.int16
+        else:
+            in_dtype, out_dtype = _PASS_THROUGH_DTYPES[codec]
+        itemsize = np.dtype(in_dtype).itemsize
+        start, stop = _resolve_range(len(raw_bytes) // itemsize, start, stop)
+        array = np.frombuffer(
+            raw_bytes, dtype=in_dtype,
+            count=stop-start, offset=start*itemsize
+        ).astype(out_dtype)
+        if codec == 11:
+            # Integer encoded 32-bit floating-point number array
+            return _decode_integer(param, array)
         return array
+
     # UTF8/ASCII fixed-length string array
     elif codec == 5:
-        array = np.frombuffer(raw_bytes, np.dtype("S" + str(param)))
+        start, stop = _resolve_range(len(raw_bytes) // param, start, stop)
+        array = np.frombuffer(
+            raw_bytes, np.dtype("S" + str(param)),
+            count=stop-start, offset=start*param
+        )
         return array.astype(np.dtype("U" + str(param)))
-    # Run-length encoded character array
-    elif codec == 6:
-        array = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
-        return np.frombuffer(_decode_run_length(array), dtype="U1")
-    # Run-length encoded 32-bit signed integer array
-    elif codec == 7:
-        array = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
-        return _decode_run_length(array)
-    # Delta & run-length encoded 32-bit signed integer array
-    elif codec == 8:
-        array = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
-        return _decode_delta(
-               _decode_run_length(array))
-    # Integer & run-length encoded 32-bit floating-point number array
-    elif codec == 9:
-        array = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
-        return _decode_integer(param, 
-               _decode_run_length(array))
-    # Integer & delta encoded
-    # & two-byte-packed 32-bit floating-point number array
-    elif codec == 10:
-        array = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
-        return _decode_integer(param, 
-               _decode_delta(
-               _decode_packed(array)))
-    # Integer encoded 32-bit floating-point number array
-    elif codec == 11:
-        array = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
-        return _decode_integer(param, array)
-    # Integer & two-byte-packed 32-bit floating-point number array
-    elif codec == 12:
-        array = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
-        return _decode_integer(param, 
-               _decode_packed(array))
-    # Integer & one-byte-packed 32-bit floating-point number array
-    elif codec == 13:
-        array = np.frombuffer(raw_bytes, dtype=">i1").astype(np.int8)
-        return _decode_integer(param, 
-               _decode_packed(array))
-    # Two-byte-packed 32-bit signed integer array
-    elif codec == 14:
-        array = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
-        return _decode_packed(array)
-    # One-byte-packed 32-bit signed integer array
-    elif codec == 15:
-        array = np.frombuffer(raw_bytes, dtype=">i1").astype(np.int8)
-        return _decode_packed(array)
+
+    elif codec in _RUN_LENGTH_CODECS:
+        encoded = np.frombuffer(raw_bytes, dtype=">i4").astype(np.int32)
+        # The sum of all run lengths
+        length = np.sum(encoded[1::2], dtype=np.int64)
+        start, stop = _resolve_range(length, start, stop)
+        if codec == 9:
+            # Integer & run-length encoded
+            # 32-bit floating-point number array
+            output = np.empty(stop - start, dtype=np.float32)
+            _decode_run_length(encoded, start, stop, False, param, output)
+            return output
+        output = np.empty(stop - start, dtype=np.int32)
+        _decode_run_length(
+            encoded, start, stop,
+            # Delta & run-length encoded 32-bit signed integer array
+            codec == 8,
+            1, output
+        )
+        if codec == 6:
+            # Run-length encoded character array
+            return output.view("U1")
+        # Run-length encoded 32-bit signed integer array
+        return output
+
+    elif codec in _PACKED_CODECS:
+        if codec in (13, 15):
+            encoded = np.frombuffer(raw_bytes, dtype=">i1").astype(np.int8)
+        else:
+            encoded = np.frombuffer(raw_bytes, dtype=">i2").astype(np.int16)
+        length = _packed_length(encoded)
+        start, stop = _resolve_range(length, start, stop)
+        if codec in (14, 15):
+            # Packed 32-bit signed integer array
+            output = np.empty(stop - start, dtype=np.int32)
+            _decode_packed(encoded, start, stop, False, 1, output)
+        else:
+            # Integer & (delta &) packed 32-bit floating-point number array
+            output = np.empty(stop - start, dtype=np.float32)
+            _decode_packed(encoded, start, stop, codec == 10, param, output)
+        return output
+
     else:
-        raise ValueError("Unknown codec with ID {codec}")
+        raise ValueError(f"Unknown codec with ID {codec}")
 
 
-def _decode_delta(np.ndarray array):
-    return np.cumsum(array, dtype=np.int32)
+def _resolve_range(length, start, stop):
+    """
+    Convert the given range into non-negative indices within the array
+    bounds, like a Python slice.
+    """
+    start, stop, _ = slice(start, stop).indices(length)
+    if stop < start:
+        stop = start
+    return start, stop
 
 
-def _decode_run_length(int32[:] array):
-    cdef int length = 0
-    cdef int i, j
-    cdef int value, repeat
-    # Determine length of output array by summing the run lengths
-    for i in range(1, array.shape[0], 2):
-        length += array[i]
-    cdef int32[:] output = np.zeros(length, dtype=np.int32)
-    # Fill output array
-    j = 0
-    for i in range(0, array.shape[0], 2):
-        value = array[i]
-        repeat = array[i+1]
-        output[j : j+repeat] = value
-        j += repeat
-    return np.asarray(output)
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _decode_run_length(const int32[:] encoded, int64 start, int64 stop,
+                       bint delta, int divisor, OutputType[:] output):
+    """
+    Decode a run-length encoded array in the given range into the
+    output array.
+    Optionally, delta and integer decoding is applied in the same pass.
+    """
+    cdef int i
+    cdef int64 j
+    cdef int32 value, repeat
+    cdef int64 run_start, run_stop
+    # The index in the decoded array, where the current run starts
+    cdef int64 pos = 0
+    # The accumulated value for delta decoding
+    cdef int32 acc = 0
 
+    for i in range(0, encoded.shape[0] - 1, 2):
+        if pos >= stop:
+            # The requested range is already decoded
+            break
+        value = encoded[i]
+        repeat = encoded[i+1]
+        run_start = max(pos, start)
+        run_stop = min(pos + repeat, stop)
+        if delta:
+            # Apply the part of the run before the range at once
+            if run_start > pos:
+                acc += <int32> (value * min(run_start - pos, repeat))
+            for j in range(run_start, run_stop):
+                acc += value
+                output[j - start] = acc
+        else:
+            for j in range(run_start, run_stop):
+                if OutputType is float32:
+                    output[j - start] = <float32> value / <float32> divisor
+                else:
+                    output[j - start] = value
+        pos += repeat
 
-ctypedef fused PackedType:
-    int8
-    int16
-def _decode_packed(PackedType[:] array):
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def _decode_packed(const PackedType[:] encoded, int64 start, int64 stop,
+                   bint delta, int divisor, OutputType[:] output):
+    """
+    Decode a recursive index (packed) encoded array in the given range
+    into the output array.
+    Optionally, delta and integer decoding is applied in the same pass.
+    """
     cdef int min_val, max_val
     if PackedType is int8:
         min_val = np.iinfo(np.int8).min
@@ -127,26 +217,44 @@ def _decode_packed(PackedType[:] array):
     else:
         min_val = np.iinfo(np.int16).min
         max_val = np.iinfo(np.int16).max
-    cdef int i, j
-    cdef int packed_val, unpacked_val
-    # Pessimistic size assumption:
-    # The maximum output array length is the input array length
-    # in case all values are within the type limits
-    cdef int32[:] output = np.zeros(array.shape[0], dtype=np.int32)
-    j = 0
-    unpacked_val = 0
-    for i in range(array.shape[0]):
-        packed_val = array[i]
+    cdef int i
+    cdef int packed_val
+    cdef int32 unpacked_val = 0
+    # The index in the decoded array
+    cdef int64 pos = 0
+    # The accumulated value for delta decoding
+    cdef int32 acc = 0
+
+    for i in range(encoded.shape[0]):
+        if pos >= stop:
+            # The requested range is already decoded
+            break
+        packed_val = encoded[i]
+        unpacked_val += packed_val
         if packed_val == max_val or packed_val == min_val:
-            unpacked_val += packed_val
-        else:
-            unpacked_val += packed_val
-            output[j] = unpacked_val
-            unpacked_val = 0
-            j += 1
-    # Trim to correct size and return
-    return np.asarray(output[:j])
+            # The value continues in the next element
+            continue
+        if delta:
+            acc += unpacked_val
+            unpacked_val = acc
+        if pos >= start:
+            if OutputType is float32:
+                output[pos - start] \
+                    = <float32> unpacked_val / <float32> divisor
+            else:
+                output[pos - start] = unpacked_val
+        pos += 1
+        unpacked_val = 0
+
+
+def _packed_length(np.ndarray encoded):
+    """
+    Get the length of the decoded array from a recursive index (packed)
+    encoded array.
+    """
+    limits = np.iinfo(encoded.dtype)
+    return np.count_nonzero((encoded != limits.min) & (encoded != limits.max))
 
 
 def _decode_integer(int divisor, np.ndarray array):
-    return np.divide(array, divisor, dtype=np.float32)
\ No newline at end of file
+    return np.divide(array, divisor, dtype=np.float32)
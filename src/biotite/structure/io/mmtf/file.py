@@ -12,7 +12,7 @@ import struct
 import copy
 import numpy as np
 import msgpack
-from ....file import File, is_binary, is_open_compatible
+from ....file import File, is_binary, is_open_compatible, open_file
 from ...error import BadStructureError
 from .decode import decode_array
 from .encode import encode_array
@@ -68,7 +68,7 @@ class MMTFFile(File, MutableMapping):
         mmtf_file = MMTFFile()
         # File name
         if is_open_compatible(file):
-            with open(file, "rb") as f:
+            with open_file(file, "rb") as f:
                 mmtf_file._content = msgpack.unpackb(
                     f.read(), use_list=True, raw=False
                 )
@@ -95,7 +95,7 @@ class MMTFFile(File, MutableMapping):
             self._content, use_bin_type=True, default=_encode_numpy
         )
         if is_open_compatible(file):
-            with open(file, "wb") as f:
+            with open_file(file, "wb") as f:
                 f.write(packed_bytes)
         else:
             if not is_binary(file):
@@ -171,6 +171,51 @@ class MMTFFile(File, MutableMapping):
         else:
             return None
     
+    def get_array(self, key, start=None, stop=None):
+        """
+        Obtain a range of an MMTF encoded array.
+
+        In contrast to indexing the file, only the values in the given
+        range are decoded.
+        This is useful to obtain for example the coordinates of a single
+        model from a file containing multiple models.
+
+        Parameters
+        ----------
+        key : str
+            The key for the encoded array.
+        start, stop : int, optional
+            The range of the array to obtain, interpreted like a Python
+            slice.
+            By default, the entire array is decoded.
+
+        Returns
+        -------
+        array : ndarray
+            The decoded array range.
+
+        Examples
+        --------
+
+        >>> import os.path
+        >>> mmtf_file = MMTFFile.read(
+        ...     os.path.join(path_to_structures, "1l2y.mmtf")
+        ... )
+        >>> print(mmtf_file.get_array("xCoordList", 304, 308))
+        [-6.919 -7.682 -6.840 -7.106]
+        """
+        data = self._content[key]
+        if isinstance(data, bytes) and data[0] == 0:
+            codec = struct.unpack(">i", data[0:4 ])[0]
+            param = struct.unpack(">i", data[8:12])[0]
+            # Use a view to avoid copying the encoded data
+            return decode_array(
+                codec, memoryview(data)[12:], param, start, stop
+            )
+        else:
+            # Value is not encoded
+            return np.asarray(data)[start:stop]
+
     def set_array(self, key, array, codec, param=0):
         length = len(array)
         raw_bytes = encode_array(array, codec, param)
@@ -187,7 +232,8 @@ class MMTFFile(File, MutableMapping):
             codec     = struct.unpack(">i", data[0:4 ])[0]
             length    = struct.unpack(">i", data[4:8 ])[0]
             param     = struct.unpack(">i", data[8:12])[0]
-            raw_bytes = data[12:]
+            # Use a view to avoid copying the encoded data
+            raw_bytes = memoryview(data)[12:]
             return decode_array(codec, raw_bytes, param)
         else:
             return data
@@ -6,10 +6,11 @@ __name__ = "biotite.structure.io.npz"
 __author__ = "Patrick Kunzmann"
 __all__ = ["NpzFile"]
 
+import io
 import numpy as np
 from ...atoms import Atom, AtomArray, AtomArrayStack
 from ...bonds import BondList
-from ....file import File, is_binary
+from ....file import File, is_binary, open_file, compression_from_suffix
 
 
 class NpzFile(File):
@@ -67,7 +68,7 @@ class NpzFile(File):
         npz_file = NpzFile()
         # File name
         if isinstance(file, str):
-            with open(file, "rb") as f:
+            with open_file(file, "rb") as f:
                 npz_file._data_dict = dict(np.load(f, allow_pickle=False))
         # File object
         else:
@@ -87,8 +88,15 @@ class NpzFile(File):
             Alternatively, a file path can be supplied.
         """
         if isinstance(file, str):
-            with open(file, "wb") as f:
-                np.savez(f, **self._data_dict)
+            with open_file(file, "wb") as f:
+                if compression_from_suffix(file) is None:
+                    np.savez(f, **self._data_dict)
+                else:
+                    # 'np.savez()' requires a seekable file,
+                    # but compressed file streams are not seekable
+                    buffer = io.BytesIO()
+                    np.savez(buffer, **self._data_dict)
+                    f.write(buffer.getvalue())
         else:
             if not is_binary(file):
                 raise TypeError("A file opened in 'binary' mode is required")
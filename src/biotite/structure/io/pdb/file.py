@@ -20,7 +20,10 @@ from ...filter import (
     filter_solvent,
 )
 from ...util import matrix_rotate
-from .hybrid36 import encode_hybrid36, decode_hybrid36, max_hybrid36_number
+from .hybrid36 import (
+    encode_hybrid36, decode_hybrid36, max_hybrid36_number,
+    _decode_hybrid36_array
+)
 
 
 # slice objects for readability
@@ -232,35 +235,15 @@ class PDBFile(TextFile):
         True
         """
         if model is None:
-            coord = np.zeros(
-                (len(self._model_start_i), self._get_model_length(), 3),
-                dtype=np.float32
+            records = self._get_atom_records(self._atom_line_i)
+            return _parse_coord(records).reshape(
+                len(self._model_start_i), self._get_model_length(), 3
             )
-            m = 0
-            i = 0
-            for line_i in self._atom_line_i:
-                if (
-                    m < len(self._model_start_i)-1
-                    and line_i > self._model_start_i[m+1]
-                ):
-                    m += 1
-                    i = 0
-                line = self.lines[line_i]
-                coord[m,i,0] = float(line[_coord_x])
-                coord[m,i,1] = float(line[_coord_y])
-                coord[m,i,2] = float(line[_coord_z])
-                i += 1
-            return coord
 
         else:
             coord_i = self._get_atom_record_indices_for_model(model)
-            coord = np.zeros((len(coord_i), 3), dtype=np.float32)
-            for i, line_i in enumerate(coord_i):
-                line = self.lines[line_i]
-                coord[i,0] = float(line[_coord_x])
-                coord[i,1] = float(line[_coord_y])
-                coord[i,2] = float(line[_coord_z])
-            return coord
+            records = self._get_atom_records(coord_i)
+            return _parse_coord(records)
 
 
     def get_b_factor(self, model=None):
@@ -294,31 +277,15 @@ class PDBFile(TextFile):
         *altloc* IDs, while `get_b_factor()` does not.
         """
         if model is None:
-            b_factor = np.zeros(
-                (len(self._model_start_i), self._get_model_length()),
-                dtype=np.float32
+            records = self._get_atom_records(self._atom_line_i)
+            return _get_column(records, _temp_f).astype(np.float32).reshape(
+                len(self._model_start_i), self._get_model_length()
             )
-            m = 0
-            i = 0
-            for line_i in self._atom_line_i:
-                if (
-                    m < len(self._model_start_i)-1
-                    and line_i > self._model_start_i[m+1]
-                ):
-                    m += 1
-                    i = 0
-                line = self.lines[line_i]
-                b_factor[m,i] = float(line[_temp_f])
-                i += 1
-            return b_factor
 
         else:
             b_factor_i = self._get_atom_record_indices_for_model(model)
-            b_factor = np.zeros(len(b_factor_i), dtype=np.float32)
-            for i, line_i in enumerate(b_factor_i):
-                line = self.lines[line_i]
-                b_factor[i] = float(line[_temp_f])
-            return b_factor
+            records = self._get_atom_records(b_factor_i)
+            return _get_column(records, _temp_f).astype(np.float32)
 
 
     def get_structure(self, model=None, altloc="first", extra_fields=[],
@@ -385,48 +352,25 @@ class PDBFile(TextFile):
             annot_i = coord_i = self._get_atom_record_indices_for_model(model)
             array = AtomArray(len(coord_i))
 
-        # Create mandatory and optional annotation arrays
-        chain_id  = np.zeros(array.array_length(), array.chain_id.dtype)
-        res_id    = np.zeros(array.array_length(), array.res_id.dtype)
-        ins_code  = np.zeros(array.array_length(), array.ins_code.dtype)
-        res_name  = np.zeros(array.array_length(), array.res_name.dtype)
-        hetero    = np.zeros(array.array_length(), array.hetero.dtype)
-        atom_name = np.zeros(array.array_length(), array.atom_name.dtype)
-        element   = np.zeros(array.array_length(), array.element.dtype)
-        atom_id_raw = np.zeros(array.array_length(), "U5")
-        charge_raw  = np.zeros(array.array_length(), "U2")
-        occupancy = np.zeros(array.array_length(), float)
-        b_factor  = np.zeros(array.array_length(), float)
-        altloc_id = np.zeros(array.array_length(), dtype="U1")
-
-        # Fill annotation array
-        # i is index in array, line_i is line index
-        for i, line_i in enumerate(annot_i):
-            line = self.lines[line_i]
-            chain_id[i] = line[_chain_id].strip()
-            res_id[i] = decode_hybrid36(line[_res_id])
-            ins_code[i] = line[_ins_code].strip()
-            res_name[i] = line[_res_name].strip()
-            hetero[i] = line[_record] == "HETATM"
-            atom_name[i] = line[_atom_name].strip()
-            element[i] = line[_element].strip()
-            altloc_id[i] = line[_alt_loc]
-            atom_id_raw[i] = line[_atom_id]
-            # turn "1-" into "-1", if necessary
-            if line[_charge][0] in "+-":
-                charge_raw[i] = line[_charge]
-            else:
-                charge_raw[i] = line[_charge][::-1]
-            occupancy[i] = float(line[_occupancy].strip())
-            b_factor[i] = float(line[_temp_f].strip())
+        # Each row represents an ATOM/HETATM record
+        annot_records = self._get_atom_records(annot_i)
+        chain_id = _get_stripped_column(annot_records, _chain_id)
+        res_id = _decode_hybrid36_array(annot_records[:, _res_id])
+        ins_code = _get_stripped_column(annot_records, _ins_code)
+        res_name = _get_stripped_column(annot_records, _res_name)
+        hetero = _get_column(annot_records, _record) == b"HETATM"
+        atom_name = _get_stripped_column(annot_records, _atom_name)
+        element = _get_stripped_column(annot_records, _element)
+        altloc_id = _get_column(annot_records, _alt_loc).astype("U1")
+        occupancy = _get_column(annot_records, _occupancy).astype(float)
+        b_factor = _get_column(annot_records, _temp_f).astype(float)
 
         if include_bonds or \
             (extra_fields is not None and "atom_id" in extra_fields):
                 # The atom IDs are only required in these two cases
-                atom_id = np.array(
-                    [decode_hybrid36(raw_id.item()) for raw_id in atom_id_raw],
-                    dtype=int
-                )
+                atom_id = _decode_hybrid36_array(
+                    annot_records[:, _atom_id]
+                ).astype(int)
         else:
             atom_id = None
 
@@ -445,9 +389,18 @@ class PDBFile(TextFile):
                 # later altloc ID filtering
                 array.set_annotation("atom_id", atom_id.copy())
             elif field == "charge":
-                charge = np.array(charge_raw)
+                charge_raw = annot_records[:, _charge]
+                # turn "1-" into "-1", if necessary
+                is_reversed = (
+                    (charge_raw[:, 0] != ord("+")) &
+                    (charge_raw[:, 0] != ord("-"))
+                )
+                charge_raw = np.where(
+                    is_reversed[:, np.newaxis], charge_raw[:, ::-1], charge_raw
+                )
+                charge = _get_column(charge_raw, slice(0, 2))
                 array.set_annotation("charge", np.where(
-                    charge == "  ", "0", charge
+                    charge == b"  ", b"0", charge
                 ).astype(int))
             elif field == "occupancy":
                 array.set_annotation("occupancy", occupancy)
@@ -471,24 +424,12 @@ class PDBFile(TextFile):
 
         # Fill in coordinates
         if isinstance(array, AtomArray):
-            for i, line_i in enumerate(coord_i):
-                line = self.lines[line_i]
-                array.coord[i, 0] = float(line[_coord_x])
-                array.coord[i, 1] = float(line[_coord_y])
-                array.coord[i, 2] = float(line[_coord_z])
+            array.coord = _parse_coord(annot_records)
 
         elif isinstance(array, AtomArrayStack):
-            m = 0
-            i = 0
-            for line_i in self._atom_line_i:
-                if m < len(self._model_start_i)-1 and line_i > self._model_start_i[m+1]:
-                    m += 1
-                    i = 0
-                line = self.lines[line_i]
-                array.coord[m, i, 0] = float(line[_coord_x])
-                array.coord[m, i, 1] = float(line[_coord_y])
-                array.coord[m, i, 2] = float(line[_coord_z])
-                i += 1
+            array.coord = _parse_coord(
+                self._get_atom_records(coord_i)
+            ).reshape(array.stack_depth(), array.array_length(), 3)
 
         # Fill in box vectors
         # PDB does not support changing box dimensions. CRYST1 is a one-time
@@ -998,31 +939,36 @@ class PDBFile(TextFile):
 
 
     def _index_models_and_atoms(self):
+        # Only the record name is required for indexing
+        # Truncating the record names to the length of a prefix
+        # allows vectorized prefix comparison
+        record_names = np.array(self.lines, dtype="U6")
         # Line indices where a new model starts
-        self._model_start_i = np.array(
-            [
-                i for i in range(len(self.lines))
-                if self.lines[i].startswith(("MODEL"))
-            ],
-            dtype=int
-        )
-        if len(self._model_start_i) == 0:
+        self._model_start_i = np.where(
+            record_names.astype("U5") == "MODEL"
+        )[0]
+        # Line indices with ATOM or HETATM records
+        self._atom_line_i = np.where(
+            (record_names.astype("U4") == "ATOM") |
+            (record_names == "HETATM")
+        )[0]
+        if len(self._model_start_i) == 0 and len(self._atom_line_i) > 0:
             # It could be an empty file or a file with a single model,
             # where the 'MODEL' line is missing
-            for line in self.lines:
-                if line.startswith(("ATOM", "HETATM")):
-                    # Single model
-                    self._model_start_i = np.array([0])
-                    break
+            self._model_start_i = np.array([0])
 
-        # Line indices with ATOM or HETATM records
-        self._atom_line_i = np.array(
-            [
-                i for i in range(len(self.lines))
-                if self.lines[i].startswith(("ATOM", "HETATM"))
-            ],
-            dtype=int
+
+    def _get_atom_records(self, line_indices):
+        """
+        Get the ATOM/HETATM records at the given line indices as
+        matrix of ASCII codes, where each row is a record.
+        """
+        records = "".join(
+            [self.lines[i][:80].ljust(80) for i in line_indices]
         )
+        return np.frombuffer(
+            records.encode("ascii", errors="replace"), dtype=np.uint8
+        ).reshape(-1, 80)
 
 
     def _get_atom_record_indices_for_model(self, model):
@@ -1052,24 +998,23 @@ class PDBFile(TextFile):
         Determine length of models and check that all models
         have equal length.
         """
-        n_models = len(self._model_start_i)
-        length = None
-        for model_i in range(len(self._model_start_i)):
-            model_start = self._model_start_i[model_i]
-            model_stop = self._model_start_i[model_i+1] \
-                         if model_i+1 < n_models else len(self.lines)
-            model_length = np.count_nonzero(
-                (self._atom_line_i >= model_start) &
-                (self._atom_line_i < model_stop)
+        # The number of atom records before each model start and
+        # the end of the file
+        n_preceding_atoms = np.searchsorted(
+            self._atom_line_i,
+            np.append(self._model_start_i, len(self.lines))
+        )
+        model_lengths = np.diff(n_preceding_atoms)
+        if len(model_lengths) == 0:
+            return None
+        invalid_models = np.where(model_lengths != model_lengths[0])[0]
+        if len(invalid_models) > 0:
+            model_i = invalid_models[0]
+            raise InvalidFileError(
+                f"Model {model_i+1} has {model_lengths[model_i]} atoms, "
+                f"but model 1 has {model_lengths[0]} atoms, must be equal"
             )
-            if length is None:
-                length = model_length
-            if model_length != length:
-                raise InvalidFileError(
-                    f"Model {model_i+1} has {model_length} atoms, "
-                    f"but model 1 has {length} atoms, must be equal"
-                )
-        return length
+        return model_lengths[0]
 
 
     def _get_bonds(self, atom_ids):
@@ -1128,6 +1073,35 @@ class PDBFile(TextFile):
                 self.lines.append(line)
 
 
+def _get_column(records, column):
+    """
+    Get the given column of a record matrix as array of byte strings.
+    """
+    width = column.stop - column.start
+    return np.ascontiguousarray(records[:, column]).view(f"S{width}")[:, 0]
+
+
+def _get_stripped_column(records, column):
+    """
+    Get the given column of a record matrix as array of strings without
+    surrounding whitespace.
+    """
+    width = column.stop - column.start
+    return np.char.strip(_get_column(records, column)).astype(f"U{width}")
+
+
+def _parse_coord(records):
+    """
+    Parse the coordinates from a record matrix.
+    """
+    # The x, y and z columns are adjacent with equal width
+    coord_columns = slice(_coord_x.start, _coord_z.stop)
+    width = _coord_x.stop - _coord_x.start
+    return np.ascontiguousarray(
+        records[:, coord_columns]
+    ).view(f"S{width}").astype(np.float32)
+
+
 def _parse_transformations(lines):
     """
     Parse the rotation and translation transformations from
@@ -7,7 +7,11 @@ __author__ = "Patrick Kunzmann"
 __all__ = ["encode_hybrid36", "decode_hybrid36", "max_hybrid36_number"]
 
 cimport cython
+cimport numpy as np
 
+import numpy as np
+
+ctypedef np.int64_t int64
 
 cdef int _ASCII_FIRST_NUMBER = 48
 cdef int _ASCII_FIRST_LETTER_UPPER = 65
@@ -15,6 +19,9 @@ cdef int _ASCII_FIRST_LETTER_LOWER = 97
 cdef int _ASCII_LAST_NUMBER = 57
 cdef int _ASCII_LAST_LETTER_UPPER = 90
 cdef int _ASCII_LAST_LETTER_LOWER = 122
+cdef int _ASCII_SPACE = 32
+cdef int _ASCII_PLUS = 43
+cdef int _ASCII_MINUS = 45
 
 
 @cython.cpow(True)
@@ -222,6 +229,98 @@ cdef int _decode_base36(const unsigned char[:] char_array_v,
             number += ascii_code - ascii_letter_offset + 10
     return number
 
+@cython.boundscheck(False)
+@cython.wraparound(False)
+@cython.cpow(True)
+def _decode_hybrid36_array(const unsigned char[:,:] char_matrix):
+    """
+    Convert multiple hybrid-36 strings into integer values.
+
+    This is the vectorized variant of :func:`decode_hybrid36()`.
+    
+    Parameters
+    ----------
+    char_matrix : ndarray, shape=(n,k), dtype=uint8
+        The ASCII codes of *n* hybrid-36 strings with length *k*.
+        The strings may be padded with whitespace.
+    
+    Returns
+    -------
+    numbers : ndarray, shape=(n,), dtype=int64
+        The integer values represented by the hybrid-36 strings.
+    """
+    cdef int64 i
+    cdef int j
+    cdef int start, stop, length
+    cdef unsigned char ascii_code
+    cdef int ascii_letter_offset
+    cdef int64 number
+    cdef bint is_negative
+
+    numbers = np.zeros(char_matrix.shape[0], dtype=np.int64)
+    cdef int64[:] numbers_v = numbers
+
+    for i in range(char_matrix.shape[0]):
+        # Strip whitespace
+        start = 0
+        stop = char_matrix.shape[1]
+        while start < stop and char_matrix[i, start] == _ASCII_SPACE:
+            start += 1
+        while stop > start and char_matrix[i, stop-1] == _ASCII_SPACE:
+            stop -= 1
+        length = stop - start
+        if length == 0:
+            raise ValueError("Cannot parse empty string into integer")
+        
+        ascii_code = char_matrix[i, start]
+        if      ascii_code >= _ASCII_FIRST_LETTER_UPPER \
+            and ascii_code <= _ASCII_LAST_LETTER_UPPER:
+                ascii_letter_offset = _ASCII_FIRST_LETTER_UPPER
+        elif    ascii_code >= _ASCII_FIRST_LETTER_LOWER \
+            and ascii_code <= _ASCII_LAST_LETTER_LOWER:
+                ascii_letter_offset = _ASCII_FIRST_LETTER_LOWER
+        else:
+            # Decimal representation
+            ascii_letter_offset = 0
+        
+        number = 0
+        if ascii_letter_offset == 0:
+            is_negative = ascii_code == _ASCII_MINUS
+            if is_negative or ascii_code == _ASCII_PLUS:
+                start += 1
+                if start == stop:
+                    _raise_illegal_string(char_matrix[i])
+            for j in range(start, stop):
+                ascii_code = char_matrix[i, j]
+                if      ascii_code < _ASCII_FIRST_NUMBER \
+                     or ascii_code > _ASCII_LAST_NUMBER:
+                        _raise_illegal_string(char_matrix[i])
+                number = number * 10 + ascii_code - _ASCII_FIRST_NUMBER
+            numbers_v[i] = -number if is_negative else number
+        else:
+            for j in range(start, stop):
+                ascii_code = char_matrix[i, j]
+                number *= 36
+                if ascii_code <= _ASCII_LAST_NUMBER:
+                    number += ascii_code - _ASCII_FIRST_NUMBER
+                else:
+                    number += ascii_code - ascii_letter_offset + 10
+            # Transform the base-36 value into the hybrid-36 value
+            # (For more information see 'decode_hybrid36()')
+            if ascii_letter_offset == _ASCII_FIRST_LETTER_UPPER:
+                numbers_v[i] = number - 10 * 36**(length-1) + 10**length
+            else:
+                numbers_v[i] = number + (26-10) * 36**(length-1) \
+                               + 10**length
+    
+    return numbers
+
+
+def _raise_illegal_string(char_array):
+    string = bytes(char_array).decode("ascii", errors="replace")
+    raise ValueError(f"Illegal hybrid-36 string '{string.strip()}'")
+
+
 def max_hybrid36_number(length):
     """
     Give the maximum integer value that can be represented by a
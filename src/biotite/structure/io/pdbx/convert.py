@@ -117,7 +117,7 @@ def get_model_count(file, data_block=None):
     model_count : int
         The number of models.
     """
-    atom_site_dict = file.get_category("atom_site", data_block)
+    atom_site_dict = file.get_category("atom_site", data_block, lazy=True)
     return len(_get_model_starts(atom_site_dict["pdbx_PDB_model_num"]))
 
 
@@ -194,7 +194,10 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
     """
     extra_fields = [] if extra_fields is None else extra_fields
 
-    atom_site_dict = pdbx_file.get_category("atom_site", data_block)
+    # Only the required entries of the 'atom_site' category are decoded
+    atom_site_dict = pdbx_file.get_category(
+        "atom_site", data_block, lazy=True
+    )
     if atom_site_dict is None:
         raise InvalidFileError("Missing 'atom_site' category in file")
     
@@ -261,23 +264,10 @@ def get_structure(pdbx_file, model=None, data_block=None, altloc="first",
 
         _fill_annotations(array, model_dict, extra_fields, use_author_fields)
 
-        # Append exclusive stop
-        model_starts = np.append(
-            model_starts, [len(atom_site_dict["group_PDB"])]
-        )
-        # Indexing starts at 0, but model number starts at 1
-        model_index = model - 1
-        start, stop = model_starts[model_index], model_starts[model_index + 1]
         array.coord = np.zeros((model_length, 3), dtype=np.float32)
-        array.coord[:, 0] = atom_site_dict["Cartn_x"][start:stop].astype(
-            np.float32
-        )
-        array.coord[:, 1] = atom_site_dict["Cartn_y"][start:stop].astype(
-            np.float32
-        )
-        array.coord[:, 2] = atom_site_dict["Cartn_z"][start:stop].astype(
-            np.float32
-        )
+        array.coord[:, 0] = model_dict["Cartn_x"].astype(np.float32)
+        array.coord[:, 1] = model_dict["Cartn_y"].astype(np.float32)
+        array.coord[:, 2] = model_dict["Cartn_z"].astype(np.float32)
 
         array = _filter_altloc(array, model_dict, altloc)
 
@@ -416,16 +406,15 @@ def _fill_annotations(array, model_dict, extra_fields, use_author_fields):
 
 def _filter_altloc(array, model_dict, altloc):
     altloc_ids = model_dict.get("label_alt_id")
-    occupancy = model_dict.get("occupancy")
 
     # Filter altloc IDs and return
     if altloc_ids is None:
         return array
-    elif altloc == "occupancy" and occupancy is not None:
+    elif altloc == "occupancy" and "occupancy" in model_dict:
         return array[
             ...,
             filter_highest_occupancy_altloc(
-                array, altloc_ids, occupancy.astype(float)
+                array, altloc_ids, model_dict["occupancy"].astype(float)
             ),
         ]
     # 'first' is also fallback if file has no occupancy information
@@ -450,21 +439,18 @@ def _get_model_starts(model_array):
 
 def _get_model_dict(atom_site_dict, model_starts, model):
     """
-    Reduce the ``atom_site`` dictionary to the values for the given
-    model.
+    Reduce the lazy ``atom_site`` category view to the rows for the
+    given model, without decoding any values.
     """
     # Append exclusive stop
     model_starts = np.append(
         model_starts, [len(atom_site_dict["pdbx_PDB_model_num"])]
     )
-    model_dict = {}
     # Indexing starts at 0, but model number starts at 1
     model_index = model - 1
-    for key in atom_site_dict.keys():
-        model_dict[key] = atom_site_dict[key][
-            model_starts[model_index] : model_starts[model_index + 1]
-        ]
-    return model_dict
+    return atom_site_dict.slice_rows(
+        model_starts[model_index], model_starts[model_index + 1]
+    )
 
 
 def _get_box(pdbx_file, data_block):
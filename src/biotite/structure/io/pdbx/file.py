@@ -4,13 +4,13 @@
 
 __name__ = "biotite.structure.io.pdbx"
 __author__ = "Patrick Kunzmann"
-__all__ = ["PDBxFile"]
+__all__ = ["PDBxFile", "PDBxCategoryView"]
 
 import copy
-import shlex
-from collections.abc import MutableMapping
+from collections.abc import Mapping, MutableMapping
 import numpy as np
 from ....file import TextFile, InvalidFileError
+from .tokenizer import index_categories, tokenize_category, decode_values
 
 
 class PDBxFile(TextFile, MutableMapping):
@@ -107,69 +107,12 @@ class PDBxFile(TextFile, MutableMapping):
         if file.lines[-1] == "":
             del file.lines[-1]
 
-        current_category = None
-        start = -1
-        stop = -1
-        is_loop = False
-        has_multiline_values = False
-        for i, line in enumerate(file.lines):
-            # Ignore empty and comment lines
-            if not _is_empty(line):
-                data_block_name = _data_block_name(line)
-                if data_block_name is not None:
-                    data_block = data_block_name
-                    # If new data block begins, reset category data
-                    current_category = None
-                    start = -1
-                    stop = -1
-                    is_loop = False
-                    has_multiline_values = False
-
-                is_loop_in_line = _is_loop_start(line)
-                category_in_line = _get_category_name(line)
-                if is_loop_in_line or (
-                    category_in_line != current_category
-                    and category_in_line is not None
-                ):
-                    # Start of a new category
-                    # Add an entry into the dictionary with the old category
-                    stop = i
-                    file._add_category(
-                        data_block,
-                        current_category,
-                        start,
-                        stop,
-                        is_loop,
-                        has_multiline_values,
-                    )
-                    # Track the new category
-                    if is_loop_in_line:
-                        # In case of lines with "loop_" the category is in the
-                        # next line
-                        category_in_line = _get_category_name(
-                            file.lines[i + 1]
-                        )
-                    is_loop = is_loop_in_line
-                    current_category = category_in_line
-                    start = i
-                    has_multiline_values = False
-
-                multiline = _is_multi(line, is_loop)
-                if multiline:
-                    has_multiline_values = True
-        # Add the entry for the final category
-        # Since at the end of the file the end of the category
-        # is not determined by the start of a new one,
-        # this needs to be handled separately
-        stop = len(file.lines)
-        file._add_category(
-            data_block,
-            current_category,
-            start,
-            stop,
-            is_loop,
-            has_multiline_values,
-        )
+        for (
+            data_block, category, start, stop, is_loop, is_multilined
+        ) in index_categories(file.lines):
+            file._add_category(
+                data_block, category, start, stop, is_loop, is_multilined
+            )
         return file
 
     def get_block_names(self):
@@ -187,7 +130,8 @@ class PDBxFile(TextFile, MutableMapping):
             blocks.add(block)
         return sorted(blocks)
 
-    def get_category(self, category, block=None, expect_looped=False):
+    def get_category(self, category, block=None, expect_looped=False,
+                     lazy=False):
         """
         Get the dictionary for a given category.
 
@@ -203,10 +147,17 @@ class PDBxFile(TextFile, MutableMapping):
             arrays (only if the category exists):
             If the category is *non-looped*, each array will contain
             only one element.
+        lazy : bool, optional
+            If set to true, a :class:`PDBxCategoryView` is returned
+            instead of a dictionary.
+            The values of the view are only decoded, when the
+            respective entry is accessed.
+            This saves time and memory, if only a few entries of a large
+            category are required.
 
         Returns
         -------
-        category_dict : dict of (str or ndarray, dtype=str) or None
+        category_dict : dict or PDBxCategoryView of (str or ndarray, dtype=str) or None
             A entry keyed dictionary. The corresponding values are
             strings or array of strings for *non-looped* and
             *looped* categories, respectively.
@@ -224,69 +175,16 @@ class PDBxFile(TextFile, MutableMapping):
         start = category_info["start"]
         stop = category_info["stop"]
         is_loop = category_info["loop"]
-        is_multilined = category_info["multiline"]
-
-        if is_multilined:
-            # Convert multiline values into singleline values
-            prelines = [
-                line.strip()
-                for line in self.lines[start:stop]
-                if not _is_empty(line) and not _is_loop_start(line)
-            ]
-            lines = (len(prelines)) * [None]
-            # lines index
-            k = 0
-            # prelines index
-            i = 0
-            while i < len(prelines):
-                if prelines[i][0] == ";":
-                    # multiline values
-                    multi_line_str = prelines[i][1:]
-                    j = i + 1
-                    while prelines[j] != ";":
-                        multi_line_str += prelines[j]
-                        j += 1
-                    lines[k - 1] += " " + shlex.quote(multi_line_str)
-                    i = j + 1
-                elif not is_loop and prelines[i][0] in ["'", '"']:
-                    # Singleline values where value is in the line
-                    # after the corresponding key
-                    lines[k - 1] += " " + prelines[i]
-                    i += 1
-                else:
-                    # Normal singleline value in the same row as the key
-                    lines[k] = prelines[i]
-                    i += 1
-                    k += 1
-            lines = [line for line in lines if line is not None]
-
-        else:
-            lines = [
-                line.strip()
-                for line in self.lines[start:stop]
-                if not _is_empty(line) and not _is_loop_start(line)
-            ]
 
-        if is_loop:
-            # Special optimization for "atom_site":
-            # Even if the values are quote protected,
-            # no whitespace is expected in escaped values
-            # Therefore slow shlex.split() call is not necessary
-            if category == "atom_site":
-                whitespace_values = False
-            else:
-                whitespace_values = True
-            category_dict = _process_looped(lines, whitespace_values)
+        view = PDBxCategoryView(
+            *tokenize_category(self.lines[start:stop]),
+            is_looped=is_loop,
+            expect_looped=expect_looped,
+        )
+        if lazy:
+            return view
         else:
-            category_dict = _process_singlevalued(lines)
-
-        if expect_looped and not is_loop:
-            category_dict = {
-                key: np.array([val], dtype=object)
-                for key, val in category_dict.items()
-            }
-
-        return category_dict
+            return {key: view[key] for key in view}
 
     def set_category(self, category, category_dict, block=None):
         """
@@ -548,97 +446,117 @@ class PDBxFile(TextFile, MutableMapping):
             }
 
 
-def _process_singlevalued(lines):
-    category_dict = {}
-    i = 0
-    while i < len(lines):
-        parts = shlex.split(lines[i])
-        key = parts[0].split(".")[1]
-        if len(parts) > 1:
-            value = parts[1]
-        else:
-            # The value is not in the same line,
-            # but in the following one
-            i += 1
-            value = shlex.split(lines[i])[0]
-        category_dict[key] = value
-        i += 1
-    return category_dict
-
-
-def _process_looped(lines, whitepace_values):
-    category_dict = {}
-    keys = []
-    # Array index
-    i = 0
-    # Dictionary key index
-    j = 0
-    for line in lines:
-        if line[0] == "_":
-            # Key line
-            key = line.split(".")[1]
-            keys.append(key)
-            # Pessimistic array allocation
-            # numpy array filled with strings
-            category_dict[key] = np.zeros(len(lines), dtype=object)
-            keys_length = len(keys)
+class PDBxCategoryView(Mapping):
+    """
+    A read-only, lazily decoded view on a category of a
+    :class:`PDBxFile`.
+
+    In contrast to the dictionary returned by
+    :meth:`PDBxFile.get_category()`, the values of an entry are only
+    decoded into strings, when the entry is accessed for the first time.
+    Hence, the decoding effort is only spent on entries that are
+    actually used.
+    Furthermore, the rows of a *looped* category can be restricted via
+    :meth:`slice_rows()`, before any value is decoded.
+
+    A view is obtained via :meth:`PDBxFile.get_category()` with
+    ``lazy=True``.
+    It is independent of subsequent modifications of the file.
+
+    Examples
+    --------
+
+    >>> import os.path
+    >>> file = PDBxFile.read(os.path.join(path_to_structures, "1l2y.cif"))
+    >>> atom_site = file.get_category("atom_site", lazy=True)
+    >>> print(len(atom_site["id"]))
+    11552
+    >>> first_atoms = atom_site.slice_rows(0, 3)
+    >>> print(first_atoms["label_atom_id"])
+    ['N' 'CA' 'C']
+    """
+
+    def __init__(self, keys, buffer, starts, stops, is_text_field,
+                 is_looped, expect_looped=False, row_range=None):
+        self._keys = list(keys)
+        # For duplicate keys the last occurence is effective
+        self._key_indices = {key: i for i, key in enumerate(keys)}
+        self._buffer = buffer
+        self._starts = starts
+        self._stops = stops
+        self._is_text_field = is_text_field
+        self._is_looped = is_looped
+        self._expect_looped = expect_looped
+        if is_looped:
+            # Ignore incomplete rows at the end of the category
+            self._n_rows = len(starts) // len(keys)
         else:
-            # If whitespace is expected in quote protected values,
-            # use standard shlex split
-            # Otherwise use much more faster whitespace split
-            # and quote removal if applicable,
-            # bypassing the slow shlex module
-            if whitepace_values:
-                values = shlex.split(line)
-            else:
-                values = line.split()
-                for k in range(len(values)):
-                    # Remove quotes
-                    if (values[k][0] == '"' and values[k][-1] == '"') or (
-                        values[k][0] == "'" and values[k][-1] == "'"
-                    ):
-                        values[k] = values[k][1:-1]
-            for value in values:
-                category_dict[keys[j]][i] = value
-                j += 1
-                if j == keys_length:
-                    # If all keys have been filled with a value,
-                    # restart with first key with incremented index
-                    j = 0
-                    i += 1
-    for key in category_dict.keys():
-        # Trim to correct size
-        category_dict[key] = category_dict[key][:i]
-    return category_dict
-
-
-def _is_empty(line):
-    return len(line) == 0 or line[0] == "#"
-
-
-def _data_block_name(line):
-    if line.startswith("data_"):
-        return line[5:]
-    else:
-        return None
+            self._n_rows = 1
+        self._row_range = (0, self._n_rows) if row_range is None \
+                          else row_range
+        self._cache = {}
 
+    def slice_rows(self, start, stop):
+        """
+        Create a view on a range of rows of this *looped* category.
 
-def _is_loop_start(line):
-    return line.startswith("loop_")
+        No value is decoded by this method.
 
+        Parameters
+        ----------
+        start, stop : int
+            The row range relative to this view, `stop` is exclusive.
 
-def _is_multi(line, is_loop):
-    if is_loop:
-        return line[0] == ";"
-    else:
-        return line[0] in [";", "'", '"']
+        Returns
+        -------
+        view : PDBxCategoryView
+            The view on the selected rows.
+        """
+        if not self._is_looped:
+            raise TypeError("Only looped categories can be sliced")
+        offset, end = self._row_range
+        start, stop, _ = slice(start, stop).indices(end - offset)
+        stop = max(start, stop)
+        return PDBxCategoryView(
+            self._keys, self._buffer,
+            self._starts, self._stops, self._is_text_field,
+            self._is_looped, self._expect_looped,
+            (offset + start, offset + stop)
+        )
 
+    def __getitem__(self, key):
+        value = self._cache.get(key)
+        if value is not None:
+            return value
+        index = self._key_indices[key]
+        if self._is_looped:
+            n_keys = len(self._keys)
+            row_start, row_stop = self._row_range
+            selection = slice(
+                row_start * n_keys + index, row_stop * n_keys, n_keys
+            )
+        else:
+            selection = slice(index, index + 1)
+        value = decode_values(
+            self._buffer,
+            self._starts[selection],
+            self._stops[selection],
+            self._is_text_field[selection],
+        )
+        if not self._is_looped and not self._expect_looped:
+            value = value[0]
+        self._cache[key] = value
+        return value
 
-def _get_category_name(line):
-    if line[0] != "_":
-        return None
-    else:
-        return line[1 : line.find(".")]
+    def __contains__(self, key):
+        # Avoid decoding of the values by 'Mapping.__contains__()'
+        return key in self._key_indices
+
+    def __iter__(self):
+        return iter(self._key_indices)
+
+    def __len__(self):
+        return len(self._key_indices)
 
 
 def _quote(value):
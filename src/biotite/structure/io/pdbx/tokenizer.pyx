@@ -0,0 +1,394 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+# distutils: language = c++
+
+"""
+Compiled routines for indexing and tokenizing PDBx/mmCIF files.
+The categories are indexed by inspecting only the start of each line,
+the values of a category are tokenized on a single byte buffer instead
+of calling Python string methods on every line.
+"""
+
+__name__ = "biotite.structure.io.pdbx"
+__author__ = "Patrick Kunzmann"
+__all__ = ["index_categories", "tokenize_category", "decode_values"]
+
+cimport cython
+cimport numpy as np
+from libcpp.vector cimport vector
+
+import numpy as np
+
+
+ctypedef np.int64_t int64
+ctypedef np.uint8_t uint8
+
+
+cdef unsigned char _NEWLINE = b"\n"
+cdef unsigned char _CR = b"\r"
+cdef unsigned char _SPACE = b" "
+cdef unsigned char _TAB = b"\t"
+cdef unsigned char _COMMENT = b"#"
+cdef unsigned char _SEMICOLON = b";"
+cdef unsigned char _UNDERSCORE = b"_"
+cdef unsigned char _DOT = b"."
+cdef unsigned char _SINGLE_QUOTE = b"'"
+cdef unsigned char _DOUBLE_QUOTE = b'"'
+
+
+def index_categories(list lines):
+    """
+    Find the line ranges of all categories in the given lines of a
+    PDBx/mmCIF file.
+
+    The lines are scanned in a single pass.
+    Only the first character of each line is inspected, unless it
+    indicates a data block, a loop or a key.
+    In contrast to :func:`tokenize_category()`, the lines are not
+    joined into a byte buffer, so the file content is not duplicated
+    in memory.
+    Lines within multi-line text fields are ignored, i.e. they cannot
+    erroneously start a new category.
+
+    Parameters
+    ----------
+    lines : list of str
+        The lines of the file.
+
+    Returns
+    -------
+    categories : list of tuple(str, str, int, int, bool, bool)
+        For each category the data block name, the category name,
+        the start and stop line, whether the category is looped and
+        whether it contains multi-line values.
+    """
+    cdef list categories = []
+    cdef str data_block = None
+    cdef str current_category = None
+    cdef str category_in_line
+    cdef Py_ssize_t start = -1
+    cdef bint is_loop = False
+    cdef bint has_multiline_values = False
+    cdef bint in_text_field = False
+    # Set after 'loop_': the category name is given by the next key
+    cdef bint awaiting_loop_name = False
+
+    cdef Py_ssize_t line_i
+    cdef str line
+    cdef Py_UCS4 first
+    for line_i in range(len(lines)):
+        line = lines[line_i]
+        if len(line) == 0:
+            continue
+        first = line[0]
+        if in_text_field:
+            # Only a semicolon at the start of the line can close
+            # a text field
+            if first == u";":
+                in_text_field = False
+        elif first == u"#":
+            pass
+        elif first == u"d" and line.startswith("data_"):
+            data_block = line[5:]
+            # A new data block resets the category data
+            current_category = None
+            start = -1
+            is_loop = False
+            has_multiline_values = False
+            awaiting_loop_name = False
+        elif first == u"l" and line.startswith("loop_"):
+            _append_category(
+                categories, data_block, current_category,
+                start, line_i, is_loop, has_multiline_values
+            )
+            current_category = None
+            start = line_i
+            is_loop = True
+            has_multiline_values = False
+            awaiting_loop_name = True
+        elif first == u"_":
+            category_in_line = _category_name(line)
+            if awaiting_loop_name:
+                current_category = category_in_line
+                awaiting_loop_name = False
+            elif category_in_line != current_category:
+                _append_category(
+                    categories, data_block, current_category,
+                    start, line_i, is_loop, has_multiline_values
+                )
+                current_category = category_in_line
+                start = line_i
+                is_loop = False
+                has_multiline_values = False
+        elif first == u";":
+            in_text_field = True
+            has_multiline_values = True
+        elif not is_loop and (first == u"'" or first == u'"'):
+            # Value of a non-looped category in the line
+            # after the corresponding key
+            has_multiline_values = True
+
+    # The end of the final category is not determined by the start of
+    # a new one, hence this needs to be handled separately
+    _append_category(
+        categories, data_block, current_category,
+        start, len(lines), is_loop, has_multiline_values
+    )
+    return categories
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def tokenize_category(list lines):
+    """
+    Split the lines of a single category into keys and value tokens.
+
+    The tokenization follows the CIF syntax:
+    Values may be enclosed in single or double quotes, which only
+    terminate a value, if they are followed by whitespace.
+    A semicolon at the start of a line opens a multi-line text field,
+    that is closed by the next line starting with a semicolon.
+
+    The values are not decoded into strings yet, instead only their
+    positions in the byte buffer are determined.
+    Use :func:`decode_values()` to obtain the actual strings.
+
+    Note that the byte buffer is a UTF-8 encoded copy of the given
+    lines, i.e. the memory required for the category text is doubled
+    while the buffer exists.
+
+    Parameters
+    ----------
+    lines : list of str
+        The lines of the category, including the ``loop_`` statement,
+        if present.
+
+    Returns
+    -------
+    keys : list of str
+        The keys of the category, without the category name.
+    buffer : bytes
+        The UTF-8 encoded text of the category.
+    starts, stops : ndarray, dtype=np.int64
+        The start and exclusive stop position of each value token in
+        `buffer` in the order of their appearance.
+    is_text_field : ndarray, dtype=np.uint8
+        Indicates for each value token whether it is a multi-line text
+        field.
+    """
+    cdef bytes buffer = "\n".join(lines).encode("UTF-8")
+    cdef const unsigned char[:] buf = buffer
+    cdef Py_ssize_t length = buf.shape[0]
+
+    cdef list keys = []
+    cdef vector[int64] starts
+    cdef vector[int64] stops
+    cdef vector[uint8] is_text_field
+
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t token_start, token_end
+    cdef Py_ssize_t i
+    cdef bint line_start = True
+    cdef unsigned char c, quote
+
+    while pos < length:
+        c = buf[pos]
+
+        if c == _NEWLINE:
+            line_start = True
+            pos += 1
+            continue
+        if c == _SPACE or c == _TAB or c == _CR:
+            line_start = False
+            pos += 1
+            continue
+
+        if line_start and c == _SEMICOLON:
+            # Multi-line text field:
+            # The token spans from the opening to the closing semicolon
+            token_start = pos + 1
+            pos = _find_line_end(buf, pos, length) + 1
+            while pos < length and buf[pos] != _SEMICOLON:
+                pos = _find_line_end(buf, pos, length) + 1
+            token_end = pos if pos < length else length
+            starts.push_back(token_start)
+            stops.push_back(token_end)
+            is_text_field.push_back(True)
+            # Skip the closing semicolon
+            pos += 1
+            line_start = False
+            continue
+
+        if line_start and _starts_with(buf, pos, length, b"data_"):
+            # The next data block begins -> end of category
+            break
+        line_start = False
+
+        if c == _COMMENT:
+            pos = _find_line_end(buf, pos, length)
+            continue
+
+        if c == _SINGLE_QUOTE or c == _DOUBLE_QUOTE:
+            quote = c
+            token_start = pos + 1
+            token_end = -1
+            i = token_start
+            while i < length and buf[i] != _NEWLINE:
+                # A quote closes the value only if it is followed by
+                # whitespace
+                if buf[i] == quote and (
+                    i + 1 == length or _is_whitespace(buf[i+1])
+                ):
+                    token_end = i
+                    break
+                i += 1
+            if token_end == -1:
+                # Unterminated quote -> take the rest of the line
+                token_end = i
+                pos = i
+            else:
+                pos = token_end + 1
+            starts.push_back(token_start)
+            stops.push_back(token_end)
+            is_text_field.push_back(False)
+            continue
+
+        # Unquoted token
+        token_start = pos
+        while pos < length and not _is_whitespace(buf[pos]):
+            pos += 1
+        token_end = pos
+        if c == _UNDERSCORE:
+            # Key: Remove the category name
+            i = token_start
+            while i < token_end and buf[i] != _DOT:
+                i += 1
+            keys.append(buffer[i+1 : token_end].decode("UTF-8"))
+        elif _starts_with(buf, token_start, token_end, b"loop_"):
+            pass
+        else:
+            starts.push_back(token_start)
+            stops.push_back(token_end)
+            is_text_field.push_back(False)
+
+    return (
+        keys,
+        buffer,
+        _to_int64_array(starts),
+        _to_int64_array(stops),
+        _to_uint8_array(is_text_field),
+    )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+def decode_values(bytes buffer, const int64[:] starts, const int64[:] stops,
+                  const uint8[:] is_text_field):
+    """
+    Decode the value tokens at the given positions into strings.
+
+    The lines of a multi-line text field are stripped and concatenated
+    without separator.
+
+    Parameters
+    ----------
+    buffer : bytes
+        The byte buffer returned by :func:`tokenize_category()`.
+    starts, stops, is_text_field : ndarray
+        The token positions and text field indicators returned by
+        :func:`tokenize_category()`.
+        May be a strided subset of these arrays.
+
+    Returns
+    -------
+    values : ndarray, dtype=object
+        The decoded strings.
+    """
+    cdef const unsigned char[:] buf = buffer
+    cdef Py_ssize_t i
+    cdef Py_ssize_t pos, line_end, stop
+    cdef list text_field_lines
+
+    values = np.empty(starts.shape[0], dtype=object)
+    for i in range(starts.shape[0]):
+        if is_text_field[i]:
+            text_field_lines = []
+            pos = starts[i]
+            stop = stops[i]
+            while pos < stop:
+                line_end = _find_line_end(buf, pos, stop)
+                text_field_lines.append(_strip(buffer, buf, pos, line_end))
+                pos = line_end + 1
+            values[i] = b"".join(text_field_lines).decode("UTF-8")
+        else:
+            values[i] = buffer[starts[i] : stops[i]].decode("UTF-8")
+    return values
+
+
+cdef inline bint _is_whitespace(unsigned char c):
+    return c == _SPACE or c == _TAB or c == _NEWLINE or c == _CR
+
+
+cdef inline bint _starts_with(const unsigned char[:] buf,
+                              Py_ssize_t pos, Py_ssize_t end,
+                              const char* prefix):
+    cdef Py_ssize_t i = 0
+    while prefix[i] != 0:
+        if pos + i >= end or buf[pos + i] != <unsigned char> prefix[i]:
+            return False
+        i += 1
+    return True
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef np.ndarray _to_int64_array(vector[int64]& vec):
+    cdef Py_ssize_t i
+    cdef np.ndarray array = np.empty(vec.size(), dtype=np.int64)
+    cdef int64[:] array_v = array
+    for i in range(<Py_ssize_t> vec.size()):
+        array_v[i] = vec[i]
+    return array
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef np.ndarray _to_uint8_array(vector[uint8]& vec):
+    cdef Py_ssize_t i
+    cdef np.ndarray array = np.empty(vec.size(), dtype=np.uint8)
+    cdef uint8[:] array_v = array
+    for i in range(<Py_ssize_t> vec.size()):
+        array_v[i] = vec[i]
+    return array
+
+
+cdef inline Py_ssize_t _find_line_end(const unsigned char[:] buf,
+                                      Py_ssize_t pos, Py_ssize_t length):
+    while pos < length and buf[pos] != _NEWLINE:
+        pos += 1
+    return pos
+
+
+cdef bytes _strip(bytes buffer, const unsigned char[:] buf,
+                  Py_ssize_t start, Py_ssize_t stop):
+    while start < stop and _is_whitespace(buf[start]):
+        start += 1
+    while stop > start and _is_whitespace(buf[stop-1]):
+        stop -= 1
+    return buffer[start:stop]
+
+
+cdef str _category_name(str line):
+    return line[1 : line.find(".")]
+
+
+cdef _append_category(list categories, str data_block, str category,
+                      Py_ssize_t start, Py_ssize_t stop,
+                      bint is_loop, bint is_multiline):
+    # Before the first category starts, the current category is None
+    if category is not None:
+        categories.append(
+            (data_block, category, start, stop, is_loop, is_multiline)
+        )
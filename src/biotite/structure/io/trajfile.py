@@ -4,10 +4,11 @@
 
 __name__ = "biotite.structure.io"
 __author__ = "Patrick Kunzmann"
-__all__ = ["TrajectoryFile"]
+__all__ = ["TrajectoryFile", "TrajectoryFrames"]
 
 import itertools
 import abc
+import os
 import numpy as np
 from ..atoms import AtomArray, AtomArrayStack, stack, from_template
 from ...file import File
@@ -103,19 +104,13 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
             if step is not None and chunk_size % step != 0:
                 chunk_size = ((chunk_size // step) + 1) * step
 
-        traj_type = cls.traj_type()
-        with traj_type(file_name, "r") as f:
+        with cls._open_for_reading(file_name) as f:
             
             if start is None:
                 start = 0
-            # Discard atoms before start
+            # Jump directly to the start frame
             if start != 0:
-                if chunk_size is None or chunk_size > start:
-                    f.read(n_frames=start, stride=None, atom_indices=atom_i)
-                else:
-                    TrajectoryFile._read_chunk_wise(
-                        f, start, None, atom_i, chunk_size, discard=True
-                    )
+                cls._seek(f, start)
             
             # The upcoming frames are saved
             # Calculate the amount of frames to be read
@@ -130,13 +125,15 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
                 # the number of frames is decremented before division
                 # and incremented afterwards again
                 n_frames = ((n_frames - 1) // step) + 1
+            if start != 0:
+                n_frames = cls._limit_frame_count(f, start, n_frames, step)
             
             # Read frames
             if chunk_size is None:
                 result = f.read(n_frames, stride=step, atom_indices=atom_i)
             else:
                 result = TrajectoryFile._read_chunk_wise(
-                    f, n_frames, step, atom_i, chunk_size, discard=False
+                    f, n_frames, step, atom_i, chunk_size
                 )
         
         # nm to Angstrom
@@ -199,14 +196,13 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
         -----
         The `step` parameter does currently not work for *DCD* files.
         """
-        traj_type = cls.traj_type()
-        with traj_type(file_name, "r") as f:
+        with cls._open_for_reading(file_name) as f:
             
             if start is None:
                 start = 0
-            # Discard atoms before start
+            # Jump directly to the start frame
             if start != 0:
-                f.read(n_frames=start, stride=None, atom_indices=atom_i)
+                cls._seek(f, start)
             
             # The upcoming frames are read
             # Calculate the amount of frames to be read
@@ -221,6 +217,8 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
                 # the number of frames is decremented before division
                 # and incremented afterwards again
                 n_frames = ((n_frames - 1) // step) + 1
+            if start != 0:
+                n_frames = cls._limit_frame_count(f, start, n_frames, step)
             
 
             # Read frames
@@ -347,7 +345,89 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
             else:
                 yield from_template(template, coord, box)
 
-    
+
+    @classmethod
+    def read_frames(cls, file_name, atom_i=None):
+        """
+        Open the given trajectory file for random access to its frames.
+
+        In contrast to :func:`read()` and :func:`read_iter()`, the
+        frames are not read consecutively:
+        The returned :class:`TrajectoryFrames` object reads the frames
+        selected via indexing directly from the file.
+        Frames before the selected ones are not read.
+
+        Parameters
+        ----------
+        file_name : str
+            The path of the file to be read.
+            A file-like-object cannot be used.
+        atom_i : ndarray, dtype=int, optional
+            If this parameter is set, only the atoms at the given
+            indices are read from each frame.
+
+        Returns
+        -------
+        frames : TrajectoryFrames
+            The random access object.
+            It should be closed after usage, preferably via a
+            ``with`` statement.
+
+        See also
+        --------
+        create_frame_index
+        """
+        return TrajectoryFrames(cls, file_name, atom_i)
+
+
+    @classmethod
+    def create_frame_index(cls, file_name):
+        """
+        Create a persistent index of the frame positions in the given
+        trajectory file.
+
+        Some trajectory formats (e.g. *XTC* and *TRR*) have frames of
+        variable size.
+        Hence, jumping to a frame requires to scan all preceding frames
+        in the file.
+        This method scans the file once and saves the frame positions
+        into a sidecar file next to the trajectory
+        (``<file_name>.offsets.npz``).
+        Afterwards, :func:`read()`, :func:`read_iter()`,
+        :func:`read_iter_structure()` and :func:`read_frames()` use
+        this index to jump directly to the requested frames.
+        The index is ignored, if the trajectory file is modified after
+        the index was created.
+
+        For formats that support random access natively, this method
+        does nothing.
+
+        Parameters
+        ----------
+        file_name : str
+            The path of the trajectory file.
+
+        Returns
+        -------
+        offsets : ndarray, dtype=int or None
+            The byte offset of each frame in the file.
+            ``None`` if the format does not need an index.
+        """
+        if not cls.has_frame_offsets():
+            return None
+        with cls.traj_type()(file_name, "r") as f:
+            offsets = np.asarray(f.offsets, dtype=np.int64)
+        stat = os.stat(file_name)
+        with open(_frame_index_path(file_name), "wb") as index_file:
+            np.savez(
+                index_file,
+                offsets=offsets,
+                file_size=stat.st_size,
+                file_mtime=stat.st_mtime_ns,
+            )
+        return offsets
+
+        
     def write(self, file_name):
         """
         Write the content into a trajectory file.
@@ -632,6 +712,90 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
         pass
 
 
+    @classmethod
+    def has_frame_offsets(cls):
+        """
+        Whether the respective :class:`mdtraj.TrajectoryFile` locates
+        frames via the byte offsets in its `offsets` attribute.
+
+        The offsets of such formats are persisted via
+        :func:`create_frame_index()`.
+
+        PROTECTED: Override when inheriting.
+
+        Returns
+        -------
+        has_offsets : bool
+            True, if the format uses frame offsets, false otherwise.
+        """
+        return False
+
+
+    @classmethod
+    def _open_for_reading(cls, file_name):
+        """
+        Open the :class:`mdtraj.TrajectoryFile` for reading and use
+        the persistent frame index, if one was created.
+        """
+        f = cls.traj_type()(file_name, "r")
+        if cls.has_frame_offsets():
+            offsets = _load_frame_index(file_name)
+            if offsets is not None:
+                f.offsets = offsets
+        return f
+
+
+    @classmethod
+    def _frame_count(cls, file):
+        """
+        Get the number of frames in an opened
+        :class:`mdtraj.TrajectoryFile`.
+        """
+        if cls.has_frame_offsets():
+            return len(file.offsets)
+        else:
+            return len(file)
+    
+
+    @classmethod
+    def _seek(cls, file, frame):
+        """
+        Move an opened :class:`mdtraj.TrajectoryFile` to the given
+        frame without reading the preceding frames.
+        If the frame is beyond the end of the trajectory, the file is
+        moved to its end.
+        """
+        n_frames = cls._frame_count(file)
+        if frame < n_frames:
+            file.seek(frame)
+        elif n_frames > 0:
+            # Some formats do not support seeking to the end directly
+            # -> Read the final frame instead
+            file.seek(n_frames - 1)
+            file.read(1)
+
+
+    @classmethod
+    def _limit_frame_count(cls, file, start, n_frames, step):
+        """
+        Limit the number of frames to be read from an opened
+        :class:`mdtraj.TrajectoryFile`, that was moved to the `start`
+        frame via :func:`_seek()`, to the number of remaining frames.
+
+        After seeking, some formats repeatedly return the final frame,
+        when reading beyond the end of the file with a stride.
+        Hence, the end of the file cannot be detected by an empty read.
+        """
+        if not cls.has_frame_offsets():
+            return n_frames
+        n_remaining = max(cls._frame_count(file) - start, 0)
+        if step is not None and n_remaining > 0:
+            n_remaining = ((n_remaining - 1) // step) + 1
+        if n_frames is None:
+            return n_remaining
+        return min(n_frames, n_remaining)
+
+
     def _check_model_count(self, array):
         """
         Check if the amount of models in the given array is equal to
@@ -653,8 +817,7 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
     
 
     @staticmethod
-    def _read_chunk_wise(file, n_frames, step, atom_i, chunk_size,
-                         discard=False):
+    def _read_chunk_wise(file, n_frames, step, atom_i, chunk_size):
         """
         Similar to :func:`read()`, just for chunk-wise reading of the
         trajectory.
@@ -687,24 +850,171 @@ class TrajectoryFile(File, metaclass=abc.ABCMeta):
                 # -> all frames have been read
                 # -> stop reading chunks
                 break
-            if not discard:
-                chunks.append(chunk)
+            chunks.append(chunk)
             if remaining_frames is not None:
                 remaining_frames -= n
         
-        if not discard:
-            # Assemble the chunks into contiguous arrays
-            # for each value (coord, box, time)
-            result = [None] * len(chunks[0])
-            # Iterate over all values in the result tuple
-            # and concatenate the corresponding value from each chunk,
-            # if the value is not None
-            # The amount of values is determined from the first chunk
-            for i in range(len(chunks[0])):
-                if chunks[0][i] is not None:
-                    result[i] = np.concatenate([chunk[i] for chunk in chunks])
-                else:
-                    result[i] = None
-            return tuple(result)
+        # Assemble the chunks into contiguous arrays
+        # for each value (coord, box, time)
+        result = [None] * len(chunks[0])
+        # Iterate over all values in the result tuple
+        # and concatenate the corresponding value from each chunk,
+        # if the value is not None
+        # The amount of values is determined from the first chunk
+        for i in range(len(chunks[0])):
+            if chunks[0][i] is not None:
+                result[i] = np.concatenate([chunk[i] for chunk in chunks])
+            else:
+                result[i] = None
+        return tuple(result)
+
+
+class TrajectoryFrames:
+    """
+    Random access to the frames of a trajectory file.
+
+    An instance is created via :func:`TrajectoryFile.read_frames()`.
+    Indexing this object with an integer reads the corresponding frame
+    from the file, without reading any preceding frame.
+    Indexing with a slice or an index array reads the selected frames
+    into an additional first dimension of the return values.
+
+    The underlying file stays open until :func:`close()` is called.
+    Therefore, this object should be used in a ``with`` statement.
+
+    Parameters
+    ----------
+    file_cls : type
+        The :class:`TrajectoryFile` subclass for the format of the file.
+    file_name : str
+        The path of the file to be read.
+    atom_i : ndarray, dtype=int, optional
+        If this parameter is set, only the atoms at the given
+        indices are read from each frame.
+    """
+
+    def __init__(self, file_cls, file_name, atom_i=None):
+        self._file_cls = file_cls
+        self._atom_i = atom_i
+        self._file = file_cls._open_for_reading(file_name)
+        self._length = file_cls._frame_count(self._file)
+
+    def close(self):
+        """
+        Close the underlying file.
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def __getitem__(self, index):
+        """
+        Returns
+        -------
+        coord : ndarray, dtype=float32, shape=(n,3) or shape=(m,n,3)
+            The atom coordinates in the selected frame(s).
+        box : ndarray, dtype=float32, shape=(3,3) or shape=(m,3,3) or None
+            The box vectors of the selected frame(s).
+        time : float or ndarray, dtype=float32, shape=(m,) or None
+            The simulation time of the selected frame(s) in *ps*.
+        """
+        if isinstance(index, (int, np.integer)):
+            coord, box, time = self._read_frames(
+                self._normalize_index(index), 1, None
+            )
+            return (
+                coord[0],
+                box[0] if box is not None else None,
+                float(time[0]) if time is not None else None,
+            )
+
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step > 0:
+                n_frames = len(range(start, stop, step))
+                if n_frames == 0:
+                    # Read empty range of frames
+                    return self[np.array([], dtype=int)]
+                # Consecutive frames can be read in one go
+                return self._read_frames(start, n_frames, step)
+            indices = np.arange(start, stop, step)
         else:
-            return None
\ No newline at end of file
+            indices = np.asarray(index)
+            if indices.dtype == bool:
+                if len(indices) != len(self):
+                    raise IndexError(
+                        f"Boolean mask has length {len(indices)}, "
+                        f"but the trajectory has {len(self)} frames"
+                    )
+                indices = np.where(indices)[0]
+            if indices.ndim != 1:
+                raise IndexError("Only one-dimensional indices are supported")
+
+        if len(indices) == 0:
+            # Read a frame to obtain the shape of the values
+            coord, box, time = self._read_frames(0, 1, None)
+            return (
+                coord[:0],
+                box[:0] if box is not None else None,
+                time[:0] if time is not None else None,
+            )
+        frames = [
+            self._read_frames(self._normalize_index(i), 1, None)
+            for i in indices
+        ]
+        return tuple(
+            np.concatenate([frame[i] for frame in frames])
+            if frames[0][i] is not None else None
+            for i in range(3)
+        )
+
+    def _normalize_index(self, index):
+        if index < 0:
+            index += len(self)
+        if index < 0 or index >= len(self):
+            raise IndexError(
+                f"Index {index} is out of range "
+                f"for a trajectory with {len(self)} frames"
+            )
+        return int(index)
+
+    def _read_frames(self, start, n_frames, step):
+        self._file.seek(start)
+        result = self._file.read(
+            n_frames, stride=step, atom_indices=self._atom_i
+        )
+        return self._file_cls.process_read_values(result)
+
+
+def _frame_index_path(file_name):
+    return f"{file_name}.offsets.npz"
+
+
+def _load_frame_index(file_name):
+    """
+    Load the frame offsets from the sidecar file created by
+    :func:`TrajectoryFile.create_frame_index()`.
+    Return ``None``, if the sidecar file does not exist or is outdated.
+    """
+    index_path = _frame_index_path(file_name)
+    if not os.path.isfile(index_path):
+        return None
+    stat = os.stat(file_name)
+    with np.load(index_path) as index:
+        if (
+            index["file_size"] != stat.st_size
+            or index["file_mtime"] != stat.st_mtime_ns
+        ):
+            return None
+        return index["offsets"]
@@ -195,10 +195,16 @@ def rdf(center, atoms, selection=None, interval=(0, 10), bins=100, box=None,
     threshold_dist = edges[-1]
     cell_size = threshold_dist
     disp = []
+    cell_list = None
     for i in range(atoms.stack_depth()):
         # Use cell list to efficiently preselect atoms that are in range
         # of the desired bin range
-        cell_list = CellList(atom_coord[i], cell_size, periodic, box[i])
+        # The cell list of the previous model is updated, as the atoms
+        # usually move only slightly between models
+        if cell_list is None:
+            cell_list = CellList(atom_coord[i], cell_size, periodic, box[i])
+        else:
+            cell_list.update(atom_coord[i], box[i])
         # 'cell_radius=1' is used in 'get_atoms_in_cells()'
         # This is enough to find all atoms that are in the given
         # interval (and more), since the size of each cell is as large
@@ -9,13 +9,15 @@ a protein or single atoms.
 
 __name__ = "biotite.structure"
 __author__ = "Patrick Kunzmann"
-__all__ = ["sasa"]
+__all__ = ["sasa", "SasaCalculator"]
 
 cimport cython
 cimport numpy as np
 from libc.stdlib cimport malloc, free
 
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
+from .atoms import AtomArrayStack
 from .celllist import CellList
 from .filter import filter_solvent, filter_monoatomic_ions
 from .info.radii import vdw_radius_protor, vdw_radius_single
@@ -25,14 +27,13 @@ ctypedef np.int64_t int64
 ctypedef np.float32_t float32
 
 
-@cython.boundscheck(False)
-@cython.wraparound(False)
 def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
          bint ignore_ions=True, int point_number=1000,
-         point_distr="Fibonacci", vdw_radii="ProtOr"):
+         point_distr="Fibonacci", vdw_radii="ProtOr", int n_threads=1):
     """
     sasa(array, probe_radius=1.4, atom_filter=None, ignore_ions=True,
-         point_number=1000, point_distr="Fibonacci", vdw_radii="ProtOr")
+         point_number=1000, point_distr="Fibonacci", vdw_radii="ProtOr",
+         n_threads=1)
 
     Calculate the Solvent Accessible Surface Area (SASA) of a protein.
     
@@ -44,8 +45,11 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
     
     Parameters
     ----------
-    array : AtomArray
-        The protein model to calculate the SASA for.
+    array : AtomArray or AtomArrayStack
+        The protein model(s) to calculate the SASA for.
+        If an :class:`AtomArrayStack` is given, the SASA is calculated
+        for each model, while the VdW radii, filters and sphere points
+        are determined only once.
     probe_radius : float, optional
         The VdW-radius of the solvent molecules (default: 1.4).
     atom_filter : ndarray, dtype=bool, optional
@@ -86,14 +90,21 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
               :footcite:`Bondi1964`
               
         By default *ProtOr* is used.
+    n_threads : int, optional
+        The number of threads the SASA calculation is distributed to.
+        The atoms are split into chunks, that are processed in parallel
+        without holding the GIL.
+        By default, the calculation runs in the calling thread.
               
     
     Returns
     -------
-    sasa : ndarray, dtype=bool, shape=(n,)
+    sasa : ndarray, dtype=float32, shape=(n,) or shape=(m,n)
         Atom-wise SASA. `NaN` for atoms where SASA has not been 
         calculated
         (solvent atoms, hydrogen atoms (ProtOr), atoms not in `filter`).
+        If an :class:`AtomArrayStack` is given, the SASA of each model
+        *m* is returned.
         
     References
     ----------
@@ -101,10 +112,153 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
     .. footbibliography::
     
     """
-    cdef int i=0, j=0, k=0, adj_atom_i=0, rel_atom_i=0
-    
-    cdef np.ndarray sasa_filter
-    cdef np.ndarray occl_filter
+    if isinstance(array, AtomArrayStack):
+        template = array[0]
+    else:
+        template = array
+    calculator = SasaCalculator(
+        template, probe_radius, atom_filter, ignore_ions, point_number,
+        point_distr, vdw_radii, n_threads
+    )
+    return calculator.compute(array.coord)
+
+
+class SasaCalculator:
+    """
+    SasaCalculator(template, probe_radius=1.4, atom_filter=None,
+                   ignore_ions=True, point_number=1000,
+                   point_distr="Fibonacci", vdw_radii="ProtOr",
+                   n_threads=1)
+
+    Calculate the Solvent Accessible Surface Area (SASA) for varying
+    coordinates of the same atoms.
+
+    In contrast to :func:`sasa()`, the setup of the calculation,
+    i.e. the filters, VdW radii and the sphere points, is performed
+    only once from the given `template`.
+    Afterwards, the SASA can be calculated repeatedly via
+    :meth:`compute()` for new coordinates, e.g. the frames of a
+    trajectory.
+    The parameters are equal to :func:`sasa()`.
+
+    Parameters
+    ----------
+    template : AtomArray
+        The atoms to calculate the SASA for.
+        The atom annotations are taken from the template,
+        the coordinates are ignored.
+    probe_radius : float, optional
+        The VdW-radius of the solvent molecules (default: 1.4).
+    atom_filter : ndarray, dtype=bool, optional
+        If this parameter is given, SASA is only calculated for the
+        filtered atoms.
+    ignore_ions : bool, optional
+        If true, all monoatomic ions are removed before SASA calculation
+        (default: True).
+    point_number : int, optional
+        The number of points in the mesh occupying each atom for SASA
+        calculation (default: 1000).
+    point_distr : str or function, optional
+        The point distribution for the mesh (default: *Fibonacci*).
+    vdw_radii : str or ndarray, dtype=float, optional
+        The set of VdW radii to be used (default: *ProtOr*).
+    n_threads : int, optional
+        The number of threads the SASA calculation is distributed to.
+
+    See also
+    --------
+    sasa
+
+    Examples
+    --------
+
+    >>> calculator = SasaCalculator(atom_array_stack[0])
+    >>> sasa_per_model = calculator.compute(atom_array_stack.coord)
+    >>> print(sasa_per_model.shape)
+    (38, 304)
+    """
+
+    def __init__(self, template, float probe_radius=1.4,
+                 np.ndarray atom_filter=None, bint ignore_ions=True,
+                 int point_number=1000, point_distr="Fibonacci",
+                 vdw_radii="ProtOr", int n_threads=1):
+        if isinstance(template, AtomArrayStack):
+            raise TypeError("Expected 'AtomArray' but got 'AtomArrayStack'")
+        if n_threads < 1:
+            raise ValueError("The number of threads must be at least 1")
+        sasa_filter, occl_filter = _create_filters(
+            template, atom_filter, ignore_ions
+        )
+        self._sphere_points = _create_sphere_points(point_number, point_distr)
+        radii, sasa_filter, occl_filter = _create_radii(
+            template, vdw_radii, sasa_filter, occl_filter
+        )
+        # Increase atom radii by probe size ("rolling probe")
+        radii += probe_radius
+        self._radii = radii
+        self._sasa_filter = sasa_filter
+        self._occl_filter = occl_filter
+        self._point_number = point_number
+        self._n_threads = n_threads
+        self._array_length = template.array_length()
+
+    def compute(self, coord):
+        """
+        compute(coord)
+
+        Calculate the atom-wise SASA for the given coordinates.
+
+        Parameters
+        ----------
+        coord : ndarray, dtype=float, shape=(n,3) or shape=(m,n,3)
+            The coordinates of the template atoms.
+            If multiple models are given, the SASA is calculated for
+            each model.
+
+        Returns
+        -------
+        sasa : ndarray, dtype=float32, shape=(n,) or shape=(m,n)
+            Atom-wise SASA. `NaN` for atoms where SASA has not been
+            calculated.
+        """
+        coord = np.asarray(coord)
+        if coord.ndim not in (2, 3) or coord.shape[-2:] != (
+            self._array_length, 3
+        ):
+            raise IndexError(
+                f"Expected coordinates for {self._array_length} atoms, "
+                f"but got shape {coord.shape}"
+            )
+
+        if self._n_threads > 1:
+            executor = ThreadPoolExecutor(max_workers=self._n_threads)
+        else:
+            executor = None
+        try:
+            if coord.ndim == 3:
+                return np.stack([
+                    self._compute_model(model_coord, executor)
+                    for model_coord in coord
+                ])
+            else:
+                return self._compute_model(coord, executor)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def _compute_model(self, coord, executor):
+        return _sasa_model(
+            coord, self._sasa_filter, self._occl_filter, self._radii,
+            self._sphere_points, self._point_number,
+            executor, self._n_threads
+        )
+
+
+def _create_filters(array, atom_filter, ignore_ions):
+    """
+    Create the filter for the atoms to calculate the SASA for and the
+    filter for the atoms that are considered for occlusion.
+    """
     if atom_filter is not None:
         # Filter for all atoms to calculate SASA for
         sasa_filter = np.array(atom_filter, dtype=bool)
@@ -121,17 +275,24 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
         filter = ~filter_monoatomic_ions(array)
         sasa_filter = sasa_filter & filter
         occl_filter = occl_filter & filter
-    
-    cdef np.ndarray sphere_points
+    return sasa_filter, occl_filter
+
+
+def _create_sphere_points(point_number, point_distr):
     if callable(point_distr):
         sphere_points = point_distr(point_number)
     elif point_distr == "Fibonacci":
         sphere_points = _create_fibonacci_points(point_number)
     else:
         raise ValueError(f"'{point_distr}' is not a valid point distribution")
-    sphere_points = sphere_points.astype(np.float32)
-    
-    cdef np.ndarray radii
+    return sphere_points.astype(np.float32)
+
+
+def _create_radii(array, vdw_radii, sasa_filter, occl_filter):
+    """
+    Get the VdW radii of the atoms and further narrow down the filters
+    to the atoms, that have a radius in the chosen set.
+    """
     if isinstance(vdw_radii, np.ndarray):
         radii = vdw_radii.astype(np.float32)
         if len(radii) != array.array_length():
@@ -156,51 +317,109 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
             radii[i] = rad if rad is not None else 1.8
     else:
         raise KeyError(f"'{vdw_radii}' is not a valid radii set")
-    # Increase atom radii by probe size ("rolling probe")
-    radii += probe_radius
-    
-    # Memoryview for filter
-    # Problem with creating boolean memoryviews
-    # -> Type uint8 is used
-    cdef np_bool[:] sasa_filter_view = np.frombuffer(sasa_filter,
-                                                     dtype=np.uint8)
-    
-    cdef np.ndarray occl_r = radii[occl_filter]
-    # Atom array containing occluding atoms
-    occl_array = array[occl_filter]
-    
-    # Memoryviews for coordinates of entire (main) array
-    # and for coordinates of occluding atom array
-    cdef float32[:,:] main_coord = array.coord.astype(np.float32,
-                                                      copy=False)
-    cdef float32[:,:] occl_coord = occl_array.coord.astype(np.float32,
-                                                           copy=False)
-    # Memoryviews for sphere points
-    cdef float32[:,:] sphere_coord = sphere_points
+    return radii, sasa_filter, occl_filter
+
+
+def _sasa_model(np.ndarray coord, np.ndarray sasa_filter,
+                np.ndarray occl_filter, np.ndarray radii,
+                np.ndarray sphere_points, int point_number,
+                executor, int n_threads):
+    """
+    Calculate the atom-wise SASA for the coordinates of a single model.
+    If an `executor` is given, the atoms are distributed in chunks to
+    its threads.
+    """
+    cdef int array_length = coord.shape[0]
+    coord = coord.astype(np.float32, copy=False)
+    occl_coord = coord[occl_filter]
     # Check if any of these arrays are empty to prevent segfault
-    if     main_coord.shape[0]   == 0 \
-        or occl_coord.shape[0]   == 0 \
-        or sphere_coord.shape[0] == 0:
+    if     array_length            == 0 \
+        or occl_coord.shape[0]     == 0 \
+        or sphere_points.shape[0]  == 0:
             raise ValueError("Coordinates are empty")
-    # Memoryviews for radii of SASA and occluding atoms
-    # their squares and their sum of sqaures
-    cdef float32[:] atom_radii = radii
-    cdef float32[:] atom_radii_sq = radii * radii
-    cdef float32[:] occl_radii = occl_r
-    cdef float32[:] occl_radii_sq = occl_r * occl_r
-    # Memoryview for atomwise SASA
-    cdef float32[:] sasa = np.full(len(array), np.nan, dtype=np.float32)
     
+    # Cell size is as large as the maximum distance, 
+    # where two atom can intersect.
+    # Therefore intersecting atoms are always in the same or adjacent cell.
+    cell_list = CellList(occl_coord, np.max(radii[occl_filter])*2)
+    cell_indices = cell_list.get_atoms_in_cells(coord)
+
+    sasa = np.full(array_length, np.nan, dtype=np.float32)
+    # Problem with creating boolean memoryviews
+    # -> Type uint8 is used
+    sasa_filter_uint8 = np.frombuffer(sasa_filter, dtype=np.uint8)
+    occl_radii = radii[occl_filter]
+    args = (
+        sasa_filter_uint8, coord, occl_coord, radii, occl_radii,
+        sphere_points, cell_indices, point_number, sasa
+    )
+
+    if executor is None:
+        _sasa_chunk(0, array_length, *args)
+    else:
+        # Use more chunks than threads,
+        # since the computation time per atom varies
+        bounds = np.linspace(
+            0, array_length, n_threads * 4 + 1
+        ).astype(int)
+        futures = [
+            executor.submit(_sasa_chunk, start, stop, *args)
+            for start, stop in zip(bounds[:-1], bounds[1:])
+            if start != stop
+        ]
+        for future in futures:
+            # Propagate exceptions
+            future.result()
+    return sasa
+
+
+def _sasa_chunk(int start, int stop, np_bool[:] sasa_filter,
+                float32[:,:] main_coord, float32[:,:] occl_coord,
+                float32[:] atom_radii, float32[:] occl_radii,
+                float32[:,:] sphere_coord, int[:,:] cell_indices,
+                int point_number, float32[:] sasa):
+    """
+    Calculate the SASA for the atoms in the range from `start` to
+    `stop` and write it into `sasa`.
+    The GIL is released during calculation.
+    """
+    # Later on, this array stores coordinates for actual
+    # occluding atoms for a certain atom to calculate the
+    # SASA for
+    # The first three indices of the second axis
+    # are x, y and z, the last one is the squared radius
+    # This list is as long as the maximal length of a list of
+    # adjacent atoms
+    # Each chunk has its own array, so that chunks can be processed
+    # in parallel
+    cdef float32[:,:] relevant_occl_coord = np.zeros(
+        (cell_indices.shape[1], 4), dtype=np.float32
+    )
     # Area of a sphere point on a unit sphere
     cdef float32 area_per_point = 4.0 * np.pi / point_number
-    
-    # Define further statically typed variables
-    # that are needed for SASA calculation
+
+    with nogil:
+        _sasa_kernel(
+            start, stop, sasa_filter, main_coord, occl_coord,
+            atom_radii, occl_radii, sphere_coord, cell_indices,
+            relevant_occl_coord, point_number, area_per_point, sasa
+        )
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void _sasa_kernel(int start, int stop, np_bool[:] sasa_filter,
+                       float32[:,:] main_coord, float32[:,:] occl_coord,
+                       float32[:] atom_radii, float32[:] occl_radii,
+                       float32[:,:] sphere_coord, int[:,:] cell_indices,
+                       float32[:,:] relevant_occl_coord, int point_number,
+                       float32 area_per_point,
+                       float32[:] sasa) noexcept nogil:
+    cdef int i=0, j=0, k=0, adj_atom_i=0, rel_atom_i=0
     cdef int n_accesible = 0
     cdef float32 radius = 0
     cdef float32 radius_sq = 0
     cdef float32 adj_radius = 0
-    cdef float32 adj_radius_sq = 0
     cdef float32 dist_sq = 0
     cdef float32 point_x = 0
     cdef float32 point_y = 0
@@ -211,36 +430,11 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
     cdef float32 occl_x = 0
     cdef float32 occl_y = 0
     cdef float32 occl_z = 0
-    cdef float32[:,:] relevant_occl_coord = None
-    
-    # Cell size is as large as the maximum distance, 
-    # where two atom can intersect.
-    # Therefore intersecting atoms are always in the same or adjacent cell.
-    cell_list = CellList(occl_array, np.max(radii[occl_filter])*2)
-    cdef np.ndarray cell_indices
-    cdef int[:,:] cell_indices_view
-    cdef int length
-    cdef int max_adj_list_length = 0
-    cdef int array_length = array.array_length()
-
-    cell_indices = cell_list.get_atoms_in_cells(array.coord)
-    cell_indices_view = cell_indices
-    max_adj_list_length = cell_indices.shape[0]
-        
-    # Later on, this array stores coordinates for actual
-    # occluding atoms for a certain atom to calculate the
-    # SASA for
-    # The first three indices of the second axis
-    # are x, y and z, the last one is the squared radius
-    # This list is as long as the maximal length of a list of
-    # adjacent atoms
-    relevant_occl_coord = np.zeros((max_adj_list_length, 4),
-                                   dtype=np.float32)
     
     # Actual SASA calculation
-    for i in range(array_length):
+    for i in range(start, stop):
         # First level: The atoms to calculate SASA for
-        if not sasa_filter_view[i]:
+        if not sasa_filter[i]:
             # SASA is not calculated for this atom
             continue
         n_accesible = point_number
@@ -248,16 +442,16 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
         atom_y = main_coord[i,1]
         atom_z = main_coord[i,2]
         radius = atom_radii[i]
-        radius_sq = atom_radii_sq[i]
+        radius_sq = radius * radius
         # Find occluding atoms from list of adjacent atoms
         rel_atom_i = 0
-        for j in range(max_adj_list_length):
+        for j in range(cell_indices.shape[1]):
             # Remove all atoms, where the distance to the relevant atom
             # is larger than the sum of the radii,
             # since those atoms do not touch
             # If distance is 0, it is the same atom,
             # and the atom is removed from the list as well
-            adj_atom_i = cell_indices_view[i,j]
+            adj_atom_i = cell_indices[i,j]
             if adj_atom_i == -1:
                 # -1 means end of list
                 break
@@ -265,7 +459,6 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
             occl_y = occl_coord[adj_atom_i,1]
             occl_z = occl_coord[adj_atom_i,2]
             adj_radius = occl_radii[adj_atom_i]
-            adj_radius_sq = occl_radii_sq[adj_atom_i]
             dist_sq = distance_sq(atom_x, atom_y, atom_z,
                                       occl_x, occl_y, occl_z)
             if dist_sq != 0 \
@@ -273,7 +466,7 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
                     relevant_occl_coord[rel_atom_i,0] = occl_x
                     relevant_occl_coord[rel_atom_i,1] = occl_y
                     relevant_occl_coord[rel_atom_i,2] = occl_z
-                    relevant_occl_coord[rel_atom_i,3] = adj_radius_sq
+                    relevant_occl_coord[rel_atom_i,3] = adj_radius*adj_radius
                     rel_atom_i += 1
         for j in range(sphere_coord.shape[0]):
             # Second level: The sphere points for that atom
@@ -296,11 +489,10 @@ def sasa(array, float probe_radius=1.4, np.ndarray atom_filter=None,
                     n_accesible -= 1
                     break
         sasa[i] = area_per_point * n_accesible * radius_sq
-    return np.asarray(sasa)
 
 
 cdef inline float32 distance_sq(float32 x1, float32 y1, float32 z1,
-                        float32 x2, float32 y2, float32 z2):
+                        float32 x2, float32 y2, float32 z2) noexcept nogil:
     cdef float32 dx = x2 - x1
     cdef float32 dy = y2 - y1
     cdef float32 dz = z2 - z1
@@ -3,8 +3,11 @@
 # information.
 
 from os.path import join
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
 import itertools
 import tempfile
+import threading
 import pytest
 import numpy as np
 import biotite.database.rcsb as rcsb
@@ -60,6 +63,139 @@ def test_fetch_invalid(format):
         )
 
 
+class _ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def local_server(monkeypatch):
+    """
+    Start a local HTTP server that stands in for the RCSB file server.
+
+    The server responds to ``/<id>.cif`` with a minimal CIF file.
+    The first *n* requests for an ID ``fail<n>`` fail with status 503
+    and the RCSB error page.
+    Requests for an ID starting with ``deny`` fail with status 403.
+    The requested paths are recorded in the returned list.
+    """
+    requested_paths = []
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                requested_paths.append(self.path)
+                n_requests = requested_paths.count(self.path)
+            id = self.path.strip("/").split(".")[0]
+            if id.startswith("fail") and n_requests <= int(id[4:]):
+                content = (
+                    b"<title>RCSB Protein Data Bank Error Page</title>"
+                )
+                self.send_response(503)
+                self.send_header("Content-Length", str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+                return
+            if id.startswith("deny"):
+                self.send_response(403)
+                self.end_headers()
+                return
+            content = f"data_{id}\n".encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = _ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(
+        "biotite.database.rcsb.download._standard_url",
+        f"http://127.0.0.1:{server.server_address[1]}/"
+    )
+    monkeypatch.setattr(
+        "biotite.database.rcsb.download._backoff_factor", 0
+    )
+    yield requested_paths
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("n_threads", [1, 4])
+def test_fetch_concurrent(tmp_path, local_server, n_threads):
+    """
+    Test whether concurrent downloads give the files in the order of
+    the input IDs.
+    """
+    ids = [f"{i:04d}" for i in range(20)]
+
+    files = rcsb.fetch(ids, "cif", tmp_path, n_threads=n_threads)
+
+    assert files == [join(tmp_path, id + ".cif") for id in ids]
+    for id, file in zip(ids, files):
+        with open(file) as f:
+            assert f.read() == f"data_{id}\n"
+
+
+def test_fetch_retry(tmp_path, local_server):
+    """
+    Test whether temporary server errors are retried up to the given
+    number of times.
+    """
+    file = rcsb.fetch("fail2", "cif", tmp_path, retries=2)
+    with open(file) as f:
+        assert f.read() == "data_fail2\n"
+
+    with pytest.raises(RequestError, match="status code 503"):
+        rcsb.fetch("fail3", "cif", tmp_path, retries=2)
+
+
+def test_fetch_error_status(tmp_path, local_server):
+    """
+    Test whether a response with an error status raises an exception
+    instead of writing the response into a file.
+    """
+    with pytest.raises(RequestError, match="status code 403"):
+        rcsb.fetch("deny", "cif", tmp_path)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_fetch_duplicates(tmp_path, local_server):
+    """
+    Test whether a file for a duplicate ID in a concurrent download is
+    downloaded only once.
+    """
+    ids = ["0001", "0002", "0001", "0001"]
+
+    files = rcsb.fetch(ids, "cif", tmp_path, n_threads=4)
+
+    assert files == [join(tmp_path, id + ".cif") for id in ids]
+    assert sorted(local_server) == ["/0001.cif", "/0002.cif"]
+    assert sorted([path.name for path in tmp_path.iterdir()]) \
+        == ["0001.cif", "0002.cif"]
+
+
+def test_fetch_resume(tmp_path, local_server):
+    """
+    Test whether an interrupted bulk download only downloads the
+    missing files, when it is repeated.
+    """
+    ids = [f"{i:04d}" for i in range(10)]
+    # Simulate an interrupted download: Some files are complete and
+    # one file was only partially written
+    rcsb.fetch(ids[:5], "cif", tmp_path)
+    with open(join(tmp_path, ids[5] + ".cif.part"), "w") as f:
+        f.write("data_")
+    local_server.clear()
+
+    rcsb.fetch(ids, "cif", tmp_path, n_threads=4)
+
+    assert sorted(local_server) == [f"/{id}.cif" for id in ids[5:]]
+
+
 def test_search_basic():
     query = rcsb.BasicQuery(TC5B_TERM)
     assert rcsb.search(query) == ["1L2Y"]
@@ -9,6 +9,7 @@ import pickle
 from typing import Any
 import numpy as np
 import pytest
+import biotite
 import biotite.sequence as seq
 import biotite.sequence.align as align
 
@@ -546,6 +547,71 @@ def test_pickle(k, random_sequences, table_class):
     assert test_table == ref_table
 
 
+@pytest.mark.parametrize(
+    "table_class",
+    [
+        align.KmerTable,
+        FixedBucketKmerTable(1000),
+        FixedBucketKmerTable(1000000)
+    ],
+    ids = idfn
+)
+def test_file(tmp_path, k, random_sequences, table_class):
+    """
+    Test whether a table written via :meth:`to_file()` and memory-mapped
+    via :meth:`from_file()` is equal to the original table, gives the
+    same matches and survives pickling.
+    """
+    file_name = tmp_path / "table.kmer"
+    ref_table = table_class.from_sequences(k, random_sequences[1:])
+    ref_table.to_file(file_name)
+
+    test_table = table_class.from_file(file_name)
+
+    assert test_table == ref_table
+    assert test_table.match(random_sequences[0]).tolist() \
+        == ref_table.match(random_sequences[0]).tolist()
+    assert np.array_equal(
+        test_table.count(np.arange(len(test_table.kmer_alphabet))),
+        ref_table.count(np.arange(len(ref_table.kmer_alphabet)))
+    )
+    # A mapped table is pickled as reference to its file
+    assert len(pickle.dumps(test_table)) < len(pickle.dumps(ref_table))
+    assert pickle.loads(pickle.dumps(test_table)) == ref_table
+
+
+@pytest.mark.parametrize(
+    "table_class", [align.KmerTable, FixedBucketKmerTable(1000)], ids = idfn
+)
+def test_file_relative_path(monkeypatch, tmp_path, k, random_sequences,
+                            table_class):
+    """
+    Test whether a table memory-mapped from a relative path can be
+    unpickled in a different working directory.
+    """
+    monkeypatch.chdir(tmp_path)
+    ref_table = table_class.from_sequences(k, random_sequences)
+    ref_table.to_file("table.kmer")
+    pickled = pickle.dumps(table_class.from_file("table.kmer"))
+
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    monkeypatch.chdir(other_dir)
+    assert pickle.loads(pickled) == ref_table
+
+
+def test_file_wrong_type(tmp_path, k, random_sequences):
+    """
+    Test whether opening a file containing a different table type
+    raises an exception.
+    """
+    file_name = tmp_path / "table.kmer"
+    align.KmerTable.from_sequences(k, random_sequences).to_file(file_name)
+
+    with pytest.raises(biotite.InvalidFileError):
+        align.BucketKmerTable.from_file(file_name)
+
+
 @pytest.mark.parametrize(
     "n_kmers, load_factor",
     itertools.product(
@@ -210,6 +210,90 @@ def test_random_alignment(seed, uint8_code):
     assert align.score(test_alignment, matrix) == ref_score
 
 
+@pytest.mark.parametrize(
+    "direction, n_threads, uint8_code", itertools.product(
+        ["both", "upstream", "downstream"], [1, 3], [False, True]
+    )
+)
+def test_batch(direction, n_threads, uint8_code):
+    """
+    Expect that :func:`align_local_ungapped_batch()` gives the same
+    alignments as :func:`align_local_ungapped()` for the seeds found
+    by :meth:`KmerTable.match()`.
+    """
+    N_TARGETS = 20
+    K = 3
+    THRESHOLD = 20
+
+    np.random.seed(0)
+    query = ProteinSequence()
+    query.code = np.random.randint(len(query.alphabet) - 1, size=200)
+    targets = []
+    for _ in range(N_TARGETS):
+        target = ProteinSequence()
+        target.code = np.random.randint(
+            len(target.alphabet) - 1, size=np.random.randint(K, 300)
+        )
+        # Place a mutated part of the query into the target
+        start = np.random.randint(len(query) - 10)
+        stop = min(start + len(target), len(query))
+        pos = np.random.randint(len(target) - (stop - start) + 1)
+        target.code[pos : pos + stop - start] = query.code[start : stop]
+        mutation_pos = np.random.randint(len(target), size=len(target) // 10)
+        target.code[mutation_pos] = np.random.randint(
+            len(target.alphabet) - 1, size=len(mutation_pos)
+        )
+        targets.append(target)
+    seeds = align.KmerTable.from_sequences(K, targets).match(query)
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    if not uint8_code:
+        converted = [
+            _convert_to_uint16_code(query, target, matrix)
+            for target in targets
+        ]
+        query = converted[0][0]
+        targets = [target for _, target, _ in converted]
+        matrix = converted[0][2]
+
+    ref_alignments = [
+        align.align_local_ungapped(
+            query, targets[target_i], matrix, (query_pos, target_pos),
+            THRESHOLD, direction
+        )
+        for query_pos, target_i, target_pos in seeds
+    ]
+
+    scores, starts, ends = align.align_local_ungapped_batch(
+        query, targets, matrix, seeds, THRESHOLD, direction,
+        n_threads=n_threads
+    )
+    assert scores.tolist() == [ali.score for ali in ref_alignments]
+    assert starts.tolist() == [ali.trace[0].tolist() for ali in ref_alignments]
+    assert ends.tolist() == [ali.trace[-1].tolist() for ali in ref_alignments]
+
+    test_alignments = align.align_local_ungapped_batch(
+        query, targets, matrix, seeds, THRESHOLD, direction,
+        traceback=True, n_threads=n_threads
+    )
+    assert test_alignments == ref_alignments
+
+
+@pytest.mark.parametrize(
+    "seeds", [[[0, 0, 10]], [[10, 0, 0]], [[0, 1, 0]], [[-1, 0, 0]]]
+)
+def test_batch_invalid_seeds(seeds):
+    """
+    Expect an exception for seeds that are out of range.
+    """
+    query = ProteinSequence("BIQTITE")
+    targets = [ProteinSequence("TITANITE")]
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    with pytest.raises(IndexError):
+        align.align_local_ungapped_batch(
+            query, targets, matrix, np.array(seeds), 10
+        )
+
+
 def _convert_to_uint16_code(seq1, seq2, matrix):
         """
         Adjust sequences, so that they use 'uint16' as dtype for the
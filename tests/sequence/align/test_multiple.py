@@ -2,6 +2,8 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+import itertools
+import numpy as np
 import pytest
 import biotite.sequence.align as align
 import biotite.application.muscle as muscle
@@ -44,4 +46,53 @@ def test_align_multiple(sequences, gap_penalty):
         ref_alignment, matrix, gap_penalty, terminal_penalty=True
     )
     
-    assert test_score >= ref_score * 0.5
\ No newline at end of file
+    assert test_score >= ref_score * 0.5
+
+
+@pytest.mark.parametrize(
+    "gap_penalty, band_width", itertools.product(
+        [-10, (-10,-1)], [None, 0]
+    )
+)
+def test_parallel_distances(sequences, gap_penalty, band_width):
+    """
+    Test whether distributing the pairwise alignments to multiple
+    processes gives the same distance matrix as the serial calculation.
+    """
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    sequences = sequences[:5]
+
+    _, _, _, ref_distances = align.align_multiple(
+        sequences, matrix, gap_penalty=gap_penalty, band_width=band_width
+    )
+    _, _, _, test_distances = align.align_multiple(
+        sequences, matrix, gap_penalty=gap_penalty, band_width=band_width,
+        n_processes=2
+    )
+
+    assert np.array_equal(test_distances, ref_distances)
+
+
+@pytest.mark.parametrize("method, param", [
+    ("band_width", 10),
+    ("band_width", 0),
+    ("kmer_size", 3),
+])
+def test_approximate_distances(sequences, method, param):
+    """
+    Test whether the approximate distance calculations give a symmetric
+    distance matrix with positive distances and a valid alignment.
+    """
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    sequences = sequences[:5]
+
+    alignment, _, _, distances = align.align_multiple(
+        sequences, matrix, **{method: param}
+    )
+
+    assert distances.shape == (len(sequences), len(sequences))
+    assert np.allclose(distances, distances.T)
+    assert np.all(np.diag(distances) == 0)
+    assert np.all(distances[~np.eye(len(sequences), dtype=bool)] > 0)
+    for i, seq in enumerate(alignment.get_gapped_sequences()):
+        assert seq.replace("-", "") == str(sequences[i])
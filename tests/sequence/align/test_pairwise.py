@@ -232,4 +232,74 @@ def test_scoring(sequences, gap_penalty, term, seq_indices):
                == alignment.score
     except AssertionError:
         print(alignment)
-        raise
\ No newline at end of file
+        raise
+
+
+@pytest.mark.parametrize(
+    "local, term, gap_penalty, base_size, seq_indices", itertools.product(
+        [True, False], [True, False], [-10, (-10,-1)], [4, 2**16],
+        [(i,j) for i in range(10) for j in range(i+1)]
+    )
+)
+def test_align_optimal_linear_memory(monkeypatch, sequences, local, term,
+                                     gap_penalty, base_size, seq_indices):
+    """
+    The alignment obtained with ``linear_memory=True`` should have the
+    same score as the alignments from the complete dynamic programming
+    table and the score should be consistent with the trace.
+    A small base case size enforces a deep recursion.
+    """
+    import biotite.sequence.align.pairwise as pairwise
+    monkeypatch.setattr(pairwise, "_LINEAR_MEMORY_BASE_SIZE", base_size)
+
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    index1, index2 = seq_indices
+    seq1 = sequences[index1]
+    seq2 = sequences[index2]
+    ref_alignment = align.align_optimal(
+        seq1, seq2, matrix,
+        gap_penalty=gap_penalty, terminal_penalty=term, local=local,
+        max_number=1
+    )[0]
+    test_alignments = align.align_optimal(
+        seq1, seq2, matrix,
+        gap_penalty=gap_penalty, terminal_penalty=term, local=local,
+        linear_memory=True
+    )
+
+    assert len(test_alignments) == 1
+    test_alignment = test_alignments[0]
+    assert test_alignment.score == ref_alignment.score
+    assert align.score(test_alignment, matrix, gap_penalty, term) \
+        == test_alignment.score
+
+
+@pytest.mark.parametrize(
+    "local, term, gap_penalty, seq_indices", itertools.product(
+        [True, False], [True, False], [-10, (-10,-1)],
+        [(i,j) for i in range(10) for j in range(i+1)]
+    )
+)
+def test_align_optimal_score_only(sequences, local, term, gap_penalty,
+                                  seq_indices):
+    """
+    The score obtained with ``score_only=True`` should be equal to the
+    score of the alignments from the complete dynamic programming
+    table.
+    """
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    index1, index2 = seq_indices
+    seq1 = sequences[index1]
+    seq2 = sequences[index2]
+    ref_score = align.align_optimal(
+        seq1, seq2, matrix,
+        gap_penalty=gap_penalty, terminal_penalty=term, local=local,
+        max_number=1
+    )[0].score
+    test_score = align.align_optimal(
+        seq1, seq2, matrix,
+        gap_penalty=gap_penalty, terminal_penalty=term, local=local,
+        score_only=True
+    )
+
+    assert test_score == ref_score
@@ -0,0 +1,194 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+import itertools
+import pytest
+import numpy as np
+import biotite.sequence as seq
+import biotite.sequence.align as align
+from .util import sequences
+
+
+@pytest.mark.parametrize(
+    "local, term, gap_penalty, seq_indices", itertools.product(
+        [True, False], [True, False], [-10, (-10,-1)],
+        [(i,j) for i in range(10) for j in range(i+1)]
+    )
+)
+def test_score_cas9(sequences, local, term, gap_penalty, seq_indices):
+    """
+    Test :meth:`QueryProfile.score()` by comparing the score to
+    the score of :func:`align_optimal()` for long similar protein
+    sequences, that require wide lanes.
+    """
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+    index1, index2 = seq_indices
+    seq1 = sequences[index1]
+    seq2 = sequences[index2]
+    ref_score = align.align_optimal(
+        seq1, seq2, matrix,
+        gap_penalty=gap_penalty, terminal_penalty=term, local=local,
+        max_number=1
+    )[0].score
+
+    profile = align.QueryProfile(seq1, matrix, gap_penalty, term, local)
+    test_score = profile.score(seq2)
+
+    assert test_score == ref_score
+
+
+@pytest.mark.parametrize(
+    "local, term, gap_penalty, seed", itertools.product(
+        [True, False], [True, False], [-5, (-7,-2), (-5,0)], range(20)
+    )
+)
+def test_score_random(local, term, gap_penalty, seed):
+    """
+    Test :meth:`QueryProfile.score()` by comparing the score to
+    the score of :func:`align_optimal()` for random short sequences,
+    including sequences shorter than the number of lanes.
+    Each profile is used for multiple targets.
+    """
+    N_TARGETS = 5
+    LENGTH_RANGE = (1, 100)
+
+    np.random.seed(seed)
+    sequences = []
+    for _ in range(N_TARGETS + 1):
+        sequence = seq.NucleotideSequence()
+        sequence.code = np.random.randint(
+            len(sequence.alphabet), size=np.random.randint(*LENGTH_RANGE)
+        )
+        sequences.append(sequence)
+    query = sequences[0]
+    matrix = align.SubstitutionMatrix.std_nucleotide_matrix()
+
+    profile = align.QueryProfile(query, matrix, gap_penalty, term, local)
+    for target in sequences[1:]:
+        ref_score = align.align_optimal(
+            query, target, matrix,
+            gap_penalty=gap_penalty, terminal_penalty=term, local=local,
+            max_number=1
+        )[0].score
+        assert profile.score(target) == ref_score
+
+
+@pytest.mark.parametrize(
+    "gap_penalty, seed", itertools.product([-5, (-7,-2)], range(20))
+)
+def test_local_end(gap_penalty, seed):
+    """
+    Test whether the end position returned by
+    :meth:`QueryProfile.score()` is the end of an optimal local
+    alignment:
+    The optimal alignment of the sequences truncated after the end
+    position must have the same score.
+    """
+    LENGTH_RANGE = (1, 200)
+
+    np.random.seed(seed)
+    sequences = []
+    for _ in range(2):
+        sequence = seq.NucleotideSequence()
+        sequence.code = np.random.randint(
+            len(sequence.alphabet), size=np.random.randint(*LENGTH_RANGE)
+        )
+        sequences.append(sequence)
+    query, target = sequences
+    matrix = align.SubstitutionMatrix.std_nucleotide_matrix()
+
+    profile = align.QueryProfile(query, matrix, gap_penalty, local=True)
+    score, (query_end, target_end) = profile.score(target, return_end=True)
+
+    assert score > 0
+    ref_alignment = align.align_optimal(
+        query[:query_end+1], target[:target_end+1], matrix,
+        gap_penalty=gap_penalty, local=True, max_number=1
+    )[0]
+    assert ref_alignment.score == score
+    # The alignment must end at the end position
+    assert ref_alignment.trace[-1].tolist() == [query_end, target_end]
+
+
+def test_global_end():
+    """
+    Check the end position of global alignments with and without
+    terminal penalty for a query that is contained in the target.
+    """
+    query = seq.NucleotideSequence("ACGTACGT")
+    target = seq.NucleotideSequence("TTTTACGTACGTTTTTT")
+    matrix = align.SubstitutionMatrix.std_nucleotide_matrix()
+
+    profile = align.QueryProfile(query, matrix, terminal_penalty=True)
+    _, end = profile.score(target, return_end=True)
+    assert end == (len(query) - 1, len(target) - 1)
+
+    profile = align.QueryProfile(query, matrix, terminal_penalty=False)
+    score, end = profile.score(target, return_end=True)
+    assert score == len(query) * 5
+    assert end == (len(query) - 1, 11)
+
+
+def test_empty_target():
+    """
+    Aligning an empty target should give the score of a single gap
+    spanning the query.
+    """
+    query = seq.NucleotideSequence("ACGTACGT")
+    matrix = align.SubstitutionMatrix.std_nucleotide_matrix()
+
+    profile = align.QueryProfile(query, matrix, (-10, -1))
+    assert profile.score(seq.NucleotideSequence()) == -10 - 7
+    profile = align.QueryProfile(query, matrix, (-10, -1), local=True)
+    assert profile.score(seq.NucleotideSequence()) == 0
+
+
+def test_incompatible_alphabet():
+    """
+    A target with an alphabet that does not fit the matrix should raise
+    an exception.
+    """
+    query = seq.NucleotideSequence("ACGT")
+    matrix = align.SubstitutionMatrix.std_nucleotide_matrix()
+    profile = align.QueryProfile(query, matrix)
+    with pytest.raises(ValueError):
+        profile.score(seq.ProteinSequence("ACWY"))
+
+
+@pytest.mark.parametrize(
+    "local, n_threads", itertools.product([True, False], [1, 3])
+)
+def test_score_batch(sequences, local, n_threads):
+    """
+    Test :meth:`QueryProfile.score_batch()` by comparing the scores and
+    end positions to the results of :meth:`QueryProfile.score()` for
+    targets of mixed lengths, requiring different lane widths.
+    """
+    np.random.seed(0)
+    targets = list(sequences[1:])
+    for _ in range(10):
+        target = seq.ProteinSequence()
+        target.code = np.random.randint(
+            len(target.alphabet) - 1, size=np.random.randint(1, 100)
+        )
+        targets.append(target)
+    targets.append(seq.ProteinSequence())
+    np.random.shuffle(targets)
+    matrix = align.SubstitutionMatrix.std_protein_matrix()
+
+    profile = align.QueryProfile(sequences[0], matrix, (-10, -1), local=local)
+    ref_scores = []
+    ref_ends = []
+    for target in targets:
+        score, end = profile.score(target, return_end=True)
+        ref_scores.append(score)
+        ref_ends.append(list(end))
+
+    test_scores, test_ends = profile.score_batch(
+        targets, return_end=True, n_threads=n_threads
+    )
+    assert test_scores.tolist() == ref_scores
+    assert test_ends.tolist() == ref_ends
+    test_scores = profile.score_batch(targets, n_threads=n_threads)
+    assert test_scores.tolist() == ref_scores
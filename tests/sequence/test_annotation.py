@@ -82,4 +82,78 @@ def test_annotated_sequence():
 def test_reverse_complement():
     gb_file = gb.GenBankFile.read(join(data_dir("sequence"), "ec_bl21.gb"))
     annot_seq = gb.get_annotated_sequence(gb_file)
-    assert annot_seq == annot_seq.reverse_complement().reverse_complement()
\ No newline at end of file
+    assert annot_seq == annot_seq.reverse_complement().reverse_complement()
+@pytest.mark.parametrize("seed", range(10))
+def test_overlapping_features(seed):
+    """
+    Compare the features found by
+    :meth:`Annotation.get_overlapping_features()` and slicing with the
+    features found by checking each location, including features with
+    multiple locations and an annotation modified after querying.
+    """
+    N_FEATURES = 100
+    N_QUERIES = 50
+
+    np.random.seed(seed)
+    features = []
+    for i in range(N_FEATURES):
+        locs = []
+        for _ in range(np.random.randint(1, 4)):
+            first = np.random.randint(-100, 1000)
+            last = first + np.random.randint(0, np.random.choice([10, 300]))
+            locs.append(Location(first, last))
+        features.append(Feature("CDS", locs, {"id" : str(i)}))
+    annotation = Annotation(features[:N_FEATURES // 2])
+
+    for added_feature in features[N_FEATURES // 2:]:
+        annotation.add_feature(added_feature)
+        start = np.random.randint(-150, 1050)
+        stop = start + np.random.randint(1, 100)
+        ref_features = set([
+            feature for feature in annotation
+            if any(loc.first < stop and loc.last >= start for loc in feature.locs)
+        ])
+
+        test_features = annotation.get_overlapping_features(start, stop)
+        assert len(test_features) == len(ref_features)
+        assert set(test_features) == ref_features
+        assert set(
+            [f.qual["id"] for f in annotation[start:stop]]
+        ) == set([f.qual["id"] for f in ref_features])
+    
+    assert set(annotation.get_overlapping_features()) == set(features)
+    assert annotation.get_location_range() == (
+        min([loc.first for f in features for loc in f.locs]),
+        max([loc.last for f in features for loc in f.locs]) + 1
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_nearest_feature(seed):
+    """
+    Check whether the feature found by
+    :meth:`Annotation.get_nearest_feature()` has the smallest distance
+    to the given position.
+    """
+    N_FEATURES = 20
+
+    np.random.seed(seed)
+    features = []
+    for i in range(N_FEATURES):
+        first = np.random.randint(0, 1000)
+        last = first + np.random.randint(0, 20)
+        features.append(Feature("CDS", [Location(first, last)]))
+    annotation = Annotation(features)
+
+    def distance(feature, position):
+        loc = list(feature.locs)[0]
+        if loc.first <= position <= loc.last:
+            return 0
+        return min(abs(loc.first - position), abs(loc.last - position))
+
+    for position in range(-10, 1030):
+        nearest = annotation.get_nearest_feature(position)
+        assert distance(nearest, position) \
+            == min([distance(f, position) for f in annotation])
+    
+    assert Annotation().get_nearest_feature(0) is None
@@ -3,6 +3,7 @@
 # information.
 
 import itertools
+import biotite
 import glob
 import io
 import biotite.sequence as seq
@@ -200,4 +201,79 @@ def test_write_iter(chars_per_line, n_sequences):
         chars_per_line
     )
 
-    assert test_file.getvalue() == ref_file.getvalue()
\ No newline at end of file
+    assert test_file.getvalue() == ref_file.getvalue()
+
+@pytest.mark.parametrize(
+    "file_name, chars_per_line, line_ending", itertools.product(
+        glob.glob(os.path.join(data_dir("sequence"), "*.fasta")),
+        [1, 7, 80],
+        ["\n", "\r\n"]
+    )
+)
+def test_indexed_access(tmp_path, file_name, chars_per_line, line_ending):
+    """
+    Test whether the sequence regions obtained from an
+    :class:`IndexedFastaFile` are equal to the corresponding sections
+    of the sequences read via :class:`FastaFile`.
+    """
+    N_REGIONS = 20
+
+    try:
+        ref_file = fasta.FastaFile.read(file_name)
+    except biotite.InvalidFileError:
+        pytest.skip("Invalid FASTA file")
+    # The index uses only the first word of the header as name
+    ref_entries = {
+        header.split()[0]: seq_str for header, seq_str in ref_file.items()
+    }
+    if len(ref_entries) != len(ref_file):
+        pytest.skip("Headers are not distinguishable by their first word")
+
+    test_file_name = str(tmp_path / "test.fasta")
+    text_buffer = io.StringIO()
+    fasta.FastaFile.write_iter(
+        text_buffer, ref_file.items(), chars_per_line=chars_per_line
+    )
+    with open(test_file_name, "w", newline=line_ending) as file:
+        file.write(text_buffer.getvalue())
+
+    np.random.seed(0)
+    with fasta.IndexedFastaFile(test_file_name) as test_file:
+        assert list(test_file.keys()) == list(ref_entries.keys())
+        for name, ref_seq_str in ref_entries.items():
+            assert test_file[name] == ref_seq_str
+            for _ in range(N_REGIONS):
+                start, stop = np.sort(
+                    np.random.randint(len(ref_seq_str) + 1, size=2)
+                )
+                assert test_file.get_region(name, start, stop) \
+                    == ref_seq_str[start:stop]
+
+
+def test_index_file(tmp_path):
+    """
+    Test whether an index written to a ``.fai`` file and read again is
+    equal to the original one and whether it is used by
+    :class:`IndexedFastaFile`.
+    """
+    file_name = os.path.join(data_dir("sequence"), "random.fasta")
+    ref_index = fasta.FastaIndex.build(file_name)
+    index_file_name = str(tmp_path / "random.fasta.fai")
+    ref_index.write(index_file_name)
+    test_index = fasta.FastaIndex.read(index_file_name)
+    assert dict(test_index.items()) == dict(ref_index.items())
+
+    ref_file = fasta.FastaFile.read(file_name)
+    with fasta.IndexedFastaFile(file_name, index_file_name) as test_file:
+        for header, ref_seq_str in ref_file.items():
+            assert str(test_file.get_sequence(header)) == ref_seq_str
+
+
+def test_index_inconsistent_line_length():
+    """
+    Building an index of a file with differing sequence line lengths
+    within an entry should raise an exception.
+    """
+    file = io.BytesIO(b">seq1\nACG\nTA\nCGT\n")
+    with pytest.raises(biotite.InvalidFileError):
+        fasta.FastaIndex.build(file)
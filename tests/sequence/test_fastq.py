@@ -136,4 +136,40 @@ def test_write_iter(offset, chars_per_line, n_sequences):
         offset, chars_per_line
     )
 
-    assert test_file.getvalue() == ref_file.getvalue()
\ No newline at end of file
+    assert test_file.getvalue() == ref_file.getvalue()
+
+
+@pytest.mark.parametrize(
+    "chunk_size, line_ending", itertools.product(
+        [7, 100, 2**24],
+        ["\n", "\r\n"]
+    )
+)
+def test_read_batches(chunk_size, line_ending):
+    """
+    Test whether :func:`FastqFile.read_batches()` gives the same
+    sequences and scores as :func:`FastqFile.read_iter()`, independent
+    of the chunk size and line ending.
+    """
+    file_name = os.path.join(data_dir("sequence"), "random.fastq")
+    ref_entries = list(fastq.FastqFile.read_iter(file_name, offset="Sanger"))
+
+    # Batch reading supports only the single-line FASTQ layout
+    single_line_file = io.StringIO()
+    fastq.FastqFile.write_iter(single_line_file, ref_entries, offset="Sanger")
+    content = single_line_file.getvalue()
+    content = line_ending.join(content.splitlines()) + line_ending
+    test_file = io.BytesIO(content.encode("ascii"))
+    test_entries = []
+    for batch in fastq.FastqFile.read_batches(
+        test_file, offset="Sanger", chunk_size=chunk_size
+    ):
+        assert isinstance(batch, fastq.FastqBatch)
+        test_entries += [batch[i] for i in range(len(batch))]
+
+    assert len(test_entries) == len(ref_entries)
+    for (test_id, (test_seq, test_sc)), (ref_id, (ref_seq, ref_sc)) \
+        in zip(test_entries, ref_entries):
+            assert test_id == ref_id
+            assert test_seq == ref_seq
+            assert np.array_equal(test_sc, ref_sc)
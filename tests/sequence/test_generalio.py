@@ -8,6 +8,8 @@ import biotite.sequence as seq
 import biotite.sequence.io as seqio
 import numpy as np
 import glob
+import itertools
+import os
 from os.path import join
 from ..util import data_dir
 import pytest
@@ -60,6 +62,31 @@ def test_saving_multiple(suffix):
         # This error might occur on AppVeyor
         pytest.skip("Permission is denied")
 
+@pytest.mark.parametrize(
+    "suffix, compression",
+    itertools.product(["fasta", "fastq", "gb"], ["gz", "bz2", "xz"])
+)
+def test_compression(tmp_path, suffix, compression):
+    """
+    Check if saving and loading a compressed sequence file gives the
+    same sequences, also if the compressed file has no compression
+    file extension.
+    """
+    ref_sequence = seqio.load_sequence(
+        join(data_dir("sequence"), "random.fasta")
+    )
+    path = str(tmp_path / f"test.{suffix}.{compression}")
+
+    seqio.save_sequence(path, ref_sequence)
+    test_sequence = seqio.load_sequence(path)
+    assert test_sequence == ref_sequence
+
+    # Compression is also detected from the file content
+    os.rename(path, tmp_path / f"test.{suffix}")
+    test_sequence = seqio.load_sequence(tmp_path / f"test.{suffix}")
+    assert test_sequence == ref_sequence
+
+
 @pytest.mark.parametrize("file_name", ["gg_avidin.gb", "bt_lysozyme.gp"])
 def test_genbank(file_name):
     """
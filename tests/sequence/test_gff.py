@@ -2,6 +2,7 @@
 # under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
 # information.
 
+import itertools
 from tempfile import TemporaryFile
 from os.path import join
 import biotite.sequence as seq
@@ -74,6 +75,81 @@ def test_conversion_highlevel(path):
     assert test_phases == ref_phases
 
 
+@pytest.mark.parametrize(
+    "path, chunk_size", itertools.product(
+        ["bt_lysozyme.gff3", "gg_avidin.gff3", "ec_bl21.gff3",
+         "sc_chrom1.gff3", "percent_test.gff3"],
+        [100, 2**24]
+    )
+)
+def test_read_tables(path, chunk_size):
+    """
+    Test whether the entries read via :meth:`GFFFile.read_tables()`
+    are equal to the entries from the line-based interface, also if
+    the lines are split across chunks, and whether
+    :meth:`GFFFile.write_tables()` writes the same entries.
+    """
+    gff_file = gff.GFFFile.read(join(data_dir("sequence"), path))
+    ref_entries = [entry for entry in gff_file]
+
+    tables = list(gff.GFFFile.read_tables(
+        join(data_dir("sequence"), path), chunk_size=chunk_size
+    ))
+    table = gff.GFFTable.concatenate(tables)
+    assert [entry for entry in table] == ref_entries
+    assert [entry for entry in table[::3]] == ref_entries[::3]
+
+    temp = TemporaryFile("w+")
+    gff.GFFFile.write_tables(temp, tables)
+    temp.seek(0)
+    gff_file = gff.GFFFile.read(temp)
+    temp.close()
+    assert [entry for entry in gff_file] == ref_entries
+
+
+@pytest.mark.parametrize(
+    "seqids, types", [
+        (None, ["gene", "CDS"]),
+        (["NC_001133.9"], None),
+        (["NC_001133.9"], ["tRNA"]),
+        (["non_existing"], None),
+    ]
+)
+def test_read_tables_filter(seqids, types):
+    """
+    Test whether the filtered entries from
+    :meth:`GFFFile.read_tables()` give the same :class:`Annotation`
+    as the corresponding entries from the line-based interface.
+    """
+    path = join(data_dir("sequence"), "sc_chrom1.gff3")
+    gff_file = gff.GFFFile.read(path)
+    ref_file = gff.GFFFile()
+    for entry in gff_file:
+        if (seqids is None or entry[0] in seqids) and \
+           (types is None or entry[2] in types):
+                ref_file.append(*entry)
+    ref_annot = gff.get_annotation(ref_file)
+
+    table = gff.GFFTable.concatenate(gff.GFFFile.read_tables(
+        path, seqids=seqids, types=types, chunk_size=1000
+    ))
+    assert len(table) == len(ref_file)
+    test_annot = gff.get_annotation(table)
+    assert test_annot == ref_annot
+
+
+def test_read_tables_fasta():
+    """
+    Test whether :meth:`GFFFile.read_tables()` ignores the FASTA data
+    at the end of a GFF3 file.
+    """
+    with pytest.warns(UserWarning):
+        table = gff.GFFTable.concatenate(gff.GFFFile.read_tables(
+            join(data_dir("sequence"), "indexing_test.gff3")
+        ))
+    assert len(table) == 3
+
+
 @pytest.mark.parametrize(
     "path", ["bt_lysozyme.gp", "gg_avidin.gb", "ec_bl21.gb", "sc_chrom1.gb"]
 )
@@ -202,4 +278,18 @@ def test_feature_without_id():
     )
     file = gff.GFFFile()
     with pytest.raises(ValueError):
-        gff.set_annotation(file, annot)
\ No newline at end of file
+        gff.set_annotation(file, annot)
+
+
+def test_read_tables_error():
+    """
+    Expect that invalid files are reported when
+    :meth:`GFFFile.read_tables()` is called, not only when the tables
+    are iterated.
+    """
+    with pytest.raises(FileNotFoundError):
+        gff.GFFFile.read_tables(join(data_dir("sequence"), "missing.gff3"))
+    temp = TemporaryFile("w+")
+    with pytest.raises(TypeError):
+        gff.GFFFile.read_tables(temp)
+    temp.close()
@@ -436,6 +436,49 @@ def test_connect_via_residue_names(single_model):
     assert test_bonds == ref_bonds
 
 
+def test_connect_via_residue_names_varying_atoms():
+    """
+    Test whether :func:`connect_via_residue_names()` finds the correct
+    bonds, if residues of the same type differ in their atoms and atom
+    order.
+    This checks that residues are not wrongly mapped to a cached bond
+    template of another residue with the same name.
+    """
+    file = mmtf.MMTFFile.read(join(data_dir("structure"), "1l2y.mmtf"))
+    atoms = mmtf.get_structure(file, model=1)
+    # Repeat the structure to obtain multiple residues of each type
+    atoms = atoms + atoms + atoms
+
+    # Randomly remove atoms and shuffle the atoms within each residue
+    np.random.seed(0)
+    residue_starts = struc.get_residue_starts(atoms, add_exclusive_stop=True)
+    order = np.concatenate([
+        np.random.permutation(np.arange(start, stop))
+        for start, stop in zip(residue_starts[:-1], residue_starts[1:])
+    ])
+    atoms = atoms[order]
+    atoms = atoms[np.random.rand(atoms.array_length()) < 0.8]
+
+    # Naive reference implementation
+    ref_bonds = []
+    residue_starts = struc.get_residue_starts(atoms, add_exclusive_stop=True)
+    for start, stop in zip(residue_starts[:-1], residue_starts[1:]):
+        atom_names = atoms.atom_name[start:stop].tolist()
+        bond_dict = info.bonds_in_residue(atoms.res_name[start])
+        for (atom_name1, atom_name2), bond_type in bond_dict.items():
+            if atom_name1 in atom_names and atom_name2 in atom_names:
+                ref_bonds.append((
+                    start + atom_names.index(atom_name1),
+                    start + atom_names.index(atom_name2),
+                    bond_type
+                ))
+    ref_bonds = struc.BondList(atoms.array_length(), np.array(ref_bonds))
+
+    test_bonds = struc.connect_via_residue_names(atoms, inter_residue=False)
+
+    assert test_bonds == ref_bonds
+
+
 @pytest.mark.parametrize("periodic", [False, True])
 def test_connect_via_distances(periodic):
     """
@@ -8,7 +8,7 @@ import numpy as np
 import pytest
 import biotite.structure as struc
 import biotite.structure.io as strucio
-from ..util import data_dir
+from ..util import data_dir, cannot_import
 
 
 # Result should be independent of cell size
@@ -153,4 +153,121 @@ def test_empty_coordinates():
         assert len(indices) == 0
         assert len(mask) == 0
         assert indices.dtype == np.int32
-        assert mask.dtype == bool
\ No newline at end of file
+        assert mask.dtype == bool
+
+
+@pytest.mark.parametrize(
+    "periodic, multi_radius", itertools.product([False, True], [False, True])
+)
+def test_get_atoms_sparse(periodic, multi_radius):
+    """
+    Expect that the sparse output of :meth:`get_atoms_sparse()`
+    contains the same atoms as the padded output of :meth:`get_atoms()`
+    and the correct distances.
+    """
+    array = strucio.load_structure(join(data_dir("structure"), "3o5r.mmtf"))
+    if periodic:
+        array.box = np.diag(
+            np.max(array.coord, axis=-2) - np.min(array.coord, axis=-2)
+        )
+    cell_list = struc.CellList(array, cell_size=5, periodic=periodic)
+    np.random.seed(0)
+    coord = array.coord[np.random.choice(array.array_length(), 100)]
+    if multi_radius:
+        radius = np.random.rand(len(coord)).astype(np.float32) * 10
+    else:
+        radius = 7.0
+
+    ref_indices = cell_list.get_atoms(coord, radius)
+    indptr, indices, distances = cell_list.get_atoms_sparse(
+        coord, radius, return_distances=True
+    )
+    
+    assert len(indptr) == len(coord) + 1
+    for i in range(len(coord)):
+        ref_row = ref_indices[i][ref_indices[i] != -1]
+        test_row = indices[indptr[i] : indptr[i+1]]
+        assert test_row.tolist() == ref_row.tolist()
+    exp_distances = struc.distance(
+        np.repeat(coord, np.diff(indptr), axis=0),
+        array.coord[indices],
+        box=array.box if periodic else None
+    )
+    assert distances == pytest.approx(exp_distances, abs=1e-4)
+
+
+@pytest.mark.skipif(
+    cannot_import("scipy"),
+    reason="SciPy is not installed"
+)
+@pytest.mark.parametrize(
+    "periodic, use_selection", itertools.product([False, True], [False, True])
+)
+def test_sparse_adjacency_matrix(periodic, use_selection):
+    """
+    Expect that the sparse adjacency matrix is equal to the dense one.
+    """
+    array = strucio.load_structure(join(data_dir("structure"), "3o5r.mmtf"))
+    if periodic:
+        array.box = np.diag(
+            np.max(array.coord, axis=-2) - np.min(array.coord, axis=-2)
+        )
+    if use_selection:
+        np.random.seed(0)
+        selection = np.random.choice((False, True), array.array_length())
+    else:
+        selection = None
+    cell_list = struc.CellList(
+        array, cell_size=5, periodic=periodic, selection=selection
+    )
+    
+    ref_matrix = cell_list.create_adjacency_matrix(5)
+    test_matrix = cell_list.create_adjacency_matrix(5, as_sparse=True)
+
+    assert np.array_equal(test_matrix.toarray(), ref_matrix)
+
+
+@pytest.mark.parametrize(
+    "periodic, use_selection, displacement",
+    itertools.product([False, True], [False, True], [0.5, 5.0, 50.0])
+)
+def test_update(periodic, use_selection, displacement):
+    """
+    Expect that a :class:`CellList` updated with new coordinates finds
+    the same atoms as a :class:`CellList` created from these
+    coordinates, irrespective of whether the atoms stay within the
+    cells.
+    """
+    array = strucio.load_structure(join(data_dir("structure"), "3o5r.mmtf"))
+    if periodic:
+        array.box = np.diag(
+            np.max(array.coord, axis=-2) - np.min(array.coord, axis=-2)
+        )
+    np.random.seed(0)
+    if use_selection:
+        selection = np.random.choice((False, True), array.array_length())
+    else:
+        selection = None
+    cell_list = struc.CellList(
+        array, cell_size=5, periodic=periodic, selection=selection
+    )
+
+    for _ in range(3):
+        array.coord += np.random.uniform(
+            -displacement, displacement, array.coord.shape
+        )
+        if periodic:
+            # Also change the box
+            array.box = array.box * np.random.uniform(0.9, 1.1)
+        cell_list.update(array)
+        ref_cell_list = struc.CellList(
+            array, cell_size=5, periodic=periodic, selection=selection
+        )
+
+        coord = array.coord[::10]
+        test_indices = cell_list.get_atoms(coord, 7.0)
+        ref_indices = ref_cell_list.get_atoms(coord, 7.0)
+        for test_row, ref_row in zip(test_indices, ref_indices):
+            # The order of atoms within a cell may differ
+            assert np.sort(test_row[test_row != -1]).tolist() \
+                == np.sort(ref_row[ref_row != -1]).tolist()
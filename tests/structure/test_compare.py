@@ -109,4 +109,30 @@ def test_rmsf_gmx(load_stack_superimpose):
         0.059, 0.037, 0.0331, 0.0392, 0.0403, 0.0954
     ])
 
-    assert np.allclose(rmsf, rmsf_gmx, atol=1e-02)
\ No newline at end of file
+    assert np.allclose(rmsf, rmsf_gmx, atol=1e-02)
+
+
+@pytest.mark.parametrize("block_size", [1, 1000, 2**22])
+def test_rmspd_blocks(load_stack_superimpose, monkeypatch, block_size):
+    """
+    Check if the RMSPD computed in blocks of atom pairs is equal to the
+    RMSPD computed from all pairwise distances at once.
+    """
+    import biotite.structure.compare as compare
+
+    stack, _ = load_stack_superimpose
+    n_atoms = stack.array_length()
+    pairs = np.stack(
+        [np.repeat(np.arange(n_atoms), n_atoms),
+         np.tile(np.arange(n_atoms), n_atoms)],
+        axis=-1
+    )
+    ref_dist = struc.index_distance(stack[0], pairs).astype(np.float64)
+    subj_dist = struc.index_distance(stack, pairs).astype(np.float64)
+    ref_rmspd = np.sqrt(np.sum((subj_dist - ref_dist)**2, axis=-1)) / n_atoms
+
+    monkeypatch.setattr(compare, "_RMSPD_BLOCK_SIZE", block_size)
+    test_rmspd = struc.rmspd(stack[0], stack)
+
+    assert test_rmspd.tolist() == pytest.approx(ref_rmspd.tolist())
+    assert struc.rmspd(stack[0], stack[1]) == pytest.approx(ref_rmspd[1])
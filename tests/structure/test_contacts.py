@@ -0,0 +1,115 @@
+# This source code is part of the Biotite package and is distributed
+# under the 3-Clause BSD License. Please see 'LICENSE.rst' for further
+# information.
+
+import itertools
+from os.path import join
+import numpy as np
+import pytest
+import biotite.structure as struc
+from biotite.structure.io import load_structure
+from ..util import data_dir
+
+
+CUTOFF = 5.0
+
+
+@pytest.fixture
+def stack():
+    return load_structure(join(data_dir("structure"), "1l2y.mmtf"))
+
+
+@pytest.fixture
+def periodic_stack(stack):
+    # The box is chosen so that periodic copies are in contact
+    box = np.diag(np.ptp(stack.coord, axis=(0, 1)) + 2.0)
+    stack.box = np.repeat(box[np.newaxis, ...], stack.stack_depth(), axis=0)
+    return stack
+
+
+def _ref_contact_map(atoms, periodic):
+    """
+    Compute the contact map using all pairwise distances.
+    """
+    n_atoms = atoms.array_length()
+    index_i, index_j = np.triu_indices(n_atoms, k=1)
+    pairs = np.stack([index_i, index_j], axis=-1)
+    distances = struc.index_distance(atoms, pairs, periodic=periodic)
+    mask = distances <= CUTOFF
+    return pairs[mask], distances[mask]
+
+
+@pytest.mark.parametrize("periodic", [False, True])
+def test_contact_map(stack, periodic_stack, periodic):
+    """
+    Compare the contacts found by :func:`contact_map()` with the
+    contacts obtained from all pairwise distances.
+    """
+    atoms = periodic_stack[0] if periodic else stack[0]
+    ref_pairs, ref_distances = _ref_contact_map(atoms, periodic)
+
+    test_pairs, test_distances = struc.contact_map(atoms, CUTOFF, periodic)
+
+    assert test_pairs.tolist() == ref_pairs.tolist()
+    assert test_distances == pytest.approx(ref_distances, abs=1e-4)
+
+
+@pytest.mark.parametrize(
+    "periodic, as_stack", itertools.product([False, True], [False, True])
+)
+def test_contact_map_iter(stack, periodic_stack, periodic, as_stack):
+    """
+    Check if :func:`contact_map_iter()` gives the same result as
+    :func:`contact_map()` for each frame, independent of whether the
+    frames are given as :class:`AtomArrayStack` or individual
+    :class:`AtomArray` objects.
+    """
+    if periodic:
+        stack = periodic_stack
+    frames = [stack[:10], stack[10:]] if as_stack else list(stack)
+
+    test_maps = list(struc.contact_map_iter(frames, CUTOFF, periodic))
+
+    assert len(test_maps) == stack.stack_depth()
+    for atoms, (test_pairs, test_distances) in zip(stack, test_maps):
+        ref_pairs, ref_distances = struc.contact_map(atoms, CUTOFF, periodic)
+        assert test_pairs.tolist() == ref_pairs.tolist()
+        assert test_distances.tolist() == ref_distances.tolist()
+
+
+def test_contact_frequency(stack):
+    """
+    Compare the contact frequency with the frequency computed from
+    the contact maps of all frames.
+    """
+    counts = {}
+    for atoms in stack:
+        pairs, _ = struc.contact_map(atoms, CUTOFF)
+        for pair in pairs.tolist():
+            counts[tuple(pair)] = counts.get(tuple(pair), 0) + 1
+    ref_pairs = sorted(counts.keys())
+    ref_frequency = [counts[pair] / stack.stack_depth() for pair in ref_pairs]
+
+    test_pairs, test_frequency = struc.contact_frequency(stack, CUTOFF)
+
+    assert test_pairs.tolist() == [list(pair) for pair in ref_pairs]
+    assert test_frequency.tolist() == pytest.approx(ref_frequency)
+
+
+def test_native_contact_fraction(stack):
+    """
+    Compare the fraction of native contacts with the fraction
+    computed from the contact maps of all frames.
+    """
+    native_pairs, _ = struc.contact_map(stack[0], CUTOFF)
+    native_pairs = set(map(tuple, native_pairs.tolist()))
+    ref_q = []
+    for atoms in stack:
+        pairs, _ = struc.contact_map(atoms, CUTOFF)
+        pairs = set(map(tuple, pairs.tolist()))
+        ref_q.append(len(native_pairs & pairs) / len(native_pairs))
+
+    test_q = struc.native_contact_fraction(stack[0], stack, CUTOFF)
+
+    assert test_q[0] == 1.0
+    assert test_q.tolist() == pytest.approx(ref_q)
@@ -155,6 +155,40 @@ def test_saving_with_extra_args(suffix):
     temp.close()
 
 
+@pytest.mark.parametrize(
+    "suffix, compression",
+    itertools.product(
+        ["pdb", "cif", "gro", "mmtf", "npz", "sdf"],
+        ["gz", "bz2", "xz"]
+    )
+)
+def test_compression(tmp_path, suffix, compression):
+    """
+    Check if saving and loading a compressed structure file gives the
+    same structure as an uncompressed file.
+    """
+    if suffix == "sdf":
+        path = join(data_dir("structure"), "molecules", "TYR.sdf")
+    else:
+        path = join(data_dir("structure"), "1l2y.mmtf")
+    ref_array = strucio.load_structure(path)
+    if isinstance(ref_array, struc.AtomArrayStack):
+        # Saving a single model is sufficient
+        ref_array = ref_array[0]
+    uncompressed_path = str(tmp_path / f"test.{suffix}")
+    compressed_path = str(tmp_path / f"test.{suffix}.{compression}")
+
+    strucio.save_structure(uncompressed_path, ref_array)
+    strucio.save_structure(compressed_path, ref_array)
+    ref_array = strucio.load_structure(uncompressed_path)
+    test_array = strucio.load_structure(compressed_path)
+
+    with open(compressed_path, "rb") as compressed_file, \
+         open(uncompressed_path, "rb") as uncompressed_file:
+        assert compressed_file.read(2) != uncompressed_file.read(2)
+    assert test_array == ref_array
+
+
 def test_small_molecule():
     """
     Check if loading a small molecule file written via
@@ -200,3 +234,52 @@ def test_guess_element(name, expected):
     """
     result = _guess_element(name)
     assert result == expected
+
+
+def _count_ca(atoms):
+    return np.count_nonzero(atoms.atom_name == "CA")
+
+
+@pytest.mark.parametrize(
+    "n_processes, prefetch, use_callback",
+    itertools.product([1, 2], [None, 1], [False, True])
+)
+def test_load_structures(n_processes, prefetch, use_callback):
+    """
+    Check if :func:`load_structures()` gives the same results in the
+    same order as loading each file via :func:`load_structure()`.
+    """
+    paths = [
+        join(data_dir("structure"), pdb_id + ".mmtf")
+        for pdb_id in ("1l2y", "1gya", "1aki", "1dix", "5eil")
+    ]
+    callback = _count_ca if use_callback else None
+    test_results = list(strucio.load_structures(
+        paths, callback, n_processes, prefetch, include_bonds=True
+    ))
+
+    assert len(test_results) == len(paths)
+    for path, test_result in zip(paths, test_results):
+        ref_atoms = strucio.load_structure(path, include_bonds=True)
+        if use_callback:
+            assert test_result == _count_ca(ref_atoms)
+        else:
+            assert test_result == ref_atoms
+            assert test_result.bonds == ref_atoms.bonds
+
+
+def test_load_structures_error():
+    """
+    Check if an exception in a worker process is raised, when the
+    respective result is requested, and if the preceding results are
+    still returned.
+    """
+    paths = [
+        join(data_dir("structure"), "1l2y.mmtf"),
+        join(data_dir("structure"), "1l2y.unknown"),
+        join(data_dir("structure"), "1aki.mmtf"),
+    ]
+    results = strucio.load_structures(paths, n_processes=2)
+    assert isinstance(next(results), struc.AtomArrayStack)
+    with pytest.raises(ValueError):
+        next(results)
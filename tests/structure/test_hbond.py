@@ -197,4 +197,89 @@ def test_hbond_periodicity(translation_vector):
     array.coord = struc.move_inside_box(array.coord, array.box)
     hbonds = struc.hbond(array, periodic=True)
     hbonds = set([tuple(triplet) for triplet in hbonds])
-    assert ref_hbonds == hbonds
\ No newline at end of file
+    assert ref_hbonds == hbonds
+
+
+# Ignore warning about missing BondList, as this is intended
+@pytest.mark.filterwarnings("ignore")
+@pytest.mark.parametrize(
+    "stack, selection1_type, as_stacks", itertools.product(
+        [False, True],
+        ["both", "donor", "acceptor"],
+        [False, True]
+    ),
+    indirect=["stack"]
+)
+def test_hbond_iter(stack, selection1_type, as_stacks):
+    """
+    Expect that :func:`hbond_iter()` finds the same hydrogen bonds in
+    each frame as :func:`hbond()`, irrespective of whether the frames
+    are given as single models or as stacks.
+    """
+    selection1 = stack.res_id < 10
+    selection2 = stack.res_id >= 5
+    ref_triplets, ref_mask = struc.hbond(
+        stack, selection1, selection2, selection1_type
+    )
+
+    if as_stacks:
+        frames = (stack[i : i+5] for i in range(0, stack.stack_depth(), 5))
+    else:
+        frames = iter(stack)
+    test_triplets, packed_mask = struc.hbond_iter(
+        frames, selection1, selection2, selection1_type
+    )
+    test_mask = np.unpackbits(
+        packed_mask, axis=1, count=len(test_triplets)
+    ).astype(bool)
+
+    # Both functions may use different order
+    # -> sort triplets for comparison
+    ref_order = np.lexsort(ref_triplets.T)
+    test_order = np.lexsort(test_triplets.T)
+    assert test_triplets[test_order].tolist() \
+        == ref_triplets[ref_order].tolist()
+    assert test_mask[:, test_order].tolist() \
+        == ref_mask[:, ref_order].tolist()
+
+
+# Ignore warning about missing BondList
+@pytest.mark.filterwarnings("ignore")
+def test_hbond_iter_periodicity():
+    """
+    Expect that :func:`hbond_iter()` finds the same hydrogen bonds as
+    :func:`hbond()` in periodic boundary conditions.
+    """
+    array = load_structure(join(data_dir("structure"), "waterbox.gro"))[0]
+    ref_triplets = struc.hbond(array, periodic=True)
+    test_triplets, packed_mask = struc.hbond_iter([array], periodic=True)
+    
+    assert set([tuple(triplet) for triplet in test_triplets]) \
+        == set([tuple(triplet) for triplet in ref_triplets])
+    assert np.unpackbits(
+        packed_mask, axis=1, count=len(test_triplets)
+    ).all()
+
+
+def test_hbond_frequency_packed():
+    """
+    Expect that :func:`hbond_frequency()` gives the same result for a
+    bit-packed mask as for the corresponding boolean mask.
+    """
+    np.random.seed(0)
+    mask = np.random.rand(3000, 21) < 0.3
+    # The last bonds are absent in a subset of models
+    mask[:10, -5:] = False
+    packed_mask = np.packbits(mask, axis=1)
+    freq = struc.hbond_frequency(packed_mask, n_bonds=mask.shape[1])
+    assert freq.tolist() == pytest.approx(struc.hbond_frequency(mask).tolist())
+
+    sub_freq = struc.hbond_frequency(packed_mask[:10], n_bonds=mask.shape[1])
+    assert len(sub_freq) == mask.shape[1]
+    assert sub_freq.tolist() \
+        == pytest.approx(struc.hbond_frequency(mask[:10]).tolist())
+    assert sub_freq[-5:].tolist() == [0] * 5
+
+    # An uint8 mask without 'n_bonds' is not interpreted as bit-packed
+    assert struc.hbond_frequency(mask.astype(np.uint8)).tolist() \
+        == pytest.approx(struc.hbond_frequency(mask).tolist())
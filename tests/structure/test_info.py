@@ -110,6 +110,44 @@ def test_link_type():
     assert strucinfo.link_type("ALA").upper() == "L-PEPTIDE LINKING"
 
 
+@pytest.mark.parametrize("writable", [False, True])
+def test_dataset_cache(monkeypatch, tmp_path, writable):
+    """
+    Test whether a dataset converted into the columnar format is
+    written into the cache directory and memory-mapped in subsequent
+    accesses, or kept in memory if the cache directory is not writable.
+    """
+    from biotite.structure.info import ccd
+
+    if writable:
+        cache_dir = tmp_path / "cache"
+    else:
+        # A directory cannot be created inside a file
+        (tmp_path / "file").touch()
+        cache_dir = tmp_path / "file" / "cache"
+    monkeypatch.setenv("BIOTITE_CACHE_DIR", str(cache_dir))
+    if writable:
+        # Outdated conversion of the same dataset and a conversion of
+        # another dataset
+        (cache_dir / "link_types-0-0-v1").mkdir(parents=True)
+        (cache_dir / "residues-0-0-v1").mkdir()
+
+    for _ in range(2):
+        # Clear the loaded datasets to enforce reading from cache
+        monkeypatch.setattr(ccd, "_datasets", {})
+        assert strucinfo.link_type("TRP") == "L-PEPTIDE LINKING"
+        dataset = ccd.get_dataset("link_types")
+        for array in dataset.values():
+            assert isinstance(array, np.memmap) == writable
+    if writable:
+        # The outdated conversion is removed
+        dir_names = sorted([path.name for path in cache_dir.iterdir()])
+        assert len(dir_names) == 2
+        assert dir_names[0].startswith("link_types-")
+        assert dir_names[0] != "link_types-0-0-v1"
+        assert dir_names[1] == "residues-0-0-v1"
+
+
 @pytest.mark.parametrize(
     "multi_model, seed", itertools.product([False, True], range(10))
 )
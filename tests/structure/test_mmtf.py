@@ -46,6 +46,56 @@ def test_codecs(path):
                 assert (array1 == array2).all()
 
 
+@pytest.mark.parametrize("codec", range(1, 16))
+def test_range_decoding(codec):
+    """
+    Test whether decoding a range of an encoded array gives the same
+    result as slicing the completely decoded array, for all codecs.
+    """
+    N_RANGES = 100
+    LENGTH = 1000
+
+    np.random.seed(0)
+    param = 0
+    if codec in (1, 9, 10, 11, 12, 13):
+        param = 100
+        # Cover the values, that require multiple elements when packed
+        ref_array = np.round(
+            np.random.normal(scale=500, size=LENGTH), 2
+        ).astype(np.float32)
+        if codec in (11, 13):
+            # These codecs only support small values
+            ref_array /= 1000
+        if codec == 9:
+            # Create runs
+            ref_array = np.repeat(ref_array[:LENGTH // 10], 10)
+    elif codec == 5:
+        param = 4
+        ref_array = np.random.choice(["A", "BC", "DEF", "GHIJ"], size=LENGTH)
+    elif codec == 6:
+        ref_array = np.repeat(np.random.choice(["A", "B"], LENGTH // 10), 10)
+    elif codec == 7:
+        ref_array = np.repeat(np.random.randint(-100, 100, LENGTH // 10), 10)
+    elif codec == 8:
+        ref_array = np.cumsum(np.random.randint(0, 2, LENGTH))
+    elif codec == 2:
+        ref_array = np.random.randint(-128, 128, LENGTH)
+    elif codec in (3, 15):
+        ref_array = np.random.randint(-1000, 1000, LENGTH)
+    else:
+        ref_array = np.random.randint(-100000, 100000, LENGTH)
+
+    mmtf_file = mmtf.MMTFFile()
+    mmtf_file.set_array("array", ref_array, codec, param)
+    full_array = mmtf_file["array"]
+    assert np.array_equal(mmtf_file.get_array("array"), full_array)
+    for _ in range(N_RANGES):
+        start, stop = np.sort(np.random.randint(-10, LENGTH + 10, size=2))
+        test_array = mmtf_file.get_array("array", start, stop)
+        assert test_array.dtype == full_array.dtype
+        assert np.array_equal(test_array, full_array[start:stop])
+
+
 @pytest.mark.parametrize(
     "path, model",
     itertools.product(
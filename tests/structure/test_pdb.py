@@ -370,6 +370,34 @@ def test_hybrid36_codec(number, length):
     assert test_number == number
 
 
+@pytest.mark.parametrize("length", LENGTHS)
+def test_hybrid36_array_decoding(length):
+    """
+    Test whether vectorized hybrid-36 decoding of whitespace padded
+    strings gives the same result as decoding each string separately.
+    """
+    np.random.seed(0)
+    numbers = np.random.randint(0, hybrid36.max_hybrid36_number(length), N)
+    # Include decimal numbers with padding and negative numbers
+    strings = [
+        hybrid36.encode_hybrid36(number, length).rjust(length)
+        for number in numbers
+    ] + [" " * (length-1) + "7", "-1".rjust(length)]
+    char_matrix = np.frombuffer(
+        "".join(strings).encode("ascii"), dtype=np.uint8
+    ).reshape(-1, length)
+
+    test_numbers = hybrid36._decode_hybrid36_array(char_matrix)
+
+    assert test_numbers.tolist() \
+        == [hybrid36.decode_hybrid36(string) for string in strings]
+
+    with pytest.raises(ValueError):
+        hybrid36._decode_hybrid36_array(
+            np.full((1, length), ord(" "), dtype=np.uint8)
+        )
+
+
 def test_max_hybrid36_number():
     assert hybrid36.max_hybrid36_number(4) == 2436111
     assert hybrid36.max_hybrid36_number(5) == 87440031
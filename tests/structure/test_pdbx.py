@@ -3,6 +3,7 @@
 # information.
 
 import glob
+import io
 import itertools
 from os.path import join
 import numpy as np
@@ -49,6 +50,77 @@ def test_parsing(category, key, exp_value):
         assert value == exp_value
 
 
+def test_tokenization():
+    """
+    Test parsing of quoted values, multi-line text fields and comments,
+    that may contain characters with special meaning.
+    """
+    text = "\n".join([
+        "data_test",
+        "#",
+        "_single.quoted   'It''s a value'",
+        "_single.double   \"'quoted' # no comment\"",
+        "_single.next_line",
+        "'value in next line'",
+        "_single.text_field",
+        ";first line",
+        "_second_line",
+        ";",
+        "#",
+        "loop_",
+        "_looped.name",
+        "_looped.value",
+        "A  \"O5'\"  # A comment",
+        "B",
+        ";text",
+        "field",
+        ";",
+        "C  'C 1'",
+        "#",
+    ])
+    pdbx_file = pdbx.PDBxFile.read(io.StringIO(text))
+
+    assert pdbx_file["single"] == {
+        "quoted": "It''s a value",
+        "double": "'quoted' # no comment",
+        "next_line": "value in next line",
+        "text_field": "first line_second_line",
+    }
+    looped = pdbx_file["looped"]
+    assert looped["name"].tolist() == ["A", "B", "C"]
+    assert looped["value"].tolist() == ["O5'", "textfield", "C 1"]
+
+
+@pytest.mark.parametrize(
+    "category, expect_looped",
+    itertools.product(
+        ["atom_site", "struct", "pdbx_nmr_ensemble"], [False, True]
+    ),
+)
+def test_lazy_category(category, expect_looped):
+    """
+    Test whether the lazy category view gives the same values as the
+    dictionary and whether row slicing selects the correct values.
+    """
+    pdbx_file = pdbx.PDBxFile.read(join(data_dir("structure"), "1l2y.cif"))
+    ref_dict = pdbx_file.get_category(category, expect_looped=expect_looped)
+    test_view = pdbx_file.get_category(
+        category, expect_looped=expect_looped, lazy=True
+    )
+
+    assert list(test_view.keys()) == list(ref_dict.keys())
+    for key, ref_value in ref_dict.items():
+        if isinstance(ref_value, np.ndarray):
+            assert test_view[key].tolist() == ref_value.tolist()
+        else:
+            assert test_view[key] == ref_value
+
+    if category == "atom_site":
+        sliced_view = test_view.slice_rows(10, 20).slice_rows(5, None)
+        for key, ref_value in ref_dict.items():
+            assert sliced_view[key].tolist() == ref_value[15:20].tolist()
+
+
 @pytest.mark.parametrize(
     "string, use_array",
     itertools.product(["", " ", "\n", "\t"], [False, True]),
@@ -73,4 +73,42 @@ def test_coarse_grained(pdb_id):
     # have less than 40% SASA difference
     assert np.count_nonzero(
         np.isclose(sasa, sasa_exp, rtol=4e-1, atol=1)
-    ) / len(sasa) > 0.98
\ No newline at end of file
+    ) / len(sasa) > 0.98
+
+
+@pytest.mark.parametrize("n_threads", [1, 2, 5])
+def test_stack(n_threads):
+    """
+    Expect that the SASA for an :class:`AtomArrayStack` is equal to the
+    SASA calculated for each model separately, irrespective of the
+    number of threads.
+    """
+    file = mmtf.MMTFFile.read(join(data_dir("structure"), "1l2y.mmtf"))
+    stack = mmtf.get_structure(file)
+
+    test_sasa = struc.sasa(stack, vdw_radii="Single", n_threads=n_threads)
+    ref_sasa = np.stack([
+        struc.sasa(array, vdw_radii="Single") for array in stack
+    ])
+
+    assert test_sasa.shape == (stack.stack_depth(), stack.array_length())
+    assert np.array_equal(test_sasa, ref_sasa, equal_nan=True)
+
+
+@pytest.mark.parametrize("vdw_radii", ["ProtOr", "Single"])
+def test_calculator(vdw_radii):
+    """
+    Expect that a :class:`SasaCalculator` created from the first model
+    gives the same SASA for each model as :func:`sasa()`.
+    """
+    file = mmtf.MMTFFile.read(join(data_dir("structure"), "1l2y.mmtf"))
+    stack = mmtf.get_structure(file)
+    calculator = struc.SasaCalculator(stack[0], vdw_radii=vdw_radii)
+
+    for array in stack[:5]:
+        test_sasa = calculator.compute(array.coord)
+        ref_sasa = struc.sasa(array, vdw_radii=vdw_radii)
+        assert np.array_equal(test_sasa, ref_sasa, equal_nan=True)
+    
+    with pytest.raises(IndexError):
+        calculator.compute(stack.coord[:, :10])
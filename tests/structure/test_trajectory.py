@@ -329,4 +329,91 @@ def test_write_iter(format, n_models, n_atoms, include_box, include_time):
     if include_box:
         assert np.allclose(test_box, ref_box, atol=1e-2)
     if include_time:
-        assert np.allclose(test_time, ref_time, atol=1e-2)
\ No newline at end of file
+        assert np.allclose(test_time, ref_time, atol=1e-2)
+
+
+@pytest.mark.skipif(
+    cannot_import("mdtraj"),
+    reason="MDTraj is not installed"
+)
+@pytest.mark.parametrize(
+    "format, index",
+    itertools.product(
+        ["trr", "xtc", "dcd", "netcdf"],
+        [
+            0,
+            20,
+            -1,
+            slice(None),
+            slice(5, 30, 3),
+            slice(30, 5, -4),
+            slice(10, 10),
+            np.array([37, 0, 20, 20]),
+        ],
+    )
+)
+def test_read_frames(format, index):
+    """
+    Expect that random access to frames via :func:`read_frames()` gives
+    the same values as indexing the full trajectory.
+    """
+    if format == "trr":
+        traj_file_cls = trr.TRRFile
+    if format == "xtc":
+        traj_file_cls = xtc.XTCFile
+    if format == "dcd":
+        traj_file_cls = dcd.DCDFile
+    if format == "netcdf":
+        traj_file_cls = netcdf.NetCDFFile
+    file_name = join(data_dir("structure"), f"1l2y.{format}")
+
+    traj_file = traj_file_cls.read(file_name)
+    ref_coord = traj_file.get_coord()[index]
+
+    with traj_file_cls.read_frames(file_name) as frames:
+        assert len(frames) == len(traj_file.get_coord())
+        test_coord, _, test_time = frames[index]
+
+    assert test_coord.shape == ref_coord.shape
+    assert test_coord == pytest.approx(ref_coord, abs=1e-2)
+    if format not in ["dcd", "netcdf"]:
+        ref_time = traj_file.get_time()[index]
+        assert np.asarray(test_time) == pytest.approx(ref_time)
+
+
+@pytest.mark.skipif(
+    cannot_import("mdtraj"),
+    reason="MDTraj is not installed"
+)
+@pytest.mark.parametrize("format", ["trr", "xtc"])
+def test_frame_index(tmp_path, format):
+    """
+    Expect that a frame index is written and used for reading, but is
+    ignored, if the trajectory file changed afterwards.
+    """
+    if format == "trr":
+        traj_file_cls = trr.TRRFile
+    if format == "xtc":
+        traj_file_cls = xtc.XTCFile
+    ref_file_name = join(data_dir("structure"), f"1l2y.{format}")
+    file_name = str(tmp_path / f"1l2y.{format}")
+    ref_coord = traj_file_cls.read(ref_file_name).get_coord()
+    traj_file_cls.write_iter(file_name, ref_coord)
+
+    offsets = traj_file_cls.create_frame_index(file_name)
+    assert len(offsets) == len(ref_coord)
+    assert (tmp_path / f"1l2y.{format}.offsets.npz").exists()
+
+    test_coord = traj_file_cls.read(file_name, start=20).get_coord()
+    assert test_coord == pytest.approx(ref_coord[20:], abs=1e-2)
+    test_coord = np.stack([
+        coord for coord, _, _
+        in traj_file_cls.read_iter(file_name, start=30)
+    ])
+    assert test_coord == pytest.approx(ref_coord[30:], abs=1e-2)
+
+    # Rewrite the file with fewer frames -> index is outdated
+    traj_file_cls.write_iter(file_name, ref_coord[:10])
+    with traj_file_cls.read_frames(file_name) as frames:
+        assert len(frames) == 10
+        assert frames[-1][0] == pytest.approx(ref_coord[9], abs=1e-2)